@@ -34,6 +34,7 @@ from tensorflow_federated.python.aggregators.mean import UnweightedMeanFactory
 from tensorflow_federated.python.aggregators.measurements import add_measurements
 from tensorflow_federated.python.aggregators.primitives import federated_max
 from tensorflow_federated.python.aggregators.primitives import federated_min
+from tensorflow_federated.python.aggregators.primitives import federated_quantiles
 from tensorflow_federated.python.aggregators.primitives import federated_sample
 from tensorflow_federated.python.aggregators.primitives import secure_quantized_sum
 from tensorflow_federated.python.aggregators.quantile_estimation import PrivateQuantileEstimationProcess
@@ -44,4 +45,6 @@ from tensorflow_federated.python.aggregators.rotation import HadamardTransformFa
 from tensorflow_federated.python.aggregators.sampling import UnweightedReservoirSamplingFactory
 from tensorflow_federated.python.aggregators.secure import SecureModularSumFactory
 from tensorflow_federated.python.aggregators.secure import SecureSumFactory
+from tensorflow_federated.python.aggregators.sparse_top_k import SparseTopKSumFactory
+from tensorflow_federated.python.aggregators.sparse_top_k import top_k_with_error_feedback
 from tensorflow_federated.python.aggregators.sum_factory import SumFactory
@@ -0,0 +1,99 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for the fast Walsh-Hadamard transform.
+
+Run with `--benchmarks=.` to report the wall time of
+`fused_fast_walsh_hadamard_transform`, with and without XLA compilation,
+compared with `fast_walsh_hadamard_transform` for a range of dimensions. The
+batched benchmark compares transforming the tensors of a structure one at a
+time with transforming them in a single batch, as done by
+`rotation.HadamardTransformFactory`.
+"""
+
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from tensorflow_federated.python.aggregators import hadamard
+
+_DIMS = (2**10, 2**16, 2**20, 2**23)
+_NUM_TENSORS = 16
+_ITERS = 5
+
+
+def _median_wall_time(fn, *args):
+  fn(*args)  # Trace and warm up.
+  wall_times = []
+  for _ in range(_ITERS):
+    start_time = time.perf_counter()
+    result = fn(*args)
+    tf.nest.map_structure(lambda x: x.numpy(), result)
+    wall_times.append(time.perf_counter() - start_time)
+  return np.median(wall_times)
+
+
+class HadamardBenchmark(tf.test.Benchmark):
+
+  def _report(self, name, dim, wall_time):
+    self.report_benchmark(
+        iters=_ITERS,
+        wall_time=wall_time,
+        name=name,
+        extras={
+            'dim': dim,
+            'elements_per_sec': dim / wall_time,
+        })
+
+  def benchmark_transform(self):
+    transforms = {
+        'op_graph':
+            tf.function(hadamard.fast_walsh_hadamard_transform),
+        'fused':
+            tf.function(hadamard.fused_fast_walsh_hadamard_transform),
+        'fused_xla':
+            tf.function(
+                hadamard.fused_fast_walsh_hadamard_transform,
+                jit_compile=True),
+    }
+    for dim in _DIMS:
+      x = tf.random.normal([1, dim])
+      for name, transform in transforms.items():
+        self._report(f'transform_{name}_{dim}', dim,
+                     _median_wall_time(transform, x))
+
+  def benchmark_batched_transform(self):
+
+    @tf.function
+    def transform_each(tensors):
+      return [
+          hadamard.fast_walsh_hadamard_transform(tf.expand_dims(x, axis=0))
+          for x in tensors
+      ]
+
+    @tf.function
+    def transform_batched(tensors):
+      return hadamard.fused_fast_walsh_hadamard_transform(tf.stack(tensors))
+
+    for dim in _DIMS[:-1]:
+      tensors = [tf.random.normal([dim]) for _ in range(_NUM_TENSORS)]
+      self._report(f'batched_op_graph_{_NUM_TENSORS}x{dim}',
+                   _NUM_TENSORS * dim,
+                   _median_wall_time(transform_each, tensors))
+      self._report(f'batched_fused_{_NUM_TENSORS}x{dim}', _NUM_TENSORS * dim,
+                   _median_wall_time(transform_batched, tensors))
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -133,5 +133,73 @@ class FastWalshHadamardTransformTests(tf.test.TestCase, parameterized.TestCase):
     self.assertAllClose(1.0 / 16.0, min_abs_hx)
 
 
+class FusedFastWalshHadamardTransformTests(tf.test.TestCase,
+                                           parameterized.TestCase):
+  """Tests for `fused_fast_walsh_hadamard_transform` method."""
+
+  @parameterized.named_parameters(('1x1', [1, 1]), ('1x2', [1, 2]),
+                                  ('3x8', [3, 8]), ('5x256', [5, 256]))
+  def test_equals_fast_walsh_hadamard_transform(self, dims):
+    x = tf.random.normal(dims)
+    expected_hx = hadamard.fast_walsh_hadamard_transform(x)
+    hx = hadamard.fused_fast_walsh_hadamard_transform(x)
+    self.assertEqual(dims, hx.shape.as_list())
+    self.assertAllClose(expected_hx, hx)
+
+  @parameterized.named_parameters(('1', 1), ('2', 2), ('5', 5), ('11', 11))
+  def test_apply_twice_equals_identity(self, first_dim):
+    x = tf.random.normal([first_dim, 16])
+    hhx = hadamard.fused_fast_walsh_hadamard_transform(
+        hadamard.fused_fast_walsh_hadamard_transform(x))
+    self.assertAllClose(x, hhx)
+
+  def test_equals_fast_walsh_hadamard_transform_with_jit_compile(self):
+    x = tf.random.normal([2, 64])
+    fused_fn = tf.function(
+        hadamard.fused_fast_walsh_hadamard_transform, jit_compile=True)
+    self.assertAllClose(hadamard.fast_walsh_hadamard_transform(x), fused_fn(x))
+
+  def test_dynamic_input_shape(self):
+
+    # Explicit drop to graph mode for non-statically known shape to be possible.
+    @tf.function
+    def test_fn():
+      rand = tf.random.uniform((), maxval=4, dtype=tf.int32)
+      x = tf.random.normal((3, 2**rand))
+      hx = hadamard.fused_fast_walsh_hadamard_transform(x)
+      expected_hx = hadamard.fast_walsh_hadamard_transform(x)
+      return hx, expected_hx
+
+    hx, expected_hx = test_fn()
+    self.assertAllClose(expected_hx, hx)
+
+  @parameterized.named_parameters(('1', [1]), ('1x4x4', [1, 4, 4]))
+  def test_illegal_inputs_shape(self, dims):
+    x = tf.random.normal(dims)
+    with self.assertRaisesRegex(hadamard.TensorShapeError,
+                                'Number of dimensions of x must be 2.'):
+      hadamard.fused_fast_walsh_hadamard_transform(x)
+
+  @parameterized.named_parameters(('1x3', [1, 3]), ('4x12', [4, 12]))
+  def test_illegal_inputs_static_power_of_two(self, dims):
+    x = tf.random.normal(dims)
+    with self.assertRaisesRegex(hadamard.TensorShapeError,
+                                'The dimension of x must be a power of two.'):
+      hadamard.fused_fast_walsh_hadamard_transform(x)
+
+  def test_illegal_inputs_dynamic_power_of_two(self):
+
+    @tf.function
+    def test_fn():
+      rand = tf.random.uniform((), maxval=3, dtype=tf.int32) + 1
+      x = tf.random.normal((3, 3**rand))
+      return hadamard.fused_fast_walsh_hadamard_transform(x)
+
+    with self.assertRaisesWithPredicateMatch(
+        tf.errors.InvalidArgumentError,
+        'The dimension of x must be a power of two.'):
+      test_fn()
+
+
 if __name__ == '__main__':
   tf.test.main()
@@ -19,6 +19,7 @@
 """A package of primitive (stateless) aggregations."""
 
 import attr
+import numpy as np
 import tensorflow as tf
 
 from tensorflow_federated.python.common_libs import py_typecheck
@@ -281,6 +282,191 @@ def federated_sample(value, max_num_samples=100):
   return intrinsics.federated_aggregate(value, zeros, accumulate, merge, report)
 
 
+@attr.s
+class _QuantileSketch:
+  """Class representing internal quantile sketch data structure.
+
+  The sketch is a fixed number of weighted centroids, `means` and `weights`,
+  as in the t-digest (https://arxiv.org/abs/1902.04023), together with the
+  exact `min_value` and `max_value` of the values added to the sketch. Unused
+  centroids have a weight of zero.
+  """
+  means = attr.ib()
+  weights = attr.ib()
+  min_value = attr.ib()
+  max_value = attr.ib()
+
+
+_QUANTILE_SKETCH_DTYPE = tf.float64
+
+
+def _compress_quantile_sketch(means, weights, max_num_centroids):
+  """Compresses the weighted `means` into `max_num_centroids` centroids.
+
+  The values are sorted and partitioned into contiguous centroids using the
+  arcsine scale function of the t-digest, which makes the centroids near the
+  tails of the distribution smaller than those near the median, so that
+  extreme quantiles are estimated more accurately.
+
+  Args:
+    means: A rank-1 tensor of values.
+    weights: A rank-1 tensor of the weights of `means`.
+    max_num_centroids: The number of centroids to compress to.
+
+  Returns:
+    A tuple of the means and weights of the compressed centroids, each with
+    shape `[max_num_centroids]`.
+  """
+  order = tf.argsort(means, stable=True)
+  means = tf.gather(means, order)
+  weights = tf.gather(weights, order)
+  cumulative_weights = tf.cumsum(weights)
+  quantiles = tf.math.divide_no_nan(cumulative_weights - weights / 2.0,
+                                    cumulative_weights[-1])
+  scaled_quantiles = max_num_centroids * (
+      tf.asin(tf.clip_by_value(2.0 * quantiles - 1.0, -1.0, 1.0)) / np.pi +
+      0.5)
+  segment_ids = tf.clip_by_value(
+      tf.cast(tf.floor(scaled_quantiles), tf.int32), 0, max_num_centroids - 1)
+  compressed_weights = tf.math.unsorted_segment_sum(weights, segment_ids,
+                                                    max_num_centroids)
+  compressed_means = tf.math.divide_no_nan(
+      tf.math.unsorted_segment_sum(weights * means, segment_ids,
+                                   max_num_centroids), compressed_weights)
+  return compressed_means, compressed_weights
+
+
+def _merge_quantile_sketch(sketch, means, weights, min_value, max_value,
+                           max_num_centroids):
+  """Merges weighted `means` in the range `[min_value, max_value]`."""
+  means, weights = _compress_quantile_sketch(
+      tf.concat([sketch.means, means], axis=0),
+      tf.concat([sketch.weights, weights], axis=0), max_num_centroids)
+  return _QuantileSketch(means, weights,
+                         tf.minimum(sketch.min_value, min_value),
+                         tf.maximum(sketch.max_value, max_value))
+
+
+def _interpolate_quantiles(sketch, quantiles):
+  """Estimates the `quantiles` of the values summarized by `sketch`.
+
+  Each centroid is placed at the quantile of its midpoint, and the minimum and
+  maximum values at quantiles 0 and 1, and the requested quantiles are
+  linearly interpolated between those points.
+
+  Args:
+    sketch: A `_QuantileSketch`.
+    quantiles: A rank-1 tensor of quantiles in the range [0, 1].
+
+  Returns:
+    A rank-1 tensor of the estimated quantiles, which are NaN if the sketch is
+    empty.
+  """
+  nonempty = sketch.weights > 0
+  means = tf.boolean_mask(sketch.means, nonempty)
+  weights = tf.boolean_mask(sketch.weights, nonempty)
+  total_weight = tf.reduce_sum(weights)
+  positions = tf.math.divide_no_nan(tf.cumsum(weights) - weights / 2.0,
+                                    total_weight)
+  zero = tf.zeros([1], _QUANTILE_SKETCH_DTYPE)
+  positions = tf.concat([zero, positions, zero + 1.0], axis=0)
+  values = tf.concat([
+      tf.reshape(sketch.min_value, [1]), means,
+      tf.reshape(sketch.max_value, [1])
+  ], axis=0)
+  upper = tf.clip_by_value(
+      tf.searchsorted(positions, quantiles, side='right'), 1,
+      tf.size(positions) - 1)
+  lower = upper - 1
+  lower_position = tf.gather(positions, lower)
+  lower_value = tf.gather(values, lower)
+  fraction = tf.math.divide_no_nan(quantiles - lower_position,
+                                   tf.gather(positions, upper) - lower_position)
+  estimates = lower_value + fraction * (tf.gather(values, upper) - lower_value)
+  return tf.where(total_weight > 0, estimates,
+                  tf.constant(np.nan, _QUANTILE_SKETCH_DTYPE))
+
+
+def federated_quantiles(value, quantiles, max_num_centroids=100):
+  """Aggregation to estimate `quantiles` of all client values.
+
+  Each client value is a tensor of any shape, all elements of which are added
+  to a mergeable quantile sketch. The sketch is a t-digest with at most
+  `max_num_centroids` centroids, which are accumulated and merged in
+  `tff.federated_aggregate` by sorting the centroids of both inputs and
+  compressing them back to `max_num_centroids` centroids. The memory used by
+  the aggregation thus does not grow with the number of clients or values.
+
+  The sketch keeps the exact minimum and maximum of the values, and the
+  accuracy of the estimated quantiles is higher for quantiles near 0 and 1
+  than near the median. If the total number of values is at most
+  `max_num_centroids / 2`, every value is kept as its own centroid.
+
+  Args:
+    value: A `tff.Value` placed on the `tff.CLIENTS`, whose member is an integer
+      or floating tensor.
+    quantiles: A list of the quantiles to estimate, each in the range [0, 1].
+    max_num_centroids: The maximum number of centroids of the sketch. Larger
+      values give more accurate estimates.
+
+  Returns:
+    A `tff.Value` placed at `tff.SERVER` with a rank-1 tensor of the estimated
+    `quantiles` of the values from `tff.CLIENTS`, with dtype `tf.float64`. If
+    no values were aggregated, the estimates are NaN.
+
+  Raises:
+    TypeError: If `value` is not a tensor placed at `tff.CLIENTS`.
+    ValueError: If `quantiles` is empty or contains values outside [0, 1], or
+      if `max_num_centroids` is not positive.
+  """
+  _validate_value_on_clients(value)
+  member_type = value.type_signature.member
+  if not member_type.is_tensor():
+    raise TypeError('Expected `value` member to be a tensor, found '
+                    f'{member_type}.')
+  _validate_dtype_is_min_max_compatible(member_type.dtype)
+  quantiles = list(quantiles)
+  if not quantiles or not all(0.0 <= q <= 1.0 for q in quantiles):
+    raise ValueError('Expected `quantiles` to be a non-empty list of values in '
+                     f'the range [0, 1], found {quantiles}.')
+  py_typecheck.check_type(max_num_centroids, int)
+  if max_num_centroids < 1:
+    raise ValueError('Expected `max_num_centroids` to be positive, found '
+                     f'{max_num_centroids}.')
+
+  @tensorflow_computation.tf_computation
+  def zeros():
+    return _QuantileSketch(
+        means=tf.zeros([max_num_centroids], _QUANTILE_SKETCH_DTYPE),
+        weights=tf.zeros([max_num_centroids], _QUANTILE_SKETCH_DTYPE),
+        min_value=tf.constant(np.inf, _QUANTILE_SKETCH_DTYPE),
+        max_value=tf.constant(-np.inf, _QUANTILE_SKETCH_DTYPE))
+
+  accumulator_type = zeros.type_signature.result
+
+  @tensorflow_computation.tf_computation(accumulator_type, member_type)
+  def accumulate(sketch, value):
+    """Adds all elements of a client value to the sketch."""
+    means = tf.cast(tf.reshape(value, [-1]), _QUANTILE_SKETCH_DTYPE)
+    return _merge_quantile_sketch(sketch, means, tf.ones_like(means),
+                                  tf.reduce_min(means), tf.reduce_max(means),
+                                  max_num_centroids)
+
+  @tensorflow_computation.tf_computation(accumulator_type, accumulator_type)
+  def merge(a, b):
+    """Merges two sketches."""
+    return _merge_quantile_sketch(a, b.means, b.weights, b.min_value,
+                                  b.max_value, max_num_centroids)
+
+  @tensorflow_computation.tf_computation(accumulator_type)
+  def report(sketch):
+    return _interpolate_quantiles(
+        sketch, tf.constant(quantiles, _QUANTILE_SKETCH_DTYPE))
+
+  return intrinsics.federated_aggregate(value, zeros(), accumulate, merge,
+                                        report)
+
+
 # Lower precision types are not supported to avoid potential hard to discover
 # numerical issues in conversion to/from format compatible with secure sum.
 _SECURE_QUANTIZED_SUM_ALLOWED_DTYPES = (tf.int32, tf.int64, tf.float32,
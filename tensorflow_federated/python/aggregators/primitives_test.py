@@ -20,6 +20,7 @@ import tensorflow as tf
 
 from tensorflow_federated.python.aggregators import primitives
 from tensorflow_federated.python.core.backends.test import execution_contexts
+from tensorflow_federated.python.core.impl.compiler import tree_analysis
 from tensorflow_federated.python.core.impl.federated_context import federated_computation
 from tensorflow_federated.python.core.impl.federated_context import intrinsics
 from tensorflow_federated.python.core.impl.types import computation_types
@@ -364,6 +365,91 @@ class FederatedSampleTest(tf.test.TestCase):
     self.assertIn(8.8, result['tuple_2']['b'])
 
 
+class FederatedQuantilesTest(tf.test.TestCase, parameterized.TestCase):
+
+  def test_federated_quantiles_scalar(self):
+
+    @federated_computation.federated_computation(
+        computation_types.FederatedType(tf.float32, placements.CLIENTS))
+    def call_federated_quantiles(value):
+      return primitives.federated_quantiles(value, [0.0, 0.5, 1.0])
+
+    value = call_federated_quantiles([4.0, 1.0, 5.0, 3.0, 2.0])
+    self.assertAllClose(value, [1.0, 3.0, 5.0])
+
+  def test_federated_quantiles_tensor(self):
+
+    @federated_computation.federated_computation(
+        computation_types.FederatedType((tf.int32, [3]), placements.CLIENTS))
+    def call_federated_quantiles(value):
+      return primitives.federated_quantiles(value, [0.0, 0.5, 1.0])
+
+    value = call_federated_quantiles([[1, 2, 3], [6, 5, 4]])
+    self.assertAllClose(value, [1.0, 3.5, 6.0])
+
+  def test_federated_quantiles_memory_is_bounded(self):
+
+    @federated_computation.federated_computation(
+        computation_types.FederatedType((tf.float32, [10]), placements.CLIENTS))
+    def call_federated_quantiles(value):
+      return primitives.federated_quantiles(
+          value, [0.0, 0.1, 0.5, 0.9, 1.0], max_num_centroids=50)
+
+    # The sketch has a fixed number of centroids, however many values it holds.
+    aggregate_call, = tree_analysis.find_aggregations_in_tree(
+        call_federated_quantiles.to_building_block())
+    accumulator_type = aggregate_call.function.type_signature.parameter[1]
+    self.assertEqual(accumulator_type.means.shape, [50])
+    self.assertEqual(accumulator_type.weights.shape, [50])
+
+    client_values = np.arange(1000, dtype=np.float32).reshape([100, 10])
+    client_values = np.random.RandomState(0).permutation(client_values)
+    value = call_federated_quantiles(list(client_values))
+    self.assertEqual(value[0], 0.0)
+    self.assertEqual(value[-1], 999.0)
+    self.assertAllClose(value[1:-1], [100.0, 500.0, 900.0], atol=30.0)
+
+  def test_federated_quantiles_wrong_placement(self):
+    with self.assertRaisesRegex(
+        TypeError, r'.*argument must be a tff.Value placed at CLIENTS.*'):
+
+      @federated_computation.federated_computation(
+          computation_types.FederatedType(tf.float32, placements.SERVER))
+      def call_federated_quantiles(value):
+        return primitives.federated_quantiles(value, [0.5])
+
+      call_federated_quantiles(1.0)
+
+  def test_federated_quantiles_struct_raises_type_error(self):
+    with self.assertRaises(TypeError):
+
+      @federated_computation.federated_computation(
+          computation_types.FederatedType([tf.float32, tf.float32],
+                                          placements.CLIENTS))
+      def call_federated_quantiles(value):
+        return primitives.federated_quantiles(value, [0.5])
+
+      call_federated_quantiles([[1.0, 2.0]])
+
+  @parameterized.named_parameters(
+      ('empty_quantiles', [], 10),
+      ('negative_quantile', [-0.1], 10),
+      ('large_quantile', [1.1], 10),
+      ('zero_centroids', [0.5], 0),
+  )
+  def test_federated_quantiles_raises_value_error(self, quantiles,
+                                                  max_num_centroids):
+    with self.assertRaises(ValueError):
+
+      @federated_computation.federated_computation(
+          computation_types.FederatedType(tf.float32, placements.CLIENTS))
+      def call_federated_quantiles(value):
+        return primitives.federated_quantiles(value, quantiles,
+                                              max_num_centroids)
+
+      call_federated_quantiles([1.0])
+
+
 class SecureQuantizedSumStaticAssertsTest(tf.test.TestCase,
                                           parameterized.TestCase):
 
@@ -63,7 +63,8 @@ class HadamardTransformFactory(factory.UnweightedAggregationFactory):
        with Rademacher random varaibles on diagonal.
     4. Applies the fast Walsh-Hadamard transform.
   Steps 3 and 4 are repeated multiple times with independent randomness, if
-  `num_repeats > 1`.
+  `num_repeats > 1`. Tensors of the structure which are padded to the same size
+  are stacked and transformed together in a single batched transform.
 
   The resulting tensors are passed to the `inner_agg_factory`. After
   aggregation, at `tff.SEREVR`, inverses of these steps are applied in reverse
@@ -97,23 +98,26 @@ class HadamardTransformFactory(factory.UnweightedAggregationFactory):
     seeds_per_round = self._num_repeats * len(structure.flatten(value_type))
     next_global_seed_fn = _build_next_global_seed_fn(stride=seeds_per_round)
 
+    padded_sizes = [
+        _padded_size_pow2(spec) for spec in tf.nest.flatten(value_specs)
+    ]
+
     @tensorflow_computation.tf_computation(value_type, SEED_TFF_TYPE)
     def client_transform(value, global_seed):
 
       @tf.function
-      def transform(tensor, seed):
+      def transform(tensors, seeds):
         for _ in range(self._num_repeats):
-          tensor *= sample_rademacher(tf.shape(tensor), tensor.dtype, seed)
-          tensor = tf.expand_dims(tensor, axis=0)
-          tensor = hadamard.fast_walsh_hadamard_transform(tensor)
-          tensor = tf.squeeze(tensor, axis=0)
-          seed += 1
-        return tensor
+          tensors *= _sample_rademacher_rows(tensors, seeds)
+          tensors = hadamard.fused_fast_walsh_hadamard_transform(tensors)
+          seeds = [seed + 1 for seed in seeds]
+        return tensors
 
       value = _flatten_and_pad_zeros_pow2(value)
       seeds = _unique_seeds_for_struct(
           value, global_seed, stride=self._num_repeats)
-      return tf.nest.map_structure(transform, value, seeds)
+      return _map_structure_batched_by_size(transform, value, seeds,
+                                            padded_sizes)
 
     inner_agg_process = self._inner_agg_factory.create(
         client_transform.type_signature.result)
@@ -123,19 +127,18 @@ class HadamardTransformFactory(factory.UnweightedAggregationFactory):
     def server_transform(value, global_seed):
 
       @tf.function
-      def transform(tensor, seed):
-        seed += self._num_repeats - 1
+      def transform(tensors, seeds):
+        seeds = [seed + self._num_repeats - 1 for seed in seeds]
         for _ in range(self._num_repeats):
-          tensor = tf.expand_dims(tensor, axis=0)
-          tensor = hadamard.fast_walsh_hadamard_transform(tensor)
-          tensor = tf.squeeze(tensor, axis=0)
-          tensor *= sample_rademacher(tf.shape(tensor), tensor.dtype, seed)
-          seed -= 1
-        return tensor
+          tensors = hadamard.fused_fast_walsh_hadamard_transform(tensors)
+          tensors *= _sample_rademacher_rows(tensors, seeds)
+          seeds = [seed - 1 for seed in seeds]
+        return tensors
 
       seeds = _unique_seeds_for_struct(
           value, global_seed, stride=self._num_repeats)
-      value = tf.nest.map_structure(transform, value, seeds)
+      value = _map_structure_batched_by_size(transform, value, seeds,
+                                             padded_sizes)
       return tf.nest.map_structure(_slice_and_reshape_to_template_spec, value,
                                    value_specs)
 
@@ -395,6 +398,73 @@ def sample_rademacher(shape, dtype, seed):
   return tf.cast(tf.sign(rand_uniform - 0.5), dtype)
 
 
+def _sample_rademacher_rows(tensors, seeds):
+  """Samples +1/-1 values for each row of `tensors`, one seed for each row.
+
+  Each row is equal to `sample_rademacher` for the shape of the row and the
+  seed of the row, so that transforming a batch of tensors uses the same random
+  values as transforming each tensor separately.
+
+  Args:
+    tensors: A rank-2 tensor.
+    seeds: A list of seeds, one for each row of `tensors`.
+
+  Returns:
+    A tensor with the same shape and dtype as `tensors`.
+  """
+  row_shape = tf.shape(tensors)[1:]
+  return tf.stack(
+      [sample_rademacher(row_shape, tensors.dtype, seed) for seed in seeds])
+
+
+def _padded_size_pow2(spec):
+  """Returns the size of `spec` padded by `_pad_zeros_pow2`, or `None`."""
+  num_elements = spec.shape.num_elements()
+  if num_elements is None:
+    return None
+  elif num_elements <= 1:
+    return num_elements
+  return 1 << (num_elements - 1).bit_length()
+
+
+def _map_structure_batched_by_size(fn, struct, seeds, sizes):
+  """Applies `fn` to the rank-1 tensors in `struct`, batched by their size.
+
+  The tensors of `struct` with the same statically known `sizes` are reshaped
+  to their static size and stacked into a single rank-2 tensor, and `fn` is
+  invoked once for each such batch with the list of corresponding `seeds`.
+  Tensors whose size is not statically known are passed to `fn` in a batch of
+  their own.
+
+  Args:
+    fn: A callable accepting a rank-2 tensor and a list of seeds, one for each
+      row, and returning a tensor of the same shape.
+    struct: A structure of rank-1 tensors compatible with `tf.nest`.
+    seeds: A structure of seeds matching the structure of `struct`.
+    sizes: A list of the sizes of the flattened `struct`, or `None` if a size is
+      not statically known.
+
+  Returns:
+    A structure of rank-1 tensors matching the structure of `struct`.
+  """
+  tensors = tf.nest.flatten(struct)
+  flat_seeds = tf.nest.flatten(seeds)
+  batches = collections.OrderedDict()
+  for index, size in enumerate(sizes):
+    key = size if size is not None else ('unknown', index)
+    batches.setdefault(key, []).append(index)
+  results = [None] * len(tensors)
+  for key, indices in batches.items():
+    if isinstance(key, int):
+      batch = tf.stack([tf.reshape(tensors[i], [key]) for i in indices])
+    else:
+      batch = tf.stack([tensors[i] for i in indices])
+    batch = fn(batch, [flat_seeds[i] for i in indices])
+    for index, tensor in zip(indices, tf.unstack(batch, num=len(indices))):
+      results[index] = tensor
+  return tf.nest.pack_sequence_as(struct, results)
+
+
 def sample_cis(shape, seed, inverse=False):
   """Sample e^(i * theta) for theta in the range [0, 2pi] as tf.complex64."""
   # While it suffices to draw theta from [0, pi/2, pi, 3pi/2] (2 bits of
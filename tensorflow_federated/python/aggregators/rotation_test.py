@@ -376,6 +376,51 @@ class PaddingUtilsTest(tf.test.TestCase, parameterized.TestCase):
                             value, spec))
 
 
+class BatchingUtilsTest(tf.test.TestCase, parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('scalar', [], 1),
+      ('5', [5], 8),
+      ('8', [8], 8),
+      ('2x3x4', [2, 3, 4], 32),
+      ('unknown', [None], None),
+  )
+  def test_padded_size_pow2(self, shape, expected_size):
+    spec = tf.TensorSpec(shape, tf.float32)
+    self.assertEqual(rotation._padded_size_pow2(spec), expected_size)
+
+  def test_map_structure_batched_by_size(self):
+    struct = collections.OrderedDict(
+        a=tf.constant([1.0, 2.0]),
+        b=[tf.constant([3.0, 4.0, 5.0, 6.0]),
+           tf.constant([7.0, 8.0])])
+    seeds = collections.OrderedDict(a=1, b=[2, 3])
+    calls = []
+
+    def fn(batch, batch_seeds):
+      calls.append((batch.shape.as_list(), batch_seeds))
+      return batch * 2.0
+
+    result = rotation._map_structure_batched_by_size(fn, struct, seeds,
+                                                     [2, 4, 2])
+
+    self.assertEqual(calls, [([2, 2], [1, 3]), ([1, 4], [2])])
+    self.assertAllClose(
+        result,
+        collections.OrderedDict(
+            a=[2.0, 4.0], b=[[6.0, 8.0, 10.0, 12.0], [14.0, 16.0]]))
+
+  def test_sample_rademacher_rows_equals_sample_rademacher(self):
+    tensors = tf.zeros([2, 16])
+    seeds = [tf.constant([1, 2], tf.int64), tf.constant([1, 3], tf.int64)]
+
+    rows = rotation._sample_rademacher_rows(tensors, seeds)
+
+    for row, seed in zip(tf.unstack(rows), seeds):
+      self.assertAllEqual(row,
+                          rotation.sample_rademacher([16], tf.float32, seed))
+
+
 class SampleRademacherTest(tf.test.TestCase, parameterized.TestCase):
 
   def _assert_signs(self, x):
@@ -0,0 +1,203 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A library for building aggregators that sum the top-k client values."""
+
+import collections
+from typing import Any, Optional
+
+import tensorflow as tf
+
+from tensorflow_federated.python.aggregators import concat
+from tensorflow_federated.python.aggregators import factory
+from tensorflow_federated.python.core.impl.federated_context import federated_computation
+from tensorflow_federated.python.core.impl.federated_context import intrinsics
+from tensorflow_federated.python.core.impl.tensorflow_context import tensorflow_computation
+from tensorflow_federated.python.core.impl.types import computation_types
+from tensorflow_federated.python.core.impl.types import placements
+from tensorflow_federated.python.core.impl.types import type_analysis
+from tensorflow_federated.python.core.templates import aggregation_process
+from tensorflow_federated.python.core.templates import measured_process
+
+_INDEX_DTYPE = tf.int32
+
+
+def _get_num_coordinates(num_elements: int, k: Optional[int],
+                         fraction: Optional[float]) -> int:
+  """Returns the number of coordinates to keep of `num_elements`."""
+  if k is not None:
+    return min(k, num_elements)
+  return min(max(int(round(fraction * num_elements)), 1), num_elements)
+
+
+def _top_k(vector: tf.Tensor, num_coordinates: int) -> tuple[tf.Tensor,
+                                                             tf.Tensor]:
+  """Returns the indices and values of the largest magnitude coordinates."""
+  _, indices = tf.math.top_k(tf.abs(vector), k=num_coordinates, sorted=False)
+  indices = tf.cast(indices, _INDEX_DTYPE)
+  return indices, tf.gather(vector, indices)
+
+
+def top_k_with_error_feedback(value: Any, error: Any,
+                              k: int) -> tuple[Any, Any]:
+  """Sparsifies `value` to its `k` largest coordinates, with error feedback.
+
+  `tff.templates.AggregationProcess` has no client-placed state, so the error
+  feedback must be kept by the client itself, e.g. as part of the client's local
+  training state. Before each aggregation, the client calls this function with
+  its update and the `error` returned by the previous call (or zeros), and
+  passes the returned sparse value to a process created by
+  `SparseTopKSumFactory` with the same `k`. The coordinates which are not sent
+  are accumulated in the returned error and added to the next update.
+
+  Args:
+    value: A tensor or a structure of float tensors.
+    error: A tensor or a structure of tensors matching `value`.
+    k: The number of coordinates to keep across all the tensors of `value`.
+
+  Returns:
+    A tuple `(sparse_value, error)` of structures matching `value`, where
+    `sparse_value` contains only the `k` largest magnitude coordinates of
+    `value + error` and zeros elsewhere, and `error` contains the other
+    coordinates.
+  """
+  corrected_value = tf.nest.map_structure(tf.add, value, error)
+  # pylint: disable=protected-access
+  vector = concat._concat_impl(corrected_value)
+  num_elements = vector.shape.num_elements()
+  indices, values = _top_k(vector, _get_num_coordinates(num_elements, k, None))
+  sparse_vector = tf.scatter_nd(
+      tf.expand_dims(indices, axis=1), values, shape=[num_elements])
+  sparse_value = concat._unconcat_impl(sparse_vector, corrected_value)
+  # pylint: enable=protected-access
+  new_error = tf.nest.map_structure(tf.subtract, corrected_value, sparse_value)
+  return sparse_value, new_error
+
+
+class SparseTopKSumFactory(factory.UnweightedAggregationFactory):
+  """`UnweightedAggregationFactory` summing the top-k coordinates of values.
+
+  The created `tff.templates.AggregationProcess` flattens and concatenates the
+  tensors of each client value into a single vector, and sends only the
+  coordinates with the largest magnitude from `tff.CLIENTS` to `tff.SERVER`, as
+  a pair of `indices` and `values`. The number of coordinates sent by each
+  client is either `k` or `fraction` of the number of elements of the value.
+
+  The pairs are summed at `tff.SERVER` using `tff.federated_aggregate`: each
+  client's pair is scatter-added into the accumulator, so accumulating a client
+  costs O(k) rather than O(d), where `d` is the number of elements of the
+  value. The sum is then unconcatenated to the structure of `value_type`.
+
+  Sparsification is biased; to avoid losing the coordinates which are not
+  sent, clients should use error feedback, see `top_k_with_error_feedback`.
+
+  The process returns an empty `state`, the summed sparsified client values in
+  `result`, and the mean ratio of the size of a dense client value to the size
+  of the sent indices and values in `measurements`, with key
+  `compression_ratio`.
+
+  The `value_type` must be a float tensor or a structure of float tensors with
+  the same dtype and statically known shapes.
+  """
+
+  def __init__(self,
+               k: Optional[int] = None,
+               fraction: Optional[float] = None):
+    """Initializes `SparseTopKSumFactory`.
+
+    Args:
+      k: The number of coordinates each client sends. Exactly one of `k` and
+        `fraction` must be specified.
+      fraction: The fraction, in `(0, 1]`, of the coordinates of the value each
+        client sends, rounded to the nearest positive integer.
+
+    Raises:
+      ValueError: If both or neither of `k` and `fraction` are specified, if `k`
+        is not positive or if `fraction` is not in `(0, 1]`.
+    """
+    if (k is None) == (fraction is None):
+      raise ValueError('Expected exactly one of `k` and `fraction` to be '
+                       f'specified, found k={k} and fraction={fraction}.')
+    if k is not None and (not isinstance(k, int) or k < 1):
+      raise ValueError(f'Expected `k` to be a positive integer, found {k}.')
+    if fraction is not None and not 0 < fraction <= 1:
+      raise ValueError(
+          f'Expected `fraction` to be in the range (0, 1], found {fraction}.')
+    self._k = k
+    self._fraction = fraction
+
+  def create(
+      self,
+      value_type: factory.ValueType) -> aggregation_process.AggregationProcess:
+    if not type_analysis.is_structure_of_floats(value_type):
+      raise TypeError('Expected `value_type` to be a float tensor or a '
+                      f'structure of float tensors, found {value_type}.')
+    concat_fn, unconcat_fn = concat.create_concat_fns(value_type)
+    concat_value_type = concat_fn.type_signature.result
+    num_elements = concat_value_type.shape.num_elements()
+    if num_elements is None:
+      raise TypeError('Expected `value_type` to have statically known shapes, '
+                      f'found {value_type}.')
+    dtype = concat_value_type.dtype
+    num_coordinates = _get_num_coordinates(num_elements, self._k,
+                                           self._fraction)
+    dense_size_bits = num_elements * dtype.size * 8
+    sparse_size_bits = num_coordinates * (_INDEX_DTYPE.size + dtype.size) * 8
+
+    @tensorflow_computation.tf_computation(value_type)
+    def client_sparsify(value):
+      indices, values = _top_k(concat_fn(value), num_coordinates)
+      compression_ratio = tf.constant(dense_size_bits / sparse_size_bits,
+                                      tf.float32)
+      return collections.OrderedDict(
+          indices=indices, values=values), compression_ratio
+
+    sparse_value_type = client_sparsify.type_signature.result[0]
+
+    @tensorflow_computation.tf_computation
+    def zero():
+      return tf.zeros([num_elements], dtype)
+
+    @tensorflow_computation.tf_computation(concat_value_type, sparse_value_type)
+    def accumulate(accumulator, sparse_value):
+      return tf.tensor_scatter_nd_add(
+          accumulator, tf.expand_dims(sparse_value['indices'], axis=1),
+          sparse_value['values'])
+
+    @tensorflow_computation.tf_computation(concat_value_type, concat_value_type)
+    def merge(accumulator_1, accumulator_2):
+      return accumulator_1 + accumulator_2
+
+    @tensorflow_computation.tf_computation(concat_value_type)
+    def report(accumulator):
+      return accumulator
+
+    @federated_computation.federated_computation()
+    def init_fn():
+      return intrinsics.federated_value((), placements.SERVER)
+
+    @federated_computation.federated_computation(
+        init_fn.type_signature.result, computation_types.at_clients(value_type))
+    def next_fn(state, value):
+      sparse_value, compression_ratio = intrinsics.federated_map(
+          client_sparsify, value)
+      summed_value = intrinsics.federated_aggregate(sparse_value, zero(),
+                                                    accumulate, merge, report)
+      result = intrinsics.federated_map(unconcat_fn, summed_value)
+      measurements = intrinsics.federated_zip(
+          collections.OrderedDict(
+              compression_ratio=intrinsics.federated_mean(compression_ratio)))
+      return measured_process.MeasuredProcessOutput(
+          state=state, result=result, measurements=measurements)
+
+    return aggregation_process.AggregationProcess(init_fn, next_fn)
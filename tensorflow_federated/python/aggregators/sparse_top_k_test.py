@@ -0,0 +1,156 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+
+from absl.testing import parameterized
+import tensorflow as tf
+
+from tensorflow_federated.python.aggregators import sparse_top_k
+from tensorflow_federated.python.core.backends.native import execution_contexts
+from tensorflow_federated.python.core.impl.types import computation_types
+from tensorflow_federated.python.core.impl.types import type_test_utils
+from tensorflow_federated.python.core.templates import aggregation_process
+from tensorflow_federated.python.core.templates import measured_process
+
+_test_struct_type = collections.OrderedDict(
+    a=(tf.float32, (2,)), b=(tf.float32, (2, 2)))
+
+
+class SparseTopKSumFactoryComputationTest(tf.test.TestCase,
+                                          parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('float', tf.float32),
+      ('vector', (tf.float32, (10,))),
+      ('struct', _test_struct_type),
+  )
+  def test_type_properties(self, value_type):
+    factory = sparse_top_k.SparseTopKSumFactory(k=2)
+    value_type = computation_types.to_type(value_type)
+    process = factory.create(value_type)
+    self.assertIsInstance(process, aggregation_process.AggregationProcess)
+
+    server_state_type = computation_types.at_server(())
+    expected_initialize_type = computation_types.FunctionType(
+        parameter=None, result=server_state_type)
+    type_test_utils.assert_types_equivalent(process.initialize.type_signature,
+                                            expected_initialize_type)
+
+    expected_measurements_type = computation_types.at_server(
+        collections.OrderedDict(compression_ratio=tf.float32))
+    expected_next_type = computation_types.FunctionType(
+        parameter=collections.OrderedDict(
+            state=server_state_type,
+            value=computation_types.at_clients(value_type)),
+        result=measured_process.MeasuredProcessOutput(
+            state=server_state_type,
+            result=computation_types.at_server(value_type),
+            measurements=expected_measurements_type))
+    type_test_utils.assert_types_equivalent(process.next.type_signature,
+                                            expected_next_type)
+
+  @parameterized.named_parameters(
+      ('int', tf.int32),
+      ('string', tf.string),
+      ('mixed', [tf.float32, tf.float64]),
+  )
+  def test_raises_on_bad_value_type(self, value_type):
+    factory = sparse_top_k.SparseTopKSumFactory(k=1)
+    with self.assertRaises(TypeError):
+      factory.create(computation_types.to_type(value_type))
+
+  @parameterized.named_parameters(
+      ('k_and_fraction', 1, 0.5),
+      ('neither', None, None),
+      ('zero_k', 0, None),
+      ('float_k', 1.5, None),
+      ('zero_fraction', None, 0.0),
+      ('large_fraction', None, 1.5),
+  )
+  def test_init_raises_value_error(self, k, fraction):
+    with self.assertRaises(ValueError):
+      sparse_top_k.SparseTopKSumFactory(k=k, fraction=fraction)
+
+
+class SparseTopKSumFactoryExecutionTest(tf.test.TestCase,
+                                        parameterized.TestCase):
+
+  def test_sums_top_k_coordinates(self):
+    factory = sparse_top_k.SparseTopKSumFactory(k=2)
+    value_type = computation_types.TensorType(tf.float32, [5])
+    process = factory.create(value_type)
+    client_values = [
+        [1.0, -5.0, 0.5, 4.0, 0.0],
+        [3.0, 0.0, -2.0, 0.0, 1.0],
+    ]
+
+    output = process.next(process.initialize(), client_values)
+
+    self.assertAllClose(output.result, [3.0, -5.0, -2.0, 4.0, 0.0])
+    # Each client sends 2 int32 indices and 2 float32 values instead of 5
+    # float32 values.
+    self.assertAllClose(output.measurements['compression_ratio'], 5 / 4)
+
+  def test_sums_top_k_coordinates_of_struct(self):
+    factory = sparse_top_k.SparseTopKSumFactory(fraction=0.5)
+    value_type = computation_types.to_type(_test_struct_type)
+    process = factory.create(value_type)
+    client_value = collections.OrderedDict(
+        a=[0.0, 6.0], b=[[-1.0, 5.0], [4.0, 0.5]])
+
+    output = process.next(process.initialize(), [client_value, client_value])
+
+    self.assertAllClose(
+        output.result,
+        collections.OrderedDict(a=[0.0, 12.0], b=[[0.0, 10.0], [8.0, 0.0]]))
+
+  def test_sums_all_coordinates_when_k_exceeds_size(self):
+    factory = sparse_top_k.SparseTopKSumFactory(k=10)
+    value_type = computation_types.TensorType(tf.float32, [3])
+    process = factory.create(value_type)
+
+    output = process.next(process.initialize(),
+                          [[1.0, 2.0, 3.0], [-1.0, 0.0, 1.0]])
+
+    self.assertAllClose(output.result, [0.0, 2.0, 4.0])
+
+
+class TopKWithErrorFeedbackTest(tf.test.TestCase):
+
+  def test_keeps_top_k_and_accumulates_error(self):
+    value = collections.OrderedDict(
+        a=tf.constant([1.0, -3.0]), b=tf.constant([[2.5], [0.5]]))
+    error = tf.nest.map_structure(tf.zeros_like, value)
+
+    sparse_value, error = sparse_top_k.top_k_with_error_feedback(
+        value, error, k=2)
+
+    self.assertAllClose(
+        sparse_value, collections.OrderedDict(a=[0.0, -3.0], b=[[2.5], [0.0]]))
+    self.assertAllClose(
+        error, collections.OrderedDict(a=[1.0, 0.0], b=[[0.0], [0.5]]))
+
+    sparse_value, error = sparse_top_k.top_k_with_error_feedback(
+        value, error, k=2)
+
+    self.assertAllClose(
+        sparse_value, collections.OrderedDict(a=[0.0, -3.0], b=[[2.5], [0.0]]))
+    self.assertAllClose(
+        error, collections.OrderedDict(a=[2.0, 0.0], b=[[0.0], [1.0]]))
+
+
+if __name__ == '__main__':
+  execution_contexts.set_localhost_cpp_execution_context()
+  tf.test.main()
@@ -96,6 +96,7 @@ class IbltFactory(factory.UnweightedAggregationFactory):
       sketch_agg_factory: Optional[factory.UnweightedAggregationFactory] = None,
       value_tensor_agg_factory: Optional[
           factory.UnweightedAggregationFactory] = None,
+      num_shards: int = 1,
   ) -> None:
     """Initializes IbltFactory.
 
@@ -120,6 +121,11 @@ class IbltFactory(factory.UnweightedAggregationFactory):
         is set to a `tff.aggregators.SecureSumFactory`, the value to be summed
         might be clipped depends on the choices of  `upper_bound_threshold` and
         `lower_bound_threshold` parameters in `SecureSumFactory`.
+      num_shards: The number of IBLTs to split the strings into. Each string is
+        inserted in one of the IBLTs according to a stable hash, and each IBLT
+        is sized for its share of `capacity`, so that the shards are aggregated
+        in the same round and decoded independently. Defaults to `1`. Must be
+        positive.
 
     Raises:
       ValueError: if parameters don't meet expectations.
@@ -131,6 +137,8 @@ class IbltFactory(factory.UnweightedAggregationFactory):
                        f'{string_max_bytes}')
     if repetitions < 3:
       raise ValueError(f'repetitions should be at least 3, got {repetitions}')
+    if num_shards < 1:
+      raise ValueError(f'num_shards should be at least 1, got {num_shards}')
 
     self._sketch_agg_factory = sum_factory.SumFactory(
     ) if sketch_agg_factory is None else sketch_agg_factory
@@ -141,6 +149,7 @@ class IbltFactory(factory.UnweightedAggregationFactory):
     self._encoding = encoding
     self._repetitions = repetitions
     self._seed = seed
+    self._num_shards = num_shards
 
   def create(
       self, value_type: computation_types.SequenceType
@@ -176,6 +185,17 @@ class IbltFactory(factory.UnweightedAggregationFactory):
       """The TF computation to compute the IBLT frequency sketches."""
       input_strings, string_values = _parse_client_dict(dataset,
                                                         self._string_max_bytes)
+      if self._num_shards > 1:
+        return iblt_tensor.compute_sharded_iblt_tensor(
+            input_strings,
+            string_values,
+            num_shards=self._num_shards,
+            capacity=self._capacity,
+            string_max_bytes=self._string_max_bytes,
+            encoding=self._encoding,
+            repetitions=self._repetitions,
+            value_shape=self._value_shape,
+            seed=self._seed)
       iblt_encoder = iblt_tensor.IbltTensorEncoder(
           capacity=self._capacity,
           string_max_bytes=self._string_max_bytes,
@@ -189,6 +209,18 @@ class IbltFactory(factory.UnweightedAggregationFactory):
     @tf.function
     def decode_iblt(sketch, value_tensor):
       """The TF computation to decode the strings and values from IBLT."""
+      if self._num_shards > 1:
+        (output_strings, _, string_values,
+         num_not_decoded) = iblt_tensor.decode_sharded_iblt_tensor_tf(
+             sketch,
+             value_tensor,
+             capacity=self._capacity,
+             string_max_bytes=self._string_max_bytes,
+             value_shape=self._value_shape,
+             encoding=self._encoding,
+             repetitions=self._repetitions,
+             seed=self._seed)
+        return (output_strings, string_values, num_not_decoded)
       iblt_decoder = iblt_tensor.IbltTensorDecoder(
           iblt=sketch,
           iblt_values=value_tensor,
@@ -112,6 +112,14 @@ class IbltFactoryTest(tf.test.TestCase, parameterized.TestCase):
     iblt_factory.IbltFactory(
         repetitions=3, capacity=10, string_max_bytes=10, seed=0)
 
+  def test_num_shards_validation(self):
+    with self.assertRaisesRegex(ValueError, 'num_shards'):
+      iblt_factory.IbltFactory(
+          num_shards=0, capacity=10, string_max_bytes=10, repetitions=3)
+    # Should not raise
+    iblt_factory.IbltFactory(
+        num_shards=2, capacity=10, string_max_bytes=10, repetitions=3)
+
   @parameterized.named_parameters(
       ('scalar',
        computation_types.SequenceType(
@@ -205,6 +213,24 @@ class IbltFactoryTest(tf.test.TestCase, parameterized.TestCase):
           'repetitions': 4,
           'seed': 5,
       },
+      {
+          'testcase_name': 'sharded',
+          'capacity': 10,
+          'string_max_bytes': 10,
+          'repetitions': DEFAULT_REPETITIONS,
+          'seed': 0,
+          'num_shards': 3,
+      },
+      {
+          'testcase_name': 'sharded_secure_sum_factories',
+          'sketch_agg_factory': secure.SecureSumFactory(2**32 - 1),
+          'value_tensor_agg_factory': secure.SecureSumFactory(2**32 - 1),
+          'capacity': 10,
+          'string_max_bytes': 10,
+          'repetitions': DEFAULT_REPETITIONS,
+          'seed': 1,
+          'num_shards': 2,
+      },
   )
   def test_iblt_aggregation_as_expected(
       self,
@@ -216,6 +242,7 @@ class IbltFactoryTest(tf.test.TestCase, parameterized.TestCase):
       sketch_agg_factory: Optional[factory.UnweightedAggregationFactory] = None,
       value_tensor_agg_factory: Optional[
           factory.UnweightedAggregationFactory] = None,
+      num_shards: int = 1,
   ):
     iblt_agg_factory = iblt_factory.IbltFactory(
         sketch_agg_factory=sketch_agg_factory,
@@ -223,7 +250,8 @@ class IbltFactoryTest(tf.test.TestCase, parameterized.TestCase):
         capacity=capacity,
         string_max_bytes=string_max_bytes,
         repetitions=repetitions,
-        seed=seed)
+        seed=seed,
+        num_shards=num_shards)
     iblt_agg_process = iblt_agg_factory.create(VALUE_TYPE)
     process_output = iblt_agg_process.next(iblt_agg_process.initialize(),
                                            CLIENT_DATA)
@@ -181,6 +181,47 @@ def _inverse_mod(x, p, dtype=tf.int64):
   return x0 % p
 
 
+def _inverse_mod_batch(x, p, dtype=tf.int64):
+  """Calculates the multiplicative inverse of each element of `x modulo p`.
+
+  Vectorized version of `_inverse_mod`, running the extended euclidean algorithm
+  on all elements of `x` at once. Elements which have already terminated are
+  left unchanged by the remaining iterations.
+
+  Args:
+    x: A rank-1 `tf.Tensor`.
+    p: A scalar `tf.Tensor`.
+    dtype: Data type to perform operations in. `x` and `p` are casted to this
+      dtype.
+
+  Returns:
+    A `tf.Tensor` `y` such that `x * y modulo p = 1` elementwise.
+
+  Raises:
+    tf.errors.InvalidArgumentError: if any element of `x` and `p` are not
+      coprime.
+  """
+  a = tf.cast(x, dtype=dtype)
+  b = tf.fill(tf.shape(a), tf.cast(p, dtype=dtype))
+  zeros, ones = tf.zeros_like(a), tf.ones_like(a)
+
+  def cond(a, b, x0, x1):
+    del b, x0, x1
+    return tf.reduce_any(tf.math.not_equal(a, 0))
+
+  def body(a, b, x0, x1):
+    active = tf.math.not_equal(a, 0)
+    safe_a = tf.where(active, a, ones)
+    q = tf.cast(b / safe_a, dtype=dtype)
+    a, b = tf.where(active, b % safe_a, a), tf.where(active, a, b)
+    x0, x1 = tf.where(active, x1, x0), tf.where(active, x0 - q * x1, x1)
+    return a, b, x0, x1
+
+  _, gcd, x0, _ = tf.while_loop(cond, body, loop_vars=(a, b, zeros, ones))
+  tf.debugging.assert_equal(gcd, tf.ones_like(gcd), "gcd(x, p) != 1")
+  return x0 % tf.cast(p, dtype=dtype)
+
+
 def _get_hash_check_salt(seed: int) -> str:
   return "hash_check_" + str(seed)
 
@@ -405,10 +446,177 @@ class IbltDecoder:
                                   count)
     return iblt, hash_indices, data_string, count
 
+  def _decode_batch(self, cells):
+    """Tries to recover strings and counts from a batch of IBLT cells.
+
+    Vectorized version of `_decode`.
+
+    Args:
+      cells: A `tf.Tensor` of shape `(num_cells, num_chunks + 2)` containing
+        IBLT cells with non-zero counts.
+
+    Returns:
+      (data_strings, counts, chunks, hash_checks, is_peelable) where
+      is_peelable is a boolean `tf.Tensor` of shape `(num_cells,)` which is
+      `True` for the cells from which a string is decoded, and the other
+      elements are the decoded values for each cell, which are only valid where
+      is_peelable is `True`.
+    """
+    counts = cells[:, self.count]
+    inverse_counts = _inverse_mod_batch(
+        counts, self.field_size, dtype=self._dtype)
+    chunks = (cells[:, 0:self.num_chunks] *
+              tf.expand_dims(inverse_counts, axis=1)) % self.field_size
+    data_strings = self.chunker.decode_tensorflow(chunks)
+    hash_checks = self._get_hash_check(data_strings)[:, 0]
+    is_peelable = tf.logical_and(
+        tf.math.equal(cells[:, self.check],
+                      counts * hash_checks % self.field_size),
+        tf.strings.length(data_strings) > 0)
+    return data_strings, counts, chunks, hash_checks, is_peelable
+
+  def _remove_elements(self, iblt, hash_indices, chunks, counts, hash_checks):
+    """Removes a batch of decoded elements from the IBLT.
+
+    Vectorized version of `_remove_element`. Several elements may hash to the
+    same cell, so the elements are removed in rounds, each of which updates
+    every cell at most once. This performs the same modular arithmetic as
+    removing the elements one at a time, which avoids overflowing when
+    accumulating the removed values in the cells for large `field_size`.
+
+    Args:
+      iblt: the IBLT data structure
+      hash_indices: A `tf.Tensor` of shape `(num_elements, repetitions)` of the
+        hash indices of the elements.
+      chunks: A `tf.Tensor` of shape `(num_elements, num_chunks)` of the chunks
+        encoding the elements.
+      counts: A `tf.Tensor` of shape `(num_elements,)` of the counts of the
+        elements.
+      hash_checks: A `tf.Tensor` of shape `(num_elements,)` of the hash checks
+        of the elements.
+
+    Returns:
+      The IBLT data structure with the elements removed at hash_indices.
+    """
+    counts = tf.expand_dims(counts, axis=1)
+    hash_checks = tf.expand_dims(hash_checks, axis=1)
+    values = tf.concat([counts * chunks, counts, counts * hash_checks], axis=1)
+    values = tf.repeat(values % self.field_size, self.repetitions, axis=0)
+    hash_indices = tf.cast(hash_indices, self._dtype)
+    repetitions = tf.broadcast_to(
+        tf.range(self.repetitions, dtype=self._dtype), tf.shape(hash_indices))
+    indices = tf.reshape(tf.stack([repetitions, hash_indices], axis=2), [-1, 2])
+
+    # Compute the rank of each update among the updates of the same cell.
+    cell_ids = indices[:, 0] * self.table_size + indices[:, 1]
+    order = tf.argsort(cell_ids, stable=True)
+    _, segment_ids = tf.unique(tf.gather(cell_ids, order))
+    positions = tf.range(tf.size(order))
+    ranks = positions - tf.gather(
+        tf.math.segment_min(positions, segment_ids), segment_ids)
+    ranks = tf.gather(ranks, tf.argsort(order))
+    num_rounds = tf.reduce_max(tf.pad(ranks + 1, [[0, 1]]))
+
+    def cond(iblt, rank):
+      del iblt
+      return rank < num_rounds
+
+    def body(iblt, rank):
+      in_round = tf.math.equal(ranks, rank)
+      round_indices = tf.boolean_mask(indices, in_round)
+      round_values = (tf.gather_nd(iblt, round_indices) -
+                      tf.boolean_mask(values, in_round)) % self.field_size
+      iblt = tf.tensor_scatter_nd_update(iblt, round_indices, round_values)
+      return iblt, rank + 1
+
+    iblt, _ = tf.while_loop(cond, body, loop_vars=(iblt, tf.constant(0)))
+    return iblt
+
+  def _peel_pure_cells(self, iblt):
+    """Decodes all currently peelable cells and removes them from the IBLT.
+
+    Args:
+      iblt: the IBLT data structure
+
+    Returns:
+      (iblt, data_strings, counts) where iblt is the IBLT data structure with
+      the decoded elements removed, and data_strings and counts are the
+      decoded strings and their counts.
+    """
+    cell_indices = tf.where(tf.math.not_equal(iblt[:, :, self.count], 0))
+    data_strings, counts, chunks, hash_checks, is_peelable = self._decode_batch(
+        tf.gather_nd(iblt, cell_indices))
+    data_strings = tf.boolean_mask(data_strings, is_peelable)
+
+    # The same element can be peelable in several repetitions, in which case it
+    # must only be removed once.
+    data_strings, string_ids = tf.unique(data_strings)
+    first_ids = tf.math.unsorted_segment_min(
+        tf.range(tf.size(string_ids)), string_ids, tf.size(data_strings))
+
+    def select(values):
+      return tf.gather(tf.boolean_mask(values, is_peelable), first_ids)
+
+    counts, chunks, hash_checks = map(select, (counts, chunks, hash_checks))
+    hash_indices = self.hyperedge_hasher.get_hash_indices_tf(data_strings)
+    hash_indices = hash_indices[:, :, 2]
+    iblt = self._remove_elements(iblt, hash_indices, chunks, counts,
+                                 hash_checks)
+    return iblt, data_strings, counts
+
   @tf.function
   def get_freq_estimates_tf(self) -> tuple[tf.Tensor, tf.Tensor, tf.Tensor]:
     """Decodes key-value pairs from an IBLT.
 
+    Decoding proceeds in passes, each of which finds all the peelable cells of
+    the IBLT at once, decodes them and removes the decoded elements, until a
+    pass decodes no element. The decoded elements and counts are the same as
+    peeling one element at a time, but the number of passes typically grows
+    logarithmically with the capacity of the IBLT.
+
+    Returns:
+      (out_strings, out_counts, num_not_decoded) where out_strings is tf.Tensor
+      containing all the decoded strings, out_counts is a tf.Tensor containing
+      the counts of each string and num_not_decoded is tf.Tensor with the number
+      of items not decoded in the IBLT.
+    """
+    iblt = tf.math.floormod(
+        tf.cast(self.iblt, dtype=self._dtype),
+        tf.constant(self.field_size, dtype=self._dtype))
+
+    out_strings = tf.TensorArray(
+        tf.string, size=0, dynamic_size=True, infer_shape=False)
+    out_counts = tf.TensorArray(
+        self._dtype, size=0, dynamic_size=True, infer_shape=False)
+
+    def cond(iblt, out_strings, out_counts, num_decoded):
+      del iblt, out_strings, out_counts
+      return num_decoded > 0
+
+    def body(iblt, out_strings, out_counts, num_decoded):
+      del num_decoded
+      iblt, data_strings, counts = self._peel_pure_cells(iblt)
+      index = out_strings.size()
+      out_strings = out_strings.write(index, data_strings)
+      out_counts = out_counts.write(index, counts)
+      return iblt, out_strings, out_counts, tf.size(data_strings)
+
+    iblt, out_strings, out_counts, _ = tf.while_loop(
+        cond,
+        body,
+        loop_vars=(iblt, out_strings, out_counts, tf.constant(1)))
+
+    # Count of entries that could not be decoded:
+    num_not_decoded = tf.reduce_sum(iblt[:, :, self.count]) / self.repetitions
+    num_not_decoded = tf.cast(num_not_decoded, dtype=self._dtype)
+
+    return out_strings.concat(), out_counts.concat(), num_not_decoded
+
+  @tf.function
+  def _get_freq_estimates_sequential_tf(
+      self) -> tuple[tf.Tensor, tf.Tensor, tf.Tensor]:
+    """Decodes key-value pairs from an IBLT, peeling one element at a time.
+
     Returns:
       (out_strings, out_counts, num_not_decoded) where out_strings is tf.Tensor
       containing all the decoded strings, out_counts is a tf.Tensor containing
@@ -0,0 +1,83 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for decoding IBLTs.
+
+Run with `--benchmarks=.` to report the wall time of
+`IbltDecoder.get_freq_estimates_tf`, which peels all peelable cells in each
+pass, for a range of capacities and string lengths. For the smaller capacities,
+the wall time of peeling one element at a time is reported for comparison.
+"""
+
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from tensorflow_federated.python.analytics.heavy_hitters.iblt import iblt_lib
+
+_CAPACITIES = (1000, 10000, 100000)
+_SEQUENTIAL_MAX_CAPACITY = 10000
+_STRING_MAX_BYTES = (8, 32, 128)
+_ITERS = 3
+
+
+def _median_wall_time(fn):
+  wall_times = []
+  for _ in range(_ITERS):
+    start_time = time.perf_counter()
+    result = fn()
+    tf.nest.map_structure(lambda x: x.numpy(), result)
+    wall_times.append(time.perf_counter() - start_time)
+  return np.median(wall_times)
+
+
+def _create_iblt(capacity, string_max_bytes):
+  """Returns an IBLT of `capacity` distinct strings of `string_max_bytes`."""
+  input_strings = tf.strings.as_string(
+      tf.range(capacity), width=string_max_bytes, fill='0')
+  iblt_encoder = iblt_lib.IbltEncoder(capacity, string_max_bytes)
+  return iblt_encoder.compute_iblt(input_strings)
+
+
+def _decode(iblt, capacity, string_max_bytes, sequential):
+  iblt_decoder = iblt_lib.IbltDecoder(iblt, capacity, string_max_bytes)
+  if sequential:
+    return iblt_decoder._get_freq_estimates_sequential_tf()  # pylint: disable=protected-access
+  return iblt_decoder.get_freq_estimates_tf()
+
+
+class IbltDecoderBenchmark(tf.test.Benchmark):
+
+  def benchmark_get_freq_estimates(self):
+    for capacity in _CAPACITIES:
+      for string_max_bytes in _STRING_MAX_BYTES:
+        iblt = _create_iblt(capacity, string_max_bytes)
+        for name, sequential in (('batch', False), ('sequential', True)):
+          if sequential and capacity > _SEQUENTIAL_MAX_CAPACITY:
+            continue
+          wall_time = _median_wall_time(
+              lambda: _decode(iblt, capacity, string_max_bytes, sequential))  # pylint: disable=cell-var-from-loop
+          self.report_benchmark(
+              iters=_ITERS,
+              wall_time=wall_time,
+              name=f'get_freq_estimates_{name}_{capacity}_{string_max_bytes}',
+              extras={
+                  'capacity': capacity,
+                  'string_max_bytes': string_max_bytes,
+                  'strings_per_sec': capacity / wall_time,
+              })
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -48,6 +48,7 @@ class IbltTest(tf.test.TestCase, parameterized.TestCase):
       hash_family: Optional[str] = None,
       hash_family_params: Optional[dict[str, Union[int, float]]] = None,
       field_size: int = iblt_lib.DEFAULT_FIELD_SIZE,
+      sequential: bool = False,
   ) -> dict[Optional[str], int]:
     iblt_decoder = iblt_lib.IbltDecoder(
         iblt=iblt_table,
@@ -60,7 +61,10 @@ class IbltTest(tf.test.TestCase, parameterized.TestCase):
         field_size=field_size,
     )
 
-    decoding_graph = iblt_decoder.get_freq_estimates_tf()
+    if sequential:
+      decoding_graph = iblt_decoder._get_freq_estimates_sequential_tf()  # pylint: disable=protected-access
+    else:
+      decoding_graph = iblt_decoder.get_freq_estimates_tf()
     out_strings, out_counts, num_not_decoded = self.evaluate(decoding_graph)
     counter = dict(
         zip(
@@ -124,6 +128,18 @@ class IbltTest(tf.test.TestCase, parameterized.TestCase):
         field_size=field_size)
     self.assertAllClose(counter, counter_by_get_freq_estimates_tf)
 
+    sequential_counter = self._get_decoded_results_by_get_freq_estimates_tf(
+        iblt_table=iblt_table,
+        capacity=capacity,
+        string_max_bytes=string_max_bytes,
+        seed=seed,
+        repetitions=repetitions,
+        hash_family=hash_family,
+        hash_family_params=hash_family_params,
+        field_size=field_size,
+        sequential=True)
+    self.assertAllClose(counter, sequential_counter)
+
     return counter
 
   @_graph_and_eager_test
@@ -355,6 +371,34 @@ class IbltTest(tf.test.TestCase, parameterized.TestCase):
     self.assertCountEqual(input_map_mod_field_size_non_zero.items(),
                           strings_with_frequency.items())
 
+  @parameterized.named_parameters(
+      ('below_capacity', 80),
+      ('above_capacity', 300),
+  )
+  def test_iblt_batch_peeling_matches_sequential_peeling(self, num_strings):
+    capacity = 100
+    string_max_bytes = 12
+    repetitions = 3
+    seed = 0
+    iblt_encoder = iblt_lib.IbltEncoder(capacity, string_max_bytes, seed=seed)
+    input_strings_list = [f'string_{i}' for i in range(num_strings)]
+    input_strings = tf.constant(input_strings_list, dtype=tf.string)
+    input_counts = tf.range(1, num_strings + 1, dtype=tf.int64)
+    iblt_table = iblt_encoder.compute_iblt(
+        input_strings, input_counts=input_counts)
+    # `_get_decoded_results` checks that batch and sequential peeling decode
+    # the same strings and counts, including when decoding fails.
+    strings_with_frequency = self._get_decoded_results(
+        iblt_table=iblt_table,
+        capacity=capacity,
+        string_max_bytes=string_max_bytes,
+        repetitions=repetitions,
+        seed=seed)
+    if num_strings <= capacity:
+      self.assertCountEqual(
+          zip(input_strings_list, range(1, num_strings + 1)),
+          strings_with_frequency.items())
+
   @parameterized.named_parameters(
       {
           'testcase_name': 'incorrect_string_list_rank',
@@ -42,7 +42,8 @@ of `(x, y, ..., z)` shaped tensors, and a scalar denoting the number of
 non-decoded strings. If the value tensor is empty, value_shape = (), the output
 value tensor is also empty (returned as a tf.constant([])).
 """
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
+import math
 from typing import Optional, Union
 
 import numpy as np
@@ -394,3 +395,149 @@ def decode_iblt_tensor_tf(
       hash_family_params=hash_family_params,
       field_size=field_size)
   return iblt_decoder.get_freq_estimates_tf()
+
+
+def get_shard_capacity(capacity: int, num_shards: int) -> int:
+  """Returns the capacity of each IBLT when sharding `capacity` strings.
+
+  Strings are assigned to shards uniformly at random by `get_shard_ids`, so the
+  number of strings in a shard is binomially distributed with mean
+  `capacity / num_shards` and a standard deviation of at most the square root
+  of the mean. Each shard is sized to the mean plus three standard deviations.
+
+  Args:
+    capacity: The total number of distinct strings expected to be inserted.
+    num_shards: The number of shards.
+
+  Returns:
+    The capacity of each shard, which is `capacity` if `num_shards` is 1.
+  """
+  if num_shards == 1:
+    return capacity
+  mean_capacity = capacity / num_shards
+  return int(math.ceil(mean_capacity + 3 * math.sqrt(mean_capacity)))
+
+
+def get_shard_ids(input_strings: tf.Tensor, num_shards: int,
+                  seed: int = 0) -> tf.Tensor:
+  """Returns the shard of each string in `input_strings`.
+
+  The shard is a stable hash of the string, so that all clients assign a
+  string to the same shard.
+
+  Args:
+    input_strings: A 1D tensor of strings.
+    num_shards: The number of shards.
+    seed: Integer seed for the hash function. Defaults to 0.
+
+  Returns:
+    A tensor of the same shape as `input_strings` with values in
+    `[0, num_shards)`.
+  """
+  salted_input = tf.strings.join([f"shard_{seed}", input_strings])
+  return tf.strings.to_hash_bucket_fast(salted_input, num_buckets=num_shards)
+
+
+def compute_sharded_iblt_tensor(
+    input_strings: tf.Tensor,
+    input_values: tf.Tensor,
+    *,
+    num_shards: int,
+    capacity: int,
+    string_max_bytes: int,
+    value_shape: Sequence[int],
+    seed: int = 0,
+    **kwargs,
+) -> tuple[tuple[tf.Tensor, ...], tuple[tf.Tensor, ...]]:
+  """Encodes strings and values into `num_shards` independent IBLTs.
+
+  Each string is inserted in the IBLT of the shard given by `get_shard_ids`.
+  All shards have the capacity given by `get_shard_capacity`, and can be summed
+  and decoded independently, see `decode_sharded_iblt_tensor_tf`.
+
+  Args:
+    input_strings: A 1D tensor of strings.
+    input_values: A tensor of shape `(num_input_strings, value_shape)`
+      containing values for each string.
+    num_shards: The number of shards. Must be positive.
+    capacity: The total number of distinct strings expected to be inserted.
+    string_max_bytes: Maximum length of a string in bytes that can be inserted.
+    value_shape: Shape of the values.
+    seed: Integer seed for hash functions. Defaults to 0.
+    **kwargs: See `IbltTensorEncoder`.
+
+  Returns:
+    A tuple `(iblts, iblt_values)` of tuples of `num_shards` tensors, as
+    returned by `IbltTensorEncoder.compute_iblt` for each shard.
+  """
+  encoders = [
+      IbltTensorEncoder(
+          capacity=get_shard_capacity(capacity, num_shards),
+          string_max_bytes=string_max_bytes,
+          value_shape=value_shape,
+          seed=seed,
+          **kwargs) for _ in range(num_shards)
+  ]
+  # Strings are assigned to shards after trimming, so that strings which are
+  # trimmed to the same string are summed in the same shard.
+  _, trimmed_input_strings = encoders[0].compute_chunks(input_strings)
+  shard_ids = get_shard_ids(trimmed_input_strings, num_shards, seed=seed)
+  iblts, iblt_values = [], []
+  for shard, encoder in enumerate(encoders):
+    in_shard = tf.math.equal(shard_ids, shard)
+    shard_values = (
+        tf.boolean_mask(input_values, in_shard)
+        if value_shape else input_values)
+    iblt, values = encoder.compute_iblt(
+        tf.boolean_mask(input_strings, in_shard), shard_values)
+    iblts.append(iblt)
+    iblt_values.append(values)
+  return tuple(iblts), tuple(iblt_values)
+
+
+def decode_sharded_iblt_tensor_tf(
+    iblts: Sequence[tf.Tensor],
+    iblt_values: Sequence[tf.Tensor],
+    capacity: int,
+    string_max_bytes: int,
+    value_shape: Sequence[int],
+    *,
+    decode_iblt_fn: Callable[..., tuple[tf.Tensor, tf.Tensor, tf.Tensor,
+                                        tf.Tensor]] = decode_iblt_tensor_tf,
+    **kwargs,
+) -> tuple[tf.Tensor, tf.Tensor, tf.Tensor, tf.Tensor]:
+  """Decodes IBLT sketches computed by `compute_sharded_iblt_tensor`.
+
+  The shards are decoded independently and their results are concatenated.
+  Decoding a shard does not depend on the other shards, so TensorFlow runs the
+  decoding of the shards concurrently on its inter-op thread pool.
+
+  Args:
+    iblts: The IBLTs of each shard.
+    iblt_values: The IBLT values of each shard.
+    capacity: The total number of distinct strings expected to be inserted, as
+      passed to `compute_sharded_iblt_tensor`.
+    string_max_bytes: Maximum length of a string in bytes that can be inserted.
+    value_shape: Shape of the values tensor.
+    decode_iblt_fn: A function to decode a single shard. Defaults to
+      `decode_iblt_tensor_tf`.
+    **kwargs: Additional keyword arguments passed to `decode_iblt_fn`.
+
+  Returns:
+    `(out_strings, out_counts, out_tensor_counts, num_not_decoded)` as returned
+    by `decode_iblt_tensor_tf`, for all shards.
+  """
+  shard_capacity = get_shard_capacity(capacity, len(iblts))
+  decoded_shards = [
+      decode_iblt_fn(
+          iblt=iblt,
+          iblt_values=values,
+          capacity=shard_capacity,
+          string_max_bytes=string_max_bytes,
+          value_shape=value_shape,
+          **kwargs) for iblt, values in zip(iblts, iblt_values)
+  ]
+  out_strings, out_counts, out_tensor_counts, num_not_decoded = zip(
+      *decoded_shards)
+  return (tf.concat(out_strings, axis=0), tf.concat(out_counts, axis=0),
+          tf.concat(out_tensor_counts, axis=0), tf.add_n(num_not_decoded))
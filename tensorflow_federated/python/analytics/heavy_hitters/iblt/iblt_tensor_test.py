@@ -367,5 +367,61 @@ class IbltTensorTest(tf.test.TestCase, parameterized.TestCase):
       iblt_encoder.compute_iblt(input_strings, input_values)
 
 
+
+class ShardedIbltTensorTest(tf.test.TestCase, parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('one_shard', 1000, 1, 1000),
+      ('four_shards', 1000, 4, 298),
+      ('many_shards', 1000, 100, 20),
+  )
+  def test_get_shard_capacity(self, capacity, num_shards, expected_capacity):
+    self.assertEqual(
+        iblt_tensor.get_shard_capacity(capacity, num_shards), expected_capacity)
+
+  def test_get_shard_ids_is_stable(self):
+    input_strings = tf.constant([f'string_{i}' for i in range(100)])
+    shard_ids = iblt_tensor.get_shard_ids(input_strings, num_shards=4, seed=1)
+    self.assertAllInRange(shard_ids, 0, 3)
+    self.assertAllEqual(
+        shard_ids,
+        iblt_tensor.get_shard_ids(input_strings, num_shards=4, seed=1))
+    self.assertAllEqual(
+        shard_ids[::-1],
+        iblt_tensor.get_shard_ids(input_strings[::-1], num_shards=4, seed=1))
+
+  @_graph_and_eager_test
+  def test_sharded_iblt_tensor_encode_and_decode(self):
+    capacity = 100
+    num_shards = 4
+    string_max_bytes = 12
+    value_shape = (2,)
+    input_strings_list = [f'string_{i}' for i in range(capacity)]
+    input_values_list = [[i, 2 * i] for i in range(capacity)]
+
+    iblts, iblt_values = iblt_tensor.compute_sharded_iblt_tensor(
+        tf.constant(input_strings_list, dtype=tf.string),
+        tf.constant(input_values_list, dtype=tf.int64),
+        num_shards=num_shards,
+        capacity=capacity,
+        string_max_bytes=string_max_bytes,
+        value_shape=value_shape)
+    self.assertLen(iblts, num_shards)
+    self.assertLen(iblt_values, num_shards)
+    decoded = iblt_tensor.decode_sharded_iblt_tensor_tf(
+        iblts,
+        iblt_values,
+        capacity=capacity,
+        string_max_bytes=string_max_bytes,
+        value_shape=value_shape)
+    out_strings, out_counts, out_tensor_values, num_not_decoded = (
+        self.evaluate(decoded))
+
+    self.assertEqual(num_not_decoded, 0)
+    self.assertCountEqual(
+        zip(input_strings_list, [1] * capacity, input_values_list),
+        [(string.decode('utf-8'), count, list(values)) for string, count,
+         values in zip(out_strings, out_counts, out_tensor_values)])
+
 if __name__ == '__main__':
   tf.test.main()
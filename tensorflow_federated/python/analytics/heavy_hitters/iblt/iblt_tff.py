@@ -73,6 +73,7 @@ def build_iblt_computation(
     seed: int = 0,
     batch_size: int = 1,
     repetitions: int = 3,
+    num_shards: int = 1,
 ) -> computation_base.Computation:
   """Builds the `tff.Computation` for heavy-hitters discovery with IBLT.
 
@@ -135,6 +136,12 @@ def build_iblt_computation(
       significantly decrease the likelihood of decoding failures, at the expense
       of multiplying the size of the data structure. Most callers should not
       override the default. Defaults to `3`. Must be at least `3`.
+    num_shards: The number of IBLT sketches to split the strings into. Each
+      string is inserted in one of the sketches according to a stable hash, and
+      each sketch is sized for its share of `capacity`. The sketches are summed
+      in the same round and decoded independently, which bounds the size of
+      each sketch and allows decoding them concurrently when the number of
+      unique strings is very large. Defaults to `1`. Must be positive.
 
   Returns:
     A `tff.Computation` that performs federated heavy hitter discovery.
@@ -165,6 +172,8 @@ def build_iblt_computation(
           f' got {secure_sum_bitwidth}')
   if batch_size < 1:
     raise ValueError(f'batch_size must be at least 1, got {batch_size}')
+  if num_shards < 1:
+    raise ValueError(f'num_shards must be at least 1, got {num_shards}')
 
   if decode_iblt_fn is None:
     decode_iblt_fn = iblt_tensor.decode_iblt_tensor_tf
@@ -203,20 +212,42 @@ def build_iblt_computation(
       if not multi_contribution:
         counts = tf.ones_like(counts)
     counts = tf.reshape(counts, shape=[-1, 1])
+    if num_shards > 1:
+      return iblt_tensor.compute_sharded_iblt_tensor(
+          k_words,
+          counts,
+          num_shards=num_shards,
+          capacity=capacity,
+          string_max_bytes=string_max_bytes,
+          encoding=_CharacterEncoding.UTF8,
+          repetitions=repetitions,
+          value_shape=(1,),
+          seed=seed)
     return encoder.compute_iblt(k_words, counts)
 
   @tensorflow_computation.tf_computation(compute_sketch.type_signature.result)
   @tf.function
   def decode_heavy_hitters(sketch, count_tensor):
     """The TF computation to decode the heavy hitters."""
-    iblt_decoded = decode_iblt_fn(
-        iblt=sketch,
-        iblt_values=count_tensor,
-        value_shape=(1,),
-        capacity=capacity,
-        string_max_bytes=string_max_bytes,
-        repetitions=repetitions,
-        seed=seed)
+    if num_shards > 1:
+      iblt_decoded = iblt_tensor.decode_sharded_iblt_tensor_tf(
+          sketch,
+          count_tensor,
+          value_shape=(1,),
+          capacity=capacity,
+          string_max_bytes=string_max_bytes,
+          decode_iblt_fn=decode_iblt_fn,
+          repetitions=repetitions,
+          seed=seed)
+    else:
+      iblt_decoded = decode_iblt_fn(
+          iblt=sketch,
+          iblt_values=count_tensor,
+          value_shape=(1,),
+          capacity=capacity,
+          string_max_bytes=string_max_bytes,
+          repetitions=repetitions,
+          seed=seed)
 
     (heavy_hitters, heavy_hitters_unique_counts, heavy_hitters_counts,
      num_not_decoded) = iblt_decoded
@@ -82,7 +82,8 @@ def _execute_computation(
     k_anonymity: int = 1,
     secure_sum_bitwidth: Optional[int] = None,
     multi_contribution: bool = True,
-    string_postprocessor: Optional[Callable[[tf.Tensor], tf.Tensor]] = None
+    string_postprocessor: Optional[Callable[[tf.Tensor], tf.Tensor]] = None,
+    num_shards: int = 1,
 ) -> tuple[dict[str, tf.Tensor], tf.Tensor, tf.Tensor]:
   """Executes one round of IBLT computation over the given datasets.
 
@@ -116,6 +117,8 @@ def _execute_computation(
       decoded from the IBLT in order to postprocess them. It should accept a
       single string tensor and output a single string tensor of the same shape.
       If `None`, no postprocessing is done.
+    num_shards: The number of IBLT sketches to split the strings into. Defaults
+      to `1`.
 
   Returns:
     A tuple, with elements:
@@ -134,7 +137,8 @@ def _execute_computation(
       secure_sum_bitwidth=secure_sum_bitwidth,
       batch_size=batch_size,
       multi_contribution=multi_contribution,
-      string_postprocessor=string_postprocessor)
+      string_postprocessor=string_postprocessor,
+      num_shards=num_shards)
   datasets = _iblt_test_data_sampler(data, batch_size)
 
   output = one_round_computation(datasets)
@@ -234,6 +238,11 @@ class IbltTffConstructionTest(absltest.TestCase):
       iblt_tff.build_iblt_computation(batch_size=-1)
     iblt_tff.build_iblt_computation(batch_size=1)
 
+  def test_num_shards_validation(self):
+    with self.assertRaisesRegex(ValueError, 'num_shards'):
+      iblt_tff.build_iblt_computation(num_shards=0)
+    iblt_tff.build_iblt_computation(num_shards=2)
+
   def test_multi_contribution_validation(self):
     iblt_tff.build_iblt_computation(multi_contribution=True)
     iblt_tff.build_iblt_computation(multi_contribution=False)
@@ -286,6 +295,26 @@ class SecAggIbltTffExecutionTest(parameterized.TestCase):
 
     self.assertDictEqual(ground_truth, results)
 
+  @parameterized.named_parameters(
+      ('no_secure_sum', None),
+      ('secure_sum', 32),
+  )
+  def test_computation_with_num_shards(self, secure_sum_bitwidth):
+    results, num_not_decoded, _ = _execute_computation(
+        DATA,
+        capacity=20,
+        string_max_bytes=20,
+        secure_sum_bitwidth=secure_sum_bitwidth,
+        num_shards=3)
+    expected_results, expected_num_not_decoded, _ = _execute_computation(
+        DATA,
+        capacity=20,
+        string_max_bytes=20,
+        secure_sum_bitwidth=secure_sum_bitwidth)
+
+    self.assertEqual(num_not_decoded, expected_num_not_decoded)
+    self.assertDictEqual(results, expected_results)
+
   def test_computation_with_string_max_bytes(self):
     results, _, _ = _execute_computation(
         DATA,
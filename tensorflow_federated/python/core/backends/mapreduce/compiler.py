@@ -71,6 +71,7 @@ from tensorflow_federated.python.common_libs import structure
 from tensorflow_federated.python.core.impl.compiler import building_block_factory
 from tensorflow_federated.python.core.impl.compiler import building_blocks
 from tensorflow_federated.python.core.impl.compiler import compiled_computation_transformations
+from tensorflow_federated.python.core.impl.compiler import compiler_profiling
 from tensorflow_federated.python.core.impl.compiler import intrinsic_defs
 from tensorflow_federated.python.core.impl.compiler import transformation_utils
 from tensorflow_federated.python.core.impl.compiler import transformations
@@ -235,9 +236,15 @@ def consolidate_and_extract_local_processing(comp, grappler_config_proto):
   comp.type_signature.check_function()
   # Drop any unused subcomputations which may reference placements different
   # from the result.
-  simplified = transformations.to_call_dominant(comp)
-  unplaced, _ = tree_transformations.strip_placement(simplified)
-  extracted = parse_tff_to_tf(unplaced, grappler_config_proto)
+  scope = 'consolidate_and_extract_local_processing'
+  simplified = compiler_profiling.profile_pass(
+      scope, 'to_call_dominant', transformations.to_call_dominant, comp)
+  unplaced, _ = compiler_profiling.profile_pass(
+      scope, 'strip_placement', tree_transformations.strip_placement,
+      simplified)
+  extracted = compiler_profiling.profile_pass(scope, 'parse_tff_to_tf',
+                                              parse_tff_to_tf, unplaced,
+                                              grappler_config_proto)
   check_extraction_result(unplaced, extracted)
   return extracted
 
@@ -33,6 +33,7 @@ from tensorflow_federated.python.core.backends.mapreduce import compiler
 from tensorflow_federated.python.core.backends.mapreduce import forms
 from tensorflow_federated.python.core.impl.compiler import building_block_factory
 from tensorflow_federated.python.core.impl.compiler import building_blocks
+from tensorflow_federated.python.core.impl.compiler import compiler_profiling
 from tensorflow_federated.python.core.impl.compiler import transformation_utils
 from tensorflow_federated.python.core.impl.compiler import transformations
 from tensorflow_federated.python.core.impl.compiler import tree_analysis
@@ -944,23 +945,39 @@ def get_map_reduce_form_for_computation(
   py_typecheck.check_type(grappler_config, tf.compat.v1.ConfigProto)
   grappler_config = _merge_grappler_config_with_default(grappler_config)
 
-  comp_bb, _ = tree_transformations.uniquify_reference_names(comp_bb)
-  before_broadcast, after_broadcast = _split_ast_on_broadcast(comp_bb)
-  before_aggregate, after_aggregate = _split_ast_on_aggregate(after_broadcast)
-
-  prepare = _extract_prepare(before_broadcast, grappler_config)
-  work = _extract_work(before_aggregate, grappler_config)
-  zero, accumulate, merge, report = _extract_federated_aggregate_functions(
-      before_aggregate, grappler_config)
-  secure_sum_bitwidth = _compile_selected_output_to_no_argument_tensorflow(
-      before_aggregate, ('federated_secure_sum_bitwidth_param', 1),
-      grappler_config)
-  secure_sum_max_input = _compile_selected_output_to_no_argument_tensorflow(
-      before_aggregate, ('federated_secure_sum_param', 1), grappler_config)
-  secure_sum_modulus = _compile_selected_output_to_no_argument_tensorflow(
-      before_aggregate, ('federated_secure_modular_sum_param', 1),
+  scope = 'get_map_reduce_form_for_computation'
+  comp_bb, _ = compiler_profiling.profile_pass(
+      scope, 'uniquify_reference_names',
+      tree_transformations.uniquify_reference_names, comp_bb)
+  before_broadcast, after_broadcast = compiler_profiling.profile_pass(
+      scope, 'split_ast_on_broadcast', _split_ast_on_broadcast, comp_bb)
+  before_aggregate, after_aggregate = compiler_profiling.profile_pass(
+      scope, 'split_ast_on_aggregate', _split_ast_on_aggregate, after_broadcast)
+
+  prepare = compiler_profiling.profile_pass(scope, 'extract_prepare',
+                                            _extract_prepare, before_broadcast,
+                                            grappler_config)
+  work = compiler_profiling.profile_pass(scope, 'extract_work', _extract_work,
+                                         before_aggregate, grappler_config)
+  zero, accumulate, merge, report = compiler_profiling.profile_pass(
+      scope, 'extract_federated_aggregate_functions',
+      _extract_federated_aggregate_functions, before_aggregate,
       grappler_config)
-  update = _extract_update(after_aggregate, grappler_config)
+  secure_sum_bitwidth = compiler_profiling.profile_pass(
+      scope, 'extract_secure_sum_bitwidth',
+      _compile_selected_output_to_no_argument_tensorflow, before_aggregate,
+      ('federated_secure_sum_bitwidth_param', 1), grappler_config)
+  secure_sum_max_input = compiler_profiling.profile_pass(
+      scope, 'extract_secure_sum_max_input',
+      _compile_selected_output_to_no_argument_tensorflow, before_aggregate,
+      ('federated_secure_sum_param', 1), grappler_config)
+  secure_sum_modulus = compiler_profiling.profile_pass(
+      scope, 'extract_secure_modular_sum_modulus',
+      _compile_selected_output_to_no_argument_tensorflow, before_aggregate,
+      ('federated_secure_modular_sum_param', 1), grappler_config)
+  update = compiler_profiling.profile_pass(scope, 'extract_update',
+                                           _extract_update, after_aggregate,
+                                           grappler_config)
 
   blocks = (prepare, work, zero, accumulate, merge, report, secure_sum_bitwidth,
             secure_sum_max_input, secure_sum_modulus, update)
@@ -18,10 +18,10 @@ from typing import Optional
 from absl import logging
 import tensorflow as tf
 
-from tensorflow_federated.python.common_libs import tracing
 from tensorflow_federated.python.core.backends.mapreduce import compiler
 from tensorflow_federated.python.core.impl.compiler import building_blocks
 from tensorflow_federated.python.core.impl.compiler import compiled_computation_transformations
+from tensorflow_federated.python.core.impl.compiler import compiler_profiling
 from tensorflow_federated.python.core.impl.compiler import transformations
 from tensorflow_federated.python.core.impl.compiler import tree_transformations
 from tensorflow_federated.python.core.impl.computation import computation_impl
@@ -36,7 +36,9 @@ def transform_to_native_form(
 
   This function transforms the proto underlying `comp` by transforming it
   to call-dominant form (see `tff.framework.to_call_dominant` for
-  definition).
+  definition). TensorFlow computations which occur more than once in the result
+  are bound to a single block local, so that they are serialized and embedded
+  in executors once.
 
   Args:
     comp: Instance of `computation_impl.ConcreteComputation` to compile.
@@ -56,39 +58,39 @@ def transform_to_native_form(
       proto)
   try:
     logging.debug('Compiling TFF computation to CDF.')
-    with tracing.span(
-        'transform_to_native_form', 'to_call_dominant', span=True):
-      call_dominant_form = transformations.to_call_dominant(
-          computation_building_block)
+    call_dominant_form = compiler_profiling.profile_pass(
+        'transform_to_native_form', 'to_call_dominant',
+        transformations.to_call_dominant, computation_building_block)
     logging.debug('Computation compiled to:')
     logging.debug(call_dominant_form.formatted_representation())
     if transform_math_to_tf:
       logging.debug('Compiling local computations to TensorFlow.')
-      with tracing.span(
+      call_dominant_form = compiler_profiling.profile_pass(
           'transform_to_native_form',
           'compile_local_subcomputations_to_tensorflow',
-          span=True):
-        call_dominant_form = compiler.compile_local_subcomputations_to_tensorflow(
-            call_dominant_form)
+          compiler.compile_local_subcomputations_to_tensorflow,
+          call_dominant_form)
       logging.debug('Computation compiled to:')
       logging.debug(call_dominant_form.formatted_representation())
     if grappler_config is not None:
-      with tracing.span(
-          'transform_to_native_form', 'optimize_tf_graphs', span=True):
-        call_dominant_form, _ = compiled_computation_transformations.optimize_tensorflow_graphs(
-            call_dominant_form, grappler_config)
-    with tracing.span(
-        'transform_to_native_form',
-        'transform_tf_call_ops_disable_grappler',
-        span=True):
-      disabled_grapler_form, _ = compiled_computation_transformations.transform_tf_call_ops_to_disable_grappler(
-          call_dominant_form)
-    with tracing.span(
-        'transform_to_native_form', 'transform_tf_add_ids', span=True):
-      form_with_ids, _ = compiled_computation_transformations.transform_tf_add_ids(
-          disabled_grapler_form)
-    return computation_impl.ConcreteComputation.from_building_block(
+      call_dominant_form, _ = compiler_profiling.profile_pass(
+          'transform_to_native_form', 'optimize_tf_graphs',
+          compiled_computation_transformations.optimize_tensorflow_graphs,
+          call_dominant_form, grappler_config)
+    disabled_grapler_form, _ = compiler_profiling.profile_pass(
+        'transform_to_native_form', 'transform_tf_call_ops_disable_grappler',
+        compiled_computation_transformations.transform_tf_call_ops_to_disable_grappler,
+        call_dominant_form)
+    form_with_ids, _ = compiler_profiling.profile_pass(
+        'transform_to_native_form', 'transform_tf_add_ids',
+        compiled_computation_transformations.transform_tf_add_ids,
+        disabled_grapler_form)
+    deduplicated_form, _ = compiler_profiling.profile_pass(
+        'transform_to_native_form', 'deduplicate_compiled_computations',
+        compiled_computation_transformations.deduplicate_compiled_computations,
         form_with_ids)
+    return computation_impl.ConcreteComputation.from_building_block(
+        deduplicated_form)
   except ValueError as e:
     logging.debug('Compilation for native runtime failed with error %s', e)
     logging.debug('computation: %s',
@@ -18,11 +18,16 @@
 # information.
 """A library of transformations for compiled computations."""
 
+import collections
+import concurrent.futures
 import ctypes
+import functools
+import hashlib
 
 from tensorflow_federated.proto.v0 import computation_pb2
 from tensorflow_federated.python.common_libs import py_typecheck
 from tensorflow_federated.python.common_libs import serialization_utils
+from tensorflow_federated.python.core.impl.compiler import building_block_factory
 from tensorflow_federated.python.core.impl.compiler import building_blocks
 from tensorflow_federated.python.core.impl.compiler import tensorflow_computation_transformations
 from tensorflow_federated.python.core.impl.compiler import transformation_utils
@@ -109,6 +114,7 @@ class TensorFlowOptimizer(transformation_utils.TransformSpec):
   """
 
   def __init__(self, config_proto):
+    super().__init__()
     self._config_proto = config_proto
 
   def should_transform(self, comp):
@@ -120,11 +126,69 @@ class TensorFlowOptimizer(transformation_utils.TransformSpec):
     return optimize_tensorflow_comp(comp, self._config_proto), True
 
 
-def optimize_tensorflow_graphs(comp, grappler_config_proto):
-  """Performs any static optimization on TensorFlow subcomputations."""
+def _fingerprint(comp: building_blocks.CompiledComputation) -> bytes:
+  """Returns a fingerprint of the proto backing `comp`."""
+  serialized_proto = comp.proto.SerializeToString(deterministic=True)
+  return hashlib.sha256(serialized_proto).digest()
+
+
+def optimize_tensorflow_graphs(comp, grappler_config_proto, max_workers=None):
+  """Performs any static optimization on TensorFlow subcomputations.
+
+  The `building_blocks.CompiledComputation`s in `comp` are optimized
+  independently of each other, so they are optimized concurrently on a thread
+  pool. Compiled computations backed by identical protos are optimized once.
+  The result does not depend on the number of threads.
+
+  Args:
+    comp: Instance of `building_blocks.ComputationBuildingBlock` whose compiled
+      computations should be optimized.
+    grappler_config_proto: Instance of `tf.compat.v1.ConfigProto` specifying the
+      optimizations to apply to the graphs backing the compiled computations.
+    max_workers: The maximum number of threads used to optimize the compiled
+      computations, or `None` to use the default of
+      `concurrent.futures.ThreadPoolExecutor`. If `1`, the compiled computations
+      are optimized on the calling thread.
+
+  Returns:
+    A tuple of the transformed `comp` and a Boolean which is `True` if `comp`
+    contains any compiled computations.
+
+  Raises:
+    ValueError: If `max_workers` is not `None` or a positive integer.
+  """
+  if max_workers is not None and max_workers < 1:
+    raise ValueError('Expected `max_workers` to be `None` or positive, found '
+                     f'{max_workers}.')
   transform_spec = TensorFlowOptimizer(grappler_config_proto)
-  return transformation_utils.transform_postorder(comp,
-                                                  transform_spec.transform)
+  unoptimized = collections.OrderedDict()
+
+  def _collect(comp):
+    if transform_spec.should_transform(comp):
+      unoptimized.setdefault(_fingerprint(comp), comp)
+    return comp, False
+
+  transformation_utils.transform_postorder(comp, _collect, memoize=True)
+  if max_workers == 1 or len(unoptimized) <= 1:
+    optimized = [
+        optimize_tensorflow_comp(c, grappler_config_proto)
+        for c in unoptimized.values()
+    ]
+  else:
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+      optimized = list(
+          executor.map(
+              functools.partial(
+                  optimize_tensorflow_comp,
+                  config_proto=grappler_config_proto), unoptimized.values()))
+  optimized_by_fingerprint = dict(zip(unoptimized.keys(), optimized))
+
+  def _replace(comp):
+    if not transform_spec.should_transform(comp):
+      return comp, False
+    return optimized_by_fingerprint[_fingerprint(comp)], True
+
+  return transformation_utils.transform_postorder(comp, _replace, memoize=True)
 
 
 class DisableCallOpGrappler(transformation_utils.TransformSpec):
@@ -171,6 +235,7 @@ class VerifyAllowedOps(transformation_utils.TransformSpec):
   """
 
   def __init__(self, allowed_op_names: frozenset[str]):
+    super().__init__()
     self._allowed_op_names = allowed_op_names
 
   def should_transform(self,
@@ -212,6 +277,7 @@ class RaiseOnDisallowedOp(transformation_utils.TransformSpec):
   """
 
   def __init__(self, disallowed_op_names: frozenset[str]):
+    super().__init__()
     self._disallowed_op_names = disallowed_op_names
 
   def should_transform(self,
@@ -280,3 +346,86 @@ def transform_tf_add_ids(comp):
   transform_spec = AddUniqueIDs()
   return transformation_utils.transform_postorder(comp,
                                                   transform_spec.transform)
+
+
+def deduplicate_compiled_computations(comp, name_generator=None):
+  """Hoists duplicated compiled computations in `comp` into block locals.
+
+  Compiled computations in `comp` are compared by a fingerprint of their protos.
+  Each compiled computation that occurs more than once is bound once to a new
+  block local, and all its occurrences are replaced with references to that
+  local. Compiled computations do not reference any variables, so the locals
+  are bound at the outermost scope of `comp`: if `comp` is a
+  `building_blocks.Lambda`, they are bound at the beginning of its result,
+  reusing the block there if there is one.
+
+  Args:
+    comp: Instance of `building_blocks.ComputationBuildingBlock` in which to
+      deduplicate compiled computations.
+    name_generator: An optional generator of the names to bind the hoisted
+      compiled computations to. If `None`, names which do not occur in `comp`
+      are generated.
+
+  Returns:
+    A tuple of the transformed `comp` and a Boolean which is `True` if any
+    compiled computations were deduplicated.
+  """
+  py_typecheck.check_type(comp, building_blocks.ComputationBuildingBlock)
+  fingerprints = {}
+
+  def _get_fingerprint(comp):
+    entry = fingerprints.get(id(comp))
+    if entry is None:
+      entry = (comp, _fingerprint(comp))
+      fingerprints[id(comp)] = entry
+    return entry[1]
+
+  counts = collections.Counter()
+  first_occurrences = {}
+
+  def _count(comp):
+    if comp.is_compiled_computation():
+      fingerprint = _get_fingerprint(comp)
+      counts[fingerprint] += 1
+      first_occurrences.setdefault(fingerprint, comp)
+    return comp, False
+
+  transformation_utils.transform_postorder(comp, _count)
+  duplicated = [f for f, count in counts.items() if count > 1]
+  if not duplicated:
+    return comp, False
+
+  if name_generator is None:
+    name_generator = building_block_factory.unique_name_generator(comp)
+  hoisted_locals = []
+  references = {}
+  for fingerprint in duplicated:
+    name = next(name_generator)
+    compiled_computation = first_occurrences[fingerprint]
+    hoisted_locals.append((name, compiled_computation))
+    references[fingerprint] = building_blocks.Reference(
+        name, compiled_computation.type_signature)
+
+  def _replace(comp):
+    if comp.is_compiled_computation():
+      reference = references.get(_get_fingerprint(comp))
+      if reference is not None:
+        return reference, True
+    return comp, False
+
+  comp, _ = transformation_utils.transform_postorder(
+      comp, _replace, memoize=True)
+  if comp.is_lambda():
+    result = comp.result
+    if result.is_block():
+      result = building_blocks.Block(hoisted_locals + result.locals,
+                                     result.result)
+    else:
+      result = building_blocks.Block(hoisted_locals, result)
+    comp = building_blocks.Lambda(comp.parameter_name, comp.parameter_type,
+                                  result)
+  elif comp.is_block():
+    comp = building_blocks.Block(hoisted_locals + comp.locals, comp.result)
+  else:
+    comp = building_blocks.Block(hoisted_locals, comp)
+  return comp, True
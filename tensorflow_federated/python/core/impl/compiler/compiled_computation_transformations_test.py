@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from absl.testing import absltest
+from absl.testing import parameterized
 import tensorflow as tf
 
 from tensorflow_federated.python.core.impl.compiler import building_block_factory
@@ -92,6 +93,65 @@ class TensorFlowOptimizerTest(absltest.TestCase):
     self.assertEqual(zero_before_transform, zero_after_transform)
 
 
+class OptimizeTensorFlowGraphsTest(parameterized.TestCase):
+
+  def _create_struct_of_compiled_computations(self):
+    tensor_type = computation_types.TensorType(tf.int32)
+    identity = building_block_factory.create_compiled_identity(tensor_type)
+    identity_copy = building_blocks.CompiledComputation(
+        identity.proto, type_signature=identity.type_signature)
+    add_one = _create_compiled_computation(lambda x: x + 1, tensor_type)
+    return building_blocks.Struct([identity, add_one, identity_copy])
+
+  @parameterized.named_parameters(
+      ('default_workers', None),
+      ('one_worker', 1),
+      ('two_workers', 2),
+  )
+  def test_optimizes_compiled_computations(self, max_workers):
+    comp = self._create_struct_of_compiled_computations()
+    config = tf.compat.v1.ConfigProto()
+    tf_optimizer = compiled_computation_transformations.TensorFlowOptimizer(
+        config)
+    expected = [tf_optimizer.transform(c)[0].proto for c in comp]
+
+    transformed_comp, modified = (
+        compiled_computation_transformations.optimize_tensorflow_graphs(
+            comp, config, max_workers=max_workers))
+
+    self.assertTrue(modified)
+    self.assertEqual([c.proto for c in transformed_comp], expected)
+
+  def test_optimizes_identical_compiled_computations_once(self):
+    comp = self._create_struct_of_compiled_computations()
+    config = tf.compat.v1.ConfigProto()
+
+    transformed_comp, _ = (
+        compiled_computation_transformations.optimize_tensorflow_graphs(
+            comp, config))
+
+    self.assertIs(transformed_comp[0], transformed_comp[2])
+    self.assertIsNot(transformed_comp[0], transformed_comp[1])
+
+  def test_returns_unmodified_without_compiled_computations(self):
+    comp = building_blocks.Reference('x', tf.int32)
+    config = tf.compat.v1.ConfigProto()
+
+    transformed_comp, modified = (
+        compiled_computation_transformations.optimize_tensorflow_graphs(
+            comp, config))
+
+    self.assertFalse(modified)
+    self.assertIs(transformed_comp, comp)
+
+  def test_raises_value_error_with_non_positive_max_workers(self):
+    comp = self._create_struct_of_compiled_computations()
+    config = tf.compat.v1.ConfigProto()
+    with self.assertRaises(ValueError):
+      compiled_computation_transformations.optimize_tensorflow_graphs(
+          comp, config, max_workers=0)
+
+
 class AddUniqueIDsTest(absltest.TestCase):
 
   def test_should_transform_compiled_tf_computation(self):
@@ -267,5 +327,76 @@ class RaiseOnDisallowedOpTest(absltest.TestCase):
           disallowed_op_names).transform(compiled_computation)
 
 
+class DeduplicateCompiledComputationsTest(absltest.TestCase):
+
+  def test_hoists_duplicated_compiled_computations_into_block(self):
+    tensor_type = computation_types.TensorType(tf.int32)
+    identity = building_block_factory.create_compiled_identity(tensor_type)
+    identity_copy = building_blocks.CompiledComputation(
+        identity.proto, type_signature=identity.type_signature)
+    add_one = _create_compiled_computation(lambda x: x + 1, tensor_type)
+    comp = building_blocks.Struct([identity, add_one, identity_copy])
+
+    transformed_comp, modified = (
+        compiled_computation_transformations.deduplicate_compiled_computations(
+            comp))
+
+    self.assertTrue(modified)
+    self.assertTrue(transformed_comp.is_block())
+    self.assertLen(transformed_comp.locals, 1)
+    name, value = transformed_comp.locals[0]
+    self.assertIs(value, identity)
+    result = transformed_comp.result
+    self.assertTrue(result[0].is_reference())
+    self.assertEqual(result[0].name, name)
+    self.assertIs(result[1], add_one)
+    self.assertTrue(result[2].is_reference())
+    self.assertEqual(result[2].name, name)
+    self.assertEqual(transformed_comp.type_signature, comp.type_signature)
+
+  def test_hoists_into_block_in_lambda(self):
+    tensor_type = computation_types.TensorType(tf.int32)
+    identity = building_block_factory.create_compiled_identity(tensor_type)
+    identity_copy = building_blocks.CompiledComputation(
+        identity.proto, type_signature=identity.type_signature)
+    block = building_blocks.Block(
+        [('a',
+          building_blocks.Call(identity,
+                               building_blocks.Reference('x', tf.int32))),
+         ('b',
+          building_blocks.Call(identity_copy,
+                               building_blocks.Reference('a', tf.int32)))],
+        building_blocks.Reference('b', tf.int32))
+    comp = building_blocks.Lambda('x', tf.int32, block)
+
+    transformed_comp, modified = (
+        compiled_computation_transformations.deduplicate_compiled_computations(
+            comp))
+
+    self.assertTrue(modified)
+    self.assertTrue(transformed_comp.is_lambda())
+    self.assertTrue(transformed_comp.result.is_block())
+    names = [name for name, _ in transformed_comp.result.locals]
+    self.assertLen(names, 3)
+    self.assertEqual(names[1:], ['a', 'b'])
+    self.assertEqual(
+        transformed_comp.compact_representation(),
+        f'(x -> (let {names[0]}={identity.compact_representation()},'
+        f'a={names[0]}(x),b={names[0]}(a) in b))')
+
+  def test_returns_unmodified_without_duplicates(self):
+    tensor_type = computation_types.TensorType(tf.int32)
+    identity = building_block_factory.create_compiled_identity(tensor_type)
+    add_one = _create_compiled_computation(lambda x: x + 1, tensor_type)
+    comp = building_blocks.Struct([identity, add_one])
+
+    transformed_comp, modified = (
+        compiled_computation_transformations.deduplicate_compiled_computations(
+            comp))
+
+    self.assertFalse(modified)
+    self.assertIs(transformed_comp, comp)
+
+
 if __name__ == '__main__':
   absltest.main()
@@ -0,0 +1,234 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Utilities for profiling the passes of the TFF compiler.
+
+Compiler passes are run through `profile_pass`, which always wraps the pass in a
+`tracing.span`. Inside a `profile_compilation` context, `profile_pass`
+additionally records a `PassProfile` for every pass it runs, for example:
+
+```python
+with compiler_profiling.profile_compilation() as profile:
+  form_utils.get_map_reduce_form_for_computation(comp)
+print(profile.to_json())
+```
+
+Outside of a `profile_compilation` context, no additional work is performed.
+"""
+
+from collections.abc import Callable, Iterator
+import contextlib
+import json
+import threading
+import time
+import tracemalloc
+from typing import Any, Optional
+
+import attr
+
+from tensorflow_federated.python.common_libs import tracing
+from tensorflow_federated.python.core.impl.compiler import building_blocks
+from tensorflow_federated.python.core.impl.compiler import tree_analysis
+
+
+@attr.s(frozen=True, slots=True)
+class PassProfile:
+  """Metrics collected for a single run of a compiler pass.
+
+  Attributes:
+    scope: The name of the compilation the pass was run as part of.
+    name: The name of the pass.
+    depth: The number of enclosing profiled passes; `0` for passes that are not
+      run as part of another profiled pass.
+    wall_time_secs: The wall time of the pass, in seconds.
+    num_nodes_before: The number of building blocks in the input of the pass.
+    num_nodes_after: The number of building blocks in the output of the pass.
+    num_tf_ops_before: The number of TensorFlow ops in the input of the pass.
+    num_tf_ops_after: The number of TensorFlow ops in the output of the pass.
+    peak_memory_bytes: The peak memory allocated by Python during the pass,
+      relative to the memory allocated when the pass started, or `None` if
+      memory was not tracked. Memory allocated by TensorFlow outside of the
+      Python allocator is not included.
+  """
+  scope = attr.ib()
+  name = attr.ib()
+  depth = attr.ib()
+  wall_time_secs = attr.ib()
+  num_nodes_before = attr.ib()
+  num_nodes_after = attr.ib()
+  num_tf_ops_before = attr.ib()
+  num_tf_ops_after = attr.ib()
+  peak_memory_bytes = attr.ib()
+
+
+class CompileProfile:
+  """The `PassProfile`s of the compiler passes run during a compilation."""
+
+  def __init__(self, track_memory: bool = False):
+    self._track_memory = track_memory
+    self._passes = []
+
+  @property
+  def track_memory(self) -> bool:
+    return self._track_memory
+
+  @property
+  def passes(self) -> list[PassProfile]:
+    """The `PassProfile`s, in the order the passes finished."""
+    return list(self._passes)
+
+  def add_pass(self, pass_profile: PassProfile):
+    self._passes.append(pass_profile)
+
+  def to_dict(self) -> dict[str, Any]:
+    return {'passes': [attr.asdict(p) for p in self._passes]}
+
+  def to_json(self, **kwargs) -> str:
+    """Returns the profile serialized as JSON.
+
+    Args:
+      **kwargs: Keyword arguments forwarded to `json.dumps`.
+    """
+    return json.dumps(self.to_dict(), **kwargs)
+
+
+class _ProfilingState(threading.local):
+  """The state of the active `profile_compilation` context in this thread."""
+
+  def __init__(self):
+    super().__init__()
+    self.profile: Optional[CompileProfile] = None
+    # The number of profiled passes currently running.
+    self.depth = 0
+    # The peak memory observed so far by each running pass, innermost last.
+    self.peak_memory: list[int] = []
+
+
+_profiling_state = _ProfilingState()
+
+
+@contextlib.contextmanager
+def profile_compilation(track_memory: bool = False) -> Iterator[CompileProfile]:
+  """Records a `PassProfile` for each pass run by `profile_pass` in this scope.
+
+  Args:
+    track_memory: Whether to record the peak memory of each pass. This uses
+      `tracemalloc`, which significantly slows down compilation.
+
+  Yields:
+    A `CompileProfile`, which is populated as passes finish.
+
+  Raises:
+    RuntimeError: If a `profile_compilation` context is already active.
+  """
+  if _profiling_state.profile is not None:
+    raise RuntimeError(
+        '`profile_compilation` contexts can not be nested in the same thread.')
+  profile = CompileProfile(track_memory=track_memory)
+  started_tracemalloc = track_memory and not tracemalloc.is_tracing()
+  if started_tracemalloc:
+    tracemalloc.start()
+  _profiling_state.profile = profile
+  try:
+    yield profile
+  finally:
+    _profiling_state.profile = None
+    _profiling_state.depth = 0
+    _profiling_state.peak_memory = []
+    if started_tracemalloc:
+      tracemalloc.stop()
+
+
+def _get_building_blocks(
+    value: Any) -> list[building_blocks.ComputationBuildingBlock]:
+  """Returns the building blocks in the input or output of a pass."""
+  if isinstance(value, building_blocks.ComputationBuildingBlock):
+    return [value]
+  elif isinstance(value, (list, tuple)):
+    return [
+        v for v in value
+        if isinstance(v, building_blocks.ComputationBuildingBlock)
+    ]
+  return []
+
+
+def _count_nodes_and_tf_ops(value) -> tuple[int, int]:
+  comps = _get_building_blocks(value)
+  num_nodes = sum(tree_analysis.count(comp) for comp in comps)
+  num_tf_ops = sum(
+      tree_analysis.count_tensorflow_ops_under(comp) for comp in comps)
+  return num_nodes, num_tf_ops
+
+
+def profile_pass(scope: str, name: str, pass_fn: Callable[..., Any], comp,
+                 *args, **kwargs):
+  """Runs the compiler pass `pass_fn` on `comp`, profiling it if enabled.
+
+  The pass is always wrapped in a `tracing.span`. If a `profile_compilation`
+  context is active, a `PassProfile` is also added to its `CompileProfile`.
+  Node and TensorFlow op counts are computed over `comp` and over the building
+  blocks returned by `pass_fn`, either directly or as elements of a tuple.
+
+  Args:
+    scope: The name of the compilation the pass is run as part of.
+    name: The name of the pass.
+    pass_fn: A Python function implementing the pass.
+    comp: The `building_blocks.ComputationBuildingBlock` to pass to `pass_fn`.
+    *args: Additional positional arguments to pass to `pass_fn`.
+    **kwargs: Keyword arguments to pass to `pass_fn`.
+
+  Returns:
+    The result of `pass_fn(comp, *args, **kwargs)`.
+  """
+  profile = _profiling_state.profile
+  if profile is None:
+    with tracing.span(scope, name, span=True):
+      return pass_fn(comp, *args, **kwargs)
+
+  num_nodes_before, num_tf_ops_before = _count_nodes_and_tf_ops(comp)
+  depth = _profiling_state.depth
+  _profiling_state.depth += 1
+  peaks = _profiling_state.peak_memory
+  track_memory = profile.track_memory and tracemalloc.is_tracing()
+  if track_memory:
+    start_memory, peak = tracemalloc.get_traced_memory()
+    # Resetting the peak for this pass would lose the peak of the enclosing
+    # pass, so it is folded into the enclosing pass first.
+    if peaks:
+      peaks[-1] = max(peaks[-1], peak)
+    tracemalloc.reset_peak()
+    peaks.append(start_memory)
+  start_time = time.perf_counter()
+  try:
+    with tracing.span(scope, name, span=True):
+      result = pass_fn(comp, *args, **kwargs)
+    wall_time_secs = time.perf_counter() - start_time
+  finally:
+    _profiling_state.depth -= 1
+    if track_memory:
+      peak = max(peaks.pop(), tracemalloc.get_traced_memory()[1])
+      if peaks:
+        peaks[-1] = max(peaks[-1], peak)
+  num_nodes_after, num_tf_ops_after = _count_nodes_and_tf_ops(result)
+  profile.add_pass(
+      PassProfile(
+          scope=scope,
+          name=name,
+          depth=depth,
+          wall_time_secs=wall_time_secs,
+          num_nodes_before=num_nodes_before,
+          num_nodes_after=num_nodes_after,
+          num_tf_ops_before=num_tf_ops_before,
+          num_tf_ops_after=num_tf_ops_after,
+          peak_memory_bytes=peak - start_memory if track_memory else None))
+  return result
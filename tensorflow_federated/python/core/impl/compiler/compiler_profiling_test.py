@@ -0,0 +1,144 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+from absl.testing import absltest
+import tensorflow as tf
+
+from tensorflow_federated.python.core.impl.compiler import building_block_factory
+from tensorflow_federated.python.core.impl.compiler import building_blocks
+from tensorflow_federated.python.core.impl.compiler import compiler_profiling
+from tensorflow_federated.python.core.impl.compiler import tree_analysis
+from tensorflow_federated.python.core.impl.types import computation_types
+
+
+def _wrap_in_struct(comp):
+  return building_blocks.Struct([comp])
+
+
+def _wrap_in_struct_with_modified(comp):
+  return building_blocks.Struct([comp]), True
+
+
+class ProfilePassTest(absltest.TestCase):
+
+  def test_returns_result_without_profile(self):
+    comp = building_blocks.Data('a', tf.int32)
+
+    result = compiler_profiling.profile_pass('scope', 'wrap', _wrap_in_struct,
+                                             comp)
+
+    self.assertEqual(result.compact_representation(), '<a>')
+
+  def test_records_pass(self):
+    comp = building_blocks.Data('a', tf.int32)
+
+    with compiler_profiling.profile_compilation() as profile:
+      result, modified = compiler_profiling.profile_pass(
+          'scope', 'wrap', _wrap_in_struct_with_modified, comp)
+
+    self.assertEqual(result.compact_representation(), '<a>')
+    self.assertTrue(modified)
+    self.assertLen(profile.passes, 1)
+    pass_profile = profile.passes[0]
+    self.assertEqual(pass_profile.scope, 'scope')
+    self.assertEqual(pass_profile.name, 'wrap')
+    self.assertEqual(pass_profile.depth, 0)
+    self.assertGreaterEqual(pass_profile.wall_time_secs, 0.0)
+    self.assertEqual(pass_profile.num_nodes_before, 1)
+    self.assertEqual(pass_profile.num_nodes_after, 2)
+    self.assertEqual(pass_profile.num_tf_ops_before, 0)
+    self.assertEqual(pass_profile.num_tf_ops_after, 0)
+    self.assertIsNone(pass_profile.peak_memory_bytes)
+
+  def test_records_tf_ops(self):
+    tensor_type = computation_types.TensorType(tf.int32)
+    comp = building_block_factory.create_compiled_identity(tensor_type)
+
+    with compiler_profiling.profile_compilation() as profile:
+      compiler_profiling.profile_pass('scope', 'wrap', _wrap_in_struct, comp)
+
+    num_tf_ops = tree_analysis.count_tensorflow_ops_under(comp)
+    self.assertGreater(num_tf_ops, 0)
+    self.assertEqual(profile.passes[0].num_tf_ops_before, num_tf_ops)
+    self.assertEqual(profile.passes[0].num_tf_ops_after, num_tf_ops)
+
+  def test_records_nested_passes(self):
+    comp = building_blocks.Data('a', tf.int32)
+
+    def outer_pass(comp):
+      comp = compiler_profiling.profile_pass('inner_scope', 'inner',
+                                             _wrap_in_struct, comp)
+      return _wrap_in_struct(comp)
+
+    with compiler_profiling.profile_compilation() as profile:
+      compiler_profiling.profile_pass('outer_scope', 'outer', outer_pass, comp)
+
+    self.assertEqual([(p.name, p.depth) for p in profile.passes],
+                     [('inner', 1), ('outer', 0)])
+    self.assertEqual(profile.passes[1].num_nodes_after, 3)
+
+  def test_records_peak_memory(self):
+    comp = building_blocks.Data('a', tf.int32)
+
+    def allocating_pass(comp):
+      allocated = [0] * 100000
+      del allocated
+      return comp
+
+    def outer_pass(comp):
+      return compiler_profiling.profile_pass('scope', 'inner', allocating_pass,
+                                             comp)
+
+    with compiler_profiling.profile_compilation(track_memory=True) as profile:
+      compiler_profiling.profile_pass('scope', 'outer', outer_pass, comp)
+
+    inner_profile, outer_profile = profile.passes
+    self.assertGreater(inner_profile.peak_memory_bytes, 0)
+    self.assertGreaterEqual(outer_profile.peak_memory_bytes,
+                            inner_profile.peak_memory_bytes)
+
+  def test_does_not_record_pass_after_profile_compilation_context(self):
+    comp = building_blocks.Data('a', tf.int32)
+
+    with compiler_profiling.profile_compilation() as profile:
+      pass
+    compiler_profiling.profile_pass('scope', 'wrap', _wrap_in_struct, comp)
+
+    self.assertEmpty(profile.passes)
+
+  def test_nested_profile_compilation_raises_runtime_error(self):
+    with compiler_profiling.profile_compilation():
+      with self.assertRaises(RuntimeError):
+        with compiler_profiling.profile_compilation():
+          pass
+
+
+class CompileProfileTest(absltest.TestCase):
+
+  def test_to_json(self):
+    comp = building_blocks.Data('a', tf.int32)
+
+    with compiler_profiling.profile_compilation() as profile:
+      compiler_profiling.profile_pass('scope', 'wrap', _wrap_in_struct, comp)
+
+    passes = json.loads(profile.to_json())['passes']
+    self.assertLen(passes, 1)
+    self.assertEqual(passes[0]['name'], 'wrap')
+    self.assertEqual(passes[0]['num_nodes_after'], 2)
+
+
+if __name__ == '__main__':
+  absltest.main()
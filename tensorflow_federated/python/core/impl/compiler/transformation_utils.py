@@ -20,7 +20,7 @@
 
 import abc
 import collections
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 import itertools
 import operator
 import typing
@@ -30,8 +30,54 @@ from tensorflow_federated.python.common_libs import structure
 from tensorflow_federated.python.core.impl.compiler import building_blocks
 
 
-def transform_postorder(comp, transform):
-  """Traverses `comp` recursively postorder and replaces its constituents.
+def _is_leaf(comp):
+  return (comp.is_compiled_computation() or comp.is_data() or
+          comp.is_intrinsic() or comp.is_placement() or comp.is_reference())
+
+
+def _get_children(comp):
+  """Returns the children of `comp` in the order they are traversed."""
+  if _is_leaf(comp):
+    return []
+  elif (comp.is_selection() or comp.is_struct() or comp.is_call() or
+        comp.is_lambda() or comp.is_block()):
+    return list(comp.children())
+  else:
+    raise NotImplementedError(
+        'Unrecognized computation building block: {}'.format(str(comp)))
+
+
+def _replace_children(comp, children):
+  """Returns a copy of `comp` with its children replaced by `children`."""
+  if comp.is_selection():
+    source, = children
+    return building_blocks.Selection(source, comp.name, comp.index)
+  elif comp.is_struct():
+    names = [name for name, _ in structure.iter_elements(comp)]
+    return building_blocks.Struct(
+        list(zip(names, children)),
+        container_type=comp.type_signature.python_container)
+  elif comp.is_call():
+    if comp.argument is not None:
+      fn, arg = children
+    else:
+      fn, = children
+      arg = None
+    return building_blocks.Call(fn, arg)
+  elif comp.is_lambda():
+    result, = children
+    return building_blocks.Lambda(comp.parameter_name, comp.parameter_type,
+                                  result)
+  elif comp.is_block():
+    names = [name for name, _ in comp.locals]
+    return building_blocks.Block(list(zip(names, children[:-1])), children[-1])
+  else:
+    raise NotImplementedError(
+        'Unrecognized computation building block: {}'.format(str(comp)))
+
+
+def transform_postorder(comp, transform, memoize=False):
+  """Traverses `comp` postorder and replaces its constituents.
 
   For each element of `comp` viewed as an expression tree, the transformation
   `transform` is applied first to building blocks it is parameterized by, then
@@ -47,6 +93,10 @@ def transform_postorder(comp, transform):
   Therefore, `f` is transformed into `f'`, next `x` into `x'` and finally,
   `Call(f',x')` is transformed at the end.
 
+  The traversal uses an explicit stack rather than Python recursion, so the
+  depth of `comp` is not bounded by the interpreter's recursion limit. Building
+  blocks whose children are all unmodified are reused rather than rebuilt.
+
   Args:
     comp: A `computation_building_block.ComputationBuildingBlock` to traverse
       and transform bottom-up.
@@ -57,6 +107,13 @@ def transform_postorder(comp, transform):
       representing either the original building block or a transformed building
       block and the bool is a flag indicating if the building block was modified
       as.
+    memoize: Whether to transform each distinct building block object in `comp`
+      only once. If `True`, a building block that appears in several places in
+      `comp` (a shared subtree) is traversed the first time it is encountered
+      and the result is reused everywhere else. This is only correct if
+      `transform` is a pure function of the building block it is given; it
+      should not be used with transforms that count or collect the building
+      blocks they visit.
 
   Returns:
     The result of applying `transform` to parts of `comp` in a bottom-up
@@ -69,59 +126,37 @@ def transform_postorder(comp, transform):
       that is currently not recognized.
   """
   py_typecheck.check_type(comp, building_blocks.ComputationBuildingBlock)
-  if (comp.is_compiled_computation() or comp.is_data() or comp.is_intrinsic() or
-      comp.is_placement() or comp.is_reference()):
-    return transform(comp)
-  elif comp.is_selection():
-    source, source_modified = transform_postorder(comp.source, transform)
-    if source_modified:
-      comp = building_blocks.Selection(source, comp.name, comp.index)
-    comp, comp_modified = transform(comp)
-    return comp, comp_modified or source_modified
-  elif comp.is_struct():
-    elements = []
-    elements_modified = False
-    for key, value in structure.iter_elements(comp):
-      value, value_modified = transform_postorder(value, transform)
-      elements.append((key, value))
-      elements_modified = elements_modified or value_modified
-    if elements_modified:
-      comp = building_blocks.Struct(
-          elements, container_type=comp.type_signature.python_container)
-    comp, comp_modified = transform(comp)
-    return comp, comp_modified or elements_modified
-  elif comp.is_call():
-    fn, fn_modified = transform_postorder(comp.function, transform)
-    if comp.argument is not None:
-      arg, arg_modified = transform_postorder(comp.argument, transform)
-    else:
-      arg, arg_modified = (None, False)
-    if fn_modified or arg_modified:
-      comp = building_blocks.Call(fn, arg)
-    comp, comp_modified = transform(comp)
-    return comp, comp_modified or fn_modified or arg_modified
-  elif comp.is_lambda():
-    result, result_modified = transform_postorder(comp.result, transform)
-    if result_modified:
-      comp = building_blocks.Lambda(comp.parameter_name, comp.parameter_type,
-                                    result)
-    comp, comp_modified = transform(comp)
-    return comp, comp_modified or result_modified
-  elif comp.is_block():
-    variables = []
-    variables_modified = False
-    for key, value in comp.locals:
-      value, value_modified = transform_postorder(value, transform)
-      variables.append((key, value))
-      variables_modified = variables_modified or value_modified
-    result, result_modified = transform_postorder(comp.result, transform)
-    if variables_modified or result_modified:
-      comp = building_blocks.Block(variables, result)
-    comp, comp_modified = transform(comp)
-    return comp, comp_modified or variables_modified or result_modified
-  else:
-    raise NotImplementedError(
-        'Unrecognized computation building block: {}'.format(str(comp)))
+  py_typecheck.check_callable(transform)
+  # Results keyed by the `id` of the original building block. The original is
+  # stored alongside its result so that its `id` can not be reused.
+  memo = {}
+  # Each entry is a building block and its list of children, which is `None`
+  # until the building block has been visited on the way down.
+  stack = [(comp, None)]
+  results = []
+  while stack:
+    original, children = stack.pop()
+    if memoize and id(original) in memo:
+      results.append(memo[id(original)][1])
+      continue
+    if children is None:
+      children = _get_children(original)
+      stack.append((original, children))
+      stack.extend((child, None) for child in reversed(children))
+      continue
+    node = original
+    transformed_children = results[len(results) - len(children):]
+    del results[len(results) - len(children):]
+    children_modified = any(modified for _, modified in transformed_children)
+    if children_modified:
+      node = _replace_children(node,
+                               [child for child, _ in transformed_children])
+    node, node_modified = transform(node)
+    result = (node, node_modified or children_modified)
+    if memoize:
+      memo[id(original)] = (original, result)
+    results.append(result)
+  return results[0]
 
 
 TransformReturnType = tuple[building_blocks.ComputationBuildingBlock, bool]
@@ -226,6 +261,11 @@ def transform_preorder(
         'Unrecognized computation building block: {}'.format(str(inner_comp)))
 
 
+_VISIT = 'visit'
+_BIND = 'bind'
+_LEAVE = 'leave'
+
+
 def transform_postorder_with_symbol_bindings(comp, transform, symbol_tree):
   """Uses symbol binding hooks to execute transformations.
 
@@ -283,40 +323,67 @@ def transform_postorder_with_symbol_bindings(comp, transform, symbol_tree):
                     '`transform_postorder_with_symbol_bindings` must '
                     'be callable.')
   identifier_seq = itertools.count(start=1)
-
-  def _transform_postorder_with_symbol_bindings_switch(comp, transform_fn,
-                                                       ctxt_tree,
-                                                       identifier_sequence):
-    """Recursive helper function delegated to after binding comp_id sequence."""
-    if (comp.is_compiled_computation() or comp.is_data() or
-        comp.is_intrinsic() or comp.is_placement() or comp.is_reference()):
-      return _traverse_leaf(comp, transform_fn, ctxt_tree, identifier_sequence)
-    elif comp.is_selection():
-      return _traverse_selection(comp, transform, ctxt_tree,
-                                 identifier_sequence)
-    elif comp.is_struct():
-      return _traverse_tuple(comp, transform, ctxt_tree, identifier_sequence)
-    elif comp.is_call():
-      return _traverse_call(comp, transform, ctxt_tree, identifier_sequence)
-    elif comp.is_lambda():
-      return _traverse_lambda(comp, transform, ctxt_tree, identifier_sequence)
-    elif comp.is_block():
-      return _traverse_block(comp, transform, ctxt_tree, identifier_sequence)
+  # The traversal is driven by an explicit stack of operations rather than by
+  # Python recursion. `_VISIT` is performed on the way down, `_BIND` after the
+  # value of a block local has been transformed, and `_LEAVE` on the way up,
+  # once all the children of a building block have been transformed.
+  stack = [(_VISIT, comp)]
+  results = []
+  while stack:
+    operation, node = stack.pop()
+    if operation is _VISIT:
+      comp_id = next(identifier_seq)
+      if _is_leaf(node):
+        results.append(transform(node, symbol_tree))
+        continue
+      stack.append((_LEAVE, node))
+      if node.is_lambda():
+        symbol_tree.drop_scope_down(comp_id)
+        symbol_tree.ingest_variable_binding(
+            name=node.parameter_name, value=None)
+        stack.append((_VISIT, node.result))
+      elif node.is_block():
+        symbol_tree.drop_scope_down(comp_id)
+        stack.append((_VISIT, node.result))
+        for name, value in reversed(node.locals):
+          stack.append((_BIND, name))
+          stack.append((_VISIT, value))
+      else:
+        stack.extend((_VISIT, child) for child in reversed(_get_children(node)))
+    elif operation is _BIND:
+      symbol_tree.ingest_variable_binding(name=node, value=results[-1][0])
     else:
-      raise NotImplementedError(
-          'Unrecognized computation building block: {}'.format(str(comp)))
-
-  def _traverse_leaf(comp, transform, context_tree, identifier_seq):
-    """Helper function holding traversal logic for leaf nodes."""
-    _ = next(identifier_seq)
-    return transform(comp, context_tree)
-
-  def _traverse_selection(comp, transform, context_tree, identifier_seq):
-    """Helper function holding traversal logic for selection nodes."""
-    _ = next(identifier_seq)
-    source, source_modified = _transform_postorder_with_symbol_bindings_switch(
-        comp.source, transform, context_tree, identifier_seq)
-    if source_modified:
+      results.append(
+          _leave_with_symbol_bindings(node, transform, symbol_tree, results))
+  return results[0]
+
+
+def _leave_with_symbol_bindings(comp, transform, symbol_tree, results):
+  """Rebuilds and transforms `comp` once its children have been transformed.
+
+  Args:
+    comp: A non-leaf `building_blocks.ComputationBuildingBlock`.
+    transform: The transform passed to
+      `transform_postorder_with_symbol_bindings`.
+    symbol_tree: The `SymbolTree` passed to
+      `transform_postorder_with_symbol_bindings`.
+    results: A Python `list` of (building block, bool) tuples, whose last
+      elements are the transformed children of `comp`. These elements are
+      removed from `results`.
+
+  Returns:
+    A (building block, bool) tuple for the transformed `comp`.
+  """
+  num_children = len(_get_children(comp))
+  transformed_children = results[len(results) - num_children:]
+  del results[len(results) - num_children:]
+  children = [child for child, _ in transformed_children]
+  children_modified = any(modified for _, modified in transformed_children)
+  is_scope = comp.is_lambda() or comp.is_block()
+  if is_scope:
+    symbol_tree.walk_to_scope_beginning()
+  if children_modified:
+    if comp.is_selection():
       # Normalize selection to index based on the type signature of the
       # original source. The new source may not have names present.
       if comp.index is not None:
@@ -324,78 +391,16 @@ def transform_postorder_with_symbol_bindings(comp, transform, symbol_tree):
       else:
         index = structure.name_to_index_map(
             comp.source.type_signature)[comp.name]
-      comp = building_blocks.Selection(source, index=index)
-    comp, comp_modified = transform(comp, context_tree)
-    return comp, comp_modified or source_modified
-
-  def _traverse_tuple(comp, transform, context_tree, identifier_seq):
-    """Helper function holding traversal logic for tuple nodes."""
-    _ = next(identifier_seq)
-    elements = []
-    elements_modified = False
-    for key, value in structure.iter_elements(comp):
-      value, value_modified = _transform_postorder_with_symbol_bindings_switch(
-          value, transform, context_tree, identifier_seq)
-      elements.append((key, value))
-      elements_modified = elements_modified or value_modified
-    if elements_modified:
-      comp = building_blocks.Struct(elements)
-    comp, comp_modified = transform(comp, context_tree)
-    return comp, comp_modified or elements_modified
-
-  def _traverse_call(comp, transform, context_tree, identifier_seq):
-    """Helper function holding traversal logic for call nodes."""
-    _ = next(identifier_seq)
-    fn, fn_modified = _transform_postorder_with_symbol_bindings_switch(
-        comp.function, transform, context_tree, identifier_seq)
-    if comp.argument is not None:
-      arg, arg_modified = _transform_postorder_with_symbol_bindings_switch(
-          comp.argument, transform, context_tree, identifier_seq)
+      comp = building_blocks.Selection(children[0], index=index)
+    elif comp.is_struct():
+      names = [name for name, _ in structure.iter_elements(comp)]
+      comp = building_blocks.Struct(list(zip(names, children)))
     else:
-      arg, arg_modified = (None, False)
-    if fn_modified or arg_modified:
-      comp = building_blocks.Call(fn, arg)
-    comp, comp_modified = transform(comp, context_tree)
-    return comp, comp_modified or fn_modified or arg_modified
-
-  def _traverse_lambda(comp, transform, context_tree, identifier_seq):
-    """Helper function holding traversal logic for lambda nodes."""
-    comp_id = next(identifier_seq)
-    context_tree.drop_scope_down(comp_id)
-    context_tree.ingest_variable_binding(name=comp.parameter_name, value=None)
-    result, result_modified = _transform_postorder_with_symbol_bindings_switch(
-        comp.result, transform, context_tree, identifier_seq)
-    context_tree.walk_to_scope_beginning()
-    if result_modified:
-      comp = building_blocks.Lambda(comp.parameter_name, comp.parameter_type,
-                                    result)
-    comp, comp_modified = transform(comp, context_tree)
-    context_tree.pop_scope_up()
-    return comp, comp_modified or result_modified
-
-  def _traverse_block(comp, transform, context_tree, identifier_seq):
-    """Helper function holding traversal logic for block nodes."""
-    comp_id = next(identifier_seq)
-    context_tree.drop_scope_down(comp_id)
-    variables = []
-    variables_modified = False
-    for key, value in comp.locals:
-      value, value_modified = _transform_postorder_with_symbol_bindings_switch(
-          value, transform, context_tree, identifier_seq)
-      context_tree.ingest_variable_binding(name=key, value=value)
-      variables.append((key, value))
-      variables_modified = variables_modified or value_modified
-    result, result_modified = _transform_postorder_with_symbol_bindings_switch(
-        comp.result, transform, context_tree, identifier_seq)
-    context_tree.walk_to_scope_beginning()
-    if variables_modified or result_modified:
-      comp = building_blocks.Block(variables, result)
-    comp, comp_modified = transform(comp, context_tree)
-    context_tree.pop_scope_up()
-    return comp, comp_modified or variables_modified or result_modified
-
-  return _transform_postorder_with_symbol_bindings_switch(
-      comp, transform, symbol_tree, identifier_seq)
+      comp = _replace_children(comp, children)
+  comp, comp_modified = transform(comp, symbol_tree)
+  if is_scope:
+    symbol_tree.pop_scope_up()
+  return comp, comp_modified or children_modified
 
 
 class SymbolTree:
@@ -1011,7 +1016,7 @@ def list_comp_names(comp):
 
   def _string_rep(inner_comp):
     names.append(str(inner_comp))
-    return inner_comp
+    return inner_comp, False
 
   transform_postorder(comp, _string_rep)
   return names
@@ -1177,3 +1182,47 @@ class TransformSpec(metaclass=abc.ABCMeta):
   @abc.abstractmethod
   def transform(self, comp):
     pass
+
+
+def fuse_transform_specs(
+    transform_specs: Sequence[TransformSpec]
+) -> Callable[[building_blocks.ComputationBuildingBlock], TransformReturnType]:
+  """Fuses `transform_specs` into a single transform function.
+
+  The returned function can be passed to `transform_postorder` to apply all of
+  `transform_specs` in a single traversal of an AST, rather than traversing it
+  once per `TransformSpec`. Each building block is passed through the
+  `TransformSpec`s in order, and each `TransformSpec` is applied to the output
+  of the previous one if its `should_transform` method returns `True`.
+
+  Args:
+    transform_specs: A sequence of `TransformSpec`s, none of which may be a
+      global transform.
+
+  Returns:
+    A Python function that accepts a building block and returns a (building
+    block, bool) tuple, suitable for use with `transform_postorder`.
+
+  Raises:
+    TypeError: If `transform_specs` contains anything other than
+      `TransformSpec`s.
+    ValueError: If any of `transform_specs` is a global transform, which can
+      not be applied one building block at a time.
+  """
+  for transform_spec in transform_specs:
+    py_typecheck.check_type(transform_spec, TransformSpec)
+    if transform_spec.global_transform:
+      raise ValueError(
+          'Global transforms can not be fused with other transforms, found '
+          f'{transform_spec!r}.')
+  transform_specs = tuple(transform_specs)
+
+  def _transform(comp):
+    modified = False
+    for transform_spec in transform_specs:
+      if transform_spec.should_transform(comp):
+        comp, spec_modified = transform_spec.transform(comp)
+        modified = modified or spec_modified
+    return comp, modified
+
+  return _transform
@@ -0,0 +1,139 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for traversing and transforming ASTs.
+
+Run with `--benchmarks=.` to report the wall time of `transform_postorder` and
+`transform_postorder_with_symbol_bindings` on synthetic ASTs that are deep (a
+long chain of calls), wide (a struct with many elements) and shared (a DAG of
+structs whose elements refer to the same building block).
+"""
+
+import functools
+import statistics
+import time
+
+import tensorflow as tf
+
+from tensorflow_federated.python.core.impl.compiler import building_blocks
+from tensorflow_federated.python.core.impl.compiler import transformation_utils
+from tensorflow_federated.python.core.impl.types import computation_types
+
+_NUM_NODES = (1000, 10000, 100000)
+_SHARED_DEPTHS = (10, 15)
+_ITERS = 3
+
+
+def _median_wall_time(fn):
+  wall_times = []
+  for _ in range(_ITERS):
+    start_time = time.perf_counter()
+    fn()
+    wall_times.append(time.perf_counter() - start_time)
+  return statistics.median(wall_times)
+
+
+def _create_deep_ast(num_nodes):
+  """Returns a chain of `num_nodes` calls to an intrinsic."""
+  function_type = computation_types.FunctionType(tf.int32, tf.int32)
+  fn = building_blocks.Intrinsic('fn', function_type)
+  comp = building_blocks.Data('data', tf.int32)
+  for _ in range(num_nodes):
+    comp = building_blocks.Call(fn, comp)
+  return comp
+
+
+def _create_wide_ast(num_nodes):
+  """Returns a struct of `num_nodes` selections from a reference."""
+  ref = building_blocks.Reference('x', [tf.int32])
+  return building_blocks.Struct(
+      [building_blocks.Selection(ref, index=0) for _ in range(num_nodes)])
+
+
+def _create_shared_ast(depth):
+  """Returns a DAG of `depth` nested structs that share their elements."""
+  comp = building_blocks.Data('data', tf.int32)
+  for _ in range(depth):
+    comp = building_blocks.Struct([comp, comp])
+  return comp
+
+
+def _rename_data(comp):
+  if comp.is_data():
+    return building_blocks.Data('renamed', comp.type_signature), True
+  return comp, False
+
+
+def _transform_with_symbol_bindings(comp):
+
+  def _transform(comp, symbol_tree):
+    del symbol_tree  # Unused.
+    return _rename_data(comp)
+
+  symbol_tree = transformation_utils.SymbolTree(
+      transformation_utils.ReferenceCounter)
+  return transformation_utils.transform_postorder_with_symbol_bindings(
+      comp, _transform, symbol_tree)
+
+
+class TransformPostorderBenchmark(tf.test.Benchmark):
+
+  def _report(self, name, num_nodes, wall_time):
+    self.report_benchmark(
+        iters=_ITERS,
+        wall_time=wall_time,
+        name=name,
+        extras={
+            'num_nodes': num_nodes,
+            'nodes_per_sec': num_nodes / wall_time,
+        })
+
+  def benchmark_transform_postorder(self):
+    for num_nodes in _NUM_NODES:
+      for shape, create_fn in (('deep', _create_deep_ast),
+                               ('wide', _create_wide_ast)):
+        comp = create_fn(num_nodes)
+        wall_time = _median_wall_time(
+            functools.partial(transformation_utils.transform_postorder, comp,
+                              _rename_data))
+        self._report(f'transform_postorder_{shape}_{num_nodes}', num_nodes,
+                     wall_time)
+
+  def benchmark_transform_postorder_with_symbol_bindings(self):
+    for num_nodes in _NUM_NODES:
+      for shape, create_fn in (('deep', _create_deep_ast),
+                               ('wide', _create_wide_ast)):
+        comp = create_fn(num_nodes)
+        wall_time = _median_wall_time(
+            functools.partial(_transform_with_symbol_bindings, comp))
+        self._report(
+            f'transform_postorder_with_symbol_bindings_{shape}_{num_nodes}',
+            num_nodes, wall_time)
+
+  def benchmark_transform_postorder_shared(self):
+    for depth in _SHARED_DEPTHS:
+      comp = _create_shared_ast(depth)
+      num_nodes = 2**(depth + 1) - 1
+      for name, memoize in (('memoized', True), ('unmemoized', False)):
+        wall_time = _median_wall_time(
+            functools.partial(
+                transformation_utils.transform_postorder,
+                comp,
+                _rename_data,
+                memoize=memoize))
+        self._report(f'transform_postorder_shared_{name}_{depth}', num_nodes,
+                     wall_time)
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import sys
+
 from absl.testing import absltest
 from absl.testing import parameterized
 import tensorflow as tf
@@ -324,6 +326,95 @@ class TransformationUtilsTest(parameterized.TestCase):
 
     self.assertEqual(leaf_name_order, list(postorder_nodes))
 
+  def test_transform_postorder_transforms_ast_deeper_than_recursion_limit(self):
+    function_type = computation_types.FunctionType(tf.int32, tf.int32)
+    fn = building_blocks.Intrinsic('fn', function_type)
+    comp = building_blocks.Data('a', tf.int32)
+    depth = sys.getrecursionlimit() * 2
+    for _ in range(depth):
+      comp = building_blocks.Call(fn, comp)
+
+    def transform(comp):
+      if comp.is_data():
+        return building_blocks.Data('b', comp.type_signature), True
+      return comp, False
+
+    transformed_comp, modified = transformation_utils.transform_postorder(
+        comp, transform)
+
+    self.assertTrue(modified)
+    for _ in range(depth):
+      self.assertTrue(transformed_comp.is_call())
+      self.assertIs(transformed_comp.function, fn)
+      transformed_comp = transformed_comp.argument
+    self.assertEqual(transformed_comp.uri, 'b')
+
+  def test_transform_postorder_visits_shared_subtree_once_if_memoized(self):
+    data = building_blocks.Data('a', tf.int32)
+    comp = building_blocks.Struct([data, data])
+
+    self.assertEqual(_get_number_of_nodes_via_transform_postorder(comp), 3)
+
+    visited = []
+
+    def transform(comp):
+      visited.append(comp)
+      if comp.is_data():
+        return building_blocks.Data('b', comp.type_signature), True
+      return comp, False
+
+    transformed_comp, modified = transformation_utils.transform_postorder(
+        comp, transform, memoize=True)
+
+    self.assertTrue(modified)
+    self.assertLen(visited, 2)
+    self.assertEqual(transformed_comp.compact_representation(), '<b,b>')
+    self.assertIs(transformed_comp[0], transformed_comp[1])
+
+  def test_transform_postorder_reuses_unmodified_subtrees(self):
+    unmodified = building_blocks.Struct([building_blocks.Data('a', tf.int32)])
+    comp = building_blocks.Struct(
+        [unmodified, building_blocks.Data('b', tf.int32)])
+
+    def transform(comp):
+      if comp.is_data() and comp.uri == 'b':
+        return building_blocks.Data('c', comp.type_signature), True
+      return comp, False
+
+    transformed_comp, modified = transformation_utils.transform_postorder(
+        comp, transform)
+
+    self.assertTrue(modified)
+    self.assertEqual(transformed_comp.compact_representation(), '<<a>,c>')
+    self.assertIs(transformed_comp[0], unmodified)
+
+  def test_transform_postorder_with_symbol_bindings_transforms_deep_ast(self):
+    function_type = computation_types.FunctionType(tf.int32, tf.int32)
+    fn = building_blocks.Intrinsic('fn', function_type)
+    comp = building_blocks.Reference('x', tf.int32)
+    depth = sys.getrecursionlimit() * 2
+    for _ in range(depth):
+      comp = building_blocks.Call(fn, comp)
+    comp = building_blocks.Lambda('x', tf.int32, comp)
+    empty_symbol_tree = transformation_utils.SymbolTree(UpdatableTracker)
+    value_holder = []
+
+    def transform(comp, ctxt_tree):
+      if comp.is_reference():
+        ctxt_tree.update_payload_with_name(comp.name)
+        value_holder.append(ctxt_tree.get_payload_with_name(comp.name))
+      return comp, False
+
+    transformed_comp, modified = (
+        transformation_utils.transform_postorder_with_symbol_bindings(
+            comp, transform, empty_symbol_tree))
+
+    self.assertFalse(modified)
+    self.assertIs(transformed_comp, comp)
+    self.assertLen(value_holder, 1)
+    self.assertEqual(value_holder[0].name, 'x')
+    self.assertEqual(value_holder[0].count, 1)
+
   # TODO(b/113123410): Add more tests for corner cases of `transform_preorder`.
 
   def test_transform_postorder_with_symbol_bindings_fails_on_none_comp(self):
@@ -1687,6 +1778,58 @@ class TransformPreorderTest(parameterized.TestCase):
     self.assertIsInstance(data_replaced[0], building_blocks.Reference)
 
 
+class _RenameData(transformation_utils.TransformSpec):
+
+  def __init__(self, old_uri, new_uri, global_transform=False):
+    super().__init__(global_transform=global_transform)
+    self._old_uri = old_uri
+    self._new_uri = new_uri
+
+  def should_transform(self, comp):
+    return comp.is_data() and comp.uri == self._old_uri
+
+  def transform(self, comp):
+    if not self.should_transform(comp):
+      return comp, False
+    return building_blocks.Data(self._new_uri, comp.type_signature), True
+
+
+class FuseTransformSpecsTest(absltest.TestCase):
+
+  def test_applies_transform_specs_in_order(self):
+    comp = building_blocks.Struct([
+        building_blocks.Data('a', tf.int32),
+        building_blocks.Data('b', tf.int32),
+    ])
+    transform = transformation_utils.fuse_transform_specs(
+        [_RenameData('a', 'b'), _RenameData('b', 'c')])
+
+    transformed_comp, modified = transformation_utils.transform_postorder(
+        comp, transform)
+
+    self.assertTrue(modified)
+    self.assertEqual(transformed_comp.compact_representation(), '<c,c>')
+
+  def test_returns_unmodified(self):
+    comp = building_blocks.Data('a', tf.int32)
+    transform = transformation_utils.fuse_transform_specs(
+        [_RenameData('b', 'c'), _RenameData('c', 'd')])
+
+    transformed_comp, modified = transform(comp)
+
+    self.assertFalse(modified)
+    self.assertIs(transformed_comp, comp)
+
+  def test_raises_type_error_with_non_transform_spec(self):
+    with self.assertRaises(TypeError):
+      transformation_utils.fuse_transform_specs([lambda comp: (comp, False)])
+
+  def test_raises_value_error_with_global_transform(self):
+    with self.assertRaises(ValueError):
+      transformation_utils.fuse_transform_specs(
+          [_RenameData('a', 'b', global_transform=True)])
+
+
 class GetUniqueNamesTest(absltest.TestCase):
 
   def test_raises_on_none(self):
@@ -31,6 +31,7 @@ from tensorflow_federated.python.common_libs import structure
 from tensorflow_federated.python.common_libs import tracing
 from tensorflow_federated.python.core.impl.computation import computation_base
 from tensorflow_federated.python.core.impl.context_stack import context_base
+from tensorflow_federated.python.core.impl.execution_contexts import compilation_cache as compilation_cache_lib
 from tensorflow_federated.python.core.impl.execution_contexts import compiler_pipeline
 from tensorflow_federated.python.core.impl.executors import cardinalities_utils
 from tensorflow_federated.python.core.impl.executors import executor_base
@@ -161,7 +162,9 @@ class AsyncExecutionContext(context_base.AsyncContext):
                                      Any]] = None,
       *,
       cardinality_inference_fn: cardinalities_utils
-      .CardinalityInferenceFnType = cardinalities_utils.infer_cardinalities):
+      .CardinalityInferenceFnType = cardinalities_utils.infer_cardinalities,
+      compilation_cache: Optional[
+          compilation_cache_lib.FileCompilationCache] = None):
     """Initializes an execution context.
 
     Args:
@@ -171,13 +174,16 @@ class AsyncExecutionContext(context_base.AsyncContext):
         cardinalities from arguments (and their associated types). The value
         returned by this function will be passed to the `create_executor` method
         of `executor_fn` to construct a `tff.framework.Executor` instance.
+      compilation_cache: An optional `FileCompilationCache` in which to persist
+        the results of `compiler_fn`. Ignored if `compiler_fn` is `None`.
     """
     super().__init__()
     py_typecheck.check_type(executor_fn, executor_factory.ExecutorFactory)
     self._executor_factory = executor_fn
     if compiler_fn is not None:
       py_typecheck.check_callable(compiler_fn)
-      self._compiler_pipeline = compiler_pipeline.CompilerPipeline(compiler_fn)
+      self._compiler_pipeline = compiler_pipeline.CompilerPipeline(
+          compiler_fn, compilation_cache=compilation_cache)
     else:
       self._compiler_pipeline = None
     py_typecheck.check_callable(cardinality_inference_fn)
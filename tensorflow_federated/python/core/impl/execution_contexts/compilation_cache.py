@@ -0,0 +1,179 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# pytype: skip-file
+# This modules disables the Pytype analyzer, see
+# https://github.com/tensorflow/federated/blob/main/docs/pytype.md for more
+# information.
+"""A persistent, content-addressed cache of compiled computations."""
+
+import hashlib
+import os
+import os.path
+import tempfile
+import time
+from typing import Any, Optional
+
+from absl import logging
+
+from google.protobuf import message
+from tensorflow_federated.proto.v0 import computation_pb2 as pb
+from tensorflow_federated.python.common_libs import py_typecheck
+from tensorflow_federated.python.core.impl.computation import computation_base
+from tensorflow_federated.python.core.impl.computation import computation_impl
+from tensorflow_federated.python.core.impl.context_stack import context_stack_impl
+
+_ENTRY_SUFFIX = '.pb'
+_TEMP_PREFIX = '.tmp-'
+# Temporary files older than this are assumed to have been left behind by a
+# writer that crashed, and are removed during eviction.
+_STALE_TEMP_FILE_AGE_SEC = 60 * 60
+
+
+class FileCompilationCache:
+  """A content-addressed cache of compiled computations stored on disk.
+
+  Entries are keyed by a hash of the serialized `pb.Computation` to compile and
+  the `compiler_id` of the cache, and hold the serialized `pb.Computation` of
+  the compiled result. Only compilations that map a
+  `computation_impl.ConcreteComputation` to a
+  `computation_impl.ConcreteComputation` are cached; other artifacts are
+  silently ignored.
+
+  The total size of the entries in `root_dir` is bounded by `max_size_bytes`;
+  when it is exceeded the least recently used entries are evicted. Entries are
+  written to a temporary file and atomically renamed into place, so a single
+  `root_dir` can be shared by several processes.
+
+  Note: The `compiler_id` must change whenever the behavior of the compiler
+  changes (e.g. by including a version number), otherwise stale entries will be
+  returned.
+  """
+
+  def __init__(self,
+               root_dir: str,
+               compiler_id: str,
+               max_size_bytes: int = 1024 * 1024 * 1024):
+    """Returns an initialized `FileCompilationCache`.
+
+    Args:
+      root_dir: A path to the directory in which to store the entries. Created
+        if it does not exist.
+      compiler_id: A string identifying the compiler whose results are cached.
+      max_size_bytes: The maximum total size of the entries in `root_dir`.
+
+    Raises:
+      ValueError: If `root_dir` or `compiler_id` is empty, or if
+        `max_size_bytes` is not positive.
+    """
+    py_typecheck.check_type(root_dir, (str, os.PathLike))
+    py_typecheck.check_type(compiler_id, str)
+    py_typecheck.check_type(max_size_bytes, int)
+    if not root_dir:
+      raise ValueError('Expected `root_dir` to not be empty.')
+    if not compiler_id:
+      raise ValueError('Expected `compiler_id` to not be empty.')
+    if max_size_bytes <= 0:
+      raise ValueError('Expected `max_size_bytes` to be positive, found '
+                       f'{max_size_bytes}.')
+    self._root_dir = os.fspath(root_dir)
+    self._compiler_id = compiler_id
+    self._max_size_bytes = max_size_bytes
+    os.makedirs(self._root_dir, exist_ok=True)
+
+  def _get_path_for_computation(
+      self, comp: computation_impl.ConcreteComputation) -> str:
+    proto = computation_impl.ConcreteComputation.get_proto(comp)
+    key = hashlib.sha256()
+    key.update(self._compiler_id.encode('utf-8'))
+    key.update(b'\0')
+    key.update(proto.SerializeToString(deterministic=True))
+    return os.path.join(self._root_dir, f'{key.hexdigest()}{_ENTRY_SUFFIX}')
+
+  def load(
+      self, comp: computation_base.Computation
+  ) -> Optional[computation_impl.ConcreteComputation]:
+    """Returns the cached compilation of `comp`, or `None` if there is none."""
+    if not isinstance(comp, computation_impl.ConcreteComputation):
+      return None
+    path = self._get_path_for_computation(comp)
+    try:
+      with open(path, 'rb') as f:
+        serialized_proto = f.read()
+    except FileNotFoundError:
+      return None
+    try:
+      proto = pb.Computation.FromString(serialized_proto)
+    except message.DecodeError:
+      logging.warning('Removing corrupt compilation cache entry %s.', path)
+      self._remove(path)
+      return None
+    # Mark the entry as recently used.
+    try:
+      os.utime(path)
+    except OSError:
+      pass
+    return computation_impl.ConcreteComputation(proto,
+                                                context_stack_impl.context_stack)
+
+  def save(self, comp: computation_base.Computation, compiled: Any):
+    """Saves `compiled` as the compilation of `comp`."""
+    if (not isinstance(comp, computation_impl.ConcreteComputation) or
+        not isinstance(compiled, computation_impl.ConcreteComputation)):
+      return
+    serialized_proto = computation_impl.ConcreteComputation.get_proto(
+        compiled).SerializeToString()
+    if len(serialized_proto) > self._max_size_bytes:
+      logging.debug('Not caching a compiled computation of %d bytes.',
+                    len(serialized_proto))
+      return
+    path = self._get_path_for_computation(comp)
+    fd, temp_path = tempfile.mkstemp(prefix=_TEMP_PREFIX, dir=self._root_dir)
+    try:
+      with os.fdopen(fd, 'wb') as f:
+        f.write(serialized_proto)
+      os.replace(temp_path, path)
+    except:
+      self._remove(temp_path)
+      raise
+    self._evict()
+
+  def _remove(self, path: str):
+    try:
+      os.remove(path)
+    except FileNotFoundError:
+      pass
+
+  def _evict(self):
+    """Removes least recently used entries until under `max_size_bytes`."""
+    entries = []
+    now = time.time()
+    with os.scandir(self._root_dir) as it:
+      for entry in it:
+        try:
+          stat = entry.stat()
+        except FileNotFoundError:
+          # Removed concurrently by another process.
+          continue
+        if entry.name.startswith(_TEMP_PREFIX):
+          if now - stat.st_mtime > _STALE_TEMP_FILE_AGE_SEC:
+            self._remove(entry.path)
+        elif entry.name.endswith(_ENTRY_SUFFIX):
+          entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+    total_size_bytes = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+      if total_size_bytes <= self._max_size_bytes:
+        break
+      self._remove(path)
+      total_size_bytes -= size
@@ -0,0 +1,138 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import os.path
+
+from absl.testing import absltest
+import tensorflow as tf
+
+from tensorflow_federated.python.core.impl.compiler import building_blocks
+from tensorflow_federated.python.core.impl.computation import computation_impl
+from tensorflow_federated.python.core.impl.execution_contexts import compilation_cache
+
+
+def _create_computation(dtype):
+  ref = building_blocks.Reference('x', dtype)
+  fn = building_blocks.Lambda(ref.name, ref.type_signature, ref)
+  return computation_impl.ConcreteComputation.from_building_block(fn)
+
+
+def _list_entries(root_dir):
+  return [x for x in os.listdir(root_dir) if not x.startswith('.')]
+
+
+class FileCompilationCacheTest(absltest.TestCase):
+
+  def test_load_returns_none_with_empty_cache(self):
+    root_dir = self.create_tempdir()
+    cache = compilation_cache.FileCompilationCache(root_dir, 'test')
+
+    self.assertIsNone(cache.load(_create_computation(tf.int32)))
+
+  def test_load_returns_saved_computation(self):
+    root_dir = self.create_tempdir()
+    cache = compilation_cache.FileCompilationCache(root_dir, 'test')
+    comp = _create_computation(tf.int32)
+    compiled = _create_computation(tf.float32)
+
+    cache.save(comp, compiled)
+    actual = cache.load(comp)
+
+    self.assertIsInstance(actual, computation_impl.ConcreteComputation)
+    self.assertEqual(
+        computation_impl.ConcreteComputation.get_proto(actual),
+        computation_impl.ConcreteComputation.get_proto(compiled))
+
+  def test_load_returns_saved_computation_from_other_instance(self):
+    root_dir = self.create_tempdir()
+    comp = _create_computation(tf.int32)
+    compiled = _create_computation(tf.float32)
+    compilation_cache.FileCompilationCache(root_dir, 'test').save(
+        comp, compiled)
+
+    actual = compilation_cache.FileCompilationCache(root_dir, 'test').load(comp)
+
+    self.assertIsNotNone(actual)
+    self.assertEqual(
+        computation_impl.ConcreteComputation.get_proto(actual),
+        computation_impl.ConcreteComputation.get_proto(compiled))
+
+  def test_load_returns_none_with_different_compiler_id(self):
+    root_dir = self.create_tempdir()
+    comp = _create_computation(tf.int32)
+    compilation_cache.FileCompilationCache(root_dir, 'test_1').save(comp, comp)
+
+    cache = compilation_cache.FileCompilationCache(root_dir, 'test_2')
+
+    self.assertIsNone(cache.load(comp))
+
+  def test_load_returns_none_and_removes_corrupt_entry(self):
+    root_dir = self.create_tempdir()
+    cache = compilation_cache.FileCompilationCache(root_dir, 'test')
+    comp = _create_computation(tf.int32)
+    cache.save(comp, comp)
+    entries = _list_entries(root_dir)
+    self.assertLen(entries, 1)
+    with open(os.path.join(root_dir, entries[0]), 'wb') as f:
+      f.write(b'\xff\xff\xff')
+
+    self.assertIsNone(cache.load(comp))
+    self.assertEmpty(_list_entries(root_dir))
+
+  def test_save_ignores_unsupported_artifact(self):
+    root_dir = self.create_tempdir()
+    cache = compilation_cache.FileCompilationCache(root_dir, 'test')
+
+    cache.save(_create_computation(tf.int32), object())
+
+    self.assertEmpty(_list_entries(root_dir))
+
+  def test_save_evicts_least_recently_used_entry(self):
+    root_dir = self.create_tempdir()
+    comps = [_create_computation(x) for x in [tf.int32, tf.float32, tf.bool]]
+    cache = compilation_cache.FileCompilationCache(root_dir, 'test')
+    cache.save(comps[0], comps[0])
+    entry_size = os.path.getsize(
+        os.path.join(root_dir,
+                     _list_entries(root_dir)[0]))
+    cache = compilation_cache.FileCompilationCache(
+        root_dir, 'test', max_size_bytes=entry_size * 2 + entry_size // 2)
+    cache.save(comps[1], comps[1])
+    # Make the entries distinguishable by modification time, with the entry for
+    # `comps[0]` being the most recently used.
+    for i, name in enumerate(sorted(
+        _list_entries(root_dir),
+        key=lambda x: os.path.getmtime(os.path.join(root_dir, x)))):
+      os.utime(os.path.join(root_dir, name), (i, i))
+    self.assertIsNotNone(cache.load(comps[0]))
+
+    cache.save(comps[2], comps[2])
+
+    self.assertIsNotNone(cache.load(comps[0]))
+    self.assertIsNone(cache.load(comps[1]))
+    self.assertIsNotNone(cache.load(comps[2]))
+
+  def test_raises_value_error_with_empty_compiler_id(self):
+    with self.assertRaises(ValueError):
+      compilation_cache.FileCompilationCache(self.create_tempdir(), '')
+
+  def test_raises_value_error_with_non_positive_max_size_bytes(self):
+    with self.assertRaises(ValueError):
+      compilation_cache.FileCompilationCache(
+          self.create_tempdir(), 'test', max_size_bytes=0)
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -20,10 +20,11 @@
 
 from collections.abc import Callable
 import functools
-from typing import Any
+from typing import Any, Optional
 
 from tensorflow_federated.python.common_libs import py_typecheck
 from tensorflow_federated.python.core.impl.computation import computation_base
+from tensorflow_federated.python.core.impl.execution_contexts import compilation_cache as compilation_cache_lib
 
 
 class CompilerPipeline:
@@ -41,16 +42,33 @@ class CompilerPipeline:
   `tff.framework.AsyncContext` , which would be initialized with a
   `CompilerPipeline` whose `compilation_fn` accepts `tff.Computations` and
   returns MapReduceForms.
+
+  Artifacts are cached in memory for the lifetime of the `CompilerPipeline`. If
+  a `compilation_cache` is provided, artifacts are additionally persisted to
+  and loaded from it, so that they can be shared across processes.
   """
 
-  def __init__(self, compilation_fn: Callable[[computation_base.Computation],
-                                              Any]):
+  def __init__(
+      self,
+      compilation_fn: Callable[[computation_base.Computation], Any],
+      compilation_cache: Optional[
+          compilation_cache_lib.FileCompilationCache] = None):
     py_typecheck.check_callable(compilation_fn)
+    if compilation_cache is not None:
+      py_typecheck.check_type(compilation_cache,
+                              compilation_cache_lib.FileCompilationCache)
     self._compilation_fn = compilation_fn
+    self._compilation_cache = compilation_cache
 
   @functools.lru_cache()
   def compile(self, computation_to_compile: computation_base.Computation):
     """Generates executable for `computation_to_compile`."""
     py_typecheck.check_type(computation_to_compile,
                             computation_base.Computation)
-    return self._compilation_fn(computation_to_compile)
+    if self._compilation_cache is None:
+      return self._compilation_fn(computation_to_compile)
+    compiled = self._compilation_cache.load(computation_to_compile)
+    if compiled is None:
+      compiled = self._compilation_fn(computation_to_compile)
+      self._compilation_cache.save(computation_to_compile, compiled)
+    return compiled
@@ -13,8 +13,12 @@
 # limitations under the License.
 
 from absl.testing import absltest
+import tensorflow as tf
 
+from tensorflow_federated.python.core.impl.compiler import building_blocks
 from tensorflow_federated.python.core.impl.computation import computation_base
+from tensorflow_federated.python.core.impl.computation import computation_impl
+from tensorflow_federated.python.core.impl.execution_contexts import compilation_cache
 from tensorflow_federated.python.core.impl.execution_contexts import compiler_pipeline
 
 
@@ -42,6 +46,30 @@ class CompilerPipelineTest(absltest.TestCase):
 
     # TODO(b/113123410): Expand the test with more structural invariants.
 
+  def test_compile_computation_with_compilation_cache(self):
+    ref = building_blocks.Reference('x', tf.int32)
+    fn = building_blocks.Lambda(ref.name, ref.type_signature, ref)
+    comp = computation_impl.ConcreteComputation.from_building_block(fn)
+    root_dir = self.create_tempdir()
+    num_compilations = 0
+
+    def compilation_fn(x):
+      nonlocal num_compilations
+      num_compilations += 1
+      return x
+
+    for _ in range(2):
+      pipeline = compiler_pipeline.CompilerPipeline(
+          compilation_fn,
+          compilation_cache=compilation_cache.FileCompilationCache(
+              root_dir, 'test'))
+      compiled = pipeline.compile(comp)
+      self.assertEqual(
+          computation_impl.ConcreteComputation.get_proto(compiled),
+          computation_impl.ConcreteComputation.get_proto(comp))
+
+    self.assertEqual(num_compilations, 1)
+
 
 if __name__ == '__main__':
   absltest.main()
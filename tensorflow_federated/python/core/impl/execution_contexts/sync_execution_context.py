@@ -26,6 +26,7 @@ from tensorflow_federated.python.common_libs import py_typecheck
 from tensorflow_federated.python.core.impl.computation import computation_base
 from tensorflow_federated.python.core.impl.context_stack import context_base
 from tensorflow_federated.python.core.impl.execution_contexts import async_execution_context
+from tensorflow_federated.python.core.impl.execution_contexts import compilation_cache as compilation_cache_lib
 from tensorflow_federated.python.core.impl.executors import cardinalities_utils
 from tensorflow_federated.python.core.impl.executors import executor_factory
 
@@ -40,7 +41,9 @@ class ExecutionContext(context_base.SyncContext):
                                      Any]] = None,
       *,
       cardinality_inference_fn: cardinalities_utils
-      .CardinalityInferenceFnType = cardinalities_utils.infer_cardinalities):
+      .CardinalityInferenceFnType = cardinalities_utils.infer_cardinalities,
+      compilation_cache: Optional[
+          compilation_cache_lib.FileCompilationCache] = None):
     """Initializes a synchronous execution context which retries invocations.
 
     Args:
@@ -50,13 +53,16 @@ class ExecutionContext(context_base.SyncContext):
         cardinalities from arguments (and their associated types). The value
         returned by this function will be passed to the `create_executor` method
         of `executor_fn` to construct a `tff.framework.Executor` instance.
+      compilation_cache: An optional `FileCompilationCache` in which to persist
+        the results of `compiler_fn`. Ignored if `compiler_fn` is `None`.
     """
     py_typecheck.check_type(executor_fn, executor_factory.ExecutorFactory)
     self._executor_factory = executor_fn
     self._async_context = async_execution_context.AsyncExecutionContext(
         executor_fn=executor_fn,
         compiler_fn=compiler_fn,
-        cardinality_inference_fn=cardinality_inference_fn)
+        cardinality_inference_fn=cardinality_inference_fn,
+        compilation_cache=compilation_cache)
     self._async_runner = async_utils.AsyncThreadRunner()
 
   @property
@@ -279,21 +279,36 @@ class UnplacedExecutorFactory(executor_factory.ExecutorFactory):
   This factory constructs executors which represent "local execution": work
   that happens at the clients, at the server, or without placements. As such,
   this executor manages the placement of work on local executors.
+
+  If a `tf_function_cache` is provided, it is shared by all the leaf executors
+  constructed by this factory, and can be used to inspect their combined cache
+  usage. In this case `leaf_executor_fn` must accept the `tf_function_cache`
+  keyword argument.
   """
 
-  def __init__(self,
-               *,
-               support_sequence_ops: bool = False,
-               can_resolve_references: bool = True,
-               server_device: Optional[tf.config.LogicalDevice] = None,
-               client_devices: Optional[Sequence[tf.config.LogicalDevice]] = (),
-               leaf_executor_fn=eager_tf_executor.EagerTFExecutor):
+  def __init__(
+      self,
+      *,
+      support_sequence_ops: bool = False,
+      can_resolve_references: bool = True,
+      server_device: Optional[tf.config.LogicalDevice] = None,
+      client_devices: Optional[Sequence[tf.config.LogicalDevice]] = (),
+      leaf_executor_fn=eager_tf_executor.EagerTFExecutor,
+      tf_function_cache: Optional[eager_tf_executor.TFFunctionCache] = None):
+    if tf_function_cache is not None:
+      py_typecheck.check_type(tf_function_cache,
+                              eager_tf_executor.TFFunctionCache)
     self._support_sequence_ops = support_sequence_ops
     self._can_resolve_references = can_resolve_references
     self._server_device = server_device
     self._client_devices = client_devices
     self._client_device_index = 0
     self._leaf_executor_fn = leaf_executor_fn
+    self._tf_function_cache = tf_function_cache
+
+  @property
+  def tf_function_cache(self) -> Optional[eager_tf_executor.TFFunctionCache]:
+    return self._tf_function_cache
 
   def _get_next_client_device(self) -> Optional[tf.config.LogicalDevice]:
     if not self._client_devices:
@@ -319,7 +334,11 @@ class UnplacedExecutorFactory(executor_factory.ExecutorFactory):
       device = self._server_device
     else:
       device = None
-    leaf_ex = self._leaf_executor_fn(device=device)
+    if self._tf_function_cache is not None:
+      leaf_ex = self._leaf_executor_fn(
+          device=device, tf_function_cache=self._tf_function_cache)
+    else:
+      leaf_ex = self._leaf_executor_fn(device=device)
     return _wrap_executor_in_threading_stack(
         leaf_ex,
         support_sequence_ops=self._support_sequence_ops,
@@ -620,6 +639,7 @@ def local_executor_factory(
     leaf_executor_fn=eager_tf_executor.EagerTFExecutor,
     local_computation_factory=tensorflow_computation_factory
     .TensorFlowComputationFactory(),
+    tf_function_cache: Optional[eager_tf_executor.TFFunctionCache] = None,
 ) -> executor_factory.ExecutorFactory:
   """Constructs an executor factory to execute computations locally.
 
@@ -655,6 +675,11 @@ def local_executor_factory(
       to construct local computations used as parameters in certain federated
       operators (such as `tff.federated_sum`, etc.). Defaults to a TensorFlow
       computation factory that generates TensorFlow code.
+    tf_function_cache: An optional `eager_tf_executor.TFFunctionCache` to share
+      between all the leaf executors, e.g. to bound the memory used by embedded
+      TensorFlow functions and to inspect the cache usage. If `None`, each leaf
+      executor uses its own cache. Requires `leaf_executor_fn` to accept the
+      `tf_function_cache` keyword argument.
 
   Returns:
     An instance of `executor_factory.ExecutorFactory` encapsulating the
@@ -675,7 +700,8 @@ def local_executor_factory(
       can_resolve_references=reference_resolving_clients,
       server_device=server_tf_device,
       client_devices=client_tf_devices,
-      leaf_executor_fn=leaf_executor_fn)
+      leaf_executor_fn=leaf_executor_fn,
+      tf_function_cache=tf_function_cache)
   federating_executor_factory = FederatingExecutorFactory(
       clients_per_thread=clients_per_thread,
       unplaced_ex_factory=unplaced_ex_factory,
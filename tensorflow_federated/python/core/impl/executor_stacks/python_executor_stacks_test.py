@@ -427,6 +427,21 @@ class UnplacedExecutorFactoryTest(parameterized.TestCase):
     unplaced_executor = unplaced_factory.create_executor()
     self.assertIsInstance(unplaced_executor, executor_base.Executor)
 
+  def test_create_executor_shares_tf_function_cache(self):
+    cache = eager_tf_executor.TFFunctionCache()
+    unplaced_factory = python_executor_stacks.UnplacedExecutorFactory(
+        tf_function_cache=cache)
+    comp, comp_type = executor_test_utils.create_whimsy_computation_tensorflow_identity(
+    )
+
+    for placement in [placements.SERVER, placements.CLIENTS]:
+      unplaced_executor = unplaced_factory.create_executor(placement=placement)
+      asyncio.run(unplaced_executor.create_value(comp, comp_type))
+
+    self.assertIs(unplaced_factory.tf_function_cache, cache)
+    self.assertEqual(cache.stats.misses, 1)
+    self.assertEqual(cache.stats.hits, 1)
+
 
 class FederatingExecutorFactoryTest(absltest.TestCase):
 
@@ -18,12 +18,16 @@
 # information.
 """A simple executor that operates synchronously in eager TensorFlow mode."""
 
-from collections.abc import Iterable, MutableMapping
+import collections
+from collections.abc import Hashable, Iterable, Iterator, MutableMapping
+import hashlib
 import itertools
+import threading
 from typing import Any, Optional
 import uuid
 
 from absl import logging
+import attr
 import cachetools
 import tensorflow as tf
 
@@ -46,6 +50,9 @@ from tensorflow_federated.python.core.impl.utils import tensorflow_utils
 
 # Cache size here is simply heuristic, no formal analysis.
 _TF_FUNCTION_CACHE_SIZE = 100
+# The number of `pb.Computation` fingerprints to remember. Each entry holds a
+# reference to the fingerprinted proto, so this is deliberately small.
+_FINGERPRINT_CACHE_SIZE = 100
 
 
 def _all_graph_def_nodes(
@@ -382,34 +389,187 @@ def embed_tensorflow_computation(comp, type_spec=None, device=None):
     return lambda: fn_to_return(None)
 
 
+@attr.s(auto_attribs=True, eq=False, order=False, frozen=True)
+class TFFunctionCacheStats:
+  """Usage statistics of a `TFFunctionCache`.
+
+  Attributes:
+    hits: The number of lookups which found an entry.
+    misses: The number of lookups which did not find an entry.
+    evictions: The number of entries evicted to stay within budget.
+    entries: The current number of entries.
+    size_bytes: The current total size of the entries, measured as the size of
+      the `pb.Computation`s from which they were embedded.
+  """
+  hits: int
+  misses: int
+  evictions: int
+  entries: int
+  size_bytes: int
+
+
+class TFFunctionCache(MutableMapping[Hashable, Any]):
+  """A thread-safe LRU cache of embedded TensorFlow functions.
+
+  The cache is bounded by a number of entries, a number of bytes, or both. The
+  size of an entry is the size of the `pb.Computation` it was embedded from, as
+  passed to `put`; entries added via `__setitem__` have size zero. When a bound
+  is exceeded the least recently used entries are evicted.
+
+  A single cache may be shared by several `EagerTFExecutor`s, for example all
+  the leaf executors constructed by an executor factory, in which case `stats`
+  reports their combined usage.
+  """
+
+  def __init__(self,
+               max_entries: Optional[int] = _TF_FUNCTION_CACHE_SIZE,
+               max_bytes: Optional[int] = None):
+    """Initializes a `TFFunctionCache`.
+
+    Args:
+      max_entries: An optional maximum number of entries.
+      max_bytes: An optional maximum total size of the entries in bytes.
+
+    Raises:
+      ValueError: If `max_entries` or `max_bytes` is not positive.
+    """
+    if max_entries is not None:
+      py_typecheck.check_type(max_entries, int)
+      if max_entries <= 0:
+        raise ValueError(
+            f'Expected `max_entries` to be positive, found {max_entries}.')
+    if max_bytes is not None:
+      py_typecheck.check_type(max_bytes, int)
+      if max_bytes <= 0:
+        raise ValueError(
+            f'Expected `max_bytes` to be positive, found {max_bytes}.')
+    self._max_entries = max_entries
+    self._max_bytes = max_bytes
+    self._entries = collections.OrderedDict()
+    self._lock = threading.Lock()
+    self._size_bytes = 0
+    self._hits = 0
+    self._misses = 0
+    self._evictions = 0
+
+  @property
+  def stats(self) -> TFFunctionCacheStats:
+    with self._lock:
+      return TFFunctionCacheStats(
+          hits=self._hits,
+          misses=self._misses,
+          evictions=self._evictions,
+          entries=len(self._entries),
+          size_bytes=self._size_bytes)
+
+  def __getitem__(self, key: Hashable) -> Any:
+    with self._lock:
+      try:
+        value, _ = self._entries[key]
+      except KeyError:
+        self._misses += 1
+        raise
+      self._entries.move_to_end(key)
+      self._hits += 1
+      return value
+
+  def __setitem__(self, key: Hashable, value: Any):
+    self.put(key, value, size_bytes=0)
+
+  def put(self, key: Hashable, value: Any, size_bytes: int):
+    """Adds `value` of size `size_bytes` under `key`, evicting as needed."""
+    with self._lock:
+      self._remove(key)
+      self._entries[key] = (value, size_bytes)
+      self._size_bytes += size_bytes
+      while self._entries and self._is_over_budget():
+        evicted_key = next(iter(self._entries))
+        self._remove(evicted_key)
+        self._evictions += 1
+
+  def _is_over_budget(self) -> bool:
+    return ((self._max_entries is not None and
+             len(self._entries) > self._max_entries) or
+            (self._max_bytes is not None and
+             self._size_bytes > self._max_bytes))
+
+  def _remove(self, key: Hashable):
+    entry = self._entries.pop(key, None)
+    if entry is not None:
+      _, size_bytes = entry
+      self._size_bytes -= size_bytes
+
+  def __delitem__(self, key: Hashable):
+    with self._lock:
+      if key not in self._entries:
+        raise KeyError(key)
+      self._remove(key)
+
+  def __iter__(self) -> Iterator[Hashable]:
+    with self._lock:
+      return iter(list(self._entries))
+
+  def __len__(self) -> int:
+    with self._lock:
+      return len(self._entries)
+
+
+_fingerprint_cache = cachetools.LRUCache(_FINGERPRINT_CACHE_SIZE)
+_fingerprint_cache_lock = threading.Lock()
+
+
+def _get_computation_fingerprint(value: pb.Computation) -> bytes:
+  """Returns a fingerprint of `value`, computed once per proto object.
+
+  Protos are not hashable, so fingerprints are remembered by object identity.
+  The cache holds a reference to each fingerprinted proto, which guarantees that
+  its identity is not reused while the entry exists.
+
+  Args:
+    value: A `pb.Computation`, which must not be mutated after being
+      fingerprinted.
+  """
+  with _fingerprint_cache_lock:
+    entry = _fingerprint_cache.get(id(value))
+  if entry is not None and entry[0] is value:
+    return entry[1]
+  fingerprint = hashlib.sha256(
+      value.SerializeToString(deterministic=True)).digest()
+  with _fingerprint_cache_lock:
+    _fingerprint_cache[id(value)] = (value, fingerprint)
+  return fingerprint
+
+
 @tracing.trace
 def _to_computation_internal_rep(*, value: pb.Computation,
-                                 tf_function_cache: MutableMapping[str, Any],
+                                 tf_function_cache: MutableMapping[Hashable,
+                                                                   Any],
                                  type_spec: computation_types.StructType,
                                  device: tf.config.LogicalDevice):
   """Converts a `pb.Computation` to a `tf.function`."""
   if value.tensorflow.cache_key.id:
     logging.debug('Using value id for cache key: %s',
                   value.tensorflow.cache_key.id)
-    key = (value.tensorflow.cache_key.id,
-           type_serialization.serialize_type(type_spec).SerializeToString(
-               deterministic=True), device.name if device else None)
+    key = (value.tensorflow.cache_key.id, type_spec,
+           device.name if device else None)
   else:
-    logging.debug('Using hash of graph_def for cache key')
-    key = (value.SerializeToString(deterministic=True),
-           type_serialization.serialize_type(type_spec).SerializeToString(
-               deterministic=True), device.name if device else None)
+    logging.debug('Using fingerprint of computation for cache key')
+    key = (_get_computation_fingerprint(value), type_spec,
+           device.name if device else None)
   cached_fn = tf_function_cache.get(key)
   if cached_fn is not None:
     return cached_fn
   embedded_fn = embed_tensorflow_computation(value, type_spec, device)
-  tf_function_cache[key] = embedded_fn
+  if isinstance(tf_function_cache, TFFunctionCache):
+    tf_function_cache.put(key, embedded_fn, size_bytes=value.ByteSize())
+  else:
+    tf_function_cache[key] = embedded_fn
   return embedded_fn
 
 
 @tracing.trace
 def _to_struct_internal_rep(
-    *, value: Any, tf_function_cache: MutableMapping[str, Any],
+    *, value: Any, tf_function_cache: MutableMapping[Hashable, Any],
     type_spec: computation_types.StructType,
     device: tf.config.LogicalDevice) -> structure.Struct:
   """Converts a python container to internal representation for TF executor."""
@@ -473,7 +633,7 @@ def _to_sequence_internal_rep(
 @tracing.trace
 def to_representation_for_type(
     value: Any,
-    tf_function_cache: MutableMapping[str, Any],
+    tf_function_cache: MutableMapping[Hashable, Any],
     type_spec: Optional[computation_types.Type] = None,
     device: Optional[tf.config.LogicalDevice] = None) -> Any:
   """Verifies or converts the `value` to an eager object matching `type_spec`.
@@ -623,7 +783,9 @@ class EagerTFExecutor(executor_base.Executor):
   other methods this executor exposes.
   """
 
-  def __init__(self, device=None):
+  def __init__(self,
+               device=None,
+               tf_function_cache: Optional[TFFunctionCache] = None):
     """Creates a new instance of an eager executor.
 
     Args:
@@ -631,6 +793,9 @@ class EagerTFExecutor(executor_base.Executor):
         schedule all of its operations to run on. For example, the list of
         logical devices can be obtained using
         `tf.config.list_logical_devices()`.
+      tf_function_cache: An optional `TFFunctionCache` in which to cache
+        embedded TensorFlow functions, which may be shared with other executors.
+        If `None`, this executor uses its own cache with the default budget.
 
     Raises:
       RuntimeError: If not executing eagerly.
@@ -644,7 +809,15 @@ class EagerTFExecutor(executor_base.Executor):
       self._device = device
     else:
       self._device = None
-    self._tf_function_cache = cachetools.LRUCache(_TF_FUNCTION_CACHE_SIZE)
+    if tf_function_cache is not None:
+      py_typecheck.check_type(tf_function_cache, TFFunctionCache)
+    else:
+      tf_function_cache = TFFunctionCache()
+    self._tf_function_cache = tf_function_cache
+
+  @property
+  def tf_function_cache(self) -> TFFunctionCache:
+    return self._tf_function_cache
 
   @tracing.trace(span=True)
   async def create_value(self, value, type_spec=None):
@@ -768,6 +768,86 @@ class EagerTFExecutorTest(tf.test.TestCase, parameterized.TestCase):
     self.assertCountEqual([x.numpy() for x in val.internal_representation],
                           [2, 5, 10])
 
+  def test_executor_create_value_computation_hits_tf_function_cache(self):
+    cache = eager_tf_executor.TFFunctionCache()
+    ex = eager_tf_executor.EagerTFExecutor(tf_function_cache=cache)
+
+    @tensorflow_computation.tf_computation
+    def comp():
+      return 1000
+
+    comp_proto = computation_impl.ConcreteComputation.get_proto(comp)
+    comp_type = computation_types.FunctionType(None, tf.int32)
+    first_val = asyncio.run(ex.create_value(comp_proto, comp_type))
+    second_val = asyncio.run(ex.create_value(comp_proto, comp_type))
+
+    self.assertIs(first_val.internal_representation,
+                  second_val.internal_representation)
+    self.assertEqual(cache.stats.misses, 1)
+    self.assertEqual(cache.stats.hits, 1)
+    self.assertEqual(cache.stats.entries, 1)
+    self.assertEqual(cache.stats.size_bytes, comp_proto.ByteSize())
+
+
+class TFFunctionCacheTest(parameterized.TestCase):
+
+  def test_get_counts_hits_and_misses(self):
+    cache = eager_tf_executor.TFFunctionCache()
+    cache['a'] = 1
+
+    self.assertEqual(cache.get('a'), 1)
+    self.assertIsNone(cache.get('b'))
+    self.assertEqual(cache.stats.hits, 1)
+    self.assertEqual(cache.stats.misses, 1)
+
+  def test_evicts_least_recently_used_entry_with_max_entries(self):
+    cache = eager_tf_executor.TFFunctionCache(max_entries=2)
+    cache['a'] = 1
+    cache['b'] = 2
+    cache.get('a')
+
+    cache['c'] = 3
+
+    self.assertCountEqual(list(cache), ['a', 'c'])
+    self.assertEqual(cache.stats.evictions, 1)
+
+  def test_evicts_least_recently_used_entries_with_max_bytes(self):
+    cache = eager_tf_executor.TFFunctionCache(max_entries=None, max_bytes=10)
+    cache.put('a', 1, size_bytes=4)
+    cache.put('b', 2, size_bytes=4)
+
+    cache.put('c', 3, size_bytes=8)
+
+    self.assertCountEqual(list(cache), ['c'])
+    self.assertEqual(cache.stats.evictions, 2)
+    self.assertEqual(cache.stats.size_bytes, 8)
+
+  def test_does_not_retain_entry_larger_than_max_bytes(self):
+    cache = eager_tf_executor.TFFunctionCache(max_bytes=10)
+
+    cache.put('a', 1, size_bytes=11)
+
+    self.assertEmpty(cache)
+    self.assertEqual(cache.stats.size_bytes, 0)
+
+  def test_put_replaces_existing_entry(self):
+    cache = eager_tf_executor.TFFunctionCache()
+    cache.put('a', 1, size_bytes=4)
+
+    cache.put('a', 2, size_bytes=6)
+
+    self.assertEqual(cache['a'], 2)
+    self.assertEqual(cache.stats.entries, 1)
+    self.assertEqual(cache.stats.size_bytes, 6)
+
+  @parameterized.named_parameters(
+      ('max_entries', dict(max_entries=0)),
+      ('max_bytes', dict(max_bytes=0)),
+  )
+  def test_raises_value_error_with_non_positive_budget(self, kwargs):
+    with self.assertRaises(ValueError):
+      eager_tf_executor.TFFunctionCache(**kwargs)
+
 
 if __name__ == '__main__':
   tf.test.main()
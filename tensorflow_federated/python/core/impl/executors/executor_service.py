@@ -20,6 +20,7 @@
 
 import asyncio
 import collections
+from collections.abc import Iterator
 import contextlib
 import functools
 import threading
@@ -215,11 +216,47 @@ class ExecutorService(executor_pb2_grpc.ExecutorGroupServicer):
     py_typecheck.check_type(request, executor_pb2.CreateValueRequest)
     with self._try_handle_request_context(request, context,
                                           executor_pb2.CreateValueResponse):
-      with tracing.span('ExecutorService.CreateValue', 'deserialize_value'):
-        value, value_type = (
-            value_serialization.deserialize_value(request.value))
       value_id = str(uuid.uuid4())
-      coro = self.executor(request, context).create_value(value, value_type)
+      self._create_value(request, context, value_id)
+      return executor_pb2.CreateValueResponse(
+          value_ref=executor_pb2.ValueRef(id=value_id))
+
+  def _create_value(self, request: executor_pb2.CreateValueRequest,
+                    context: grpc.ServicerContext, value_id: str):
+    """Creates the value in `request` and stores it under `value_id`."""
+    with tracing.span('ExecutorService.CreateValue', 'deserialize_value'):
+      value, value_type = value_serialization.deserialize_value(request.value)
+    coro = self.executor(request, context).create_value(value, value_type)
+    future_val = self._run_coro_threadsafe_with_tracing(coro)
+    with self._lock:
+      self._values[value_id] = future_val
+
+  def CreateValueStream(
+      self,
+      request_iterator: Iterator[executor_pb2.CreateValueStreamRequest],
+      context: grpc.ServicerContext,
+  ) -> executor_pb2.CreateValueResponse:
+    """Creates a value embedded in the executor from a stream of chunks."""
+    request = next(request_iterator, executor_pb2.CreateValueStreamRequest())
+    py_typecheck.check_type(request, executor_pb2.CreateValueStreamRequest)
+    with self._try_handle_request_context(request, context,
+                                          executor_pb2.CreateValueResponse):
+      # Resolve the executor before receiving the rest of the stream, so that
+      # an unknown executor fails fast.
+      executor = self.executor(request, context)
+
+      def chunks():
+        if request.HasField('chunk'):
+          yield request.chunk
+        for next_request in request_iterator:
+          yield next_request.chunk
+
+      with tracing.span('ExecutorService.CreateValueStream',
+                        'deserialize_value_chunks'):
+        value, value_type = value_serialization.deserialize_value_chunks(
+            chunks())
+      value_id = str(uuid.uuid4())
+      coro = executor.create_value(value, value_type)
       future_val = self._run_coro_threadsafe_with_tracing(coro)
       with self._lock:
         self._values[value_id] = future_val
@@ -235,27 +272,32 @@ class ExecutorService(executor_pb2_grpc.ExecutorGroupServicer):
     py_typecheck.check_type(request, executor_pb2.CreateCallRequest)
     with self._try_handle_request_context(request, context,
                                           executor_pb2.CreateCallResponse):
-      function_id = str(request.function_ref.id)
-      argument_id = str(request.argument_ref.id)
-      with self._lock:
-        function_val = self._values[function_id]
-        argument_val = self._values[argument_id] if argument_id else None
-
-      async def _process_create_call():
-        function = await asyncio.wrap_future(function_val)
-        argument = await asyncio.wrap_future(
-            argument_val) if argument_val is not None else None
-        return await self.executor(request,
-                                   context).create_call(function, argument)
-
-      coro = _process_create_call()
-      result_fut = self._run_coro_threadsafe_with_tracing(coro)
       result_id = str(uuid.uuid4())
-      with self._lock:
-        self._values[result_id] = result_fut
+      self._create_call(request, context, result_id)
       return executor_pb2.CreateCallResponse(
           value_ref=executor_pb2.ValueRef(id=result_id))
 
+  def _create_call(self, request: executor_pb2.CreateCallRequest,
+                   context: grpc.ServicerContext, result_id: str):
+    """Creates the call in `request` and stores it under `result_id`."""
+    function_id = str(request.function_ref.id)
+    argument_id = str(request.argument_ref.id)
+    with self._lock:
+      function_val = self._values[function_id]
+      argument_val = self._values[argument_id] if argument_id else None
+
+    async def _process_create_call():
+      function = await asyncio.wrap_future(function_val)
+      argument = await asyncio.wrap_future(
+          argument_val) if argument_val is not None else None
+      return await self.executor(request,
+                                 context).create_call(function, argument)
+
+    coro = _process_create_call()
+    result_fut = self._run_coro_threadsafe_with_tracing(coro)
+    with self._lock:
+      self._values[result_id] = result_fut
+
   def CreateStruct(
       self,
       request: executor_pb2.CreateStructRequest,
@@ -265,27 +307,32 @@ class ExecutorService(executor_pb2_grpc.ExecutorGroupServicer):
     py_typecheck.check_type(request, executor_pb2.CreateStructRequest)
     with self._try_handle_request_context(request, context,
                                           executor_pb2.CreateStructResponse):
-      with self._lock:
-        elem_futures = [self._values[e.value_ref.id] for e in request.element]
-      elem_names = [
-          str(elem.name) if elem.name else None for elem in request.element
-      ]
-
-      async def _process_create_struct():
-        elem_values = await asyncio.gather(
-            *[asyncio.wrap_future(v) for v in elem_futures])
-        elements = list(zip(elem_names, elem_values))
-        struct = structure.Struct(elements)
-        return await self.executor(request, context).create_struct(struct)
-
-      result_fut = self._run_coro_threadsafe_with_tracing(
-          _process_create_struct())
       result_id = str(uuid.uuid4())
-      with self._lock:
-        self._values[result_id] = result_fut
+      self._create_struct(request, context, result_id)
       return executor_pb2.CreateStructResponse(
           value_ref=executor_pb2.ValueRef(id=result_id))
 
+  def _create_struct(self, request: executor_pb2.CreateStructRequest,
+                     context: grpc.ServicerContext, result_id: str):
+    """Creates the struct in `request` and stores it under `result_id`."""
+    with self._lock:
+      elem_futures = [self._values[e.value_ref.id] for e in request.element]
+    elem_names = [
+        str(elem.name) if elem.name else None for elem in request.element
+    ]
+
+    async def _process_create_struct():
+      elem_values = await asyncio.gather(
+          *[asyncio.wrap_future(v) for v in elem_futures])
+      elements = list(zip(elem_names, elem_values))
+      struct = structure.Struct(elements)
+      return await self.executor(request, context).create_struct(struct)
+
+    result_fut = self._run_coro_threadsafe_with_tracing(
+        _process_create_struct())
+    with self._lock:
+      self._values[result_id] = result_fut
+
   def CreateSelection(
       self,
       request: executor_pb2.CreateSelectionRequest,
@@ -295,22 +342,59 @@ class ExecutorService(executor_pb2_grpc.ExecutorGroupServicer):
     py_typecheck.check_type(request, executor_pb2.CreateSelectionRequest)
     with self._try_handle_request_context(request, context,
                                           executor_pb2.CreateSelectionResponse):
-      with self._lock:
-        source_fut = self._values[request.source_ref.id]
-
-      async def _process_create_selection():
-        source = await asyncio.wrap_future(source_fut)
-        return await self.executor(request, context).create_selection(
-            source, request.index)
-
-      result_fut = self._run_coro_threadsafe_with_tracing(
-          _process_create_selection())
       result_id = str(uuid.uuid4())
-      with self._lock:
-        self._values[result_id] = result_fut
+      self._create_selection(request, context, result_id)
       return executor_pb2.CreateSelectionResponse(
           value_ref=executor_pb2.ValueRef(id=result_id))
 
+  def _create_selection(self, request: executor_pb2.CreateSelectionRequest,
+                        context: grpc.ServicerContext, result_id: str):
+    """Creates the selection in `request` and stores it under `result_id`."""
+    with self._lock:
+      source_fut = self._values[request.source_ref.id]
+
+    async def _process_create_selection():
+      source = await asyncio.wrap_future(source_fut)
+      return await self.executor(request, context).create_selection(
+          source, request.index)
+
+    result_fut = self._run_coro_threadsafe_with_tracing(
+        _process_create_selection())
+    with self._lock:
+      self._values[result_id] = result_fut
+
+  def ExecuteBatch(
+      self,
+      request: executor_pb2.ExecuteBatchRequest,
+      context: grpc.ServicerContext,
+  ) -> executor_pb2.ExecuteBatchResponse:
+    """Performs a batch of operations creating values in the executor."""
+    py_typecheck.check_type(request, executor_pb2.ExecuteBatchRequest)
+    with self._try_handle_request_context(request, context,
+                                          executor_pb2.ExecuteBatchResponse):
+      for operation in request.operation:
+        result_id = str(operation.result_ref.id)
+        if not result_id:
+          raise ValueError('Expected every operation in a batch to have a '
+                           '`result_ref`.')
+        with self._lock:
+          if result_id in self._values:
+            raise ValueError(f'A value with id {result_id} already exists.')
+        which_operation = operation.WhichOneof('operation')
+        if which_operation is None:
+          raise ValueError('Expected every operation in a batch to be set.')
+        operation_request = getattr(operation, which_operation)
+        operation_request.executor.CopyFrom(request.executor)
+        if which_operation == 'create_value':
+          self._create_value(operation_request, context, result_id)
+        elif which_operation == 'create_call':
+          self._create_call(operation_request, context, result_id)
+        elif which_operation == 'create_struct':
+          self._create_struct(operation_request, context, result_id)
+        elif which_operation == 'create_selection':
+          self._create_selection(operation_request, context, result_id)
+      return executor_pb2.ExecuteBatchResponse()
+
   def Compute(
       self,
       request: executor_pb2.ComputeRequest,
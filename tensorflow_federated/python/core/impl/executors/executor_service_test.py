@@ -18,6 +18,7 @@ from unittest import mock
 from absl.testing import absltest
 import grpc
 from grpc.framework.foundation import logging_pool
+import numpy as np
 import portpicker
 import tensorflow as tf
 
@@ -32,6 +33,7 @@ from tensorflow_federated.python.core.impl.executors import executor_test_utils
 from tensorflow_federated.python.core.impl.executors import executor_value_base
 from tensorflow_federated.python.core.impl.executors import value_serialization
 from tensorflow_federated.python.core.impl.tensorflow_context import tensorflow_computation
+from tensorflow_federated.python.core.impl.types import computation_types
 from tensorflow_federated.python.core.impl.types import placements
 
 
@@ -163,6 +165,25 @@ class ExecutorServiceTest(absltest.TestCase):
     self.assertEqual(value, 10.0)
     del env
 
+  def test_executor_service_create_tensor_value_stream(self):
+    ex_factory = executor_test_utils.BasicTestExFactory(
+        eager_tf_executor.EagerTFExecutor())
+    env = TestEnv(ex_factory)
+    x = np.arange(1000, dtype=np.float32)
+    value_proto, _ = value_serialization.serialize_value(
+        x, computation_types.TensorType(tf.float32, [1000]))
+    chunks = value_serialization.split_value_into_chunks(value_proto, 100)
+    requests = [
+        executor_pb2.CreateValueStreamRequest(
+            executor=env.executor_pb, chunk=chunk) for chunk in chunks
+    ]
+    response = env.stub.CreateValueStream(iter(requests))
+    self.assertIsInstance(response, executor_pb2.CreateValueResponse)
+    value_id = str(response.value_ref.id)
+    value = env.get_value(value_id)
+    np.testing.assert_array_equal(value, x)
+    del env
+
   def test_executor_service_create_no_arg_computation_value_and_call(self):
     ex_factory = executor_test_utils.BasicTestExFactory(
         eager_tf_executor.EagerTFExecutor())
@@ -186,6 +207,57 @@ class ExecutorServiceTest(absltest.TestCase):
     self.assertEqual(value, 10)
     del env
 
+  def test_executor_service_execute_batch_with_dependent_operations(self):
+    ex_factory = executor_test_utils.BasicTestExFactory(
+        eager_tf_executor.EagerTFExecutor())
+    env = TestEnv(ex_factory)
+
+    @tensorflow_computation.tf_computation(tf.int32)
+    def comp(x):
+      return tf.add(x, 1)
+
+    comp_proto, _ = value_serialization.serialize_value(comp)
+    arg_proto, _ = value_serialization.serialize_value(10, tf.int32)
+    comp_ref = executor_pb2.ValueRef(id='comp')
+    arg_ref = executor_pb2.ValueRef(id='arg')
+    result_ref = executor_pb2.ValueRef(id='result')
+    request = executor_pb2.ExecuteBatchRequest(
+        executor=env.executor_pb,
+        operation=[
+            executor_pb2.ExecuteBatchRequest.Operation(
+                result_ref=comp_ref,
+                create_value=executor_pb2.CreateValueRequest(
+                    value=comp_proto)),
+            executor_pb2.ExecuteBatchRequest.Operation(
+                result_ref=arg_ref,
+                create_value=executor_pb2.CreateValueRequest(value=arg_proto)),
+            executor_pb2.ExecuteBatchRequest.Operation(
+                result_ref=result_ref,
+                create_call=executor_pb2.CreateCallRequest(
+                    function_ref=comp_ref, argument_ref=arg_ref)),
+        ])
+    response = env.stub.ExecuteBatch(request)
+    self.assertIsInstance(response, executor_pb2.ExecuteBatchResponse)
+    value = env.get_value(result_ref.id)
+    self.assertEqual(value, 11)
+    del env
+
+  def test_executor_service_execute_batch_with_existing_ref_fails(self):
+    ex_factory = executor_test_utils.BasicTestExFactory(
+        eager_tf_executor.EagerTFExecutor())
+    env = TestEnv(ex_factory)
+    value_proto, _ = value_serialization.serialize_value(10, tf.int32)
+    operation = executor_pb2.ExecuteBatchRequest.Operation(
+        result_ref=executor_pb2.ValueRef(id='value'),
+        create_value=executor_pb2.CreateValueRequest(value=value_proto))
+    request = executor_pb2.ExecuteBatchRequest(
+        executor=env.executor_pb, operation=[operation, operation])
+    with self.assertRaises(grpc.RpcError) as context:
+      env.stub.ExecuteBatch(request)
+    self.assertEqual(context.exception.code(),
+                     grpc.StatusCode.INVALID_ARGUMENT)
+    del env
+
   def test_executor_service_value_unavailable_after_dispose(self):
     ex_factory = executor_test_utils.BasicTestExFactory(
         eager_tf_executor.EagerTFExecutor())
@@ -47,7 +47,7 @@
 """
 
 import asyncio
-from typing import Any
+from typing import Any, Optional
 
 from absl import logging
 import tensorflow as tf
@@ -143,6 +143,13 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
 
   Note that this strategy does not have a built-in concept of intermediate
   aggregation, partitioning placements, clustering clients, etc.
+
+  By default, reductions (e.g. `tff.federated_sum`, `tff.federated_aggregate`)
+  move every client value to the server and fold them one at a time. If
+  `reduction_arity` is set, reductions which have a merge operator available
+  instead accumulate each client value on its own executor and merge the
+  partial results in a tree with fan-in `reduction_arity`, running all merges
+  at a given level of the tree concurrently on the client executors.
   """
 
   @classmethod
@@ -150,12 +157,14 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
               target_executors: dict[str, executor_base.Executor],
               local_computation_factory: local_computation_factory_base
               .LocalComputationFactory = tensorflow_computation_factory
-              .TensorFlowComputationFactory()):
+              .TensorFlowComputationFactory(),
+              reduction_arity: Optional[int] = None):
     # pylint:disable=g-long-lambda
     return lambda executor: cls(
         executor,
         target_executors,
-        local_computation_factory=local_computation_factory)
+        local_computation_factory=local_computation_factory,
+        reduction_arity=reduction_arity)
     # pylint:enable=g-long-lambda
 
   def __init__(self,
@@ -163,7 +172,8 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
                target_executors: dict[str, executor_base.Executor],
                local_computation_factory: local_computation_factory_base
                .LocalComputationFactory = tensorflow_computation_factory
-               .TensorFlowComputationFactory()):
+               .TensorFlowComputationFactory(),
+               reduction_arity: Optional[int] = None):
     """Creates a `FederatedResolvingStrategy`.
 
     Args:
@@ -178,6 +188,11 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
         to construct local computations used as parameters in certain federated
         operators (such as `tff.federated_sum`, etc.). Defaults to a TensorFlow
         computation factory that generates TensorFlow code.
+      reduction_arity: An optional integer greater than 1. If specified,
+        reductions with an available merge operator are computed as a tree of
+        merges with this fan-in on the client executors, rather than as a
+        sequential fold on the server. If `None` (the default), all reductions
+        are sequential folds on the server.
 
     Raises:
       TypeError: If `target_executors` is not a `dict`, where each key is a
@@ -185,15 +200,22 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
         `executor_base.Executor` or a list of `executor_base.Executor`s.
       ValueError: If `target_executors` contains a
         `placements.PlacementLiteral` key that is not a kind supported
-        by the `FederatedResolvingStrategy`.
+        by the `FederatedResolvingStrategy`, or if `reduction_arity` is less
+        than 2.
     """
     super().__init__(executor)
     py_typecheck.check_type(target_executors, dict)
     py_typecheck.check_type(
         local_computation_factory,
         local_computation_factory_base.LocalComputationFactory)
+    if reduction_arity is not None:
+      py_typecheck.check_type(reduction_arity, int)
+      if reduction_arity < 2:
+        raise ValueError('Expected `reduction_arity` to be greater than 1, '
+                         f'found {reduction_arity}.')
     self._target_executors = {}
     self._local_computation_factory = local_computation_factory
+    self._reduction_arity = reduction_arity
     for k, v in target_executors.items():
       if k is not None:
         py_typecheck.check_type(k, placements.PlacementLiteral)
@@ -395,21 +417,23 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
     val_type, zero_type, accumulate_type, merge_type, report_type = (
         executor_utils.parse_federated_aggregate_argument_types(
             arg.type_signature))
-    del val_type, merge_type
+    del val_type
     py_typecheck.check_type(arg.internal_representation, structure.Struct)
     py_typecheck.check_len(arg.internal_representation, 5)
     val, zero, accumulate, merge, report = arg.internal_representation
 
-    # Discard `merge`. Since all aggregation happens on a single executor,
-    # there's no need for this additional layer.
-    del merge
-
     # Re-wrap `zero` in a `FederatingResolvingStrategyValue` to ensure that it
     # is an `ExecutorValue` rather than a `Struct` (since the internal
     # representation can include embedded values, lists of embedded values
     # (in the case of federated values), or `Struct`s.
     zero = FederatedResolvingStrategyValue(zero, zero_type)
-    pre_report = await self.reduce(val, zero, accumulate, accumulate_type)
+    pre_report = await self.reduce(
+        val,
+        zero,
+        accumulate,
+        accumulate_type,
+        merge=merge,
+        merge_type=merge_type)
 
     py_typecheck.check_type(pre_report.type_signature,
                             computation_types.FederatedType)
@@ -497,7 +521,29 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
       zero: executor_value_base.ExecutorValue,
       op: pb.Computation,
       op_type: computation_types.FunctionType,
+      merge: Optional[pb.Computation] = None,
+      merge_type: Optional[computation_types.FunctionType] = None,
   ) -> FederatedResolvingStrategyValue:
+    """Reduces the client values in `val` to a single value at the server.
+
+    Args:
+      val: A list of values embedded in the client executors, one per client.
+      zero: The initial value of the reduction.
+      op: A computation accumulating a single client value into a partial
+        result.
+      op_type: The type signature of `op`.
+      merge: An optional computation merging two partial results. If specified
+        and this strategy was configured with a `reduction_arity`, the
+        reduction is computed as a tree of merges on the client executors.
+      merge_type: The type signature of `merge`.
+
+    Returns:
+      A `FederatedResolvingStrategyValue` placed at the server.
+    """
+    if (self._reduction_arity is not None and merge is not None and val and
+        len(val) == len(self._target_executors[placements.CLIENTS])):
+      return await self._tree_reduce(val, zero, op, op_type, merge, merge_type)
+
     server = self._target_executors[placements.SERVER][0]
 
     async def _move(v):
@@ -520,6 +566,72 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
                                                placements.SERVER,
                                                all_equal=True))
 
+  @tracing.trace
+  async def _tree_reduce(
+      self,
+      val: list[executor_value_base.ExecutorValue],
+      zero: executor_value_base.ExecutorValue,
+      accumulate: pb.Computation,
+      accumulate_type: computation_types.FunctionType,
+      merge: pb.Computation,
+      merge_type: computation_types.FunctionType,
+  ) -> FederatedResolvingStrategyValue:
+    """Reduces `val` by merging partial results in a tree.
+
+    Each client value is first accumulated into `zero` on the executor which
+    holds it. The partial results are then merged `self._reduction_arity` at a
+    time on the executor holding the first partial result of each group, with
+    all groups at a given level of the tree being merged concurrently. The
+    final partial result is moved to the server.
+    """
+    children = self._target_executors[placements.CLIENTS]
+    zero_value = await zero.compute()
+
+    async def _accumulate(child, value):
+      accumulate_at_child, zero_at_child = await asyncio.gather(
+          child.create_value(accumulate, accumulate_type),
+          child.create_value(zero_value, zero.type_signature))
+      accumulate_arg = await child.create_struct(
+          structure.Struct([(None, zero_at_child), (None, value)]))
+      return child, await child.create_call(accumulate_at_child,
+                                            accumulate_arg)
+
+    async def _move(child, value_child, value):
+      if value_child is child:
+        return value
+      return await child.create_value(await value.compute(),
+                                      value.type_signature)
+
+    async def _merge(group):
+      child, result = group[0]
+      merge_at_child, *items = await asyncio.gather(
+          child.create_value(merge, merge_type),
+          *[_move(child, c, v) for c, v in group[1:]])
+      for item in items:
+        result = await child.create_call(
+            merge_at_child, await child.create_struct(
+                structure.Struct([(None, result), (None, item)])))
+      return child, result
+
+    partials = await asyncio.gather(
+        *[_accumulate(child, value) for child, value in zip(children, val)])
+    while len(partials) > 1:
+      groups = [
+          partials[i:i + self._reduction_arity]
+          for i in range(0, len(partials), self._reduction_arity)
+      ]
+      partials = await asyncio.gather(*[_merge(group) for group in groups])
+    _, result = partials[0]
+
+    server = self._target_executors[placements.SERVER][0]
+    result_at_server = await server.create_value(await result.compute(),
+                                                 result.type_signature)
+    return FederatedResolvingStrategyValue([result_at_server],
+                                           computation_types.FederatedType(
+                                               result_at_server.type_signature,
+                                               placements.SERVER,
+                                               all_equal=True))
+
   @tracing.trace
   async def compute_federated_secure_sum_bitwidth(
       self,
@@ -618,8 +730,13 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
             self._executor,
             arg.type_signature.member,
             local_computation_factory=self._local_computation_factory))
-    return await self.reduce(arg.internal_representation, zero,
-                             plus.internal_representation, plus.type_signature)
+    return await self.reduce(
+        arg.internal_representation,
+        zero,
+        plus.internal_representation,
+        plus.type_signature,
+        merge=plus.internal_representation,
+        merge_type=plus.type_signature)
 
   @tracing.trace
   async def compute_federated_value_at_clients(
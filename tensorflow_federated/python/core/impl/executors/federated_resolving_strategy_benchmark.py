@@ -0,0 +1,101 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for the reduction modes of `FederatedResolvingStrategy`.
+
+Run with `--benchmarks=.` to report the latency of a `tff.federated_sum` for a
+range of client counts, comparing the sequential fold on the server with the
+tree reduction on the client executors.
+"""
+
+import asyncio
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from tensorflow_federated.python.core.impl.compiler import intrinsic_defs
+from tensorflow_federated.python.core.impl.executors import eager_tf_executor
+from tensorflow_federated.python.core.impl.executors import federated_resolving_strategy
+from tensorflow_federated.python.core.impl.executors import federating_executor
+from tensorflow_federated.python.core.impl.executors import reference_resolving_executor
+from tensorflow_federated.python.core.impl.types import computation_types
+from tensorflow_federated.python.core.impl.types import placements
+
+_NUMBER_OF_CLIENTS = (10, 100, 1000)
+_REDUCTION_ARITIES = (None, 2, 8)
+_TENSOR_SIZE = 10000
+_ITERS = 3
+
+
+def _create_executor(number_of_clients, reduction_arity):
+
+  def create_bottom_stack():
+    executor = eager_tf_executor.EagerTFExecutor()
+    return reference_resolving_executor.ReferenceResolvingExecutor(executor)
+
+  factory = federated_resolving_strategy.FederatedResolvingStrategy.factory(
+      {
+          placements.SERVER:
+              create_bottom_stack(),
+          placements.CLIENTS: [
+              create_bottom_stack() for _ in range(number_of_clients)
+          ],
+      },
+      reduction_arity=reduction_arity)
+  return federating_executor.FederatingExecutor(factory, create_bottom_stack())
+
+
+async def _federated_sum(executor, value, value_type):
+  comp_type = computation_types.FunctionType(
+      value_type, computation_types.at_server(value_type.member))
+  comp = await executor.create_value(intrinsic_defs.FEDERATED_SUM, comp_type)
+  arg = await executor.create_value(value, value_type)
+  result = await executor.create_call(comp, arg)
+  return await result.compute()
+
+
+class FederatedResolvingStrategyBenchmark(tf.test.Benchmark):
+
+  def benchmark_federated_sum(self):
+    value_type = computation_types.at_clients(
+        computation_types.TensorType(tf.float32, [_TENSOR_SIZE]))
+    for number_of_clients in _NUMBER_OF_CLIENTS:
+      value = [
+          np.ones([_TENSOR_SIZE], dtype=np.float32)
+          for _ in range(number_of_clients)
+      ]
+      for reduction_arity in _REDUCTION_ARITIES:
+        wall_times = []
+        for _ in range(_ITERS):
+          executor = _create_executor(number_of_clients, reduction_arity)
+          start_time = time.perf_counter()
+          asyncio.run(_federated_sum(executor, value, value_type))
+          wall_times.append(time.perf_counter() - start_time)
+          executor.close()
+        if reduction_arity is None:
+          mode = 'linear'
+        else:
+          mode = f'tree_{reduction_arity}'
+        self.report_benchmark(
+            iters=_ITERS,
+            wall_time=np.median(wall_times),
+            name=f'federated_sum_{mode}_{number_of_clients}_clients',
+            extras={
+                'number_of_clients': number_of_clients,
+                'min_wall_time': min(wall_times),
+            })
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -15,12 +15,35 @@
 import unittest
 
 from absl.testing import absltest
+from absl.testing import parameterized
 import tensorflow as tf
 
 from tensorflow_federated.python.common_libs import structure
 from tensorflow_federated.python.core.impl.executors import eager_tf_executor
+from tensorflow_federated.python.core.impl.executors import executor_test_utils
 from tensorflow_federated.python.core.impl.executors import federated_resolving_strategy
+from tensorflow_federated.python.core.impl.executors import federating_executor
+from tensorflow_federated.python.core.impl.executors import reference_resolving_executor
 from tensorflow_federated.python.core.impl.types import computation_types
+from tensorflow_federated.python.core.impl.types import placements
+
+
+def create_test_executor(number_of_clients: int = 3, reduction_arity=None):
+
+  def create_bottom_stack():
+    executor = eager_tf_executor.EagerTFExecutor()
+    return reference_resolving_executor.ReferenceResolvingExecutor(executor)
+
+  factory = federated_resolving_strategy.FederatedResolvingStrategy.factory(
+      {
+          placements.SERVER:
+              create_bottom_stack(),
+          placements.CLIENTS: [
+              create_bottom_stack() for _ in range(number_of_clients)
+          ],
+      },
+      reduction_arity=reduction_arity)
+  return federating_executor.FederatingExecutor(factory, create_bottom_stack())
 
 
 class FederatedResolvingStrategyValueComputeTest(
@@ -109,5 +132,80 @@ class FederatedResolvingStrategyValueComputeTest(
       await value.compute()
 
 
+class FederatedResolvingStrategyReduceTest(unittest.IsolatedAsyncioTestCase,
+                                           parameterized.TestCase):
+
+  # pyformat: disable
+  @parameterized.named_parameters(
+      ('linear_1_client', None, 1),
+      ('linear_5_clients', None, 5),
+      ('arity_2_1_client', 2, 1),
+      ('arity_2_5_clients', 2, 5),
+      ('arity_2_8_clients', 2, 8),
+      ('arity_3_5_clients', 3, 5),
+      ('arity_3_10_clients', 3, 10),
+  )
+  # pyformat: enable
+  async def test_federated_sum(self, reduction_arity, number_of_clients):
+    executor = create_test_executor(
+        number_of_clients=number_of_clients, reduction_arity=reduction_arity)
+    comp, comp_type = executor_test_utils.create_whimsy_intrinsic_def_federated_sum(
+    )
+    value, value_type = executor_test_utils.create_whimsy_value_at_clients(
+        number_of_clients)
+
+    comp = await executor.create_value(comp, comp_type)
+    arg = await executor.create_value(value, value_type)
+    result = await executor.create_call(comp, arg)
+
+    self.assertEqual(result.type_signature.compact_representation(),
+                     comp_type.result.compact_representation())
+    self.assertEqual(await result.compute(), sum(value))
+
+  # pyformat: disable
+  @parameterized.named_parameters(
+      ('linear_5_clients', None, 5),
+      ('arity_2_5_clients', 2, 5),
+      ('arity_4_9_clients', 4, 9),
+  )
+  # pyformat: enable
+  async def test_federated_aggregate(self, reduction_arity, number_of_clients):
+    executor = create_test_executor(
+        number_of_clients=number_of_clients, reduction_arity=reduction_arity)
+    comp, comp_type = executor_test_utils.create_whimsy_intrinsic_def_federated_aggregate(
+    )
+    value, value_type = executor_test_utils.create_whimsy_value_at_clients(
+        number_of_clients)
+    args = [
+        (value, value_type),
+        (0.0, computation_types.TensorType(tf.float32)),
+        executor_test_utils.create_whimsy_computation_tensorflow_add(),
+        executor_test_utils.create_whimsy_computation_tensorflow_add(),
+        executor_test_utils.create_whimsy_computation_tensorflow_identity(),
+    ]
+
+    comp = await executor.create_value(comp, comp_type)
+    elements = [await executor.create_value(*x) for x in args]
+    arg = await executor.create_struct(elements)
+    result = await executor.create_call(comp, arg)
+
+    self.assertEqual(result.type_signature.compact_representation(),
+                     comp_type.result.compact_representation())
+    self.assertEqual(await result.compute(), sum(value))
+
+  @parameterized.named_parameters(
+      ('zero', 0),
+      ('one', 1),
+  )
+  def test_raises_value_error_with_bad_reduction_arity(self, reduction_arity):
+    factory = federated_resolving_strategy.FederatedResolvingStrategy.factory(
+        {placements.SERVER: eager_tf_executor.EagerTFExecutor()},
+        reduction_arity=reduction_arity)
+
+    with self.assertRaises(ValueError):
+      federating_executor.FederatingExecutor(
+          factory, eager_tf_executor.EagerTFExecutor())
+
+
 if __name__ == '__main__':
   absltest.main()
@@ -18,7 +18,9 @@
 # information.
 """A local proxy for a remote executor service hosted on a separate machine."""
 
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
+import time
+import uuid
 import weakref
 
 from absl import logging
@@ -37,6 +39,9 @@ from tensorflow_federated.python.core.impl.types import computation_types
 from tensorflow_federated.python.core.impl.types import placements
 
 _STREAM_CLOSE_WAIT_SECONDS = 10
+# Batches of operations are sent before they grow above this size, to stay
+# under the gRPC message size limit.
+_MAX_BATCH_SIZE_BYTES = 2 * 1024 * 1024
 
 
 class RemoteValue(executor_value_base.ExecutorValue):
@@ -88,7 +93,10 @@ class RemoteExecutor(executor_base.Executor):
   def __init__(self,
                stub: remote_executor_stub.RemoteExecutorStub,
                thread_pool_executor=None,
-               dispose_batch_size=20):
+               dispose_batch_size=20,
+               stream_chunk_size_bytes=None,
+               batch_size=None,
+               flush_age_on_enqueue_seconds=None):
     """Creates a remote executor.
 
     Args:
@@ -100,10 +108,43 @@ class RemoteExecutor(executor_base.Executor):
       dispose_batch_size: The batch size for requests to dispose of remote
         worker values. Lower values will result in more requests to the remote
         worker, but will result in values being cleaned up sooner and therefore
-        may result in lower memory usage on the remote worker.
+        may result in lower memory usage on the remote worker. Values are
+        queued for disposal when they are garbage collected, and disposed of by
+        the next request sent by this executor once enough are queued.
+      stream_chunk_size_bytes: Optional maximum size of a chunk of a value sent
+        to the remote executor service. Values which serialize to more than
+        this are streamed in chunks with `CreateValueStream`, which avoids the
+        gRPC message size limit and lets the service reassemble the value
+        incrementally. If `None`, every value is sent in a single message.
+      batch_size: Optional maximum number of `create_*` operations to coalesce
+        into a single `ExecuteBatch` request. If set, operations are queued
+        locally and sent together when a value is computed, or when
+        `batch_size` operations are queued. If `None`, every operation is
+        sent in a separate request.
+      flush_age_on_enqueue_seconds: Optional age, checked only when an
+        operation is queued: if the oldest queued operation is at least this
+        old, the batch is sent together with the new operation. A partial
+        batch is otherwise not sent on a timer, and waits for the next
+        operation or computed value. Only used if `batch_size` is set.
     """
 
     py_typecheck.check_type(dispose_batch_size, int)
+    if stream_chunk_size_bytes is not None:
+      py_typecheck.check_type(stream_chunk_size_bytes, int)
+      if stream_chunk_size_bytes <= 0:
+        raise ValueError('Expected `stream_chunk_size_bytes` to be positive, '
+                         f'found {stream_chunk_size_bytes}.')
+    if batch_size is not None:
+      py_typecheck.check_type(batch_size, int)
+      if batch_size <= 0:
+        raise ValueError(
+            f'Expected `batch_size` to be positive, found {batch_size}.')
+    if flush_age_on_enqueue_seconds is not None:
+      py_typecheck.check_type(flush_age_on_enqueue_seconds, (int, float))
+      if flush_age_on_enqueue_seconds < 0:
+        raise ValueError(
+            'Expected `flush_age_on_enqueue_seconds` to be non-negative, '
+            f'found {flush_age_on_enqueue_seconds}.')
 
     logging.debug('Creating new ExecutorStub')
 
@@ -113,6 +154,16 @@ class RemoteExecutor(executor_base.Executor):
     self._executor_id = None
     self._dispose_request = None
     self._dispose_batch_size = dispose_batch_size
+    self._stream_chunk_size_bytes = stream_chunk_size_bytes
+    self._batch_size = batch_size
+    self._flush_age_on_enqueue_seconds = flush_age_on_enqueue_seconds
+    self._batch_request = None
+    self._batch_size_bytes = 0
+    self._batch_start_time = None
+    # The references assigned by the remote executor service to the results of
+    # batched operations that were replayed individually, keyed by the ids
+    # assigned to them locally.
+    self._replayed_value_refs = {}
 
   def close(self):
     logging.debug('Clearing executor state on server.')
@@ -126,19 +177,153 @@ class RemoteExecutor(executor_base.Executor):
 
   def _dispose(self, value_ref: executor_pb2.ValueRef,
                value_executor_id: executor_pb2.ExecutorId):
-    """Disposes of the remote value stored on the worker service."""
+    """Queues the remote value stored on the worker service for disposal.
+
+    This is called by the finalizers of `RemoteValue`s, which can run at any
+    point, so it only queues `value_ref`; the queued values are disposed of by
+    `_flush_batch`, on the call path of the executor.
+
+    Args:
+      value_ref: The reference of the value to dispose of.
+      value_executor_id: The id of the executor the value was created in.
+    """
     if value_executor_id != self._executor_id:
       # The executor this value corresponds to was already disposed, so we can
       # skip disposing this value.
       return
     self._dispose_request.value_ref.append(value_ref)
-    if len(self._dispose_request.value_ref) < self._dispose_batch_size:
+
+  def _send_dispose_request(self):
+    """Disposes of the queued values, if there are enough of them."""
+    if (self._dispose_request is None or
+        len(self._dispose_request.value_ref) < self._dispose_batch_size):
       return
     dispose_request = self._dispose_request
     self._dispose_request = executor_pb2.DisposeRequest(
         executor=self._executor_id)
+    if self._replayed_value_refs:
+      value_refs = [
+          self._replayed_value_refs.pop(v.id, v)
+          for v in dispose_request.value_ref
+      ]
+      del dispose_request.value_ref[:]
+      dispose_request.value_ref.extend(value_refs)
     self._stub.dispose(dispose_request)
 
+  def _resolve_value_ref(
+      self, value_ref: executor_pb2.ValueRef) -> executor_pb2.ValueRef:
+    """Returns the reference the remote executor service knows `value_ref` by.
+
+    Args:
+      value_ref: The reference of a `RemoteValue` created by this executor.
+    """
+    return self._replayed_value_refs.get(value_ref.id, value_ref)
+
+  def _reset_batch(self):
+    if self._executor_id is None:
+      self._batch_request = None
+    else:
+      self._batch_request = executor_pb2.ExecuteBatchRequest(
+          executor=self._executor_id)
+    self._batch_size_bytes = 0
+    self._batch_start_time = None
+
+  @tracing.trace(span=True)
+  def _flush_batch(self):
+    """Sends the queued operations and disposals to the remote service.
+
+    The operations are sent first, since the values being disposed of may not
+    have been created yet.
+    """
+    if self._batch_request is not None and self._batch_request.operation:
+      self._execute_batch()
+    self._send_dispose_request()
+
+  def _execute_batch(self):
+    """Sends the queued operations in a single `ExecuteBatch` request."""
+    request = self._batch_request
+    self._reset_batch()
+    try:
+      response = self._stub.execute_batch(request)
+    except grpc.RpcError as e:
+      if e.code() != grpc.StatusCode.UNIMPLEMENTED:
+        raise
+    except NotImplementedError:
+      pass
+    else:
+      py_typecheck.check_type(response, executor_pb2.ExecuteBatchResponse)
+      return
+    logging.warning('The remote executor service does not implement '
+                    '`ExecuteBatch`; sending operations in separate requests '
+                    'instead.')
+    self._batch_size = None
+    self._replay_operations(request.operation)
+
+  def _replay_operations(
+      self, operations: Sequence[executor_pb2.ExecuteBatchRequest.Operation]):
+    """Sends the batched `operations` to the remote service one at a time.
+
+    The remote executor service assigns its own references to the results of
+    the operations, which are recorded so that the references already returned
+    for them can still be used.
+
+    Args:
+      operations: The operations of an `ExecuteBatchRequest`, in order.
+    """
+    for operation in operations:
+      which_operation = operation.WhichOneof('operation')
+      if which_operation == 'create_value':
+        response = self._stub.create_value(operation.create_value)
+        py_typecheck.check_type(response, executor_pb2.CreateValueResponse)
+      elif which_operation == 'create_call':
+        request = executor_pb2.CreateCallRequest()
+        request.CopyFrom(operation.create_call)
+        request.function_ref.CopyFrom(
+            self._resolve_value_ref(request.function_ref))
+        if request.HasField('argument_ref'):
+          request.argument_ref.CopyFrom(
+              self._resolve_value_ref(request.argument_ref))
+        response = self._stub.create_call(request)
+        py_typecheck.check_type(response, executor_pb2.CreateCallResponse)
+      elif which_operation == 'create_struct':
+        request = executor_pb2.CreateStructRequest()
+        request.CopyFrom(operation.create_struct)
+        for element in request.element:
+          element.value_ref.CopyFrom(self._resolve_value_ref(element.value_ref))
+        response = self._stub.create_struct(request)
+        py_typecheck.check_type(response, executor_pb2.CreateStructResponse)
+      elif which_operation == 'create_selection':
+        request = executor_pb2.CreateSelectionRequest()
+        request.CopyFrom(operation.create_selection)
+        request.source_ref.CopyFrom(self._resolve_value_ref(request.source_ref))
+        response = self._stub.create_selection(request)
+        py_typecheck.check_type(response, executor_pb2.CreateSelectionResponse)
+      else:
+        raise ValueError(
+            f'Unable to replay a batched operation with {which_operation}.')
+      self._replayed_value_refs[operation.result_ref.id] = response.value_ref
+
+  def _enqueue_operation(
+      self, operation: executor_pb2.ExecuteBatchRequest.Operation
+  ) -> executor_pb2.ValueRef:
+    """Queues `operation` and returns a reference to its result."""
+    operation_size_bytes = operation.ByteSize()
+    if (self._batch_request.operation and
+        self._batch_size_bytes + operation_size_bytes > _MAX_BATCH_SIZE_BYTES):
+      self._flush_batch()
+    value_ref = executor_pb2.ValueRef(id=str(uuid.uuid4()))
+    operation.result_ref.CopyFrom(value_ref)
+    self._batch_request.operation.append(operation)
+    self._batch_size_bytes += operation_size_bytes
+    if self._batch_start_time is None:
+      self._batch_start_time = time.monotonic()
+    if (len(self._batch_request.operation) >= self._batch_size or
+        (self._flush_age_on_enqueue_seconds is not None and
+         time.monotonic() - self._batch_start_time >=
+         self._flush_age_on_enqueue_seconds)):
+      self._flush_batch()
+    return value_ref
+
   @tracing.trace(span=True)
   def set_cardinalities(self,
                         cardinalities: Mapping[placements.PlacementLiteral,
@@ -152,6 +337,7 @@ class RemoteExecutor(executor_base.Executor):
     self._executor_id = self._stub.get_executor(request).executor
     self._dispose_request = executor_pb2.DisposeRequest(
         executor=self._executor_id)
+    self._reset_batch()
 
   @tracing.trace(span=True)
   def _clear_executor(self):
@@ -166,6 +352,9 @@ class RemoteExecutor(executor_base.Executor):
                     'therefore there is no state to clear.')
     self._executor_id = None
     self._dispose_request = None
+    # Operations still queued for the executor are dropped with it.
+    self._reset_batch()
+    self._replayed_value_refs = {}
     return
 
   @tracing.trace(span=True)
@@ -177,12 +366,53 @@ class RemoteExecutor(executor_base.Executor):
       return value_serialization.serialize_value(value, type_spec)
 
     value_proto, type_spec = serialize_value()
-    create_value_request = executor_pb2.CreateValueRequest(
-        executor=self._executor_id, value=value_proto)
-    response = self._stub.create_value(create_value_request)
+    if (self._stream_chunk_size_bytes is not None and
+        value_proto.ByteSize() > self._stream_chunk_size_bytes):
+      self._send_dispose_request()
+      response = self._create_value_stream(value_proto)
+    else:
+      create_value_request = executor_pb2.CreateValueRequest(
+          executor=self._executor_id, value=value_proto)
+      if self._batch_size is not None:
+        value_ref = self._enqueue_operation(
+            executor_pb2.ExecuteBatchRequest.Operation(
+                create_value=create_value_request))
+        return RemoteValue(value_ref, type_spec, self)
+      self._send_dispose_request()
+      response = self._stub.create_value(create_value_request)
     py_typecheck.check_type(response, executor_pb2.CreateValueResponse)
     return RemoteValue(response.value_ref, type_spec, self)
 
+  @tracing.trace(span=True)
+  def _create_value_stream(
+      self,
+      value_proto: executor_pb2.Value) -> executor_pb2.CreateValueResponse:
+    """Creates `value_proto` in the remote executor as a stream of chunks."""
+    chunks = value_serialization.split_value_into_chunks(
+        value_proto, self._stream_chunk_size_bytes)
+
+    def requests():
+      # The executor only needs to be identified in the first request.
+      yield executor_pb2.CreateValueStreamRequest(
+          executor=self._executor_id, chunk=next(chunks))
+      for chunk in chunks:
+        yield executor_pb2.CreateValueStreamRequest(chunk=chunk)
+
+    try:
+      return self._stub.create_value_stream(requests())
+    except grpc.RpcError as e:
+      if e.code() != grpc.StatusCode.UNIMPLEMENTED:
+        raise
+    except NotImplementedError:
+      pass
+    logging.warning('The remote executor service does not implement '
+                    '`CreateValueStream`; sending values in a single message '
+                    'instead.')
+    self._stream_chunk_size_bytes = None
+    create_value_request = executor_pb2.CreateValueRequest(
+        executor=self._executor_id, value=value_proto)
+    return self._stub.create_value(create_value_request)
+
   @tracing.trace(span=True)
   async def create_call(self, comp, arg=None):
     self._check_has_executor_id()
@@ -192,8 +422,15 @@ class RemoteExecutor(executor_base.Executor):
       py_typecheck.check_type(arg, RemoteValue)
     create_call_request = executor_pb2.CreateCallRequest(
         executor=self._executor_id,
-        function_ref=comp.value_ref,
-        argument_ref=(arg.value_ref if arg is not None else None))
+        function_ref=self._resolve_value_ref(comp.value_ref),
+        argument_ref=(self._resolve_value_ref(arg.value_ref)
+                      if arg is not None else None))
+    if self._batch_size is not None:
+      value_ref = self._enqueue_operation(
+          executor_pb2.ExecuteBatchRequest.Operation(
+              create_call=create_call_request))
+      return RemoteValue(value_ref, comp.type_signature.result, self)
+    self._send_dispose_request()
     response = self._stub.create_call(create_call_request)
     py_typecheck.check_type(response, executor_pb2.CreateCallResponse)
     return RemoteValue(response.value_ref, comp.type_signature.result, self)
@@ -208,11 +445,17 @@ class RemoteExecutor(executor_base.Executor):
       py_typecheck.check_type(v, RemoteValue)
       proto_elem.append(
           executor_pb2.CreateStructRequest.Element(
-              name=(k if k else None), value_ref=v.value_ref))
+              name=(k if k else None),
+              value_ref=self._resolve_value_ref(v.value_ref)))
       type_elem.append((k, v.type_signature) if k else v.type_signature)
     result_type = computation_types.StructType(type_elem)
     request = executor_pb2.CreateStructRequest(
         executor=self._executor_id, element=proto_elem)
+    if self._batch_size is not None:
+      value_ref = self._enqueue_operation(
+          executor_pb2.ExecuteBatchRequest.Operation(create_struct=request))
+      return RemoteValue(value_ref, result_type, self)
+    self._send_dispose_request()
     response = self._stub.create_struct(request)
     py_typecheck.check_type(response, executor_pb2.CreateStructResponse)
     return RemoteValue(response.value_ref, result_type, self)
@@ -225,7 +468,14 @@ class RemoteExecutor(executor_base.Executor):
     py_typecheck.check_type(index, int)
     result_type = source.type_signature[index]
     request = executor_pb2.CreateSelectionRequest(
-        executor=self._executor_id, source_ref=source.value_ref, index=index)
+        executor=self._executor_id,
+        source_ref=self._resolve_value_ref(source.value_ref),
+        index=index)
+    if self._batch_size is not None:
+      value_ref = self._enqueue_operation(
+          executor_pb2.ExecuteBatchRequest.Operation(create_selection=request))
+      return RemoteValue(value_ref, result_type, self)
+    self._send_dispose_request()
     response = self._stub.create_selection(request)
     py_typecheck.check_type(response, executor_pb2.CreateSelectionResponse)
     return RemoteValue(response.value_ref, result_type, self)
@@ -234,8 +484,10 @@ class RemoteExecutor(executor_base.Executor):
   async def _compute(self, value_ref, type_spec):
     self._check_has_executor_id()
     py_typecheck.check_type(value_ref, executor_pb2.ValueRef)
+    self._flush_batch()
     request = executor_pb2.ComputeRequest(
-        executor=self._executor_id, value_ref=value_ref)
+        executor=self._executor_id,
+        value_ref=self._resolve_value_ref(value_ref))
     response = self._stub.compute(request)
     py_typecheck.check_type(response, executor_pb2.ComputeResponse)
     value, _ = value_serialization.deserialize_value(response.value, type_spec)
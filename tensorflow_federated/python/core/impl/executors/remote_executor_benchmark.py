@@ -0,0 +1,99 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for creating large values in a `RemoteExecutor`.
+
+Run with `--benchmarks=.` to report the throughput of `create_value` against an
+`ExecutorService` over a local loopback connection, comparing values sent in a
+single `CreateValue` message with values streamed with `CreateValueStream`.
+"""
+
+import asyncio
+import time
+
+import grpc
+from grpc.framework.foundation import logging_pool
+import numpy as np
+import portpicker
+import tensorflow as tf
+
+from tensorflow_federated.proto.v0 import executor_pb2_grpc
+from tensorflow_federated.python.core.impl.executors import eager_tf_executor
+from tensorflow_federated.python.core.impl.executors import executor_service
+from tensorflow_federated.python.core.impl.executors import executor_test_utils
+from tensorflow_federated.python.core.impl.executors import remote_executor
+from tensorflow_federated.python.core.impl.executors import remote_executor_grpc_stub
+from tensorflow_federated.python.core.impl.types import computation_types
+
+_VALUE_SIZES_BYTES = (10 * 1024**2, 100 * 1024**2, 1024**3)
+_STREAM_CHUNK_SIZE_BYTES = 4 * 1024**2
+_ITERS = 3
+# Allow the unary baseline to send values larger than the default limit.
+_GRPC_OPTIONS = [
+    ('grpc.max_send_message_length', -1),
+    ('grpc.max_receive_message_length', -1),
+]
+
+
+class RemoteExecutorBenchmark(tf.test.Benchmark):
+
+  def _benchmark_create_value(self, port, name, stream_chunk_size_bytes):
+    channel = grpc.insecure_channel(f'localhost:{port}', options=_GRPC_OPTIONS)
+    stub = remote_executor_grpc_stub.RemoteExecutorGrpcStub(channel)
+    # Dispose of each value as soon as it is released, to bound the memory
+    # used by the service.
+    executor = remote_executor.RemoteExecutor(
+        stub,
+        dispose_batch_size=1,
+        stream_chunk_size_bytes=stream_chunk_size_bytes)
+    executor.set_cardinalities({})
+    for size_bytes in _VALUE_SIZES_BYTES:
+      value = np.random.random([size_bytes // 4]).astype(np.float32)
+      value_type = computation_types.TensorType(tf.float32, value.shape)
+      wall_times = []
+      for _ in range(_ITERS):
+        start_time = time.perf_counter()
+        asyncio.run(executor.create_value(value, value_type))
+        wall_times.append(time.perf_counter() - start_time)
+      wall_time = np.median(wall_times)
+      self.report_benchmark(
+          iters=_ITERS,
+          wall_time=wall_time,
+          name=f'create_value_{name}_{size_bytes}_bytes',
+          extras={
+              'size_bytes': size_bytes,
+              'throughput_mb_per_sec': size_bytes / wall_time / 1024**2,
+          })
+    executor.close()
+    channel.close()
+
+  def benchmark_create_value(self):
+    port = portpicker.pick_unused_port()
+    server_pool = logging_pool.pool(max_workers=1)
+    server = grpc.server(server_pool, options=_GRPC_OPTIONS)
+    server.add_insecure_port(f'[::]:{port}')
+    service = executor_service.ExecutorService(
+        executor_test_utils.BasicTestExFactory(
+            eager_tf_executor.EagerTFExecutor()))
+    executor_pb2_grpc.add_ExecutorGroupServicer_to_server(service, server)
+    server.start()
+    try:
+      self._benchmark_create_value(port, 'unary', None)
+      self._benchmark_create_value(port, 'stream', _STREAM_CHUNK_SIZE_BYTES)
+    finally:
+      server.stop(None)
+      server_pool.shutdown(wait=False)
+
+
+if __name__ == '__main__':
+  tf.test.main()
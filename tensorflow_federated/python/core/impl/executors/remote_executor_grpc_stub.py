@@ -18,6 +18,8 @@
 # information.
 """A stub connects to a remote executor over gRPC."""
 
+from collections.abc import Iterator
+
 from absl import logging
 import grpc
 
@@ -81,6 +83,12 @@ class RemoteExecutorGrpcStub(remote_executor_stub.RemoteExecutorStub):
     """Dispatches a CreateValue gRPC."""
     return _request(self._stub.CreateValue, request)
 
+  def create_value_stream(
+      self, requests: Iterator[executor_pb2.CreateValueStreamRequest]
+  ) -> executor_pb2.CreateValueResponse:
+    """Dispatches a CreateValueStream gRPC."""
+    return _request(self._stub.CreateValueStream, requests)
+
   def create_struct(
       self, request: executor_pb2.CreateStructRequest
   ) -> executor_pb2.CreateStructResponse:
@@ -99,6 +107,12 @@ class RemoteExecutorGrpcStub(remote_executor_stub.RemoteExecutorStub):
     """Dispatches a CreateSelection gRPC."""
     return _request(self._stub.CreateSelection, request)
 
+  def execute_batch(
+      self, request: executor_pb2.ExecuteBatchRequest
+  ) -> executor_pb2.ExecuteBatchResponse:
+    """Dispatches an ExecuteBatch gRPC."""
+    return _request(self._stub.ExecuteBatch, request)
+
   def compute(
       self,
       request: executor_pb2.ComputeRequest) -> executor_pb2.ComputeResponse:
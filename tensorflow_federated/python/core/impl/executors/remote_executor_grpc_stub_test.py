@@ -123,6 +123,25 @@ class RemoteExecutorGrpcStubTest(absltest.TestCase):
     result = stub.create_value(request=executor_pb2.CreateValueRequest())
     self.assertEqual(result, response)
 
+  def test_create_value_stream_returns_value(self, mock_executor_grpc_stub):
+    response = executor_pb2.CreateValueResponse()
+    instance = mock_executor_grpc_stub.return_value
+    instance.CreateValueStream = mock.Mock(side_effect=[response])
+    stub = create_stub()
+    requests = iter([executor_pb2.CreateValueStreamRequest()])
+    result = stub.create_value_stream(requests)
+    instance.CreateValueStream.assert_called_once_with(requests)
+    self.assertEqual(result, response)
+
+  def test_execute_batch_returns_response(self, mock_executor_grpc_stub):
+    response = executor_pb2.ExecuteBatchResponse()
+    instance = mock_executor_grpc_stub.return_value
+    instance.ExecuteBatch = mock.Mock(side_effect=[response])
+    stub = create_stub()
+    result = stub.execute_batch(request=executor_pb2.ExecuteBatchRequest())
+    instance.ExecuteBatch.assert_called_once()
+    self.assertEqual(result, response)
+
   def test_create_value_raises_retryable_error_on_grpc_error_unavailable(
       self, mock_executor_grpc_stub):
     instance = mock_executor_grpc_stub.return_value
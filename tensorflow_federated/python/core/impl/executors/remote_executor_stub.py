@@ -19,6 +19,7 @@
 """A base Python interface for all stubs handles remote executions."""
 
 import abc
+from collections.abc import Iterator
 
 from tensorflow_federated.proto.v0 import executor_pb2
 
@@ -47,6 +48,20 @@ class RemoteExecutorStub(abc.ABC):
     """
     raise NotImplementedError
 
+  def create_value_stream(
+      self, requests: Iterator[executor_pb2.CreateValueStreamRequest]
+  ) -> executor_pb2.CreateValueResponse:
+    """Invokes CreateValueStream remotely.
+
+    Args:
+      requests: An iterator of CreateValueStreamRequest, holding the chunks of
+        the value to create in order.
+
+    Returns:
+      CreateValueResponse.
+    """
+    raise NotImplementedError
+
   @abc.abstractmethod
   def create_struct(
       self, request: executor_pb2.CreateStructRequest
@@ -89,6 +104,19 @@ class RemoteExecutorStub(abc.ABC):
     """
     raise NotImplementedError
 
+  def execute_batch(
+      self, request: executor_pb2.ExecuteBatchRequest
+  ) -> executor_pb2.ExecuteBatchResponse:
+    """Invokes ExecuteBatch in a remote TFF runtime.
+
+    Args:
+      request: ExecuteBatchRequest.
+
+    Returns:
+      ExecuteBatchResponse.
+    """
+    raise NotImplementedError
+
   @abc.abstractmethod
   def compute(
       self,
@@ -15,12 +15,14 @@
 import asyncio
 import collections
 import contextlib
+import gc
 from unittest import mock
 
 from absl.testing import absltest
 from absl.testing import parameterized
 import grpc
 from grpc.framework.foundation import logging_pool
+import numpy as np
 import portpicker
 import tensorflow as tf
 
@@ -33,6 +35,7 @@ from tensorflow_federated.python.core.impl.executors import reference_resolving_
 from tensorflow_federated.python.core.impl.executors import remote_executor
 from tensorflow_federated.python.core.impl.executors import remote_executor_grpc_stub
 from tensorflow_federated.python.core.impl.executors import remote_executor_stub
+from tensorflow_federated.python.core.impl.executors import value_serialization
 from tensorflow_federated.python.core.impl.federated_context import federated_computation
 from tensorflow_federated.python.core.impl.federated_context import intrinsics
 from tensorflow_federated.python.core.impl.tensorflow_context import tensorflow_computation
@@ -41,7 +44,7 @@ from tensorflow_federated.python.core.impl.types import placements
 
 
 @contextlib.contextmanager
-def test_context():
+def test_context(stream_chunk_size_bytes=None, batch_size=None):
   port = portpicker.pick_unused_port()
   server_pool = logging_pool.pool(max_workers=1)
   server = grpc.server(server_pool)
@@ -64,7 +67,10 @@ def test_context():
   channel = grpc.insecure_channel('localhost:{}'.format(port))
 
   stub = remote_executor_grpc_stub.RemoteExecutorGrpcStub(channel)
-  remote_exec = remote_executor.RemoteExecutor(stub)
+  remote_exec = remote_executor.RemoteExecutor(
+      stub,
+      stream_chunk_size_bytes=stream_chunk_size_bytes,
+      batch_size=batch_size)
   remote_exec.set_cardinalities({placements.CLIENTS: 3})
   executor = reference_resolving_executor.ReferenceResolvingExecutor(
       remote_exec)
@@ -100,6 +106,13 @@ def _raise_grpc_error_unavailable(*args):
   raise error
 
 
+def _raise_grpc_error_unimplemented(*args):
+  del args  # Unused
+  error = grpc.RpcError()
+  error.code = lambda: grpc.StatusCode.UNIMPLEMENTED
+  raise error
+
+
 def _raise_non_retryable_grpc_error(*args):
   del args  # Unused
   error = grpc.RpcError()
@@ -107,6 +120,46 @@ def _raise_non_retryable_grpc_error(*args):
   raise error
 
 
+class _UnaryStub(remote_executor_stub.RemoteExecutorStub):
+  """A stub which only implements the abstract methods of the base stub."""
+
+  def __init__(self):
+    self.requests = []
+
+  def get_executor(self, request):
+    del request  # Unused.
+    return executor_pb2.GetExecutorResponse(
+        executor=executor_pb2.ExecutorId(id='id'))
+
+  def create_value(self, request):
+    self.requests.append(request)
+    return executor_pb2.CreateValueResponse()
+
+  def create_struct(self, request):
+    del request  # Unused.
+    raise NotImplementedError
+
+  def create_call(self, request):
+    del request  # Unused.
+    raise NotImplementedError
+
+  def create_selection(self, request):
+    del request  # Unused.
+    raise NotImplementedError
+
+  def compute(self, request):
+    del request  # Unused.
+    raise NotImplementedError
+
+  def dispose(self, request):
+    del request  # Unused.
+    return executor_pb2.DisposeResponse()
+
+  def dispose_executor(self, request):
+    del request  # Unused.
+    return executor_pb2.DisposeExecutorResponse()
+
+
 def _set_cardinalities_with_mock(executor: remote_executor.RemoteExecutor,
                                  mock_stub: mock.Mock):
   mock_stub.get_executor.return_value = executor_pb2.GetExecutorResponse(
@@ -200,6 +253,217 @@ class RemoteExecutorTest(absltest.TestCase):
     with self.assertRaises(TypeError):
       asyncio.run(executor.create_value(1, tf.int32))
 
+  def test_create_value_streams_large_value(self, mock_stub):
+    requests = []
+
+    def create_value_stream(request_iterator):
+      requests.extend(request_iterator)
+      return executor_pb2.CreateValueResponse()
+
+    mock_stub.create_value_stream = mock.Mock(side_effect=create_value_stream)
+    executor = remote_executor.RemoteExecutor(
+        mock_stub, stream_chunk_size_bytes=100)
+    _set_cardinalities_with_mock(executor, mock_stub)
+    value = np.arange(1000, dtype=np.float32)
+
+    result = asyncio.run(
+        executor.create_value(value,
+                              computation_types.TensorType(tf.float32, [1000])))
+
+    mock_stub.create_value.assert_not_called()
+    self.assertIsInstance(result, remote_executor.RemoteValue)
+    self.assertEqual(requests[0].executor.id, 'id')
+    actual, _ = value_serialization.deserialize_value_chunks(
+        [r.chunk for r in requests])
+    np.testing.assert_array_equal(actual, value)
+
+  def test_create_value_does_not_stream_small_value(self, mock_stub):
+    mock_stub.create_value.return_value = executor_pb2.CreateValueResponse()
+    executor = remote_executor.RemoteExecutor(
+        mock_stub, stream_chunk_size_bytes=100)
+    _set_cardinalities_with_mock(executor, mock_stub)
+
+    asyncio.run(executor.create_value(1, tf.int32))
+
+    mock_stub.create_value.assert_called_once()
+    mock_stub.create_value_stream.assert_not_called()
+
+  def test_create_value_falls_back_if_stream_unimplemented(self, mock_stub):
+
+    def raise_unimplemented(*args):
+      del args  # Unused
+      error = grpc.RpcError()
+      error.code = lambda: grpc.StatusCode.UNIMPLEMENTED
+      raise error
+
+    mock_stub.create_value_stream = mock.Mock(side_effect=raise_unimplemented)
+    mock_stub.create_value.return_value = executor_pb2.CreateValueResponse()
+    executor = remote_executor.RemoteExecutor(
+        mock_stub, stream_chunk_size_bytes=100)
+    _set_cardinalities_with_mock(executor, mock_stub)
+    value_type = computation_types.TensorType(tf.float32, [1000])
+
+    asyncio.run(
+        executor.create_value(np.zeros([1000], dtype=np.float32), value_type))
+    asyncio.run(
+        executor.create_value(np.zeros([1000], dtype=np.float32), value_type))
+
+    mock_stub.create_value_stream.assert_called_once()
+    self.assertEqual(mock_stub.create_value.call_count, 2)
+
+  def test_create_value_falls_back_if_stub_does_not_stream(self, mock_stub):
+    del mock_stub  # Unused.
+    stub = _UnaryStub()
+    executor = remote_executor.RemoteExecutor(
+        stub, stream_chunk_size_bytes=100)
+    executor.set_cardinalities({placements.CLIENTS: 3})
+    value_type = computation_types.TensorType(tf.float32, [1000])
+
+    result = asyncio.run(
+        executor.create_value(np.zeros([1000], dtype=np.float32), value_type))
+
+    self.assertIsInstance(result, remote_executor.RemoteValue)
+    self.assertLen(stub.requests, 1)
+    self.assertEqual(stub.requests[0].executor.id, 'id')
+
+  def test_raises_value_error_with_non_positive_stream_chunk_size_bytes(
+      self, mock_stub):
+    with self.assertRaises(ValueError):
+      remote_executor.RemoteExecutor(mock_stub, stream_chunk_size_bytes=0)
+
+  def test_create_with_batching_sends_batch_on_compute(self, mock_stub):
+    mock_stub.execute_batch.return_value = executor_pb2.ExecuteBatchResponse()
+    mock_stub.compute.return_value = executor_pb2.ComputeResponse(
+        value=value_serialization.serialize_value(1, tf.int32)[0])
+    executor = remote_executor.RemoteExecutor(mock_stub, batch_size=10)
+    _set_cardinalities_with_mock(executor, mock_stub)
+    type_signature = computation_types.FunctionType(tf.int32, tf.int32)
+    fn = remote_executor.RemoteValue(
+        executor_pb2.ValueRef(id='fn'), type_signature, executor)
+
+    arg = asyncio.run(executor.create_value(1, tf.int32))
+    result = asyncio.run(executor.create_call(fn, arg))
+
+    mock_stub.create_value.assert_not_called()
+    mock_stub.create_call.assert_not_called()
+    mock_stub.execute_batch.assert_not_called()
+
+    asyncio.run(result.compute())
+
+    mock_stub.execute_batch.assert_called_once()
+    request = mock_stub.execute_batch.call_args[0][0]
+    self.assertEqual(request.executor.id, 'id')
+    self.assertLen(request.operation, 2)
+    self.assertEqual(request.operation[0].result_ref, arg.value_ref)
+    self.assertEqual(request.operation[1].result_ref, result.value_ref)
+    self.assertEqual(request.operation[1].create_call.argument_ref,
+                     arg.value_ref)
+    mock_stub.compute.assert_called_once()
+
+  def test_create_with_batching_sends_batch_when_full(self, mock_stub):
+    mock_stub.execute_batch.return_value = executor_pb2.ExecuteBatchResponse()
+    executor = remote_executor.RemoteExecutor(mock_stub, batch_size=2)
+    _set_cardinalities_with_mock(executor, mock_stub)
+
+    for _ in range(5):
+      asyncio.run(executor.create_value(1, tf.int32))
+
+    self.assertEqual(mock_stub.execute_batch.call_count, 2)
+    for call in mock_stub.execute_batch.call_args_list:
+      self.assertLen(call[0][0].operation, 2)
+
+  def test_create_with_batching_sends_old_batch_on_enqueue(self, mock_stub):
+    mock_stub.execute_batch.return_value = executor_pb2.ExecuteBatchResponse()
+    executor = remote_executor.RemoteExecutor(
+        mock_stub, batch_size=100, flush_age_on_enqueue_seconds=0)
+    _set_cardinalities_with_mock(executor, mock_stub)
+
+    asyncio.run(executor.create_value(1, tf.int32))
+
+    mock_stub.execute_batch.assert_called_once()
+
+  def _test_create_with_batching_falls_back(self, mock_stub,
+                                            execute_batch_side_effect):
+    mock_stub.execute_batch = mock.Mock(side_effect=execute_batch_side_effect)
+    mock_stub.create_value.return_value = executor_pb2.CreateValueResponse(
+        value_ref=executor_pb2.ValueRef(id='remote_arg'))
+    mock_stub.create_call.side_effect = [
+        executor_pb2.CreateCallResponse(
+            value_ref=executor_pb2.ValueRef(id='remote_result')),
+        executor_pb2.CreateCallResponse(
+            value_ref=executor_pb2.ValueRef(id='remote_unbatched')),
+    ]
+    mock_stub.compute.return_value = executor_pb2.ComputeResponse(
+        value=value_serialization.serialize_value(1, tf.int32)[0])
+    executor = remote_executor.RemoteExecutor(mock_stub, batch_size=10)
+    _set_cardinalities_with_mock(executor, mock_stub)
+    type_signature = computation_types.FunctionType(tf.int32, tf.int32)
+    fn = remote_executor.RemoteValue(
+        executor_pb2.ValueRef(id='fn'), type_signature, executor)
+    arg = asyncio.run(executor.create_value(1, tf.int32))
+    result = asyncio.run(executor.create_call(fn, arg))
+
+    asyncio.run(result.compute())
+    asyncio.run(executor.create_call(fn, result))
+
+    mock_stub.execute_batch.assert_called_once()
+    mock_stub.create_value.assert_called_once()
+    self.assertEqual(mock_stub.create_call.call_count, 2)
+    replayed_call_request = mock_stub.create_call.call_args_list[0][0][0]
+    self.assertEqual(replayed_call_request.argument_ref.id, 'remote_arg')
+    compute_request = mock_stub.compute.call_args[0][0]
+    self.assertEqual(compute_request.value_ref.id, 'remote_result')
+    unbatched_call_request = mock_stub.create_call.call_args_list[1][0][0]
+    self.assertEqual(unbatched_call_request.argument_ref.id, 'remote_result')
+
+  def test_create_with_batching_falls_back_if_batch_rpc_unimplemented(
+      self, mock_stub):
+    self._test_create_with_batching_falls_back(mock_stub,
+                                               _raise_grpc_error_unimplemented)
+
+  def test_create_with_batching_falls_back_if_stub_batch_not_implemented(
+      self, mock_stub):
+    self._test_create_with_batching_falls_back(mock_stub, NotImplementedError)
+
+  def test_create_with_batching_reraises_batch_error(self, mock_stub):
+    mock_stub.execute_batch = mock.Mock(
+        side_effect=_raise_non_retryable_grpc_error)
+    executor = remote_executor.RemoteExecutor(mock_stub, batch_size=1)
+    _set_cardinalities_with_mock(executor, mock_stub)
+
+    with self.assertRaises(grpc.RpcError):
+      asyncio.run(executor.create_value(1, tf.int32))
+
+    mock_stub.create_value.assert_not_called()
+
+  def test_dispose_queues_values_until_batch_is_sent(self, mock_stub):
+    mock_stub.execute_batch.return_value = executor_pb2.ExecuteBatchResponse()
+    mock_stub.compute.return_value = executor_pb2.ComputeResponse(
+        value=value_serialization.serialize_value(1, tf.int32)[0])
+    executor = remote_executor.RemoteExecutor(
+        mock_stub, dispose_batch_size=1, batch_size=10)
+    _set_cardinalities_with_mock(executor, mock_stub)
+    disposed_value = asyncio.run(executor.create_value(1, tf.int32))
+    disposed_value_ref = disposed_value.value_ref
+    value = asyncio.run(executor.create_value(2, tf.int32))
+
+    del disposed_value
+    gc.collect()
+
+    mock_stub.execute_batch.assert_not_called()
+    mock_stub.dispose.assert_not_called()
+
+    asyncio.run(value.compute())
+
+    self.assertEqual([c[0] for c in mock_stub.method_calls[-3:]],
+                     ['execute_batch', 'dispose', 'compute'])
+    dispose_request = mock_stub.dispose.call_args[0][0]
+    self.assertEqual(list(dispose_request.value_ref), [disposed_value_ref])
+
+  def test_raises_value_error_with_non_positive_batch_size(self, mock_stub):
+    with self.assertRaises(ValueError):
+      remote_executor.RemoteExecutor(mock_stub, batch_size=0)
+
   def test_create_call_returns_remote_value(self, mock_stub):
     mock_stub.create_call.return_value = executor_pb2.CreateCallResponse()
     executor = remote_executor.RemoteExecutor(mock_stub)
@@ -424,6 +688,46 @@ class RemoteExecutorIntegrationTest(parameterized.TestCase):
       result = _invoke(context.executor, baz, 50)
       self.assertEqual(result, [51, 51, 51])
 
+  def test_with_streamed_values(self):
+    with test_context(stream_chunk_size_bytes=64) as context:
+
+      @tensorflow_computation.tf_computation(
+          computation_types.TensorType(tf.float32, [1000]))
+      def reduce_sum(x):
+        return tf.reduce_sum(x)
+
+      @federated_computation.federated_computation(
+          computation_types.FederatedType(
+              computation_types.TensorType(tf.float32, [1000]),
+              placements.CLIENTS))
+      def foo(x):
+        return intrinsics.federated_sum(intrinsics.federated_map(reduce_sum, x))
+
+      value = [np.ones([1000], dtype=np.float32) * i for i in range(1, 4)]
+      result = _invoke(context.executor, foo, value)
+      self.assertEqual(result, 6000.0)
+
+  @parameterized.named_parameters(
+      ('batch_size_1', 1),
+      ('batch_size_3', 3),
+      ('batch_size_100', 100),
+  )
+  def test_with_batched_operations(self, batch_size):
+    with test_context(batch_size=batch_size) as context:
+
+      @tensorflow_computation.tf_computation(tf.int32)
+      def add_one(x):
+        return x + 1
+
+      @federated_computation.federated_computation(
+          computation_types.FederatedType(tf.int32, placements.SERVER))
+      def foo(x):
+        value = intrinsics.federated_broadcast(x)
+        return intrinsics.federated_map(add_one, value)
+
+      result = _invoke(context.executor, foo, 50)
+      self.assertEqual(result, [51, 51, 51])
+
 
 if __name__ == '__main__':
   absltest.main()
@@ -19,7 +19,7 @@
 """A set of utility methods for serializing Value protos using pybind11 bindings."""
 
 import collections
-from collections.abc import Collection, Mapping, Sequence
+from collections.abc import Collection, Iterable, Iterator, Mapping, Sequence
 import os
 import os.path
 import tempfile
@@ -31,6 +31,7 @@ import numpy as np
 import tensorflow as tf
 
 from google.protobuf import any_pb2
+from tensorflow.core.framework import tensor_pb2
 from tensorflow_federated.proto.v0 import computation_pb2
 from tensorflow_federated.proto.v0 import executor_pb2
 from tensorflow_federated.python.common_libs import py_typecheck
@@ -55,6 +56,26 @@ _DeserializeReturnType = tuple[Any, computation_types.Type]
 # variables from the graph.
 _DEFAULT_MAX_SERIALIZED_SEQUENCE_SIZE_BYTES = 100 * (1024**2)  # 100 MB
 
+# The dtypes of dense tensors which are serialized directly as their raw
+# buffers. The raw buffer of a tensor with one of these dtypes is a valid
+# `TensorProto.tensor_content`.
+_RAW_BUFFER_DTYPES = frozenset([
+    tf.bool,
+    tf.complex64,
+    tf.complex128,
+    tf.float16,
+    tf.float32,
+    tf.float64,
+    tf.int8,
+    tf.int16,
+    tf.int32,
+    tf.int64,
+    tf.uint8,
+    tf.uint16,
+    tf.uint32,
+    tf.uint64,
+])
+
 
 class DatasetSerializationError(Exception):
   """Error raised during Dataset serialization or deserialization."""
@@ -71,11 +92,37 @@ def _serialize_computation(
   return executor_pb2.Value(computation=comp), type_spec
 
 
+def _tensor_proto_for_raw_buffer(value: np.ndarray) -> tensor_pb2.TensorProto:
+  """Creates a `TensorProto` holding the raw buffer of `value`.
+
+  Unlike `tf.make_tensor_proto`, this copies the contents of `value` exactly
+  once (if `value` is already C-contiguous in native byte order), and performs
+  no per-element conversion.
+
+  Args:
+    value: A Numpy array with a dtype in `_RAW_BUFFER_DTYPES`.
+
+  Returns:
+    A `TensorProto` with only the `dtype`, `tensor_shape` and `tensor_content`
+    fields set.
+  """
+  value = np.ascontiguousarray(value)
+  if not value.dtype.isnative:
+    value = value.astype(value.dtype.newbyteorder('='))
+  return tensor_pb2.TensorProto(
+      dtype=tf.dtypes.as_dtype(value.dtype).as_datatype_enum,
+      tensor_shape=tf.TensorShape(value.shape).as_proto(),
+      tensor_content=value.tobytes())
+
+
 def _value_proto_for_np_array(
     value, type_spec: computation_types.Type) -> executor_pb2.Value:
   """Creates value proto for np array, assumed to be assignable to type_spec."""
-  tensor_proto = tf.make_tensor_proto(
-      value, dtype=type_spec.dtype, verify_shape=True)
+  if type_spec.dtype in _RAW_BUFFER_DTYPES and isinstance(value, np.ndarray):
+    tensor_proto = _tensor_proto_for_raw_buffer(value)
+  else:
+    tensor_proto = tf.make_tensor_proto(
+        value, dtype=type_spec.dtype, verify_shape=True)
   any_pb = any_pb2.Any()
   any_pb.Pack(tensor_proto)
   return executor_pb2.Value(tensor=any_pb)
@@ -366,10 +413,24 @@ def _deserialize_computation(
           type_serialization.deserialize_type(value_proto.computation.type))
 
 
-def _tensor_for_value(value_proto: executor_pb2.Value) -> tf.Tensor:
-  tensor_proto = tf.make_tensor_proto(values=0)
+def _tensor_for_value(value_proto: executor_pb2.Value) -> np.ndarray:
+  """Returns the Numpy array packed in `value_proto`.
+
+  Tensors whose content is a raw buffer are returned as a read-only view of
+  that buffer, without copying it.
+
+  Args:
+    value_proto: An instance of `executor_pb2.Value` with the `tensor` field
+      set.
+  """
+  tensor_proto = tensor_pb2.TensorProto()
   if not value_proto.tensor.Unpack(tensor_proto):
     raise ValueError('Unable to unpack the received tensor value.')
+  dtype = tf.dtypes.as_dtype(tensor_proto.dtype)
+  if dtype in _RAW_BUFFER_DTYPES and tensor_proto.tensor_content:
+    shape = tf.TensorShape(tensor_proto.tensor_shape).as_list()
+    return np.frombuffer(
+        tensor_proto.tensor_content, dtype=dtype.as_numpy_dtype).reshape(shape)
   tensor_value = tf.make_ndarray(tensor_proto)
   return tensor_value
 
@@ -385,13 +446,18 @@ def _deserialize_tensor_value(
   Returns:
     A tuple `(value, type_spec)`, where `value` is a Numpy array that represents
     the deserialized value, and `type_spec` is an instance of `tff.TensorType`
-    that represents its type.
+    that represents its type. Arrays whose content was serialized as a raw
+    buffer, as numeric tensors are, are read-only views of that buffer and must
+    be copied before being modified. Scalars are returned as Numpy scalars.
 
   Raises:
     TypeError: If the arguments are of the wrong types.
     ValueError: If the value is malformed.
   """
-  value = _tensor_for_value(value_proto)
+  return _tensor_value_and_type(_tensor_for_value(value_proto))
+
+
+def _tensor_value_and_type(value: np.ndarray) -> _DeserializeReturnType:
   value_type = computation_types.TensorType(
       dtype=value.dtype, shape=value.shape)
   if not value.shape:
@@ -689,6 +755,239 @@ def deserialize_value(
         'Unable to deserialize a value of type {}.'.format(which_value))
 
 
+def _iter_value_chunks(
+    value_proto: executor_pb2.Value,
+    max_chunk_size_bytes: int) -> Iterator[executor_pb2.ValueChunk]:
+  """Yields the chunks of `value_proto`, see `split_value_into_chunks`."""
+  which_value = value_proto.WhichOneof('value')
+  if value_proto.ByteSize() <= max_chunk_size_bytes:
+    yield executor_pb2.ValueChunk(value=value_proto)
+  elif which_value == 'struct':
+    element_names = [e.name for e in value_proto.struct.element]
+    yield executor_pb2.ValueChunk(
+        struct_start=executor_pb2.ValueChunk.StructStart(
+            element_name=element_names))
+    for element in value_proto.struct.element:
+      yield from _iter_value_chunks(element.value, max_chunk_size_bytes)
+  elif which_value == 'federated':
+    yield executor_pb2.ValueChunk(
+        federated_start=executor_pb2.ValueChunk.FederatedStart(
+            type=value_proto.federated.type,
+            num_values=len(value_proto.federated.value)))
+    for member in value_proto.federated.value:
+      yield from _iter_value_chunks(member, max_chunk_size_bytes)
+  elif which_value == 'tensor':
+    tensor_proto = tensor_pb2.TensorProto()
+    if (not value_proto.tensor.Unpack(tensor_proto) or
+        tf.dtypes.as_dtype(tensor_proto.dtype) not in _RAW_BUFFER_DTYPES or
+        not tensor_proto.tensor_content):
+      # Only raw buffers can be split, anything else is sent whole.
+      yield executor_pb2.ValueChunk(value=value_proto)
+      return
+    content = memoryview(tensor_proto.tensor_content)
+    tensor_proto.ClearField('tensor_content')
+    header_pb = any_pb2.Any()
+    header_pb.Pack(tensor_proto)
+    yield executor_pb2.ValueChunk(
+        tensor_start=executor_pb2.ValueChunk.TensorStart(
+            tensor=header_pb, content_size_bytes=len(content)))
+    for start in range(0, len(content), max_chunk_size_bytes):
+      yield executor_pb2.ValueChunk(
+          tensor_content=bytes(content[start:start + max_chunk_size_bytes]))
+  else:
+    yield executor_pb2.ValueChunk(value=value_proto)
+
+
+def split_value_into_chunks(
+    value_proto: executor_pb2.Value,
+    max_chunk_size_bytes: int) -> Iterator[executor_pb2.ValueChunk]:
+  """Splits `value_proto` into a stream of `executor_pb2.ValueChunk`s.
+
+  Structs and federated values are split into their elements, and tensors with
+  a raw `tensor_content` are split into pieces of at most
+  `max_chunk_size_bytes`. Values that cannot be split further (e.g.
+  computations and sequences) are sent as a single chunk regardless of their
+  size. The chunks are produced lazily, so at most one chunk is materialized at
+  a time in addition to `value_proto`.
+
+  Args:
+    value_proto: An instance of `executor_pb2.Value`.
+    max_chunk_size_bytes: The maximum size of the serialized content of a
+      chunk.
+
+  Returns:
+    An iterator of `executor_pb2.ValueChunk`s which can be reassembled with
+    `deserialize_value_chunks`.
+
+  Raises:
+    ValueError: If `max_chunk_size_bytes` is not positive.
+  """
+  py_typecheck.check_type(value_proto, executor_pb2.Value)
+  py_typecheck.check_type(max_chunk_size_bytes, int)
+  if max_chunk_size_bytes <= 0:
+    raise ValueError('Expected `max_chunk_size_bytes` to be positive, found '
+                     f'{max_chunk_size_bytes}.')
+  return _iter_value_chunks(value_proto, max_chunk_size_bytes)
+
+
+class _StructChunksBuilder:
+  """Accumulates the elements of a struct streamed as chunks."""
+
+  def __init__(self, struct_start: executor_pb2.ValueChunk.StructStart):
+    self._names = [name if name else None for name in struct_start.element_name]
+    self._elements = []
+    self._element_types = []
+
+  def is_complete(self) -> bool:
+    return len(self._elements) == len(self._names)
+
+  def add(self, value: Any, type_spec: computation_types.Type):
+    name = self._names[len(self._elements)]
+    self._elements.append((name, value))
+    self._element_types.append((name, type_spec) if name else type_spec)
+
+  def build(self) -> _DeserializeReturnType:
+    return (structure.Struct(self._elements),
+            computation_types.StructType(self._element_types))
+
+
+class _FederatedChunksBuilder:
+  """Accumulates the members of a federated value streamed as chunks."""
+
+  def __init__(self, federated_start: executor_pb2.ValueChunk.FederatedStart):
+    if federated_start.num_values <= 0:
+      raise ValueError(
+          'Attempting to deserialize federated value with no data.')
+    self._type = federated_start.type
+    self._num_values = federated_start.num_values
+    self._values = []
+    self._member_type = None
+
+  def is_complete(self) -> bool:
+    return len(self._values) == self._num_values
+
+  def add(self, value: Any, type_spec: computation_types.Type):
+    self._member_type = _ensure_deserialized_types_compatible(
+        self._member_type, type_spec)
+    self._values.append(value)
+
+  def build(self) -> _DeserializeReturnType:
+    all_equal = self._type.all_equal
+    type_spec = computation_types.FederatedType(
+        self._member_type,
+        placement=placements.uri_to_placement_literal(
+            self._type.placement.value.uri),
+        all_equal=all_equal)
+    if all_equal:
+      return self._values[0], type_spec
+    return self._values, type_spec
+
+
+class _TensorChunksBuilder:
+  """Copies the content of a tensor streamed as chunks into a single buffer."""
+
+  def __init__(self, tensor_start: executor_pb2.ValueChunk.TensorStart):
+    tensor_proto = tensor_pb2.TensorProto()
+    if not tensor_start.tensor.Unpack(tensor_proto):
+      raise ValueError('Unable to unpack the received tensor value.')
+    self._dtype = tf.dtypes.as_dtype(tensor_proto.dtype)
+    if self._dtype not in _RAW_BUFFER_DTYPES:
+      raise ValueError(
+          f'Unable to stream the content of a tensor of dtype {self._dtype}.')
+    shape = tf.TensorShape(tensor_proto.tensor_shape)
+    if not shape.is_fully_defined():
+      raise ValueError('Expected the shape of a streamed tensor to be fully '
+                       f'defined, found {shape}.')
+    expected_size_bytes = shape.num_elements() * self._dtype.size
+    if tensor_start.content_size_bytes != expected_size_bytes:
+      raise ValueError(
+          f'Expected the content of a tensor of dtype {self._dtype} and shape '
+          f'{shape} to be {expected_size_bytes} bytes, found '
+          f'{tensor_start.content_size_bytes}.')
+    self._shape = shape.as_list()
+    self._buffer = bytearray(tensor_start.content_size_bytes)
+    self._view = memoryview(self._buffer)
+    self._size_bytes = 0
+
+  def is_complete(self) -> bool:
+    return self._size_bytes == len(self._buffer)
+
+  def add_content(self, content: bytes):
+    end = self._size_bytes + len(content)
+    if end > len(self._buffer):
+      raise ValueError('Received more tensor content than expected.')
+    self._view[self._size_bytes:end] = content
+    self._size_bytes = end
+
+  def build(self) -> _DeserializeReturnType:
+    self._view.release()
+    value = np.frombuffer(
+        self._buffer, dtype=self._dtype.as_numpy_dtype).reshape(self._shape)
+    return _tensor_value_and_type(value)
+
+
+@tracing.trace
+def deserialize_value_chunks(
+    chunks: Iterable[executor_pb2.ValueChunk]) -> _DeserializeReturnType:
+  """Deserializes a value from a stream of `executor_pb2.ValueChunk`s.
+
+  The value is reassembled incrementally as `chunks` is consumed: the content
+  of a streamed tensor is copied directly into the buffer backing the
+  deserialized Numpy array, so only one chunk is held in memory in addition to
+  the deserialized value.
+
+  Args:
+    chunks: An iterable of `executor_pb2.ValueChunk`s, as produced by
+      `split_value_into_chunks`.
+
+  Returns:
+    A tuple `(value, type_spec)`, as returned by `deserialize_value`.
+
+  Raises:
+    ValueError: If the chunks are malformed, or do not form exactly one value.
+  """
+  # The builders of the values which have been started but not completed yet,
+  # innermost last.
+  builders = []
+  result = None
+  for chunk in chunks:
+    if result is not None:
+      raise ValueError('Received more chunks after the end of the value.')
+    which_chunk = chunk.WhichOneof('chunk')
+    current = builders[-1] if builders else None
+    completed = None
+    if isinstance(current, _TensorChunksBuilder):
+      if which_chunk != 'tensor_content':
+        raise ValueError('Expected the content of a tensor, found a chunk '
+                         f'with {which_chunk}.')
+      current.add_content(chunk.tensor_content)
+    elif which_chunk == 'value':
+      completed = deserialize_value(chunk.value)
+    elif which_chunk == 'struct_start':
+      builders.append(_StructChunksBuilder(chunk.struct_start))
+    elif which_chunk == 'federated_start':
+      builders.append(_FederatedChunksBuilder(chunk.federated_start))
+    elif which_chunk == 'tensor_start':
+      builders.append(_TensorChunksBuilder(chunk.tensor_start))
+    else:
+      raise ValueError(f'Unexpected chunk with {which_chunk}.')
+    # Complete all the values which are finished by this chunk, and add them
+    # to their enclosing values.
+    while True:
+      if completed is None:
+        if not builders or not builders[-1].is_complete():
+          break
+        completed = builders.pop().build()
+      if not builders:
+        result = completed
+        break
+      builders[-1].add(*completed)
+      completed = None
+  if result is None:
+    raise ValueError('The stream of chunks ended before the end of the value.')
+  return result
+
+
 CardinalitiesType = Mapping[placements.PlacementLiteral, int]
 
 
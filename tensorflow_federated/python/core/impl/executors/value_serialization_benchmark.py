@@ -0,0 +1,92 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for serializing tensor values.
+
+Run with `--benchmarks=.` to report the serialize and deserialize throughput of
+`value_serialization` for a range of tensor sizes, compared with a round trip
+through `tf.make_tensor_proto` and `tf.make_ndarray`.
+"""
+
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from google.protobuf import any_pb2
+from tensorflow_federated.proto.v0 import executor_pb2
+from tensorflow_federated.python.core.impl.executors import value_serialization
+from tensorflow_federated.python.core.impl.types import computation_types
+
+_TENSOR_SIZES_BYTES = (1024, 1024**2, 16 * 1024**2, 128 * 1024**2)
+_ITERS = 5
+
+
+def _serialize_with_make_tensor_proto(value):
+  any_pb = any_pb2.Any()
+  any_pb.Pack(tf.make_tensor_proto(value))
+  return executor_pb2.Value(tensor=any_pb)
+
+
+def _deserialize_with_make_ndarray(value_proto):
+  tensor_proto = tf.make_tensor_proto(values=0)
+  value_proto.tensor.Unpack(tensor_proto)
+  return tf.make_ndarray(tensor_proto)
+
+
+def _median_wall_time(fn, arg):
+  wall_times = []
+  for _ in range(_ITERS):
+    start_time = time.perf_counter()
+    fn(arg)
+    wall_times.append(time.perf_counter() - start_time)
+  return np.median(wall_times)
+
+
+class ValueSerializationBenchmark(tf.test.Benchmark):
+
+  def _report(self, name, size_bytes, wall_time):
+    self.report_benchmark(
+        iters=_ITERS,
+        wall_time=wall_time,
+        name=name,
+        extras={
+            'size_bytes': size_bytes,
+            'throughput_mb_per_sec': size_bytes / wall_time / 1024**2,
+        })
+
+  def benchmark_tensor_serialization(self):
+    for size_bytes in _TENSOR_SIZES_BYTES:
+      value = np.random.random([size_bytes // 4]).astype(np.float32)
+      type_spec = computation_types.TensorType(tf.float32, value.shape)
+
+      def serialize(x, type_spec=type_spec):
+        value_proto, _ = value_serialization.serialize_value(x, type_spec)
+        return value_proto
+
+      value_proto = serialize(value)
+      self._report(f'serialize_raw_buffer_{size_bytes}_bytes', size_bytes,
+                   _median_wall_time(serialize, value))
+      self._report(f'deserialize_raw_buffer_{size_bytes}_bytes', size_bytes,
+                   _median_wall_time(value_serialization.deserialize_value,
+                                     value_proto))
+      self._report(f'serialize_make_tensor_proto_{size_bytes}_bytes',
+                   size_bytes,
+                   _median_wall_time(_serialize_with_make_tensor_proto, value))
+      self._report(f'deserialize_make_ndarray_{size_bytes}_bytes', size_bytes,
+                   _median_wall_time(_deserialize_with_make_ndarray,
+                                     value_proto))
+
+
+if __name__ == '__main__':
+  tf.test.main()
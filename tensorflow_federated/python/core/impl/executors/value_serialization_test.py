@@ -19,6 +19,7 @@ from absl.testing import parameterized
 import numpy as np
 import tensorflow as tf
 
+from google.protobuf import any_pb2
 from tensorflow_federated.proto.v0 import computation_pb2
 from tensorflow_federated.proto.v0 import executor_pb2
 from tensorflow_federated.python.common_libs import structure
@@ -94,6 +95,65 @@ class ValueSerializationtest(tf.test.TestCase, parameterized.TestCase):
     self.assertEqual(y.dtype, serialize_type_spec.dtype.as_numpy_dtype)
     self.assertAllEqual(x, y)
 
+  @parameterized.named_parameters(
+      ('bool', np.array([True, False, True]), tf.bool),
+      ('int8', np.arange(6, dtype=np.int8).reshape([2, 3]), tf.int8),
+      ('int64', np.arange(6, dtype=np.int64), tf.int64),
+      ('float16', np.ones([2, 2], dtype=np.float16), tf.float16),
+      ('float32', np.ones([2, 2, 2], dtype=np.float32), tf.float32),
+      ('float64_big_endian', np.arange(4, dtype='>f8'), tf.float64),
+      ('complex64', np.array([1 + 2j, 3 - 4j], dtype=np.complex64),
+       tf.complex64),
+      ('non_contiguous', np.arange(12, dtype=np.int32).reshape([3, 4])[:, ::2],
+       tf.int32),
+  )
+  def test_serialize_deserialize_tensor_value_as_raw_buffer(self, x, dtype):
+    type_spec = TensorType(dtype, x.shape)
+    value_proto, _ = value_serialization.serialize_value(x, type_spec)
+
+    tensor_proto = tf.make_tensor_proto(values=0)
+    self.assertTrue(value_proto.tensor.Unpack(tensor_proto))
+    self.assertNotEmpty(tensor_proto.tensor_content)
+    y, deserialize_type_spec = value_serialization.deserialize_value(
+        value_proto)
+    type_test_utils.assert_types_identical(deserialize_type_spec, type_spec)
+    self.assertEqual(y.dtype, dtype.as_numpy_dtype)
+    self.assertAllEqual(x, y)
+    self.assertFalse(y.flags.writeable)
+
+  def test_deserialize_tensor_value_as_raw_buffer_is_read_only(self):
+    x = np.arange(6, dtype=np.int32)
+    value_proto, _ = value_serialization.serialize_value(
+        x, TensorType(tf.int32, [6]))
+
+    y, _ = value_serialization.deserialize_value(value_proto)
+
+    with self.assertRaises(ValueError):
+      y[0] = 10
+    z, _ = value_serialization.deserialize_value(value_proto)
+    self.assertAllEqual(z, x)
+
+  def test_deserialize_scalar_tensor_value_as_raw_buffer_returns_scalar(self):
+    value_proto, _ = value_serialization.serialize_value(
+        np.array(5, dtype=np.int32), TensorType(tf.int32))
+
+    y, _ = value_serialization.deserialize_value(value_proto)
+
+    self.assertIsInstance(y, np.int32)
+    self.assertEqual(y, 5)
+
+  def test_deserialize_tensor_value_from_make_tensor_proto(self):
+    x = np.arange(6, dtype=np.float32).reshape([2, 3])
+    any_pb = any_pb2.Any()
+    any_pb.Pack(tf.make_tensor_proto(x))
+    value_proto = executor_pb2.Value(tensor=any_pb)
+
+    y, type_spec = value_serialization.deserialize_value(value_proto)
+
+    type_test_utils.assert_types_identical(type_spec,
+                                           TensorType(tf.float32, [2, 3]))
+    self.assertAllEqual(x, y)
+
   @parameterized.named_parameters(
       ('int32_array', [1, 2, 3], np.int32),
       ('int64_array', [1, 2, 3], np.int64),
@@ -666,6 +726,108 @@ class DatasetSerializationTest(tf.test.TestCase):
       self.assertAllClose(actual, expected)
 
 
+class ValueChunksTest(tf.test.TestCase, parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('one_chunk', 1024 * 1024),
+      ('many_chunks', 100),
+      ('uneven_chunks', 333),
+  )
+  def test_split_deserialize_struct_value(self, max_chunk_size_bytes):
+    x = collections.OrderedDict(
+        a=np.arange(1000, dtype=np.float32).reshape([10, 100]),
+        b=[np.int64(10), np.ones([300], dtype=np.int32)],
+        c=np.array(['a', 'b']))
+    x_type = computation_types.to_type(
+        collections.OrderedDict(
+            a=computation_types.TensorType(tf.float32, [10, 100]),
+            b=[tf.int64, computation_types.TensorType(tf.int32, [300])],
+            c=computation_types.TensorType(tf.string, [2])))
+    value_proto, _ = value_serialization.serialize_value(x, x_type)
+
+    chunks = list(
+        value_serialization.split_value_into_chunks(value_proto,
+                                                    max_chunk_size_bytes))
+    y, y_type = value_serialization.deserialize_value_chunks(chunks)
+
+    for chunk in chunks:
+      if chunk.WhichOneof('chunk') == 'tensor_content':
+        self.assertLessEqual(len(chunk.tensor_content), max_chunk_size_bytes)
+    # Don't assert on the Python container since it is lost in serialization.
+    type_test_utils.assert_types_equivalent(y_type, x_type)
+    self.assertAllEqual(y.a, x['a'])
+    self.assertEqual(y.b[0], 10)
+    self.assertAllEqual(y.b[1], x['b'][1])
+    self.assertAllEqual(y.c, [b'a', b'b'])
+
+  def test_split_deserialize_federated_value(self):
+    x = [np.full([100], i, dtype=np.float32) for i in range(3)]
+    x_type = computation_types.at_clients(
+        computation_types.TensorType(tf.float32, [100]))
+    value_proto, _ = value_serialization.serialize_value(x, x_type)
+
+    chunks = value_serialization.split_value_into_chunks(value_proto, 64)
+    y, y_type = value_serialization.deserialize_value_chunks(chunks)
+
+    type_test_utils.assert_types_identical(y_type, x_type)
+    self.assertLen(y, 3)
+    for y_member, x_member in zip(y, x):
+      self.assertAllEqual(y_member, x_member)
+
+  def test_split_deserialize_empty_tensor_value(self):
+    x = np.zeros([0, 1000], dtype=np.float32)
+    x_type = computation_types.TensorType(tf.float32, [0, 1000])
+    value_proto, _ = value_serialization.serialize_value(x, x_type)
+
+    chunks = value_serialization.split_value_into_chunks(value_proto, 1)
+    y, y_type = value_serialization.deserialize_value_chunks(chunks)
+
+    type_test_utils.assert_types_identical(y_type, x_type)
+    self.assertAllEqual(y, x)
+
+  def test_split_raises_value_error_with_non_positive_chunk_size(self):
+    value_proto, _ = value_serialization.serialize_value(10, tf.int32)
+    with self.assertRaises(ValueError):
+      value_serialization.split_value_into_chunks(value_proto, 0)
+
+  def test_deserialize_raises_value_error_with_truncated_chunks(self):
+    x = np.ones([100], dtype=np.float32)
+    value_proto, _ = value_serialization.serialize_value(
+        x, computation_types.TensorType(tf.float32, [100]))
+    chunks = list(value_serialization.split_value_into_chunks(value_proto, 64))
+
+    with self.assertRaises(ValueError):
+      value_serialization.deserialize_value_chunks(chunks[:-1])
+
+  def test_deserialize_raises_value_error_with_trailing_chunks(self):
+    value_proto, _ = value_serialization.serialize_value(10, tf.int32)
+    chunks = list(
+        value_serialization.split_value_into_chunks(value_proto, 1024))
+
+    with self.assertRaises(ValueError):
+      value_serialization.deserialize_value_chunks(chunks * 2)
+
+  @parameterized.named_parameters(
+      ('too_large', [4], 10**12),
+      ('too_small', [4], 8),
+      ('undefined_shape', [-1], 16),
+  )
+  def test_deserialize_raises_value_error_with_malformed_tensor_start(
+      self, shape, content_size_bytes):
+    tensor_proto = tf.make_tensor_proto(np.zeros([4], dtype=np.float32))
+    tensor_proto.ClearField('tensor_content')
+    for dim, size in zip(tensor_proto.tensor_shape.dim, shape):
+      dim.size = size
+    header_pb = any_pb2.Any()
+    header_pb.Pack(tensor_proto)
+    tensor_start = executor_pb2.ValueChunk.TensorStart(
+        tensor=header_pb, content_size_bytes=content_size_bytes)
+    chunks = [executor_pb2.ValueChunk(tensor_start=tensor_start)]
+
+    with self.assertRaises(ValueError):
+      value_serialization.deserialize_value_chunks(chunks)
+
+
 class SerializeCardinalitiesTest(tf.test.TestCase):
 
   def test_serialize_deserialize_clients_and_server_cardinalities_roundtrip(
@@ -261,9 +261,17 @@ class Type(metaclass=abc.ABCMeta):
     if not self.is_assignable_from(source_type):
       raise TypeNotAssignableError(source_type=source_type, target_type=self)
 
-  @abc.abstractmethod
   def is_assignable_from(self, source_type: 'Type') -> bool:
     """Returns whether values of `source_type` can be cast to this type."""
+    result = _assignable_cache.get(self, source_type)
+    if result is None:
+      result = self._is_assignable_from(source_type)
+      _assignable_cache.put(self, source_type, result)
+    return result
+
+  @abc.abstractmethod
+  def _is_assignable_from(self, source_type: 'Type') -> bool:
+    """Uncached implementation of `is_assignable_from`."""
     raise NotImplementedError
 
   def check_equivalent_to(self, other: 'Type') -> None:
@@ -273,7 +281,11 @@ class Type(metaclass=abc.ABCMeta):
 
   def is_equivalent_to(self, other: 'Type') -> bool:
     """Returns whether values of `other` can be cast to and from this type."""
-    return self.is_assignable_from(other) and other.is_assignable_from(self)
+    result = _equivalent_cache.get(self, other)
+    if result is None:
+      result = self.is_assignable_from(other) and other.is_assignable_from(self)
+      _equivalent_cache.put(self, other, result)
+    return result
 
   def check_identical_to(self, other: 'Type') -> None:
     """Raises if `other` and `Type` are not exactly identical."""
@@ -493,7 +505,7 @@ class TensorType(Type, metaclass=_Intern):
             (isinstance(other, TensorType) and self._dtype == other.dtype and
              tensor_utils.same_shape(self._shape, other.shape)))
 
-  def is_assignable_from(self, source_type: 'Type') -> bool:
+  def _is_assignable_from(self, source_type: 'Type') -> bool:
     if self is source_type:
       return True
     if (not isinstance(source_type, TensorType) or
@@ -617,7 +629,7 @@ class StructType(structure.Struct, Type, metaclass=_Intern):
     return (self is other) or (isinstance(other, StructType) and
                                structure.Struct.__eq__(self, other))
 
-  def is_assignable_from(self, source_type: 'Type') -> bool:
+  def _is_assignable_from(self, source_type: 'Type') -> bool:
     if self is source_type:
       return True
     if not isinstance(source_type, StructType):
@@ -740,7 +752,7 @@ class SequenceType(Type, metaclass=_Intern):
     return ((self is other) or (isinstance(other, SequenceType) and
                                 self._element == other.element))
 
-  def is_assignable_from(self, source_type: 'Type') -> bool:
+  def _is_assignable_from(self, source_type: 'Type') -> bool:
     if self is source_type:
       return True
     return ((isinstance(source_type, SequenceType) and
@@ -795,7 +807,7 @@ class FunctionType(Type, metaclass=_Intern):
                                 self._parameter == other.parameter and
                                 self._result == other.result))
 
-  def is_assignable_from(self, source_type: 'Type') -> bool:
+  def _is_assignable_from(self, source_type: 'Type') -> bool:
     if self is source_type:
       return True
     if not isinstance(source_type, FunctionType):
@@ -847,7 +859,7 @@ class AbstractType(Type, metaclass=_Intern):
     return (self is other) or (isinstance(other, AbstractType) and
                                self._label == other.label)
 
-  def is_assignable_from(self, source_type: 'Type') -> bool:
+  def _is_assignable_from(self, source_type: 'Type') -> bool:
     del source_type  # Unused.
     # TODO(b/113112108): Revise this to extend the relation of assignability to
     # abstract types.
@@ -884,7 +896,7 @@ class PlacementType(Type, metaclass=_Intern):
   def __eq__(self, other):
     return (self is other) or isinstance(other, PlacementType)
 
-  def is_assignable_from(self, source_type: 'Type') -> bool:
+  def _is_assignable_from(self, source_type: 'Type') -> bool:
     if self is source_type:
       return True
     return isinstance(source_type, PlacementType)
@@ -963,7 +975,7 @@ class FederatedType(Type, metaclass=_Intern):
                                 self._placement == other.placement and
                                 self._all_equal == other.all_equal))
 
-  def is_assignable_from(self, source_type: 'Type') -> bool:
+  def _is_assignable_from(self, source_type: 'Type') -> bool:
     if self is source_type:
       return True
     return (isinstance(source_type, FederatedType) and
@@ -1214,6 +1226,112 @@ def _possibly_disallowed_children(
   return disallowed
 
 
+class _TypePairCache:
+  """A bounded cache of results for pairs of types, keyed by their identity.
+
+  Types are interned, so types constructed from the same arguments are the
+  same object, and looking up a pair of types by identity is O(1) regardless of
+  the size of the types, unlike hashing them as `WeakKeyDictionary` keys does.
+
+  Interned types are never destroyed, so the cache is bounded by evicting the
+  least recently used entry once it holds `max_size` entries. The cache holds
+  only weak references to the types, and the entries for a type that is
+  destroyed are also evicted, before its `id` can be reused by another object.
+  """
+
+  def __init__(self, max_size: int):
+    self._max_size = max_size
+    self._results: collections.OrderedDict[tuple[int, int],
+                                           bool] = collections.OrderedDict()
+    self._keys_by_id: dict[int, set[tuple[int, int]]] = {}
+    self._refs: dict[int, weakref.ref] = {}
+
+  def __len__(self):
+    return len(self._results)
+
+  def get(self, first: Type, second: Any) -> Optional[bool]:
+    """Returns the cached result for `(first, second)`, or `None`."""
+    key = (id(first), id(second))
+    result = self._results.get(key)
+    if result is not None:
+      try:
+        self._results.move_to_end(key)
+      except KeyError:
+        # The entry was evicted concurrently.
+        pass
+    return result
+
+  def put(self, first: Type, second: Any, result: bool) -> None:
+    """Caches `result` for `(first, second)` if `second` is a `Type`."""
+    if not isinstance(second, Type):
+      return
+    key = (id(first), id(second))
+    for type_signature in (first, second):
+      type_id = id(type_signature)
+      if type_id not in self._refs:
+        self._refs[type_id] = weakref.ref(type_signature,
+                                          self._make_evict_fn(type_id))
+      self._keys_by_id.setdefault(type_id, set()).add(key)
+    self._results[key] = result
+    while len(self._results) > self._max_size:
+      try:
+        evicted_key, _ = self._results.popitem(last=False)
+      except KeyError:
+        break
+      for type_id in evicted_key:
+        self._discard_key(type_id, evicted_key)
+
+  def _discard_key(self, type_id: int, key: tuple[int, int]) -> None:
+    """Forgets that `key` refers to `type_id`, dropping unused references."""
+    keys = self._keys_by_id.get(type_id)
+    if keys is None:
+      return
+    keys.discard(key)
+    if not keys:
+      self._keys_by_id.pop(type_id, None)
+      self._refs.pop(type_id, None)
+
+  def _make_evict_fn(self, type_id: int):
+
+    def evict(ref):
+      del ref  # Unused.
+      self._refs.pop(type_id, None)
+      for key in self._keys_by_id.pop(type_id, ()):
+        self._results.pop(key, None)
+        for other_id in key:
+          if other_id != type_id:
+            other_keys = self._keys_by_id.get(other_id)
+            if other_keys is not None:
+              other_keys.discard(key)
+
+    return evict
+
+  def clear(self) -> None:
+    """Removes all entries, dropping the weak references and their callbacks."""
+    self._results.clear()
+    self._keys_by_id.clear()
+    self._refs.clear()
+
+
+# The maximum number of pairs of types whose results are cached for each of
+# `Type.is_assignable_from` and `Type.is_equivalent_to`.
+_TYPE_PAIR_CACHE_SIZE = 10000
+
+
+_assignable_cache = _TypePairCache(_TYPE_PAIR_CACHE_SIZE)
+_equivalent_cache = _TypePairCache(_TYPE_PAIR_CACHE_SIZE)
+
+
+def _clear_type_pair_caches():
+  # As with the caches above, clear the caches at the end of the program so
+  # that no eviction callbacks run while Python is tearing down modules.
+  _assignable_cache.clear()
+  _equivalent_cache.clear()
+
+
+atexit.register(_clear_type_pair_caches)
+
+
 _FEDERATED_TYPES = 'federated types (types placed @CLIENT or @SERVER)'
 _FUNCTION_TYPES = 'function types'
 _SEQUENCE_TYPES = 'sequence types'
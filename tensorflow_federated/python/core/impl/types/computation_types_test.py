@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import collections
+import gc
 import sys
 
 from absl.testing import absltest
@@ -1021,5 +1022,111 @@ class CheckWellFormedTest(parameterized.TestCase):
       create_type_signature()
 
 
+class _UninternedType(computation_types.Type):
+  """A type which is not interned, so that it can be garbage collected."""
+
+  def children(self):
+    return iter(())
+
+  def __repr__(self):
+    return '_UninternedType()'
+
+  def __hash__(self):
+    return id(self)
+
+  def __eq__(self, other):
+    return self is other
+
+  def _is_assignable_from(self, source_type):
+    return self is source_type
+
+
+class TypePairCacheTest(absltest.TestCase):
+
+  def test_is_assignable_from_caches_result(self):
+    target_type = computation_types.StructType([(tf.int32, [None])] * 10)
+    source_type = computation_types.StructType([(tf.int32, [3])] * 10)
+    cache = computation_types._assignable_cache  # pylint: disable=protected-access
+
+    self.assertTrue(target_type.is_assignable_from(source_type))
+    self.assertFalse(source_type.is_assignable_from(target_type))
+
+    self.assertTrue(cache.get(target_type, source_type))
+    self.assertFalse(cache.get(source_type, target_type))
+
+  def test_is_equivalent_to_caches_result(self):
+    first_type = computation_types.FederatedType(tf.int32, placements.CLIENTS)
+    second_type = computation_types.FederatedType(tf.float32,
+                                                  placements.CLIENTS)
+    cache = computation_types._equivalent_cache  # pylint: disable=protected-access
+
+    self.assertFalse(first_type.is_equivalent_to(second_type))
+
+    self.assertFalse(cache.get(first_type, second_type))
+    self.assertIsNone(cache.get(second_type, first_type))
+
+  def test_does_not_cache_abstract_type_errors(self):
+    abstract_type = computation_types.AbstractType('T')
+    for _ in range(2):
+      with self.assertRaises(TypeError):
+        abstract_type.is_assignable_from(abstract_type)
+
+  def test_evicts_entries_when_type_is_destroyed(self):
+    cache = computation_types._TypePairCache(max_size=10)  # pylint: disable=protected-access
+    first_type = _UninternedType()
+    second_type = _UninternedType()
+    third_type = _UninternedType()
+    cache.put(first_type, second_type, True)
+    cache.put(second_type, third_type, False)
+    self.assertLen(cache, 2)
+
+    del first_type
+    gc.collect()
+
+    self.assertLen(cache, 1)
+    self.assertFalse(cache.get(second_type, third_type))
+
+    del third_type
+    gc.collect()
+
+    self.assertEmpty(cache)
+
+  def test_does_not_cache_non_types(self):
+    cache = computation_types._TypePairCache(max_size=10)  # pylint: disable=protected-access
+    int_type = computation_types.TensorType(tf.int32)
+
+    cache.put(int_type, None, False)
+
+    self.assertEmpty(cache)
+
+  def test_evicts_least_recently_used_entry_when_full(self):
+    cache = computation_types._TypePairCache(max_size=2)  # pylint: disable=protected-access
+    int_type = computation_types.TensorType(tf.int32)
+    float_type = computation_types.TensorType(tf.float32)
+    struct_type = computation_types.StructType([tf.int32, tf.float32])
+    cache.put(int_type, float_type, False)
+    cache.put(int_type, struct_type, False)
+
+    # Using the first entry makes the second the least recently used.
+    self.assertFalse(cache.get(int_type, float_type))
+    cache.put(struct_type, int_type, False)
+
+    self.assertLen(cache, 2)
+    self.assertFalse(cache.get(int_type, float_type))
+    self.assertIsNone(cache.get(int_type, struct_type))
+    self.assertFalse(cache.get(struct_type, int_type))
+
+  def test_module_caches_are_bounded(self):
+    cache = computation_types._assignable_cache  # pylint: disable=protected-access
+    max_size = computation_types._TYPE_PAIR_CACHE_SIZE  # pylint: disable=protected-access
+    target_type = computation_types.StructType([(tf.int32, [None])])
+
+    for size in range(max_size + 10):
+      source_type = computation_types.StructType([(tf.int32, [size])])
+      self.assertTrue(target_type.is_assignable_from(source_type))
+
+    self.assertLen(cache, max_size)
+
+
 if __name__ == '__main__':
   absltest.main()
@@ -24,6 +24,8 @@ from tensorflow_federated.python.program.federated_context import check_in_feder
 from tensorflow_federated.python.program.federated_context import contains_only_server_placed_data
 from tensorflow_federated.python.program.federated_context import FederatedContext
 from tensorflow_federated.python.program.file_program_state_manager import FileProgramStateManager
+from tensorflow_federated.python.program.file_program_state_manager import ProgramStateFormat
+from tensorflow_federated.python.program.file_release_manager import AppendOnlyCSVFileReleaseManager
 from tensorflow_federated.python.program.file_release_manager import CSVFileReleaseManager
 from tensorflow_federated.python.program.file_release_manager import CSVSaveMode
 from tensorflow_federated.python.program.file_release_manager import FileReleaseManagerIncompatibleFileError
@@ -36,6 +38,7 @@ from tensorflow_federated.python.program.native_platform import NativeFederatedC
 from tensorflow_federated.python.program.prefetching_data_source import FetchedValue
 from tensorflow_federated.python.program.prefetching_data_source import PrefetchingDataSource
 from tensorflow_federated.python.program.prefetching_data_source import PrefetchingDataSourceIterator
+from tensorflow_federated.python.program.prefetching_data_source import PrefetchingMetrics
 from tensorflow_federated.python.program.program_state_manager import ProgramStateManager
 from tensorflow_federated.python.program.program_state_manager import ProgramStateManagerStateAlreadyExistsError
 from tensorflow_federated.python.program.program_state_manager import ProgramStateManagerStateNotFoundError
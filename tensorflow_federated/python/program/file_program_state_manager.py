@@ -21,6 +21,7 @@ means that this library:
 """
 
 import asyncio
+import enum
 import os
 import os.path
 from typing import Any, Optional, Union
@@ -36,6 +37,21 @@ from tensorflow_federated.python.program import program_state_manager
 from tensorflow_federated.python.program import value_reference
 
 
+@enum.unique
+class ProgramStateFormat(enum.Enum):
+  """The file format used to save program state.
+
+  Attributes:
+    SAVED_MODEL: The program state is saved using the SavedModel format.
+    TENSOR_ARCHIVE: The program state is saved as the raw content of each value
+      and an index (see `file_utils.write_tensor_archive`). Saving and loading
+      does not build a TensorFlow graph and values can be memory-mapped when
+      loaded from the local file system.
+  """
+  SAVED_MODEL = 'saved_model'
+  TENSOR_ARCHIVE = 'tensor_archive'
+
+
 class FileProgramStateManager(program_state_manager.ProgramStateManager):
   """A `tff.program.ProgramStateManager` that is backed by a file system.
 
@@ -51,9 +67,29 @@ class FileProgramStateManager(program_state_manager.ProgramStateManager):
   using the SavedModel format. The structure of the program state is discarded,
   but is required to load the program state.
 
-  Note: The SavedModel format can only contain values that can be converted to a
+  Alternatively, program state can be saved using the
+  `tff.program.ProgramStateFormat.TENSOR_ARCHIVE` format, which writes the raw
+  content of each flattened value, optionally split into shards that are
+  written in parallel. This format is much faster to save and load than the
+  SavedModel format for large program state, and loaded values are lazily read
+  from memory-mapped files when the program state is on the local file system.
+  Program state is loaded using the format it was saved with, regardless of
+  `state_format`.
+
+  When using the `tff.program.ProgramStateFormat.TENSOR_ARCHIVE` format,
+  program state can also be saved incrementally by setting
+  `full_snapshot_interval` to a value greater than one. In this case, a full
+  snapshot of the program state is saved every `full_snapshot_interval`
+  versions, and the versions in between only save the values that changed since
+  the previous version, identified by a digest of their content. The values
+  that did not change refer to the version they were saved in, and are read
+  from that version when the program state is loaded. A saved program state is
+  not removed while a kept program state refers to it.
+
+  Note: Both formats can only contain values that can be converted to a
   `tf.Tensor` (see `tf.convert_to_tensor`), releasing any other values will
-  result in an error.
+  result in an error. Additionally, the tensor archive format can not contain
+  `tf.data.Dataset`s.
 
   See https://www.tensorflow.org/guide/saved_model for more information about
   the SavedModel format.
@@ -63,7 +99,11 @@ class FileProgramStateManager(program_state_manager.ProgramStateManager):
                root_dir: Union[str, os.PathLike[str]],
                prefix: str = 'program_state_',
                keep_total: int = 5,
-               keep_first: bool = True):
+               keep_first: bool = True,
+               state_format: ProgramStateFormat = ProgramStateFormat
+               .SAVED_MODEL,
+               num_shards: int = 1,
+               full_snapshot_interval: int = 1):
     """Returns an initialized `tff.program.ProgramStateManager`.
 
     Args:
@@ -79,9 +119,21 @@ class FileProgramStateManager(program_state_manager.ProgramStateManager):
         weights or optimizer states are initialized randomly. By loading from
         the initial program state, one can avoid re-initializing and obtaining
         different results.
+      state_format: A `tff.program.ProgramStateFormat` used to save program
+        state.
+      num_shards: The number of files to write in parallel when saving program
+        state using the `tff.program.ProgramStateFormat.TENSOR_ARCHIVE` format.
+      full_snapshot_interval: The number of versions between full snapshots of
+        the program state. If the value is greater than one, the versions in
+        between only save the values that changed since the previous version.
+        This requires the `tff.program.ProgramStateFormat.TENSOR_ARCHIVE`
+        format.
 
     Raises:
-      ValueError: If `root_dir` is an empty string.
+      ValueError: If `root_dir` is an empty string, `num_shards` or
+        `full_snapshot_interval` is not positive, or `full_snapshot_interval` is
+        greater than one and `state_format` is not
+        `tff.program.ProgramStateFormat.TENSOR_ARCHIVE`.
     """
     py_typecheck.check_type(root_dir, (str, os.PathLike))
     if not root_dir:
@@ -89,6 +141,22 @@ class FileProgramStateManager(program_state_manager.ProgramStateManager):
     py_typecheck.check_type(prefix, str)
     py_typecheck.check_type(keep_total, int)
     py_typecheck.check_type(keep_first, bool)
+    py_typecheck.check_type(state_format, ProgramStateFormat)
+    py_typecheck.check_type(num_shards, int)
+    if num_shards < 1:
+      raise ValueError(
+          f'Expected `num_shards` to be positive, found {num_shards}.')
+    py_typecheck.check_type(full_snapshot_interval, int)
+    if full_snapshot_interval < 1:
+      raise ValueError(
+          'Expected `full_snapshot_interval` to be positive, found '
+          f'{full_snapshot_interval}.')
+    if (full_snapshot_interval > 1 and
+        state_format != ProgramStateFormat.TENSOR_ARCHIVE):
+      raise ValueError(
+          'Expected `state_format` to be `ProgramStateFormat.TENSOR_ARCHIVE` '
+          'when `full_snapshot_interval` is greater than one, found '
+          f'{state_format}.')
 
     if not tf.io.gfile.exists(root_dir):
       tf.io.gfile.makedirs(root_dir)
@@ -96,6 +164,9 @@ class FileProgramStateManager(program_state_manager.ProgramStateManager):
     self._prefix = prefix
     self._keep_total = keep_total
     self._keep_first = keep_first
+    self._state_format = state_format
+    self._num_shards = num_shards
+    self._full_snapshot_interval = full_snapshot_interval
 
   async def get_versions(self) -> Optional[list[int]]:
     """Returns a list of saved versions or `None`.
@@ -175,7 +246,16 @@ class FileProgramStateManager(program_state_manager.ProgramStateManager):
     if not await file_utils.exists(path):
       raise program_state_manager.ProgramStateManagerStateNotFoundError(
           f'No program state found for version: {version}')
-    flattened_state = await file_utils.read_saved_model(path)
+    index_path = os.path.join(path, file_utils.TENSOR_ARCHIVE_INDEX_FILENAME)
+    if await file_utils.exists(index_path):
+      metadata = await file_utils.read_tensor_archive_metadata(path)
+      if metadata is not None:
+        flattened_state = await self._read_incremental_program_state(
+            version, metadata)
+      else:
+        flattened_state = await file_utils.read_tensor_archive(path)
+    else:
+      flattened_state = await file_utils.read_saved_model(path)
     try:
       program_state = tree.unflatten_as(structure, flattened_state)
     except ValueError as e:
@@ -205,6 +285,107 @@ class FileProgramStateManager(program_state_manager.ProgramStateManager):
     logging.info('Program state loaded: %s', path)
     return normalized_value
 
+  async def _read_metadata(self, version: int) -> Optional[dict[str, Any]]:
+    """Returns the metadata of incremental program state or `None`.
+
+    Args:
+      version: The version of a saved program state.
+
+    Returns:
+      The metadata written by `_write_incremental_program_state` for the given
+      `version`, or `None` if the program state for the given `version` does
+      not exist or was not saved incrementally.
+    """
+    path = self._get_path_for_version(version)
+    index_path = os.path.join(path, file_utils.TENSOR_ARCHIVE_INDEX_FILENAME)
+    if not await file_utils.exists(index_path):
+      return None
+    return await file_utils.read_tensor_archive_metadata(path)
+
+  async def _read_incremental_program_state(
+      self, version: int, metadata: dict[str, Any]) -> list[Any]:
+    """Returns the flattened program state described by `metadata`.
+
+    Args:
+      version: The version of the saved program state.
+      metadata: The metadata written by `_write_incremental_program_state`.
+
+    Raises:
+      ProgramStateManagerStateNotFoundError: If the program state of a version
+        referred to by `metadata` does not exist.
+    """
+    referenced_versions = sorted(set(v for v, _ in metadata['leaves']))
+    referenced_paths = [
+        self._get_path_for_version(v) for v in referenced_versions
+    ]
+    for referenced_version, path in zip(referenced_versions, referenced_paths):
+      if not await file_utils.exists(path):
+        raise program_state_manager.ProgramStateManagerStateNotFoundError(
+            f'No program state found for version: {referenced_version}, '
+            f'required to load version: {version}')
+    values = await asyncio.gather(
+        *[file_utils.read_tensor_archive(p) for p in referenced_paths])
+    values_by_version = dict(zip(referenced_versions, values))
+    return [values_by_version[v][i] for v, i in metadata['leaves']]
+
+  async def _write_incremental_program_state(self, flattened_state: list[Any],
+                                             version: int, path: str) -> None:
+    """Writes `flattened_state` incrementally to `path`.
+
+    If the previous version was saved incrementally, has the same number of
+    values, and is fewer than `full_snapshot_interval` versions away from a full
+    snapshot, only the values whose digests differ from the previous version are
+    written. Otherwise, all the values are written as a full snapshot.
+
+    The metadata of the tensor archive records, for each value, the version and
+    position it is stored at, the digest of its content, and the number of
+    versions since the last full snapshot.
+
+    Args:
+      flattened_state: The flattened program state to write.
+      version: The version of the program state.
+      path: The path to write the program state to.
+    """
+    loop = asyncio.get_running_loop()
+    digests = await loop.run_in_executor(
+        None, lambda: [file_utils.get_tensor_archive_digest(x)
+                       for x in flattened_state])
+
+    versions = await self.get_versions()
+    previous_versions = [v for v in versions or [] if v < version]
+    if previous_versions:
+      previous_metadata = await self._read_metadata(previous_versions[-1])
+    else:
+      previous_metadata = None
+
+    version = int(version)
+    if (previous_metadata is None or previous_metadata['num_deltas'] + 1 >=
+        self._full_snapshot_interval or
+        len(previous_metadata['digests']) != len(digests)):
+      values = flattened_state
+      leaves = [[version, i] for i in range(len(flattened_state))]
+      num_deltas = 0
+    else:
+      values = []
+      leaves = []
+      for value, digest, previous_digest, previous_leaf in zip(
+          flattened_state, digests, previous_metadata['digests'],
+          previous_metadata['leaves']):
+        if digest == previous_digest:
+          leaves.append(previous_leaf)
+        else:
+          leaves.append([version, len(values)])
+          values.append(value)
+      num_deltas = previous_metadata['num_deltas'] + 1
+
+    metadata = {
+        'leaves': leaves,
+        'digests': digests,
+        'num_deltas': num_deltas,
+    }
+    await file_utils.write_tensor_archive(
+        values, path, num_shards=self._num_shards, metadata=metadata)
+
   async def _remove(self, version: int) -> None:
     """Removes program state for the given `version`."""
     py_typecheck.check_type(version, (int, np.integer))
@@ -222,7 +403,19 @@ class FileProgramStateManager(program_state_manager.ProgramStateManager):
     if versions is not None and len(versions) > self._keep_total:
       start = 1 if self._keep_first else 0
       stop = start - self._keep_total
-      await asyncio.gather(*[self._remove(v) for v in versions[start:stop]])
+      versions_to_remove = versions[start:stop]
+      if self._full_snapshot_interval > 1:
+        versions_to_keep = [v for v in versions if v not in versions_to_remove]
+        metadata = await asyncio.gather(
+            *[self._read_metadata(v) for v in versions_to_keep])
+        referenced_versions = set()
+        for m in metadata:
+          if m is not None:
+            referenced_versions.update(v for v, _ in m['leaves'])
+        versions_to_remove = [
+            v for v in versions_to_remove if v not in referenced_versions
+        ]
+      await asyncio.gather(*[self._remove(v) for v in versions_to_remove])
 
   async def remove_all(self) -> None:
     """Removes all program states."""
@@ -252,6 +445,13 @@ class FileProgramStateManager(program_state_manager.ProgramStateManager):
           f'Program state already exists for version: {version}')
     materialized_state = await value_reference.materialize_value(program_state)
     flattened_state = tree.flatten(materialized_state)
-    await file_utils.write_saved_model(flattened_state, path)
+    if self._full_snapshot_interval > 1:
+      await self._write_incremental_program_state(flattened_state, version,
+                                                  path)
+    elif self._state_format == ProgramStateFormat.TENSOR_ARCHIVE:
+      await file_utils.write_tensor_archive(
+          flattened_state, path, num_shards=self._num_shards)
+    else:
+      await file_utils.write_saved_model(flattened_state, path)
     logging.info('Program state saved: %s', path)
     await self._remove_old_program_state()
@@ -105,6 +105,46 @@ class FileProgramStateManagerInitTest(parameterized.TestCase):
       file_program_state_manager.FileProgramStateManager(
           root_dir=root_dir, keep_first=keep_first)
 
+  @parameterized.named_parameters(
+      ('none', None),
+      ('str', 'saved_model'),
+      ('list', []),
+  )
+  def test_raises_type_error_with_state_format(self, state_format):
+    root_dir = self.create_tempdir()
+
+    with self.assertRaises(TypeError):
+      file_program_state_manager.FileProgramStateManager(
+          root_dir=root_dir, state_format=state_format)
+
+  @parameterized.named_parameters(
+      ('zero', 0),
+      ('negative', -1),
+  )
+  def test_raises_value_error_with_num_shards(self, num_shards):
+    root_dir = self.create_tempdir()
+
+    with self.assertRaises(ValueError):
+      file_program_state_manager.FileProgramStateManager(
+          root_dir=root_dir, num_shards=num_shards)
+
+  @parameterized.named_parameters(
+      ('zero', 0, file_program_state_manager.ProgramStateFormat.TENSOR_ARCHIVE),
+      ('negative', -1,
+       file_program_state_manager.ProgramStateFormat.TENSOR_ARCHIVE),
+      ('saved_model', 2,
+       file_program_state_manager.ProgramStateFormat.SAVED_MODEL),
+  )
+  def test_raises_value_error_with_full_snapshot_interval(
+      self, full_snapshot_interval, state_format):
+    root_dir = self.create_tempdir()
+
+    with self.assertRaises(ValueError):
+      file_program_state_manager.FileProgramStateManager(
+          root_dir=root_dir,
+          state_format=state_format,
+          full_snapshot_interval=full_snapshot_interval)
+
 
 class FileProgramStateManagerGetVersionsTest(parameterized.TestCase,
                                              unittest.IsolatedAsyncioTestCase):
@@ -368,6 +408,90 @@ class FileProgramStateManagerLoadTest(parameterized.TestCase,
     else:
       self.assertEqual(actual_state, expected_state)
 
+  # pyformat: disable
+  @parameterized.named_parameters(
+      ('none', None, None),
+      ('int', 1, np.int32(1)),
+      ('str', 'a', b'a'),
+      ('numpy_array', np.ones([3], np.int32), np.ones([3], np.int32)),
+      ('dict',
+       {'a': True,
+        'b': program_test_utils.TestMaterializableValueReference(1),
+        'c': np.ones([2, 2], np.float32)},
+       {'a': np.bool_(True), 'b': np.int32(1),
+        'c': np.ones([2, 2], np.float32)}),
+  )
+  # pyformat: enable
+  async def test_returns_saved_program_state_with_tensor_archive_format(
+      self, program_state, expected_state):
+    root_dir = self.create_tempdir()
+    program_state_mngr = file_program_state_manager.FileProgramStateManager(
+        root_dir=root_dir,
+        prefix='a_',
+        state_format=file_program_state_manager.ProgramStateFormat
+        .TENSOR_ARCHIVE,
+        num_shards=2)
+    await program_state_mngr.save(program_state, 1)
+    structure = program_state
+
+    actual_state = await program_state_mngr.load(1, structure)
+
+    program_test_utils.assert_types_equal(actual_state, expected_state)
+    tree.map_structure(np.testing.assert_equal, actual_state, expected_state)
+
+  async def test_returns_saved_program_state_with_other_state_format(self):
+    root_dir = self.create_tempdir()
+    program_state_mngr = file_program_state_manager.FileProgramStateManager(
+        root_dir=root_dir, prefix='a_')
+    tensor_archive_mngr = file_program_state_manager.FileProgramStateManager(
+        root_dir=root_dir,
+        prefix='a_',
+        state_format=file_program_state_manager.ProgramStateFormat
+        .TENSOR_ARCHIVE)
+    await program_state_mngr.save('state_1', 1)
+    await tensor_archive_mngr.save('state_2', 2)
+
+    self.assertEqual(await tensor_archive_mngr.load(1, 'state'), b'state_1')
+    self.assertEqual(await program_state_mngr.load(2, 'state'), b'state_2')
+
+  async def test_returns_saved_program_state_with_full_snapshot_interval(
+      self):
+    root_dir = self.create_tempdir()
+    program_state_mngr = file_program_state_manager.FileProgramStateManager(
+        root_dir=root_dir,
+        prefix='a_',
+        keep_total=0,
+        state_format=file_program_state_manager.ProgramStateFormat
+        .TENSOR_ARCHIVE,
+        full_snapshot_interval=3)
+    program_states = [[np.int32(i // 2), np.ones([3], np.float32) * i]
+                      for i in range(5)]
+    for version, program_state in enumerate(program_states):
+      await program_state_mngr.save(program_state, version)
+    structure = [None, None]
+
+    for version, expected_state in enumerate(program_states):
+      actual_state = await program_state_mngr.load(version, structure)
+
+      tree.map_structure(np.testing.assert_equal, actual_state, expected_state)
+
+  async def test_raises_version_not_found_error_with_removed_snapshot(self):
+    root_dir = self.create_tempdir()
+    program_state_mngr = file_program_state_manager.FileProgramStateManager(
+        root_dir=root_dir,
+        prefix='a_',
+        keep_total=0,
+        state_format=file_program_state_manager.ProgramStateFormat
+        .TENSOR_ARCHIVE,
+        full_snapshot_interval=3)
+    await program_state_mngr.save([1, 2], 1)
+    await program_state_mngr.save([1, 3], 2)
+    shutil.rmtree(os.path.join(root_dir, 'a_1'))
+
+    with self.assertRaises(
+        program_state_manager.ProgramStateManagerStateNotFoundError):
+      await program_state_mngr.load(2, [None, None])
+
   @parameterized.named_parameters(
       ('0', 0),
       ('1', 1),
@@ -540,6 +664,27 @@ class FileProgramStateManagerRemoveOldProgramStateTest(
     self.assertCountEqual(os.listdir(root_dir), ['a_7', 'a_8', 'a_9'])
 
 
+  async def test_does_not_remove_referenced_program_state(self):
+    root_dir = self.create_tempdir()
+    program_state_mngr = file_program_state_manager.FileProgramStateManager(
+        root_dir=root_dir,
+        prefix='a_',
+        keep_total=2,
+        keep_first=False,
+        state_format=file_program_state_manager.ProgramStateFormat
+        .TENSOR_ARCHIVE,
+        full_snapshot_interval=3)
+    for version in range(4):
+      await program_state_mngr.save([1, version], version)
+
+    # Version 2 refers to version 0 and version 3 is a full snapshot.
+    self.assertEqual(await program_state_mngr.get_versions(), [0, 2, 3])
+
+    await program_state_mngr.save([1, 4], 4)
+
+    self.assertEqual(await program_state_mngr.get_versions(), [3, 4])
+
+
 class FileProgramStateManagerRemoveAllTest(absltest.TestCase,
                                            unittest.IsolatedAsyncioTestCase):
 
@@ -657,6 +802,48 @@ class FileProgramStateManagerSaveTest(parameterized.TestCase,
       self.assertEqual(actual_path, expected_path)
       self.assertEqual(kwargs, {})
 
+  async def test_writes_program_state_with_tensor_archive_format(self):
+    root_dir = self.create_tempdir()
+    program_state_mngr = file_program_state_manager.FileProgramStateManager(
+        root_dir=root_dir,
+        prefix='a_',
+        keep_total=0,
+        state_format=file_program_state_manager.ProgramStateFormat
+        .TENSOR_ARCHIVE,
+        num_shards=3)
+
+    with mock.patch.object(
+        file_utils, 'write_tensor_archive') as mock_write_tensor_archive:
+      await program_state_mngr.save([True, 1, 'a'], 1)
+
+      mock_write_tensor_archive.assert_called_once_with(
+          [True, 1, 'a'], os.path.join(root_dir, 'a_1'), num_shards=3)
+
+  async def test_writes_changed_values_with_full_snapshot_interval(self):
+    root_dir = self.create_tempdir()
+    program_state_mngr = file_program_state_manager.FileProgramStateManager(
+        root_dir=root_dir,
+        prefix='a_',
+        keep_total=0,
+        state_format=file_program_state_manager.ProgramStateFormat
+        .TENSOR_ARCHIVE,
+        full_snapshot_interval=2)
+    await program_state_mngr.save([1, 2, 3], 1)
+
+    with mock.patch.object(
+        file_utils,
+        'write_tensor_archive',
+        wraps=file_utils.write_tensor_archive) as mock_write_tensor_archive:
+      await program_state_mngr.save([1, 4, 3], 2)
+      await program_state_mngr.save([1, 4, 3], 3)
+
+      self.assertEqual(mock_write_tensor_archive.call_count, 2)
+      delta_call, full_call = mock_write_tensor_archive.mock_calls
+      _, args, _ = delta_call
+      self.assertEqual(args[0], [4])
+      _, args, _ = full_call
+      self.assertEqual(args[0], [1, 4, 3])
+
   async def test_removes_saved_program_state(self):
     root_dir = self.create_tempdir()
     program_state_mngr = file_program_state_manager.FileProgramStateManager(
@@ -21,13 +21,17 @@ means that this library:
 """
 
 import asyncio
+import bisect
 import collections
 from collections.abc import Iterable, Mapping, Sequence
 import csv
 import enum
+import io
+import json
 import os
 import os.path
 import random
+import threading
 from typing import Any, Union
 
 import numpy as np
@@ -42,6 +46,9 @@ from tensorflow_federated.python.program import structure_utils
 from tensorflow_federated.python.program import value_reference
 
 
+_SCHEMA_SUFFIX = '.schema.json'
+
+
 class FileReleaseManagerIncompatibleFileError(Exception):
   pass
 
@@ -56,6 +63,30 @@ class CSVSaveMode(enum.Enum):
   WRITE = 'write'
 
 
+def _normalize_value(value: Any, key_fieldname: str,
+                     key: int) -> collections.OrderedDict[str, Any]:
+  """Returns a flat mapping of the values to release as a row of a CSV file.
+
+  The value is flattened and each leaf is converted to a nested list of Python
+  scalars. The first item is the `key`, named `key_fieldname`.
+
+  Args:
+    value: A materialized value to release.
+    key_fieldname: The fieldname of the key.
+    key: An integer used to reference the released `value`.
+  """
+
+  def _normalize(value: Any) -> Any:
+    if isinstance(value, tf.data.Dataset):
+      value = list(value)
+    return np.array(value).tolist()
+
+  flattened_value = structure_utils.flatten_with_name(value)
+  normalized_value = [(k, _normalize(v)) for k, v in flattened_value]
+  normalized_value.insert(0, (key_fieldname, key))
+  return collections.OrderedDict(normalized_value)
+
+
 class CSVFileReleaseManager(release_manager.ReleaseManager):
   """A `tff.program.ReleaseManager` that releases values to a CSV file.
 
@@ -278,16 +309,8 @@ class CSVFileReleaseManager(release_manager.ReleaseManager):
         self._remove_values_greater_than(key - 1),
         value_reference.materialize_value(value))
 
-    flattened_value = structure_utils.flatten_with_name(materialized_value)
-
-    def _normalize(value: Any) -> Any:
-      if isinstance(value, tf.data.Dataset):
-        value = list(value)
-      return np.array(value).tolist()
-
-    normalized_value = [(k, _normalize(v)) for k, v in flattened_value]
-    normalized_value.insert(0, (self._key_fieldname, key))
-    normalized_value = collections.OrderedDict(normalized_value)
+    normalized_value = _normalize_value(materialized_value, self._key_fieldname,
+                                        key)
     if self._save_mode == CSVSaveMode.APPEND:
       await self._append_value(normalized_value)
     elif self._save_mode == CSVSaveMode.WRITE:
@@ -295,6 +318,249 @@ class CSVFileReleaseManager(release_manager.ReleaseManager):
     self._latest_key = key
 
 
+class AppendOnlyCSVFileReleaseManager(release_manager.ReleaseManager):
+  """A `tff.program.ReleaseManager` that appends values to a CSV file.
+
+  A `tff.program.AppendOnlyCSVFileReleaseManager` releases values in the same
+  format as a `tff.program.CSVFileReleaseManager`, but never rewrites the file.
+  This keeps the cost of a release constant, no matter how many values have
+  already been released.
+
+  * The fieldnames and the byte offset of the row of each released key are
+    kept in memory, so a release does not read the file.
+  * The header of the CSV file holds the fieldnames of the first released
+    value. If a later value adds fieldnames, the complete list of fieldnames
+    is written to a sidecar schema file, `<file_path>.schema.json`, and the
+    rows are written with all the fieldnames. Use `read_values` to read the
+    file with the fieldnames of the schema.
+  * Rows are buffered in memory. They are written to the file by a background
+    thread every `flush_interval_seconds`, when `max_buffered_rows` rows are
+    buffered, or when `flush` is called.
+  * Removing values truncates the file at the offset of the first removed row.
+
+  Note: This manager truncates files and therefore only supports local file
+  systems, not all the file systems supported by `tf.io.gfile`. Call `close`
+  when the manager is no longer used to write the buffered rows.
+  """
+
+  def __init__(self,
+               file_path: Union[str, os.PathLike[str]],
+               key_fieldname: str = 'key',
+               flush_interval_seconds: float = 1.0,
+               max_buffered_rows: int = 100):
+    """Returns an initialized `tff.program.AppendOnlyCSVFileReleaseManager`.
+
+    Args:
+      file_path: A path on the local file system to save released values. If
+        this file does not exist it will be created.
+      key_fieldname: A `str` specifying the fieldname used for the key when
+        saving released value.
+      flush_interval_seconds: The interval at which the buffered rows are
+        written to the file.
+      max_buffered_rows: The number of buffered rows above which the rows are
+        written to the file when a value is released.
+
+    Raises:
+      ValueError: If `file_path` or `key_fieldname` is an empty string, or if
+        `flush_interval_seconds` or `max_buffered_rows` is not positive.
+      FileReleaseManagerIncompatibleFileError: If the file exists but does not
+        contain a fieldname of `key_fieldname`.
+    """
+    py_typecheck.check_type(file_path, (str, os.PathLike))
+    if not file_path:
+      raise ValueError('Expected `file_path` to not be an empty string.')
+    py_typecheck.check_type(key_fieldname, str)
+    if not key_fieldname:
+      raise ValueError('Expected `key_fieldname` to not be an empty string.')
+    py_typecheck.check_type(flush_interval_seconds, (int, float))
+    if flush_interval_seconds <= 0:
+      raise ValueError(
+          'Expected `flush_interval_seconds` to be positive, found '
+          f'{flush_interval_seconds}.')
+    py_typecheck.check_type(max_buffered_rows, int)
+    if max_buffered_rows <= 0:
+      raise ValueError('Expected `max_buffered_rows` to be positive, found '
+                       f'{max_buffered_rows}.')
+
+    self._file_path = os.fspath(file_path)
+    self._schema_path = f'{self._file_path}{_SCHEMA_SUFFIX}'
+    self._key_fieldname = key_fieldname
+    self._flush_interval_seconds = flush_interval_seconds
+    self._max_buffered_rows = max_buffered_rows
+
+    file_dir = os.path.dirname(self._file_path)
+    if file_dir:
+      os.makedirs(file_dir, exist_ok=True)
+    # The fieldnames written to the header of the file, and the fieldnames of
+    # all the values released so far.
+    self._header_fieldnames = []
+    self._fieldnames = []
+    # The released keys, in increasing order, and the byte offset of the row of
+    # each key. Includes the rows which are buffered.
+    self._keys = []
+    self._offsets = []
+    self._size_bytes = 0
+    self._buffer = []
+    self._lock = threading.Lock()
+    self._load_index()
+
+    self._closed = threading.Event()
+    self._flush_thread = threading.Thread(
+        target=self._flush_periodically,
+        name='append_only_csv_file_release_manager',
+        daemon=True)
+    self._flush_thread.start()
+
+  def _load_index(self) -> None:
+    """Loads the fieldnames and the index of the rows of an existing file."""
+    if not os.path.exists(self._file_path):
+      open(self._file_path, 'wb').close()
+      return
+
+    with open(self._file_path, 'rb') as file:
+      offset = 0
+      record = b''
+      record_offset = 0
+      for line in file:
+        if not record:
+          record_offset = offset
+        record += line
+        offset += len(line)
+        # A record is complete when its quotes are balanced, since quotes in
+        # quoted values are escaped by doubling them.
+        if record.count(b'"') % 2 or not record.endswith(b'\n'):
+          continue
+        row = next(csv.reader(io.StringIO(record.decode('utf-8'))), [])
+        record = b''
+        if not self._header_fieldnames:
+          self._header_fieldnames = row
+          if self._key_fieldname not in row:
+            raise FileReleaseManagerIncompatibleFileError(
+                f'The file \'{self._file_path}\' exists but does not contain a '
+                f'fieldname of \'{self._key_fieldname}\'. It is possible that '
+                'this file was not created by a '
+                '`tff.program.AppendOnlyCSVFileReleaseManager` or the '
+                '`tff.program.AppendOnlyCSVFileReleaseManager` was constructed '
+                'with a different `key_fieldname`.')
+          self._fieldnames = list(row)
+          if os.path.exists(self._schema_path):
+            with open(self._schema_path, 'r') as schema_file:
+              self._fieldnames = json.load(schema_file)['fieldnames']
+          key_index = self._fieldnames.index(self._key_fieldname)
+          continue
+        self._keys.append(int(row[key_index]))
+        self._offsets.append(record_offset)
+      # Remove a trailing partial row, e.g. left by a crash while writing.
+      self._size_bytes = offset - len(record)
+    if record:
+      os.truncate(self._file_path, self._size_bytes)
+
+  def _write_schema(self) -> None:
+    """Atomically writes the fieldnames to the sidecar schema file."""
+    temp_path = f'{self._schema_path}_temp{random.randint(1000, 9999)}'
+    with open(temp_path, 'w') as file:
+      json.dump({'fieldnames': self._fieldnames}, file)
+    os.replace(temp_path, self._schema_path)
+
+  def _encode_row(self, values: Sequence[Any]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(values)
+    return buffer.getvalue().encode('utf-8')
+
+  def _append_row(self, key: int, value: Mapping[str, Any]) -> None:
+    """Buffers `value` as the row of `key`."""
+    with self._lock:
+      if not self._header_fieldnames:
+        self._header_fieldnames = list(value.keys())
+        self._fieldnames = list(self._header_fieldnames)
+        header = self._encode_row(self._header_fieldnames)
+        self._buffer.append(header)
+        self._size_bytes += len(header)
+      new_fieldnames = [x for x in value.keys() if x not in self._fieldnames]
+      if new_fieldnames:
+        self._fieldnames.extend(new_fieldnames)
+        self._write_schema()
+      row = self._encode_row([value.get(x, '') for x in self._fieldnames])
+      self._keys.append(key)
+      self._offsets.append(self._size_bytes)
+      self._buffer.append(row)
+      self._size_bytes += len(row)
+
+  def _flush_locked(self) -> None:
+    if not self._buffer:
+      return
+    with open(self._file_path, 'ab') as file:
+      file.write(b''.join(self._buffer))
+    self._buffer = []
+
+  def flush(self) -> None:
+    """Writes the buffered rows to the file."""
+    with self._lock:
+      self._flush_locked()
+
+  def close(self) -> None:
+    """Writes the buffered rows and stops the background flush."""
+    self._closed.set()
+    self._flush_thread.join()
+    self.flush()
+
+  def _flush_periodically(self) -> None:
+    while not self._closed.wait(self._flush_interval_seconds):
+      self.flush()
+
+  def read_values(self) -> tuple[list[str], list[dict[str, Any]]]:
+    """Returns a tuple of fieldnames and values from the managed CSV."""
+    self.flush()
+    with self._lock:
+      fieldnames = list(self._fieldnames)
+    with open(self._file_path, 'r', newline='') as file:
+      reader = csv.reader(file)
+      # Skip the header, the fieldnames are read from the schema.
+      next(reader, None)
+      values = [dict(zip(fieldnames, row)) for row in reader]
+    return fieldnames, values
+
+  def _remove_values_greater_than(self, key: int) -> None:
+    """Removes all values greater than `key` from the managed CSV."""
+    with self._lock:
+      index = bisect.bisect_right(self._keys, key)
+      if index == len(self._keys):
+        return
+      self._flush_locked()
+      self._size_bytes = self._offsets[index]
+      del self._keys[index:]
+      del self._offsets[index:]
+      os.truncate(self._file_path, self._size_bytes)
+
+  async def release(self, value: Any, type_signature: computation_types.Type,
+                    key: int) -> None:
+    """Releases `value` from a federated program.
+
+    This method will remove all values previously released with a key greater
+    than or equal to `key` before appending `value`.
+
+    Args:
+      value: A materialized value, a value reference, or a structure of
+        materialized values and value references representing the value to
+        release.
+      type_signature: The `tff.Type` of `value`.
+      key: An integer used to reference the released `value`, `key` represents a
+        step in a federated program.
+    """
+    del type_signature  # Unused.
+    py_typecheck.check_type(key, (int, np.integer))
+
+    materialized_value = await value_reference.materialize_value(value)
+    normalized_value = _normalize_value(materialized_value, self._key_fieldname,
+                                        key)
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, self._remove_values_greater_than,
+                               int(key) - 1)
+    self._append_row(int(key), normalized_value)
+    if len(self._buffer) >= self._max_buffered_rows:
+      await loop.run_in_executor(None, self.flush)
+
+
 class SavedModelFileReleaseManager(release_manager.ReleaseManager):
   """A `tff.program.ReleaseManager` that releases values to a file system.
 
@@ -892,6 +892,130 @@ class CSVFileReleaseManagerReleaseTest(parameterized.TestCase,
       await release_mngr.release(value, type_signature, key)
 
 
+class AppendOnlyCSVFileReleaseManagerTest(parameterized.TestCase,
+                                          unittest.IsolatedAsyncioTestCase):
+
+  def _create_release_manager(self, file_path):
+    release_mngr = file_release_manager.AppendOnlyCSVFileReleaseManager(
+        file_path=file_path)
+    self.addCleanup(release_mngr.close)
+    return release_mngr
+
+  async def test_release_appends_values(self):
+    file_path = self.create_tempfile()
+    os.remove(file_path)
+    release_mngr = self._create_release_manager(file_path)
+    type_signature = computation_types.StructWithPythonType(
+        [('a', tf.int32), ('b', tf.int32)], collections.OrderedDict)
+
+    await release_mngr.release({'a': 11, 'b': 12}, type_signature, 1)
+    await release_mngr.release({'a': 21, 'b': 22}, type_signature, 2)
+    release_mngr.flush()
+
+    fieldnames, values = _read_values_from_csv(file_path)
+    self.assertEqual(fieldnames, ['key', 'a', 'b'])
+    self.assertEqual(values, [
+        {'key': '1', 'a': '11', 'b': '12'},
+        {'key': '2', 'a': '21', 'b': '22'},
+    ])
+    self.assertFalse(os.path.exists(f'{file_path}.schema.json'))
+
+  async def test_release_writes_schema_with_new_fieldnames(self):
+    file_path = self.create_tempfile()
+    os.remove(file_path)
+    release_mngr = self._create_release_manager(file_path)
+
+    await release_mngr.release({'a': 11},
+                               computation_types.StructWithPythonType(
+                                   [('a', tf.int32)], collections.OrderedDict),
+                               1)
+    await release_mngr.release({'a': 21, 'b': 22},
+                               computation_types.StructWithPythonType(
+                                   [('a', tf.int32), ('b', tf.int32)],
+                                   collections.OrderedDict), 2)
+
+    fieldnames, values = release_mngr.read_values()
+    self.assertEqual(fieldnames, ['key', 'a', 'b'])
+    self.assertEqual(values, [
+        {'key': '1', 'a': '11', 'b': ''},
+        {'key': '2', 'a': '21', 'b': '22'},
+    ])
+    header_fieldnames, _ = _read_values_from_csv(file_path)
+    self.assertEqual(header_fieldnames, ['key', 'a'])
+    self.assertTrue(os.path.exists(f'{file_path}.schema.json'))
+
+  async def test_release_removes_values_greater_than_key(self):
+    file_path = self.create_tempfile()
+    os.remove(file_path)
+    release_mngr = self._create_release_manager(file_path)
+    type_signature = computation_types.TensorType(tf.int32)
+    for key in range(1, 5):
+      await release_mngr.release(key * 10, type_signature, key)
+    release_mngr.flush()
+
+    await release_mngr.release(100, type_signature, 2)
+    release_mngr.flush()
+
+    _, values = _read_values_from_csv(file_path)
+    self.assertEqual(values, [
+        {'key': '1', '': '10'},
+        {'key': '2', '': '100'},
+    ])
+
+  async def test_init_loads_index_from_existing_file(self):
+    file_path = self.create_tempfile()
+    os.remove(file_path)
+    release_mngr = self._create_release_manager(file_path)
+    type_signature = computation_types.TensorType(tf.string)
+    for key in range(1, 4):
+      await release_mngr.release(f'a "quoted",\nvalue {key}', type_signature,
+                                 key)
+    release_mngr.close()
+
+    release_mngr = self._create_release_manager(file_path)
+    self.assertEqual(release_mngr._keys, [1, 2, 3])
+    await release_mngr.release('b', type_signature, 2)
+    release_mngr.flush()
+
+    _, values = _read_values_from_csv(file_path)
+    self.assertEqual(values, [
+        {'key': '1', '': 'a "quoted",\nvalue 1'},
+        {'key': '2', '': 'b'},
+    ])
+
+  def test_init_removes_partial_row(self):
+    file_path = self.create_tempfile()
+    with open(file_path, 'w') as file:
+      file.write('key,a\r\n1,11\r\n2,"2')
+
+    release_mngr = self._create_release_manager(file_path)
+
+    self.assertEqual(release_mngr._keys, [1])
+    _, values = _read_values_from_csv(file_path)
+    self.assertEqual(values, [{'key': '1', 'a': '11'}])
+
+  def test_init_raises_incompatible_file_error_with_unknown_key_fieldname(self):
+    file_path = self.create_tempfile()
+    _write_values_to_csv(
+        file_path=file_path, fieldnames=['a', 'b'], values=[{'a': 1, 'b': 2}])
+
+    with self.assertRaises(
+        file_release_manager.FileReleaseManagerIncompatibleFileError):
+      file_release_manager.AppendOnlyCSVFileReleaseManager(file_path=file_path)
+
+  @parameterized.named_parameters(
+      ('zero', 0),
+      ('negative', -1),
+  )
+  def test_init_raises_value_error_with_max_buffered_rows(
+      self, max_buffered_rows):
+    file_path = self.create_tempfile()
+
+    with self.assertRaises(ValueError):
+      file_release_manager.AppendOnlyCSVFileReleaseManager(
+          file_path=file_path, max_buffered_rows=max_buffered_rows)
+
+
 class SavedModelFileReleaseManagerInitTest(parameterized.TestCase):
 
   def test_creates_new_dir_with_root_dir_str(self):
@@ -14,12 +14,17 @@
 """Utilities for working with file systems."""
 
 import asyncio
-from collections.abc import Callable
+from collections.abc import Callable, Mapping, Sequence
+import concurrent.futures
 import functools
+import hashlib
+import json
 import os
+import os.path
 import random
-from typing import Any, Union
+from typing import Any, Optional, Union
 
+import numpy as np
 import tensorflow as tf
 
 from tensorflow_federated.python.common_libs import py_typecheck
@@ -104,3 +109,263 @@ async def write_saved_model(value: Any,
 
   loop = asyncio.get_running_loop()
   await loop.run_in_executor(None, _write_saved_model, value, path, overwrite)
+
+
+_TENSOR_ARCHIVE_FORMAT_VERSION = 1
+TENSOR_ARCHIVE_INDEX_FILENAME = 'index.json'
+# The offset of each array in a shard is aligned to this number of bytes, so
+# that memory-mapped arrays are aligned for any dtype.
+_TENSOR_ARCHIVE_ALIGNMENT = 64
+
+
+def _get_tensor_archive_shard_filename(shard: int, num_shards: int) -> str:
+  return f'shard-{shard:05d}-of-{num_shards:05d}.bin'
+
+
+def _to_numpy(value: Any) -> Any:
+  """Returns `value` as a numpy value, converting it like a `tf.Tensor`."""
+  if value is None or isinstance(value, (np.ndarray, np.generic)):
+    return value
+  if isinstance(value, tf.data.Dataset):
+    raise TypeError(
+        'Expected a value that can be converted to a `tf.Tensor`, found a '
+        '`tf.data.Dataset`; datasets can only be written using the SavedModel '
+        'format.')
+  return tf.convert_to_tensor(value).numpy()
+
+
+def _encode_leaf(value: Any) -> tuple[dict[str, Any], bytes]:
+  """Returns the index entry and the content of a leaf of a tensor archive."""
+  value = _to_numpy(value)
+  if value is None:
+    return {'kind': 'none'}, b''
+  array = np.asarray(value)
+  entry = {'shape': list(array.shape)}
+  if array.dtype.kind in ('O', 'S', 'U'):
+    strings = [
+        x.encode('utf-8') if isinstance(x, str) else bytes(x)
+        for x in array.reshape([-1]).tolist()
+    ]
+    entry.update(kind='strings', lengths=[len(x) for x in strings])
+    return entry, b''.join(strings)
+  array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder('<'))
+  entry.update(kind='array', dtype=array.dtype.str)
+  return entry, array.tobytes()
+
+
+def _decode_leaf(entry: Mapping[str, Any], buffer: np.ndarray) -> Any:
+  """Returns the value of a leaf of a tensor archive from its `buffer`."""
+  if entry['kind'] == 'none':
+    return None
+  elif entry['kind'] == 'strings':
+    strings = []
+    offset = 0
+    for length in entry['lengths']:
+      strings.append(buffer[offset:offset + length].tobytes())
+      offset += length
+    value = np.empty([len(strings)], dtype=object)
+    value[:] = strings
+    value = value.reshape(entry['shape'])
+  else:
+    value = buffer.view(np.dtype(entry['dtype'])).reshape(entry['shape'])
+  if not entry['shape']:
+    return value[()]
+  return value
+
+
+def get_tensor_archive_digest(value: Any) -> str:
+  """Returns a digest of the content of `value` as written to a tensor archive.
+
+  Two values have the same digest if they are written to a tensor archive with
+  the same kind, dtype, shape and content.
+
+  Args:
+    value: A value that can be converted to a `tf.Tensor`, or `None`.
+  """
+  entry, content = _encode_leaf(value)
+  digest = hashlib.sha256(json.dumps(entry, sort_keys=True).encode('utf-8'))
+  digest.update(content)
+  return digest.hexdigest()
+
+
+async def write_tensor_archive(values: Sequence[Any],
+                               path: Union[str, os.PathLike[str]],
+                               num_shards: int = 1,
+                               overwrite: bool = False,
+                               metadata: Optional[Any] = None) -> None:
+  """Writes a flat sequence of `values` to `path` as a tensor archive.
+
+  A tensor archive is a directory containing the raw content of each value in
+  one or more shard files, and an index describing the dtype, shape and
+  location of each value. Each value is converted to a `numpy.ndarray` the same
+  way as it would be converted to a `tf.Tensor`. Unlike the SavedModel format,
+  no TensorFlow graph is built to write or read the values.
+
+  Args:
+    values: A flat sequence of values that can be converted to a `tf.Tensor`,
+      or `None`.
+    path: The path of the directory to write.
+    num_shards: The number of shard files to write in parallel. The values are
+      distributed across the shards to balance their sizes.
+    overwrite: Whether to overwrite an existing directory at `path`.
+    metadata: An optional JSON-serializable value to write to the index of the
+      tensor archive, see `read_tensor_archive_metadata`.
+
+  Raises:
+    FileAlreadyExistsError: If `path` exists and `overwrite` is `False`.
+    ValueError: If `num_shards` is not positive.
+  """
+  py_typecheck.check_type(values, Sequence)
+  py_typecheck.check_type(path, (str, os.PathLike))
+  py_typecheck.check_type(num_shards, int)
+  if num_shards < 1:
+    raise ValueError(
+        f'Expected `num_shards` to be positive, found {num_shards}.')
+  py_typecheck.check_type(overwrite, bool)
+
+  def _write_shard(shard_path: str, contents: Sequence[tuple[int,
+                                                             bytes]]) -> None:
+    with tf.io.gfile.GFile(shard_path, 'wb') as file:
+      position = 0
+      for offset, content in contents:
+        if offset > position:
+          file.write(b'\0' * (offset - position))
+        file.write(content)
+        position = offset + len(content)
+
+  def _write_tensor_archive(values: Sequence[Any],
+                            path: Union[str, os.PathLike[str]], num_shards: int,
+                            overwrite: bool, metadata: Optional[Any]) -> None:
+    if isinstance(path, os.PathLike):
+      path = os.fspath(path)
+    encoded_leaves = [_encode_leaf(x) for x in values]
+
+    # Assign the leaves to shards, largest first, to balance the shard sizes.
+    shard_sizes = [0] * num_shards
+    shard_contents = [[] for _ in range(num_shards)]
+    order = sorted(
+        range(len(encoded_leaves)),
+        key=lambda i: len(encoded_leaves[i][1]),
+        reverse=True)
+    for i in order:
+      entry, content = encoded_leaves[i]
+      shard = shard_sizes.index(min(shard_sizes))
+      offset = -(-shard_sizes[shard] //
+                 _TENSOR_ARCHIVE_ALIGNMENT) * _TENSOR_ARCHIVE_ALIGNMENT
+      entry.update(shard=shard, offset=offset, size=len(content))
+      shard_contents[shard].append((offset, content))
+      shard_sizes[shard] = offset + len(content)
+    for contents in shard_contents:
+      contents.sort(key=lambda x: x[0])
+
+    # Create a temporary directory.
+    temp_path = f'{path}_temp{random.randint(1000, 9999)}'
+    if tf.io.gfile.exists(temp_path):
+      tf.io.gfile.rmtree(temp_path)
+    tf.io.gfile.makedirs(temp_path)
+
+    # Write to the temporary directory.
+    shard_paths = [
+        os.path.join(temp_path,
+                     _get_tensor_archive_shard_filename(i, num_shards))
+        for i in range(num_shards)
+    ]
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=num_shards) as executor:
+      list(executor.map(_write_shard, shard_paths, shard_contents))
+    index = {
+        'format_version': _TENSOR_ARCHIVE_FORMAT_VERSION,
+        'num_shards': num_shards,
+        'leaves': [entry for entry, _ in encoded_leaves],
+        'metadata': metadata,
+    }
+    with tf.io.gfile.GFile(
+        os.path.join(temp_path, TENSOR_ARCHIVE_INDEX_FILENAME), 'w') as file:
+      json.dump(index, file)
+
+    # Rename the temporary directory to the final location atomically.
+    if tf.io.gfile.exists(path):
+      if not overwrite:
+        raise FileAlreadyExistsError(f'File already exists for path: {path}')
+      tf.io.gfile.rmtree(path)
+    tf.io.gfile.rename(temp_path, path)
+
+  loop = asyncio.get_running_loop()
+  await loop.run_in_executor(None, _write_tensor_archive, values, path,
+                             num_shards, overwrite, metadata)
+
+
+def _read_tensor_archive_index(path: str) -> dict[str, Any]:
+  """Returns the index of the tensor archive at `path`."""
+  with tf.io.gfile.GFile(os.path.join(path, TENSOR_ARCHIVE_INDEX_FILENAME),
+                         'r') as file:
+    index = json.load(file)
+  if index.get('format_version') != _TENSOR_ARCHIVE_FORMAT_VERSION:
+    raise ValueError('Unsupported tensor archive format version '
+                     f'{index.get("format_version")} at {path}.')
+  return index
+
+
+async def read_tensor_archive(path: Union[str, os.PathLike[str]],
+                              mmap: bool = True) -> list[Any]:
+  """Reads the flat list of values of a tensor archive from `path`.
+
+  Args:
+    path: The path of a directory written by `write_tensor_archive`.
+    mmap: Whether to memory-map the shards when they are on the local file
+      system. The returned arrays are then read-only views of the shards, whose
+      content is only read when it is accessed.
+
+  Returns:
+    A list of `numpy.ndarray`s, numpy scalars, `bytes` and `None`s.
+  """
+  py_typecheck.check_type(path, (str, os.PathLike))
+  py_typecheck.check_type(mmap, bool)
+
+  def _read_shard(shard_path: str) -> np.ndarray:
+    if mmap and os.path.isfile(shard_path):
+      if os.path.getsize(shard_path) == 0:
+        # Empty files cannot be memory-mapped.
+        return np.zeros([0], dtype=np.uint8)
+      return np.memmap(shard_path, dtype=np.uint8, mode='r')
+    with tf.io.gfile.GFile(shard_path, 'rb') as file:
+      return np.frombuffer(file.read(), dtype=np.uint8)
+
+  def _read_tensor_archive(path: Union[str, os.PathLike[str]]) -> list[Any]:
+    if isinstance(path, os.PathLike):
+      path = os.fspath(path)
+    index = _read_tensor_archive_index(path)
+    num_shards = index['num_shards']
+    shards = [
+        _read_shard(
+            os.path.join(path,
+                         _get_tensor_archive_shard_filename(i, num_shards)))
+        for i in range(num_shards)
+    ]
+    values = []
+    for entry in index['leaves']:
+      if entry['kind'] == 'none':
+        buffer = None
+      else:
+        offset = entry['offset']
+        buffer = shards[entry['shard']][offset:offset + entry['size']]
+      values.append(_decode_leaf(entry, buffer))
+    return values
+
+  loop = asyncio.get_running_loop()
+  return await loop.run_in_executor(None, _read_tensor_archive, path)
+
+
+async def read_tensor_archive_metadata(
+    path: Union[str, os.PathLike[str]]) -> Optional[Any]:
+  """Returns the metadata written to the tensor archive at `path` or `None`."""
+  py_typecheck.check_type(path, (str, os.PathLike))
+
+  def _read_tensor_archive_metadata(
+      path: Union[str, os.PathLike[str]]) -> Optional[Any]:
+    if isinstance(path, os.PathLike):
+      path = os.fspath(path)
+    return _read_tensor_archive_index(path).get('metadata')
+
+  loop = asyncio.get_running_loop()
+  return await loop.run_in_executor(None, _read_tensor_archive_metadata, path)
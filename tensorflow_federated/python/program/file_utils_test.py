@@ -19,6 +19,7 @@ import unittest
 
 from absl.testing import absltest
 from absl.testing import parameterized
+import numpy as np
 import tensorflow as tf
 
 from tensorflow_federated.python.program import file_utils
@@ -124,5 +125,138 @@ class WriteSavedModelTest(parameterized.TestCase,
       await file_utils.write_saved_model(1, path, overwrite)
 
 
+class TensorArchiveTest(parameterized.TestCase,
+                        unittest.IsolatedAsyncioTestCase):
+
+  @parameterized.named_parameters(
+      ('one_shard_mmap', 1, True),
+      ('one_shard_no_mmap', 1, False),
+      ('three_shards_mmap', 3, True),
+      ('three_shards_no_mmap', 3, False),
+  )
+  async def test_writes_and_reads_values(self, num_shards, mmap):
+    path = os.path.join(self.create_tempdir().full_path, 'archive')
+    values = [
+        True,
+        1,
+        'a',
+        None,
+        np.array([1.0, 2.0, 3.0], dtype=np.float32),
+        np.array([[1, 2], [3, 4]], dtype=np.int64),
+        np.array([b'a', b'', b'\x00bc'], dtype=object),
+        np.zeros([0, 3], dtype=np.float64),
+        tf.constant([1, 2], dtype=tf.int16),
+    ]
+
+    await file_utils.write_tensor_archive(values, path, num_shards=num_shards)
+    actual_values = await file_utils.read_tensor_archive(path, mmap=mmap)
+
+    expected_values = [
+        np.bool_(True),
+        np.int32(1),
+        b'a',
+        None,
+        np.array([1.0, 2.0, 3.0], dtype=np.float32),
+        np.array([[1, 2], [3, 4]], dtype=np.int64),
+        np.array([b'a', b'', b'\x00bc'], dtype=object),
+        np.zeros([0, 3], dtype=np.float64),
+        np.array([1, 2], dtype=np.int16),
+    ]
+    self.assertLen(actual_values, len(expected_values))
+    for actual_value, expected_value in zip(actual_values, expected_values):
+      if expected_value is None:
+        self.assertIsNone(actual_value)
+        continue
+      self.assertEqual(type(actual_value), type(expected_value))
+      np.testing.assert_array_equal(actual_value, expected_value)
+      if isinstance(expected_value, np.ndarray):
+        self.assertEqual(actual_value.dtype, expected_value.dtype)
+
+  async def test_writes_shards(self):
+    path = self.create_tempdir().full_path
+    shutil.rmtree(path)
+
+    await file_utils.write_tensor_archive([1, 2, 3], path, num_shards=2)
+
+    self.assertCountEqual(
+        os.listdir(path), [
+            file_utils.TENSOR_ARCHIVE_INDEX_FILENAME,
+            'shard-00000-of-00002.bin',
+            'shard-00001-of-00002.bin',
+        ])
+
+  async def test_writes_to_existing_file(self):
+    path = self.create_tempdir()
+
+    await file_utils.write_tensor_archive([1], path, overwrite=True)
+
+    actual_values = await file_utils.read_tensor_archive(path)
+    self.assertEqual(actual_values, [1])
+
+  async def test_raises_file_already_exists_error_with_existing_file(self):
+    path = self.create_tempdir()
+
+    with self.assertRaises(file_utils.FileAlreadyExistsError):
+      await file_utils.write_tensor_archive([1], path)
+
+  async def test_writes_and_reads_metadata(self):
+    path = os.path.join(self.create_tempdir().full_path, 'archive')
+    metadata = {'a': [1, 2], 'b': 'c'}
+
+    await file_utils.write_tensor_archive([1], path, metadata=metadata)
+
+    actual_metadata = await file_utils.read_tensor_archive_metadata(path)
+    self.assertEqual(actual_metadata, metadata)
+
+  async def test_reads_none_metadata(self):
+    path = os.path.join(self.create_tempdir().full_path, 'archive')
+
+    await file_utils.write_tensor_archive([1], path)
+
+    self.assertIsNone(await file_utils.read_tensor_archive_metadata(path))
+
+  async def test_raises_type_error_with_dataset(self):
+    path = os.path.join(self.create_tempdir().full_path, 'archive')
+
+    with self.assertRaises(TypeError):
+      await file_utils.write_tensor_archive([tf.data.Dataset.range(3)], path)
+
+  @parameterized.named_parameters(
+      ('zero', 0),
+      ('negative', -1),
+  )
+  async def test_raises_value_error_with_num_shards(self, num_shards):
+    path = os.path.join(self.create_tempdir().full_path, 'archive')
+
+    with self.assertRaises(ValueError):
+      await file_utils.write_tensor_archive([1], path, num_shards=num_shards)
+
+
+class GetTensorArchiveDigestTest(parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('int', 1, np.int32(1)),
+      ('str', 'a', b'a'),
+      ('tensor', tf.constant([1.0, 2.0]), np.array([1.0, 2.0], np.float32)),
+  )
+  def test_returns_same_digest(self, value, other):
+    self.assertEqual(
+        file_utils.get_tensor_archive_digest(value),
+        file_utils.get_tensor_archive_digest(other))
+
+  @parameterized.named_parameters(
+      ('content', np.array([1, 2], np.int32), np.array([1, 3], np.int32)),
+      ('dtype', np.array([1, 2], np.int32), np.array([1, 2], np.int64)),
+      ('shape', np.array([1, 2], np.int32), np.array([[1], [2]], np.int32)),
+      ('strings', np.array([b'ab', b''], object), np.array([b'a', b'b'],
+                                                            object)),
+      ('none', None, np.zeros([0], np.int32)),
+  )
+  def test_returns_different_digest(self, value, other):
+    self.assertNotEqual(
+        file_utils.get_tensor_archive_digest(value),
+        file_utils.get_tensor_archive_digest(other))
+
+
 if __name__ == '__main__':
   absltest.main()
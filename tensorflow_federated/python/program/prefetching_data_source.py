@@ -14,9 +14,17 @@
 """Utilities for prefetching federated data."""
 
 import asyncio
+import collections
 from collections.abc import Awaitable, Callable, Mapping
+import concurrent.futures
 import threading
+import time
 from typing import Any, Optional
+import weakref
+
+import attr
+import numpy as np
+import tensorflow as tf
 
 from tensorflow_federated.python.common_libs import py_typecheck
 from tensorflow_federated.python.core.impl.execution_contexts import async_execution_context
@@ -78,17 +86,125 @@ class FetchedValue(ingestable_base.Ingestable,
       return self._executor_value
 
 
+@attr.s(auto_attribs=True, eq=False, order=False, frozen=True)
+class PrefetchingMetrics:
+  """Metrics of a `tff.program.PrefetchingDataSourceIterator`.
+
+  Attributes:
+    num_selections: The number of calls to `select`.
+    num_hits: The number of calls to `select` whose data had already been
+      prefetched, and therefore did not wait.
+    stall_time_seconds: The total time spent in `select` waiting for data to be
+      prefetched.
+    prefetched_bytes: The current size of the data that has been prefetched but
+      not yet selected, estimated by summing the sizes of the arrays, tensors
+      and datasets in the data of each client. Datasets whose size can not be
+      estimated are counted as zero.
+  """
+  num_selections: int
+  num_hits: int
+  stall_time_seconds: float
+  prefetched_bytes: int
+
+  @property
+  def hit_rate(self) -> float:
+    """The fraction of calls to `select` that did not wait."""
+    if not self.num_selections:
+      return 0.0
+    return self.num_hits / self.num_selections
+
+
+def _get_dataset_size_bytes(dataset: tf.data.Dataset) -> Optional[int]:
+  """Returns the size of the elements of `dataset` in bytes, or `None`.
+
+  The size can only be estimated without iterating `dataset` if it has a finite,
+  known cardinality and its elements are non-string tensors of fully defined
+  shape.
+
+  Args:
+    dataset: A `tf.data.Dataset`.
+  """
+  cardinality = int(dataset.cardinality())
+  if cardinality < 0:
+    return None
+  element_size_bytes = 0
+  for spec in tf.nest.flatten(dataset.element_spec):
+    if (not isinstance(spec, tf.TensorSpec) or spec.dtype == tf.string or
+        not spec.shape.is_fully_defined()):
+      return None
+    element_size_bytes += spec.shape.num_elements() * spec.dtype.size
+  return cardinality * element_size_bytes
+
+
+def _get_size_bytes(value: Any) -> Optional[int]:
+  """Returns the size of the arrays, tensors and datasets in `value` in bytes.
+
+  Args:
+    value: A possibly nested structure of values.
+
+  Returns:
+    The size in bytes, or `None` if `value` contains a `tf.data.Dataset` whose
+    size can not be estimated without iterating it.
+  """
+  size_bytes = 0
+  for leaf in tf.nest.flatten(value):
+    if isinstance(leaf, (np.ndarray, np.generic)):
+      size_bytes += leaf.nbytes
+    elif isinstance(leaf, tf.Tensor):
+      if leaf.dtype != tf.string and leaf.shape.is_fully_defined():
+        size_bytes += leaf.shape.num_elements() * leaf.dtype.size
+    elif isinstance(leaf, (bytes, str)):
+      size_bytes += len(leaf)
+    elif isinstance(leaf, tf.data.Dataset):
+      dataset_size_bytes = _get_dataset_size_bytes(leaf)
+      if dataset_size_bytes is None:
+        return None
+      size_bytes += dataset_size_bytes
+  return size_bytes
+
+
 class PrefetchingDataSourceIterator(data_source_lib.FederatedDataSourceIterator
                                    ):
-  """A `tff.program.FederatedDataSourceIterator` that prefetches data."""
+  """A `tff.program.FederatedDataSourceIterator` that prefetches data.
+
+  Up to `num_rounds_to_prefetch` rounds of data are embedded in the executor of
+  the `context` concurrently, on a pool of threads. The data of a round is
+  selected from `iterator` when the round is scheduled, so `select` returns the
+  rounds in the order in which they were scheduled.
+
+  If `materialize_client_fn` is specified, it is applied to the data of each
+  client before the data is embedded, for example to run expensive client
+  preprocessing ahead of the round that uses it. The clients of a round are
+  materialized concurrently on `materialization_executor`, which can be a
+  `concurrent.futures.ThreadPoolExecutor` or, if `materialize_client_fn` and
+  the data are picklable, a `concurrent.futures.ProcessPoolExecutor`.
+
+  The data of each round is selected from `iterator` on a single background
+  thread, so `select` does not wait for `iterator`, `iterator` is never called
+  concurrently, and the rounds are selected in the order they were scheduled.
+
+  If `max_prefetch_bytes` is specified, no more rounds are scheduled once the
+  prefetched data, plus the rounds in flight estimated to be the size of the
+  last prefetched round, would exceed the budget. At least one round is always
+  scheduled. The size of a `tf.data.Dataset` is estimated from its cardinality
+  and element spec; rounds containing datasets whose size can not be estimated
+  fail to prefetch, and the data should be materialized (for example using
+  `materialize_client_fn`) instead.
+
+  Call `close` to stop prefetching once the iterator is no longer used.
+  """
 
-  def __init__(self,
-               iterator: data_source_lib.FederatedDataSourceIterator,
-               context: async_execution_context.AsyncExecutionContext,
-               total_rounds: int,
-               num_rounds_to_prefetch: int,
-               num_clients_to_prefetch: int,
-               prefetch_threshold: int = 0):
+  def __init__(
+      self,
+      iterator: data_source_lib.FederatedDataSourceIterator,
+      context: async_execution_context.AsyncExecutionContext,
+      total_rounds: int,
+      num_rounds_to_prefetch: int,
+      num_clients_to_prefetch: int,
+      prefetch_threshold: int = 0,
+      max_prefetch_bytes: Optional[int] = None,
+      materialize_client_fn: Optional[Callable[[Any], Any]] = None,
+      materialization_executor: Optional[concurrent.futures.Executor] = None):
     """Returns an initialized `tff.program.FederatedDataSourceIterator`.
 
     Args:
@@ -103,9 +219,19 @@ class PrefetchingDataSourceIterator(data_source_lib.FederatedDataSourceIterator
         select any other number of clients will fail.
       prefetch_threshold: The threshold below which the data source starts
         prefetching.
+      max_prefetch_bytes: An optional budget for the size of the prefetched
+        data in bytes.
+      materialize_client_fn: An optional callable applied to the data of each
+        client selected from `iterator`, returning a value of the same type.
+        Requires the data selected from `iterator` to be a list with one value
+        per client.
+      materialization_executor: An optional `concurrent.futures.Executor` on
+        which to call `materialize_client_fn` concurrently for the clients of a
+        round. If `None`, the clients are materialized sequentially.
 
     Raises:
-      ValueError: If `num_clients_to_prefetch` is not greater than 1.
+      ValueError: If `num_clients_to_prefetch` is not greater than 1, or if
+        `max_prefetch_bytes` is not positive.
     """
     py_typecheck.check_type(iterator,
                             data_source_lib.FederatedDataSourceIterator)
@@ -119,24 +245,72 @@ class PrefetchingDataSourceIterator(data_source_lib.FederatedDataSourceIterator
       raise ValueError(
           'Expected `num_clients_to_prefetch` to be greater than 1, found '
           f'{num_clients_to_prefetch}.')
+    if max_prefetch_bytes is not None:
+      py_typecheck.check_type(max_prefetch_bytes, int)
+      if max_prefetch_bytes <= 0:
+        raise ValueError('Expected `max_prefetch_bytes` to be positive, found '
+                         f'{max_prefetch_bytes}.')
+    if materialize_client_fn is not None:
+      py_typecheck.check_callable(materialize_client_fn)
+    if materialization_executor is not None:
+      py_typecheck.check_type(materialization_executor,
+                              concurrent.futures.Executor)
 
     self._iterator = iterator
     self._total_rounds = total_rounds
     self._num_rounds_to_prefetch = num_rounds_to_prefetch
     self._num_clients_to_prefetch = num_clients_to_prefetch
     self._prefetch_threshold = prefetch_threshold
+    self._max_prefetch_bytes = max_prefetch_bytes
+    self._materialize_client_fn = materialize_client_fn
+    self._materialization_executor = materialization_executor
     self._executor_factory = context.executor_factory
     self._cardinality = {placements.CLIENTS: num_clients_to_prefetch}
     self._num_rounds_prefetched = 0
-    self._prefetched_data = []
+    # The rounds that have been scheduled but not yet selected, in the order in
+    # which they were scheduled, as futures of a `FetchedValue` and its size in
+    # bytes.
+    self._prefetched_data = collections.deque()
     self._lock = threading.Lock()
-    self._active_threads = []
+    self._closed = False
+    # A single thread, so that `iterator` is never called concurrently and the
+    # rounds are selected in the order in which they were scheduled.
+    self._selection_executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix='prefetching_data_source_select')
+    self._round_executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(num_rounds_to_prefetch, 1),
+        thread_name_prefix='prefetching_data_source')
+
+    def finalize(selection_executor, round_executor):
+      selection_executor.shutdown(wait=False, cancel_futures=True)
+      round_executor.shutdown(wait=False, cancel_futures=True)
+
+    self._finalizer = weakref.finalize(self, finalize,
+                                       self._selection_executor,
+                                       self._round_executor)
+    self._last_round_size_bytes = 0
+    self._num_selections = 0
+    self._num_hits = 0
+    self._stall_time_seconds = 0.0
 
     self._start_prefetching()
 
-  def _single_round_fn(self):
-    data = self._iterator.select(
-        self._num_clients_to_prefetch)  # gen-stub-imports
+  def _materialize(self, data: Any) -> Any:
+    if not isinstance(data, list):
+      raise TypeError(
+          'Expected the data selected from the iterator to be a list with one '
+          'value per client when `materialize_client_fn` is specified, found '
+          f'{py_typecheck.type_string(type(data))}.')
+    if self._materialization_executor is None:
+      return [self._materialize_client_fn(x) for x in data]
+    return list(
+        self._materialization_executor.map(self._materialize_client_fn, data))
+
+  def _single_round_fn(
+      self, selection: concurrent.futures.Future) -> tuple[FetchedValue, int]:
+    data = selection.result()
+    if self._materialize_client_fn is not None:
+      data = self._materialize(data)
 
     # We assume the executor factory uses a cache, so most calls to this
     # function should result in a hit.
@@ -160,51 +334,81 @@ class PrefetchingDataSourceIterator(data_source_lib.FederatedDataSourceIterator
       async def defining_coro_fn(executor):
         return await executor.create_value(data, self._iterator.federated_type)
 
+    size_bytes = _get_size_bytes(data)
+    if size_bytes is None:
+      if self._max_prefetch_bytes is not None:
+        raise ValueError(
+            'Expected the size of the data to be known when '
+            '`max_prefetch_bytes` is specified, found a `tf.data.Dataset` '
+            'whose size can not be estimated without iterating it. Consider '
+            'materializing the data using `materialize_client_fn`.')
+      size_bytes = 0
+
     event_loop = asyncio.new_event_loop()
     executor_value = event_loop.run_until_complete(executor_value_coro)
     fetched_data = FetchedValue(executor_at_invocation, executor_value,
                                 self._cardinality, defining_coro_fn)
-
-    with self._lock:
-      self._prefetched_data.append(fetched_data)
+    return fetched_data, size_bytes
+
+  def _get_prefetched_bytes(self) -> int:
+    """Returns the size of the rounds prefetched but not yet selected."""
+    size_bytes = 0
+    for future in self._prefetched_data:
+      if future.done() and future.exception() is None:
+        _, round_size_bytes = future.result()
+        size_bytes += round_size_bytes
+    return size_bytes
+
+  def _is_over_budget(self) -> bool:
+    """Returns whether scheduling another round would exceed the budget."""
+    if self._max_prefetch_bytes is None or not self._prefetched_data:
+      return False
+    size_bytes = 0
+    for future in self._prefetched_data:
+      if future.done() and future.exception() is None:
+        _, round_size_bytes = future.result()
+        self._last_round_size_bytes = round_size_bytes
+      else:
+        # Estimate the size of a round in flight by the last prefetched round.
+        round_size_bytes = self._last_round_size_bytes
+      size_bytes += round_size_bytes
+    return size_bytes + self._last_round_size_bytes > self._max_prefetch_bytes
 
   def _start_prefetching(self) -> None:
     with self._lock:
-      if self._active_threads:
-        # Already prefetching
+      if self._closed:
         return
       if len(self._prefetched_data) > self._prefetch_threshold:
         # Only fetch data when _prefetched_data has a low volume of data
-        # to avoid new threads created in each round.
+        # to avoid scheduling rounds in each round.
         return
       num_to_prefetch = min(
           self._num_rounds_to_prefetch - len(self._prefetched_data),
           self._total_rounds - self._num_rounds_prefetched)
-      if num_to_prefetch < 1:
-        # Already have enough
-        return
-      self._num_rounds_prefetched = self._num_rounds_prefetched + num_to_prefetch
       for _ in range(num_to_prefetch):
-        thread = threading.Thread(target=self._single_round_fn)
-        thread.start()
-        self._active_threads.append(thread)
-
-  def _finish_prefetching(self) -> None:
-    threads = []
-    with self._lock:
-      threads = self._active_threads
-      self._active_threads = []
-    for thread in threads:
-      thread.join()
-    with self._lock:
-      if len(self._prefetched_data) < 1:
-        raise RuntimeError('Failed to prefetch at least one item.')
+        if self._is_over_budget():
+          break
+        selection = self._selection_executor.submit(
+            self._iterator.select, self._num_clients_to_prefetch)
+        self._prefetched_data.append(
+            self._round_executor.submit(self._single_round_fn, selection))
+        self._num_rounds_prefetched += 1
 
   @property
   def federated_type(self) -> computation_types.FederatedType:
     """The type of the data returned by calling `select`."""
     return self._iterator.federated_type
 
+  @property
+  def metrics(self) -> PrefetchingMetrics:
+    """The `tff.program.PrefetchingMetrics` of this iterator."""
+    with self._lock:
+      return PrefetchingMetrics(
+          num_selections=self._num_selections,
+          num_hits=self._num_hits,
+          stall_time_seconds=self._stall_time_seconds,
+          prefetched_bytes=self._get_prefetched_bytes())
+
   def select(self, num_clients: Optional[int] = None) -> Any:
     """Returns a new selection of data from this iterator.
 
@@ -215,6 +419,8 @@ class PrefetchingDataSourceIterator(data_source_lib.FederatedDataSourceIterator
     Raises:
       ValueError: If `num_clients` is not a positive integer or if `num_clients`
         is not equal to `num_clients_to_prefetch`.
+      RuntimeError: If no data has been prefetched or if the iterator has been
+        closed.
     """
     if num_clients is not None:
       py_typecheck.check_type(num_clients, int)
@@ -225,13 +431,37 @@ class PrefetchingDataSourceIterator(data_source_lib.FederatedDataSourceIterator
           f'`num_clients_to_prefetch`, found `num_clients`: {num_clients}, '
           f'`num_clients_to_prefetch`: {self._num_clients_to_prefetch}')
 
-    self._finish_prefetching()
     with self._lock:
-      data = self._prefetched_data[0]
-      self._prefetched_data = self._prefetched_data[1:]
+      if self._closed:
+        raise RuntimeError('Expected the iterator to be open, found it closed.')
+      if not self._prefetched_data:
+        raise RuntimeError('Failed to prefetch at least one item.')
+      future = self._prefetched_data.popleft()
+    hit = future.done()
+    start_time = time.perf_counter()
+    data, size_bytes = future.result()
+    stall_time_seconds = time.perf_counter() - start_time
+    with self._lock:
+      self._last_round_size_bytes = size_bytes
+      self._num_selections += 1
+      if hit:
+        self._num_hits += 1
+      else:
+        self._stall_time_seconds += stall_time_seconds
     self._start_prefetching()
     return data
 
+  def close(self) -> None:
+    """Stops prefetching and releases the threads of this iterator.
+
+    Rounds that have not started to be prefetched are cancelled; rounds that
+    are being prefetched finish in the background.
+    """
+    with self._lock:
+      self._closed = True
+      self._prefetched_data.clear()
+    self._finalizer()
+
 
 class PrefetchingDataSource(data_source_lib.FederatedDataSource):
   """A `tff.program.FederatedDataSource` that prefetches data."""
@@ -242,9 +472,16 @@ class PrefetchingDataSource(data_source_lib.FederatedDataSource):
                total_rounds: int,
                num_rounds_to_prefetch: int,
                num_clients_to_prefetch: int,
-               prefetch_threshold: int = 0):
+               prefetch_threshold: int = 0,
+               max_prefetch_bytes: Optional[int] = None,
+               materialize_client_fn: Optional[Callable[[Any], Any]] = None,
+               materialization_executor: Optional[
+                   concurrent.futures.Executor] = None):
     """Returns an initialized `tff.program.PrefetchingDataSource`.
 
+    See `tff.program.PrefetchingDataSourceIterator` for how the data is
+    prefetched.
+
     Args:
       data_source: A `tff.program.FederatedDataSource` used to prefetch data
         from.
@@ -257,9 +494,17 @@ class PrefetchingDataSource(data_source_lib.FederatedDataSource):
         select any other number of clients will fail.
       prefetch_threshold: The threshold below which the data source starts
         prefetching.
+      max_prefetch_bytes: An optional budget for the size of the prefetched
+        data in bytes.
+      materialize_client_fn: An optional callable applied to the data of each
+        client before it is embedded, returning a value of the same type.
+      materialization_executor: An optional `concurrent.futures.Executor` on
+        which to call `materialize_client_fn` concurrently for the clients of a
+        round. Shared by all the iterators of this data source.
 
     Raises:
-      ValueError: If `num_clients_to_prefetch` is not greater than 1.
+      ValueError: If `num_clients_to_prefetch` is not greater than 1, or if
+        `max_prefetch_bytes` is not positive.
     """
     py_typecheck.check_type(data_source, data_source_lib.FederatedDataSource)
     py_typecheck.check_type(context,
@@ -272,6 +517,11 @@ class PrefetchingDataSource(data_source_lib.FederatedDataSource):
       raise ValueError(
           'Expected `num_clients_to_prefetch` to be greater than 1, found '
           f'{num_clients_to_prefetch}.')
+    if max_prefetch_bytes is not None:
+      py_typecheck.check_type(max_prefetch_bytes, int)
+      if max_prefetch_bytes <= 0:
+        raise ValueError('Expected `max_prefetch_bytes` to be positive, found '
+                         f'{max_prefetch_bytes}.')
 
     self._data_source = data_source
     self._context = context
@@ -279,6 +529,9 @@ class PrefetchingDataSource(data_source_lib.FederatedDataSource):
     self._num_rounds_to_prefetch = num_rounds_to_prefetch
     self._num_clients_to_prefetch = num_clients_to_prefetch
     self._prefetch_threshold = prefetch_threshold
+    self._max_prefetch_bytes = max_prefetch_bytes
+    self._materialize_client_fn = materialize_client_fn
+    self._materialization_executor = materialization_executor
 
   @property
   def federated_type(self) -> computation_types.FederatedType:
@@ -299,4 +552,7 @@ class PrefetchingDataSource(data_source_lib.FederatedDataSource):
         total_rounds=self._total_rounds,
         num_rounds_to_prefetch=self._num_rounds_to_prefetch,
         num_clients_to_prefetch=self._num_clients_to_prefetch,
-        prefetch_threshold=self._prefetch_threshold)
+        prefetch_threshold=self._prefetch_threshold,
+        max_prefetch_bytes=self._max_prefetch_bytes,
+        materialize_client_fn=self._materialize_client_fn,
+        materialization_executor=self._materialization_executor)
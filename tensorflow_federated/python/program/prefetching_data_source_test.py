@@ -12,11 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import concurrent.futures
+import threading
 import unittest
 from unittest import mock
 
 from absl.testing import absltest
 from absl.testing import parameterized
+import numpy as np
 import tensorflow as tf
 
 from tensorflow_federated.python.core.backends.native import execution_contexts
@@ -28,6 +31,11 @@ from tensorflow_federated.python.program import data_source as data_source_lib
 from tensorflow_federated.python.program import prefetching_data_source
 
 
+def _wait_for_prefetched_data(iterator):
+  for future in list(iterator._prefetched_data):
+    future.result()
+
+
 class PrefetchingDataSourceIteratorTest(parameterized.TestCase,
                                         unittest.IsolatedAsyncioTestCase):
 
@@ -284,28 +292,191 @@ class PrefetchingDataSourceIteratorTest(parameterized.TestCase,
         num_clients_to_prefetch=3,
         prefetch_threshold=1)
 
-    self.assertEmpty(iterator._prefetched_data)
+    self.assertLen(iterator._prefetched_data, 3)
+    _wait_for_prefetched_data(iterator)
     self.assertEqual(mock_iterator.select.call_count, 3)
 
-    iterator.select(num_clients=3)
-    self.assertLen(iterator._prefetched_data, 2)
-    self.assertEqual(mock_iterator.select.call_count, 3)
+    for expected_len, expected_call_count in ((2, 3), (3, 5), (2, 5), (1, 5),
+                                              (0, 5)):
+      iterator.select(num_clients=3)
+      self.assertLen(iterator._prefetched_data, expected_len)
+      _wait_for_prefetched_data(iterator)
+      self.assertEqual(mock_iterator.select.call_count, expected_call_count)
 
-    iterator.select(num_clients=3)
-    self.assertLen(iterator._prefetched_data, 1)
+  def test_select_selects_data_in_background_thread(self):
+    selection_threads = []
+
+    def select(num_clients):
+      selection_threads.append(threading.current_thread())
+      return list(range(num_clients))
+
+    mock_iterator = mock.create_autospec(
+        data_source_lib.FederatedDataSourceIterator)
+    mock_iterator.select.side_effect = select
+    mock_iterator.federated_type = computation_types.FederatedType(
+        tf.int32, placements.CLIENTS)
+    context = execution_contexts.create_local_async_python_execution_context()
+    iterator = prefetching_data_source.PrefetchingDataSourceIterator(
+        iterator=mock_iterator,
+        context=context,
+        total_rounds=4,
+        num_rounds_to_prefetch=2,
+        num_clients_to_prefetch=3)
+
+    for _ in range(4):
+      iterator.select(num_clients=3)
+      _wait_for_prefetched_data(iterator)
+
+    self.assertLen(selection_threads, 4)
+    self.assertLen(set(selection_threads), 1)
+    self.assertIsNot(selection_threads[0], threading.current_thread())
+
+  async def test_select_returns_materialized_data(self):
+    mock_iterator = mock.create_autospec(
+        data_source_lib.FederatedDataSourceIterator)
+    mock_iterator.select.return_value = [1, 2, 3]
+    mock_iterator.federated_type = computation_types.FederatedType(
+        tf.int32, placements.CLIENTS)
+    context = execution_contexts.create_local_async_python_execution_context()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+      iterator = prefetching_data_source.PrefetchingDataSourceIterator(
+          iterator=mock_iterator,
+          context=context,
+          total_rounds=5,
+          num_rounds_to_prefetch=3,
+          num_clients_to_prefetch=3,
+          materialize_client_fn=lambda x: x * 10,
+          materialization_executor=executor)
+
+      data = iterator.select(num_clients=3)
+
+    @federated_computation.federated_computation(iterator.federated_type)
+    def _identity(x):
+      return x
+
+    actual_value = await context.invoke(_identity, data)
+    self.assertEqual(actual_value, [10, 20, 30])
+
+  def test_select_prefetches_data_within_max_prefetch_bytes(self):
+    mock_iterator = mock.create_autospec(
+        data_source_lib.FederatedDataSourceIterator)
+    mock_iterator.select.return_value = [
+        np.zeros([10], np.float32) for _ in range(3)
+    ]
+    mock_iterator.federated_type = computation_types.FederatedType(
+        computation_types.TensorType(tf.float32, [10]), placements.CLIENTS)
+    context = execution_contexts.create_local_async_python_execution_context()
+    iterator = prefetching_data_source.PrefetchingDataSourceIterator(
+        iterator=mock_iterator,
+        context=context,
+        total_rounds=10,
+        num_rounds_to_prefetch=5,
+        num_clients_to_prefetch=3,
+        prefetch_threshold=4,
+        max_prefetch_bytes=250)
+    _wait_for_prefetched_data(iterator)
+    # The size of a round is not known until one has been prefetched.
     self.assertEqual(mock_iterator.select.call_count, 5)
 
-    iterator.select(num_clients=3)
+    for _ in range(5):
+      for future in list(iterator._prefetched_data):
+        future.result()
+      iterator.select(num_clients=3)
+    for future in list(iterator._prefetched_data):
+      future.result()
+
+    # Each round is 120 bytes, so only two rounds fit in the budget.
+    self.assertEqual(mock_iterator.select.call_count, 7)
     self.assertLen(iterator._prefetched_data, 2)
-    self.assertEqual(mock_iterator.select.call_count, 5)
+    self.assertEqual(iterator.metrics.prefetched_bytes, 240)
 
+  def test_metrics_estimates_size_of_datasets(self):
+    mock_iterator = mock.create_autospec(
+        data_source_lib.FederatedDataSourceIterator)
+    mock_iterator.select.return_value = [
+        tf.data.Dataset.range(5) for _ in range(3)
+    ]
+    mock_iterator.federated_type = computation_types.FederatedType(
+        computation_types.SequenceType(tf.int64), placements.CLIENTS)
+    context = execution_contexts.create_local_async_python_execution_context()
+    iterator = prefetching_data_source.PrefetchingDataSourceIterator(
+        iterator=mock_iterator,
+        context=context,
+        total_rounds=1,
+        num_rounds_to_prefetch=1,
+        num_clients_to_prefetch=3,
+        max_prefetch_bytes=1000)
+
+    _wait_for_prefetched_data(iterator)
+
+    # Each client has 5 elements of 8 bytes.
+    self.assertEqual(iterator.metrics.prefetched_bytes, 120)
+
+  def test_select_raises_value_error_with_dataset_of_unknown_size(self):
+    mock_iterator = mock.create_autospec(
+        data_source_lib.FederatedDataSourceIterator)
+    mock_iterator.select.return_value = [
+        tf.data.Dataset.range(5).filter(lambda x: x > 2) for _ in range(3)
+    ]
+    mock_iterator.federated_type = computation_types.FederatedType(
+        computation_types.SequenceType(tf.int64), placements.CLIENTS)
+    context = execution_contexts.create_local_async_python_execution_context()
+    iterator = prefetching_data_source.PrefetchingDataSourceIterator(
+        iterator=mock_iterator,
+        context=context,
+        total_rounds=1,
+        num_rounds_to_prefetch=1,
+        num_clients_to_prefetch=3,
+        max_prefetch_bytes=1000)
+
+    with self.assertRaises(ValueError):
+      iterator.select(num_clients=3)
+
+  def test_select_raises_runtime_error_after_close(self):
+    mock_iterator = mock.create_autospec(
+        data_source_lib.FederatedDataSourceIterator)
+    mock_iterator.select.return_value = [1, 2, 3]
+    mock_iterator.federated_type = computation_types.FederatedType(
+        tf.int32, placements.CLIENTS)
+    context = execution_contexts.create_local_async_python_execution_context()
+    iterator = prefetching_data_source.PrefetchingDataSourceIterator(
+        iterator=mock_iterator,
+        context=context,
+        total_rounds=5,
+        num_rounds_to_prefetch=3,
+        num_clients_to_prefetch=3)
+
+    iterator.close()
+
+    self.assertEmpty(iterator._prefetched_data)
+    with self.assertRaises(RuntimeError):
+      iterator.select(num_clients=3)
+
+  def test_metrics_counts_hits_and_stalls(self):
+    mock_iterator = mock.create_autospec(
+        data_source_lib.FederatedDataSourceIterator)
+    mock_iterator.select.return_value = [1, 2, 3]
+    mock_iterator.federated_type = computation_types.FederatedType(
+        tf.int32, placements.CLIENTS)
+    context = execution_contexts.create_local_async_python_execution_context()
+    iterator = prefetching_data_source.PrefetchingDataSourceIterator(
+        iterator=mock_iterator,
+        context=context,
+        total_rounds=2,
+        num_rounds_to_prefetch=2,
+        num_clients_to_prefetch=3)
     iterator.select(num_clients=3)
-    self.assertLen(iterator._prefetched_data, 1)
-    self.assertEqual(mock_iterator.select.call_count, 5)
+    # Wait for the second round to be prefetched.
+    iterator._prefetched_data[0].result()
 
     iterator.select(num_clients=3)
-    self.assertEmpty(iterator._prefetched_data)
-    self.assertEqual(mock_iterator.select.call_count, 5)
+
+    metrics = iterator.metrics
+    self.assertEqual(metrics.num_selections, 2)
+    self.assertGreaterEqual(metrics.num_hits, 1)
+    self.assertGreaterEqual(metrics.stall_time_seconds, 0.0)
+    self.assertEqual(metrics.prefetched_bytes, 0)
+    self.assertGreaterEqual(metrics.hit_rate, 0.5)
 
   @parameterized.named_parameters(
       ('str', 'a'),
@@ -19,12 +19,21 @@ from tensorflow_federated.python.simulation import models
 from tensorflow_federated.python.simulation.iterative_process_compositions import compose_dataset_computation_with_computation
 from tensorflow_federated.python.simulation.iterative_process_compositions import compose_dataset_computation_with_iterative_process
 from tensorflow_federated.python.simulation.iterative_process_compositions import compose_dataset_computation_with_learning_process
+from tensorflow_federated.python.simulation.sampling_utils import build_epoch_index_sampling_fn
+from tensorflow_federated.python.simulation.sampling_utils import build_stratified_index_sampling_fn
+from tensorflow_federated.python.simulation.sampling_utils import build_uniform_index_sampling_fn
 from tensorflow_federated.python.simulation.sampling_utils import build_uniform_sampling_fn
+from tensorflow_federated.python.simulation.sampling_utils import build_weighted_index_sampling_fn
 from tensorflow_federated.python.simulation.server_utils import run_server
 from tensorflow_federated.python.simulation.server_utils import server_context
+from tensorflow_federated.python.simulation.training_loop import CohortSelectionFn
+from tensorflow_federated.python.simulation.training_loop import DATA_PREPARATION_TIME_KEY
 from tensorflow_federated.python.simulation.training_loop import EVALUATION_METRICS_PREFIX
 from tensorflow_federated.python.simulation.training_loop import EVALUATION_TIME_KEY
+from tensorflow_federated.python.simulation.training_loop import RELEASE_TIME_KEY
 from tensorflow_federated.python.simulation.training_loop import ROUND_NUMBER_KEY
 from tensorflow_federated.python.simulation.training_loop import ROUND_TIME_KEY
 from tensorflow_federated.python.simulation.training_loop import run_training_process
+from tensorflow_federated.python.simulation.training_loop import SAVE_TIME_KEY
+from tensorflow_federated.python.simulation.training_loop import SELECTION_TIME_KEY
 from tensorflow_federated.python.simulation.training_loop import TRAINING_TIME_KEY
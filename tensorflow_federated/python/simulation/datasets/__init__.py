@@ -21,6 +21,9 @@ from tensorflow_federated.python.simulation.datasets import inaturalist
 from tensorflow_federated.python.simulation.datasets import shakespeare
 from tensorflow_federated.python.simulation.datasets import stackoverflow
 from tensorflow_federated.python.simulation.datasets.client_data import ClientData
+from tensorflow_federated.python.simulation.datasets.columnar_client_data import ColumnarClientData
+from tensorflow_federated.python.simulation.datasets.columnar_client_data import convert_sql_client_data_to_columnar
+from tensorflow_federated.python.simulation.datasets.columnar_client_data import save_to_columnar_client_data
 from tensorflow_federated.python.simulation.datasets.dataset_utils import build_dataset_mixture
 from tensorflow_federated.python.simulation.datasets.dataset_utils import build_single_label_dataset
 from tensorflow_federated.python.simulation.datasets.dataset_utils import build_synthethic_iid_datasets
@@ -0,0 +1,506 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Implementation of `ClientData` backed by memory-mapped columnar files.
+
+A columnar client data directory holds one file per feature, in which the
+values of that feature for all the examples of all the clients are stored
+contiguously, ordered by client. A separate index holds the offset of the first
+example of each client, so the examples of a client are a contiguous slice of
+each file.
+
+The directory contains:
+
+  *   `metadata.json`: The format version, the sorted client ids and the name,
+      dtype and shape of each feature.
+  *   `client_offsets.bin`: An `int64` array of length `len(client_ids) + 1`,
+      where the examples of the `i`-th client are `[offsets[i], offsets[i+1])`.
+  *   `<feature>.bin`: For a numeric or bool feature, an array of shape
+      `[num_examples] + shape`. For a string feature, the concatenated bytes of
+      all the strings.
+  *   `<feature>.offsets.bin`: For a string feature only, an `int64` array with
+      the offset of each string in `<feature>.bin`, followed by the total size.
+
+Since the files of a feature are named after it, feature names must not end
+with `.offsets`, and must not map to the same file as another feature or as
+`client_offsets.bin`, compared case-insensitively.
+
+Every `.bin` file starts with the 8 bytes `_MAGIC` followed by the raw,
+little-endian, C-ordered content. Since the files are read directly, several
+processes reading the same directory share the OS page cache.
+"""
+
+import collections
+from collections.abc import Callable, Mapping, Sequence
+import json
+import os
+import os.path
+from typing import Any, Optional
+
+import numpy as np
+import tensorflow as tf
+
+from tensorflow_federated.python.common_libs import py_typecheck
+from tensorflow_federated.python.simulation.datasets import client_data
+from tensorflow_federated.python.simulation.datasets import sql_client_data_utils
+
+_FORMAT_VERSION = 1
+_MAGIC = b'TFFCOL01'
+_METADATA_FILENAME = 'metadata.json'
+_CLIENT_OFFSETS_FILENAME = 'client_offsets.bin'
+# The dtypes of the numeric features, which must all be supported by
+# `tf.io.decode_raw`.
+_NUMERIC_DTYPES = frozenset([
+    tf.bool,
+    tf.complex64,
+    tf.complex128,
+    tf.float16,
+    tf.float32,
+    tf.float64,
+    tf.int8,
+    tf.int16,
+    tf.int32,
+    tf.int64,
+    tf.uint8,
+    tf.uint16,
+])
+
+
+class ColumnarFormatError(Exception):
+  """Raised if a directory is not a valid columnar client data directory."""
+  pass
+
+
+_OFFSETS_SUFFIX = '.offsets'
+
+
+def _data_filename(feature_name: str) -> str:
+  return f'{feature_name}.bin'
+
+
+def _offsets_filename(feature_name: str) -> str:
+  return f'{feature_name}{_OFFSETS_SUFFIX}.bin'
+
+
+def _validate_element_spec(element_spec: Any):
+  """Checks that `element_spec` is a `Mapping[str, tf.TensorSpec]`."""
+  if not isinstance(element_spec, Mapping):
+    raise sql_client_data_utils.ElementSpecCompatibilityError(
+        'The element_spec of the local dataset must be a Mapping, '
+        f'found {element_spec} instead.')
+  # The names of the files written so far, compared case-insensitively since
+  # some filesystems are case-insensitive.
+  filenames = {
+      _METADATA_FILENAME.casefold(), _CLIENT_OFFSETS_FILENAME.casefold()
+  }
+  for key, tensor_spec in element_spec.items():
+    if (not isinstance(key, str) or not key or os.sep in key or
+        (os.altsep is not None and os.altsep in key)):
+      raise sql_client_data_utils.ElementSpecCompatibilityError(
+          f'Feature names must be non-empty strings usable as filenames, '
+          f'found {key!r}.')
+    if key.casefold().endswith(_OFFSETS_SUFFIX):
+      raise sql_client_data_utils.ElementSpecCompatibilityError(
+          f'Feature names must not end with {_OFFSETS_SUFFIX!r}, which is '
+          f'reserved for the offsets of string features, found {key!r}.')
+    if not isinstance(tensor_spec, tf.TensorSpec):
+      raise sql_client_data_utils.ElementSpecCompatibilityError(
+          'The element_spec of the local dataset must be a Mapping[str, '
+          f'TensorSpec], and must not be nested, found {key}:{tensor_spec} '
+          'instead.')
+    if not tensor_spec.shape.is_fully_defined():
+      raise sql_client_data_utils.ElementSpecCompatibilityError(
+          f'Feature {key} must have a fully defined shape, found '
+          f'{tensor_spec.shape}.')
+    if (tensor_spec.dtype != tf.string and
+        tensor_spec.dtype not in _NUMERIC_DTYPES):
+      raise sql_client_data_utils.ElementSpecCompatibilityError(
+          f'Unsupported dtype {tensor_spec.dtype} for feature {key}.')
+    key_filenames = [_data_filename(key).casefold()]
+    if tensor_spec.dtype == tf.string:
+      key_filenames.append(_offsets_filename(key).casefold())
+    if any(filename in filenames for filename in key_filenames):
+      raise sql_client_data_utils.ElementSpecCompatibilityError(
+          f'Feature {key!r} would be written to the same file as another '
+          'feature or as the index of the columnar client data.')
+    filenames.update(key_filenames)
+
+
+def _open_for_write(path: str):
+  f = open(path, 'wb')
+  f.write(_MAGIC)
+  return f
+
+
+def save_to_columnar_client_data(
+    client_ids: Sequence[str],
+    dataset_fn: Callable[[str], tf.data.Dataset],
+    directory: str,
+    allow_overwrite: bool = False,
+) -> None:
+  """Writes a federated dataset to a directory readable by `ColumnarClientData`.
+
+  Note: All the clients must share the same dataset.element_spec of type
+  `Mapping[str, TensorSpec]`, with fully defined shapes, and with feature names
+  which map to distinct files (see the module docstring).
+
+  Args:
+    client_ids: A list of string identifiers for clients in this dataset.
+    dataset_fn: A callable that accepts a `str` as an argument and returns a
+      `tf.data.Dataset` instance.
+    directory: A `str` path to a local directory in which to write the files.
+    allow_overwrite: A boolean indicating whether to allow overwriting the
+      files of an existing columnar client data at `directory`.
+
+  Raises:
+    FileExistsError: If a columnar client data already exists at `directory`
+      and `allow_overwrite` is False.
+    ElementSpecCompatibilityError: If the element_spec of the datasets are not
+      identical across clients, or are not a supported
+      `Mapping[str, TensorSpec]`.
+    ValueError: If `client_ids` is empty or contains duplicates.
+  """
+  metadata_path = os.path.join(directory, _METADATA_FILENAME)
+  if os.path.exists(metadata_path) and not allow_overwrite:
+    raise FileExistsError(f'Columnar client data already exists at {directory}')
+  if not client_ids:
+    raise ValueError('Expected `client_ids` to not be empty.')
+  client_ids = sorted(client_ids)
+  if len(set(client_ids)) != len(client_ids):
+    raise ValueError('Expected `client_ids` to not contain duplicates.')
+  element_spec = dataset_fn(client_ids[0]).element_spec
+  _validate_element_spec(element_spec)
+  os.makedirs(directory, exist_ok=True)
+  # Remove the metadata first, so that an interrupted write does not leave a
+  # directory which looks valid.
+  if os.path.exists(metadata_path):
+    os.remove(metadata_path)
+
+  data_files = {}
+  offsets_files = {}
+  string_offsets = {}
+  try:
+    for key, tensor_spec in element_spec.items():
+      data_files[key] = _open_for_write(
+          os.path.join(directory, _data_filename(key)))
+      if tensor_spec.dtype == tf.string:
+        offsets_files[key] = _open_for_write(
+            os.path.join(directory, _offsets_filename(key)))
+        offsets_files[key].write(np.array([0], dtype='<i8').tobytes())
+        string_offsets[key] = 0
+    client_offsets = [0]
+    for client_id in client_ids:
+      dataset = dataset_fn(client_id)
+      if dataset.element_spec != element_spec:
+        raise sql_client_data_utils.ElementSpecCompatibilityError(
+            f'All the clients must share the same dataset element type. The '
+            f'local dataset of client {client_id!r} has element type '
+            f'{dataset.element_spec}, which is different from client '
+            f'{client_ids[0]!r} which has element type {element_spec}.')
+      num_examples = 0
+      for element in dataset.as_numpy_iterator():
+        num_examples += 1
+        for key, tensor_spec in element_spec.items():
+          if tensor_spec.dtype == tf.string:
+            # Use an object array, since fixed width byte arrays would strip
+            # trailing null bytes.
+            value = np.asarray(element[key], dtype=object)
+            lengths = []
+            for s in value.reshape([-1]):
+              data_files[key].write(s)
+              lengths.append(len(s))
+            offsets = string_offsets[key] + np.cumsum(lengths, dtype=np.int64)
+            if lengths:
+              string_offsets[key] = int(offsets[-1])
+            offsets_files[key].write(offsets.astype('<i8').tobytes())
+          else:
+            numpy_dtype = np.dtype(tensor_spec.dtype.as_numpy_dtype)
+            data_files[key].write(
+                np.ascontiguousarray(element[key],
+                                     dtype=numpy_dtype.newbyteorder('<')))
+      client_offsets.append(client_offsets[-1] + num_examples)
+  finally:
+    for f in list(data_files.values()) + list(offsets_files.values()):
+      f.close()
+
+  with _open_for_write(os.path.join(directory,
+                                    _CLIENT_OFFSETS_FILENAME)) as f:
+    f.write(np.array(client_offsets, dtype='<i8').tobytes())
+  metadata = {
+      'format_version':
+          _FORMAT_VERSION,
+      'client_ids':
+          client_ids,
+      'features': [{
+          'name': key,
+          'dtype': tensor_spec.dtype.name,
+          'shape': tensor_spec.shape.as_list(),
+      } for key, tensor_spec in element_spec.items()],
+  }
+  with open(metadata_path, 'w') as f:
+    json.dump(metadata, f)
+
+
+def convert_sql_client_data_to_columnar(
+    database_filepath: str,
+    element_spec: Mapping[str, tf.TensorSpec],
+    directory: str,
+    split_name: Optional[str] = None,
+    allow_overwrite: bool = False,
+) -> None:
+  """Converts a database written by `save_to_sql_client_data` to columns.
+
+  The `tf.train.Example` protos in the database are parsed once, and the
+  parsed features are written to `directory` with
+  `save_to_columnar_client_data`.
+
+  Args:
+    database_filepath: A `str` filepath of the SQL database.
+    element_spec: The `element_spec` of the local dataset, used to parse the
+      serialized examples. Must be of type `Mapping[str, TensorSpec]`.
+    directory: A `str` path to a local directory in which to write the files.
+    split_name: An optional `str` identifier for the split of the database to
+      convert. A value of `None` means no filtering, converting all examples.
+    allow_overwrite: A boolean indicating whether to allow overwriting the
+      files of an existing columnar client data at `directory`.
+  """
+  parsed_client_data = sql_client_data_utils.load_and_parse_sql_client_data(
+      database_filepath, element_spec, split_name)
+  save_to_columnar_client_data(
+      parsed_client_data.client_ids,
+      parsed_client_data.create_tf_dataset_for_client,
+      directory,
+      allow_overwrite=allow_overwrite)
+
+
+def _read_bytes(path: str, file_size: int, start: tf.Tensor,
+                num_bytes: tf.Tensor) -> tf.data.Dataset:
+  """Returns a dataset of one string, the bytes `[start, start + num_bytes)`.
+
+  The offsets are relative to the end of `_MAGIC`. The record read is one byte
+  longer than requested, starting in the magic, because
+  `tf.data.FixedLengthRecordDataset` does not support empty records.
+
+  Args:
+    path: The path of the file to read.
+    file_size: The size of the file in bytes, including `_MAGIC`.
+    start: A scalar `tf.int64` offset of the first byte to read.
+    num_bytes: A scalar `tf.int64` number of bytes to read.
+  """
+  header_bytes = len(_MAGIC) - 1 + start
+  dataset = tf.data.FixedLengthRecordDataset(
+      path,
+      record_bytes=num_bytes + 1,
+      header_bytes=header_bytes,
+      footer_bytes=file_size - header_bytes - num_bytes - 1)
+  return dataset.map(lambda record: tf.strings.substr(record, 1, num_bytes))
+
+
+def _split_strings(data: tf.Tensor, offsets: tf.Tensor) -> tf.Tensor:
+  """Splits the scalar string `data` at the relative `offsets`."""
+  lengths = offsets[1:] - offsets[:-1]
+  num_strings = tf.size(lengths)
+  segment_ids = tf.repeat(tf.range(num_strings), lengths)
+  return tf.strings.unsorted_segment_join(
+      tf.strings.bytes_split(data), segment_ids, num_segments=num_strings)
+
+
+# The name, `tf.TensorSpec`, data file path and size, and offsets file path and
+# size (or `None` for non-string features) of a feature.
+_Feature = tuple[str, tf.TensorSpec, str, int, Optional[str], Optional[int]]
+
+
+def _read_examples(features: Sequence[_Feature], start: tf.Tensor,
+                   num_examples: tf.Tensor) -> tf.data.Dataset:
+  """Returns a dataset of the examples `[start, start + num_examples)`.
+
+  The bytes of the examples are only read from the files when the dataset is
+  iterated, so creating the dataset takes constant time.
+
+  Args:
+    features: The `_Feature`s of the examples.
+    start: A scalar `tf.int64` index of the first example.
+    num_examples: A scalar `tf.int64` number of examples.
+  """
+  feature_datasets = collections.OrderedDict()
+  for (key, tensor_spec, data_path, data_size, offsets_path,
+       offsets_size) in features:
+    shape = [-1] + tensor_spec.shape.as_list()
+    if tensor_spec.dtype == tf.string:
+      num_strings = num_examples * tensor_spec.shape.num_elements()
+      string_offsets = _read_bytes(
+          offsets_path, offsets_size,
+          start * tensor_spec.shape.num_elements() * 8,
+          (num_strings + 1) * 8).map(
+              lambda x: tf.io.decode_raw(x, tf.int64, little_endian=True))
+
+      def read_strings(string_offsets,
+                       data_path=data_path,
+                       data_size=data_size,
+                       shape=shape):
+        data = _read_bytes(data_path, data_size, string_offsets[0],
+                           string_offsets[-1] - string_offsets[0])
+        return data.map(lambda x: tf.reshape(  # pylint: disable=g-long-lambda
+            _split_strings(x, string_offsets - string_offsets[0]), shape))
+
+      feature_datasets[key] = string_offsets.flat_map(read_strings)
+    else:
+      row_bytes = tensor_spec.dtype.size * tensor_spec.shape.num_elements()
+      feature_datasets[key] = _read_bytes(
+          data_path, data_size, start * row_bytes,
+          num_examples * row_bytes).map(
+              lambda x, dtype=tensor_spec.dtype, shape=shape: tf.reshape(  # pylint: disable=g-long-lambda
+                  tf.io.decode_raw(x, dtype, little_endian=True), shape))
+  return tf.data.Dataset.zip(feature_datasets).flat_map(
+      tf.data.Dataset.from_tensor_slices)
+
+
+class ColumnarClientData(client_data.ClientData):
+  """A `tff.simulation.datasets.ClientData` backed by columnar files.
+
+  The data is read from a directory written by `save_to_columnar_client_data`
+  or `convert_sql_client_data_to_columnar`. Looking up the examples of a client
+  is a constant time lookup in the memory-mapped client index, and does not
+  parse any protocol buffers: the datasets returned by both
+  `create_tf_dataset_for_client` and `serializable_dataset_fn` read the bytes
+  of the client directly from the files, only when they are iterated.
+
+  The elements of the datasets are `collections.OrderedDict`s of tensors, with
+  the features in the order they were written.
+  """
+
+  def __init__(self, directory: str):
+    """Constructs a `tff.simulation.datasets.ColumnarClientData` object.
+
+    Args:
+      directory: A `str` path to a local directory written by
+        `save_to_columnar_client_data`.
+
+    Raises:
+      ColumnarFormatError: If `directory` does not hold a supported columnar
+        client data.
+    """
+    py_typecheck.check_type(directory, str)
+    metadata_path = os.path.join(directory, _METADATA_FILENAME)
+    try:
+      with open(metadata_path) as f:
+        metadata = json.load(f)
+    except FileNotFoundError as e:
+      raise ColumnarFormatError(
+          f'No columnar client data found at {directory}.') from e
+    if metadata.get('format_version') != _FORMAT_VERSION:
+      raise ColumnarFormatError(
+          f'Unsupported columnar client data format version '
+          f'{metadata.get("format_version")} at {directory}.')
+    self._directory = directory
+    self._client_ids = list(metadata['client_ids'])
+    self._client_indices = {
+        client_id: i for i, client_id in enumerate(self._client_ids)
+    }
+    self._element_type_structure = collections.OrderedDict(
+        (feature['name'],
+         tf.TensorSpec(shape=feature['shape'], dtype=feature['dtype']))
+        for feature in metadata['features'])
+    self._client_offsets = self._memmap(_CLIENT_OFFSETS_FILENAME, '<i8')
+    if len(self._client_offsets) != len(self._client_ids) + 1:
+      raise ColumnarFormatError(
+          f'Expected {len(self._client_ids) + 1} client offsets, found '
+          f'{len(self._client_offsets)}.')
+    self._features = []
+    for key, tensor_spec in self._element_type_structure.items():
+      data_path = self._path(_data_filename(key))
+      data_size = self._check_file(data_path)
+      if tensor_spec.dtype == tf.string:
+        offsets_path = self._path(_offsets_filename(key))
+        offsets_size = self._check_file(offsets_path)
+      else:
+        offsets_path = None
+        offsets_size = None
+      self._features.append((key, tensor_spec, data_path, data_size,
+                             offsets_path, offsets_size))
+
+  def _path(self, filename: str) -> str:
+    return os.path.join(self._directory, filename)
+
+  def _check_file(self, path: str) -> int:
+    """Checks that `path` starts with `_MAGIC` and returns its size in bytes."""
+    with open(path, 'rb') as f:
+      if f.read(len(_MAGIC)) != _MAGIC:
+        raise ColumnarFormatError(f'{path} is not a columnar data file.')
+    return os.path.getsize(path)
+
+  def _memmap(self, filename: str, dtype) -> np.ndarray:
+    """Memory-maps the content of `filename` after `_MAGIC` as read-only."""
+    path = self._path(filename)
+    if self._check_file(path) == len(_MAGIC):
+      # Empty files cannot be memory-mapped.
+      return np.zeros([0], dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=len(_MAGIC))
+
+  @property
+  def client_ids(self):
+    return self._client_ids
+
+  @property
+  def element_type_structure(self):
+    return self._element_type_structure
+
+  def _check_client_id(self, client_id: str) -> int:
+    index = self._client_indices.get(client_id)
+    if index is None:
+      raise ValueError(
+          'ID [{i}] is not a client in this ClientData. See '
+          'property `client_ids` for the list of valid ids.'.format(
+              i=client_id))
+    return index
+
+  def create_tf_dataset_for_client(self, client_id: str) -> tf.data.Dataset:
+    """Creates a new `tf.data.Dataset` containing the client training examples.
+
+    Unlike `self.serializable_dataset_fn`, this method is not serializable.
+    The dataset is created in constant time, and reads the examples of the
+    client from the files as it is iterated.
+
+    Args:
+      client_id: The string identifier for the desired client.
+
+    Returns:
+      A `tf.data.Dataset` object.
+    """
+    index = self._check_client_id(client_id)
+    start = int(self._client_offsets[index])
+    end = int(self._client_offsets[index + 1])
+    return _read_examples(self._features, tf.constant(start, tf.int64),
+                          tf.constant(end - start, tf.int64))
+
+  @property
+  def serializable_dataset_fn(self):
+    client_ids = self._client_ids
+    client_offsets = np.asarray(self._client_offsets, dtype=np.int64)
+    features = self._features
+
+    def dataset_fn(client_id):
+      client_table = tf.lookup.StaticHashTable(
+          tf.lookup.KeyValueTensorInitializer(
+              keys=tf.constant(client_ids),
+              values=tf.range(len(client_ids), dtype=tf.int64)),
+          default_value=-1)
+      index = client_table.lookup(tf.convert_to_tensor(client_id))
+      tf.debugging.assert_non_negative(
+          index, message='No data found for client.')
+      offsets = tf.constant(client_offsets)
+      start = tf.gather(offsets, index)
+      num_examples = tf.gather(offsets, index + 1) - start
+      return _read_examples(features, start, num_examples)
+
+    return dataset_fn
@@ -0,0 +1,182 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import os
+
+from absl.testing import parameterized
+import numpy as np
+import tensorflow as tf
+
+from tensorflow_federated.python.core.backends.native import execution_contexts
+from tensorflow_federated.python.simulation.datasets import columnar_client_data
+from tensorflow_federated.python.simulation.datasets import from_tensor_slices_client_data
+from tensorflow_federated.python.simulation.datasets import sql_client_data_utils
+
+_TEST_DATA = {
+    'client_a':
+        collections.OrderedDict(
+            x=np.array([[1.0, 2.0], [3.0, 4.0]], dtype=np.float32),
+            y=np.array([1, 2], dtype=np.int64),
+            z=np.array([b'abc', b''], dtype=object),
+        ),
+    'client_b':
+        collections.OrderedDict(
+            x=np.array([[5.0, 6.0]], dtype=np.float32),
+            y=np.array([3], dtype=np.int64),
+            z=np.array([b'\x00de\xff'], dtype=object),
+        ),
+    'client_c':
+        collections.OrderedDict(
+            x=np.array([[7.0, 8.0], [9.0, 10.0], [11.0, 12.0]],
+                       dtype=np.float32),
+            y=np.array([4, 5, 6], dtype=np.int64),
+            z=np.array([b'', b'g', b'hij'], dtype=object),
+        ),
+}
+
+
+def _create_test_client_data():
+  return from_tensor_slices_client_data.TestClientData(_TEST_DATA)
+
+
+class ColumnarClientDataTest(tf.test.TestCase, parameterized.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._directory = self.create_tempdir().full_path
+    test_client_data = _create_test_client_data()
+    columnar_client_data.save_to_columnar_client_data(
+        test_client_data.client_ids,
+        test_client_data.create_tf_dataset_for_client, self._directory)
+
+  def assert_datasets_equal(self, actual, expected):
+    actual = list(actual.as_numpy_iterator())
+    expected = list(expected.as_numpy_iterator())
+    self.assertLen(actual, len(expected))
+    for actual_element, expected_element in zip(actual, expected):
+      self.assertAllEqual(actual_element, expected_element)
+
+  def test_client_ids_property(self):
+    client_data = columnar_client_data.ColumnarClientData(self._directory)
+    self.assertEqual(client_data.client_ids,
+                     ['client_a', 'client_b', 'client_c'])
+
+  def test_element_type_structure(self):
+    client_data = columnar_client_data.ColumnarClientData(self._directory)
+    self.assertEqual(
+        client_data.element_type_structure,
+        collections.OrderedDict(
+            x=tf.TensorSpec(shape=[2], dtype=tf.float32),
+            y=tf.TensorSpec(shape=[], dtype=tf.int64),
+            z=tf.TensorSpec(shape=[], dtype=tf.string),
+        ))
+
+  def test_create_tf_dataset_for_client(self):
+    client_data = columnar_client_data.ColumnarClientData(self._directory)
+    test_client_data = _create_test_client_data()
+    for client_id in client_data.client_ids:
+      dataset = client_data.create_tf_dataset_for_client(client_id)
+      self.assertEqual(dataset.element_spec,
+                       client_data.element_type_structure)
+      self.assert_datasets_equal(
+          dataset, test_client_data.create_tf_dataset_for_client(client_id))
+
+  def test_serializable_dataset_fn(self):
+    client_data = columnar_client_data.ColumnarClientData(self._directory)
+    test_client_data = _create_test_client_data()
+    for client_id in client_data.client_ids:
+      dataset = client_data.serializable_dataset_fn(client_id)
+      self.assert_datasets_equal(
+          dataset, test_client_data.create_tf_dataset_for_client(client_id))
+
+  def test_dataset_computation(self):
+    client_data = columnar_client_data.ColumnarClientData(self._directory)
+    dataset = client_data.dataset_computation('client_b')
+    self.assert_datasets_equal(
+        dataset,
+        _create_test_client_data().create_tf_dataset_for_client('client_b'))
+
+  def test_create_tf_dataset_for_missing_client_raises_value_error(self):
+    client_data = columnar_client_data.ColumnarClientData(self._directory)
+    with self.assertRaises(ValueError):
+      client_data.create_tf_dataset_for_client('missing_client')
+
+  def test_save_raises_file_exists_error(self):
+    test_client_data = _create_test_client_data()
+    with self.assertRaises(FileExistsError):
+      columnar_client_data.save_to_columnar_client_data(
+          test_client_data.client_ids,
+          test_client_data.create_tf_dataset_for_client, self._directory)
+
+  def test_save_with_unknown_shape_raises_element_spec_error(self):
+    client_data = from_tensor_slices_client_data.TestClientData(
+        {'client_a': collections.OrderedDict(x=[1.0])})
+
+    def dataset_fn(client_id):
+      return client_data.create_tf_dataset_for_client(client_id).batch(1)
+
+    with self.assertRaises(sql_client_data_utils.ElementSpecCompatibilityError):
+      columnar_client_data.save_to_columnar_client_data(
+          client_data.client_ids, dataset_fn,
+          self.create_tempdir().full_path)
+
+  @parameterized.named_parameters(
+      ('client_offsets', {'client_offsets': [1]}),
+      ('client_offsets_upper_case', {'Client_Offsets': [1]}),
+      ('offsets_of_string_feature', {'x': [b'a'], 'x.offsets': [1]}),
+      ('offsets_suffix', {'x.offsets': [1]}),
+      ('same_file_case_insensitive', {'x': [1], 'X': [2]}),
+  )
+  def test_save_with_reserved_feature_name_raises_element_spec_error(
+      self, tensor_slices):
+    directory = self.create_tempdir().full_path
+
+    def dataset_fn(client_id):
+      del client_id  # Unused.
+      return tf.data.Dataset.from_tensor_slices(tensor_slices)
+
+    with self.assertRaises(sql_client_data_utils.ElementSpecCompatibilityError):
+      columnar_client_data.save_to_columnar_client_data(['client_a'],
+                                                        dataset_fn, directory)
+    self.assertEmpty(os.listdir(directory))
+
+  def test_load_from_missing_directory_raises_format_error(self):
+    with self.assertRaises(columnar_client_data.ColumnarFormatError):
+      columnar_client_data.ColumnarClientData(
+          os.path.join(self.create_tempdir().full_path, 'missing'))
+
+  def test_convert_sql_client_data_to_columnar(self):
+    test_client_data = _create_test_client_data()
+    database_filepath = os.path.join(self.create_tempdir().full_path,
+                                     'test.sqlite')
+    sql_client_data_utils.save_to_sql_client_data(
+        test_client_data.client_ids,
+        test_client_data.create_tf_dataset_for_client, database_filepath)
+    directory = self.create_tempdir().full_path
+
+    columnar_client_data.convert_sql_client_data_to_columnar(
+        database_filepath, test_client_data.element_type_structure, directory)
+
+    client_data = columnar_client_data.ColumnarClientData(directory)
+    self.assertEqual(client_data.client_ids, test_client_data.client_ids)
+    for client_id in client_data.client_ids:
+      self.assert_datasets_equal(
+          client_data.create_tf_dataset_for_client(client_id),
+          test_client_data.create_tf_dataset_for_client(client_id))
+
+
+if __name__ == '__main__':
+  execution_contexts.set_localhost_cpp_execution_context()
+  tf.test.main()
@@ -13,8 +13,12 @@
 # limitations under the License.
 """Implementation of `ClientData` backed by an SQL database."""
 
-from collections.abc import Iterator
+from collections.abc import Iterator, Sequence
+import contextlib
+import pathlib
+import queue
 import sqlite3
+import threading
 from typing import Optional
 
 from absl import logging
@@ -31,6 +35,11 @@ class DatabaseFormatError(Exception):
 REQUIRED_TABLES = frozenset(["examples", "client_metadata"])
 REQUIRED_EXAMPLES_COLUMNS = frozenset(
     ["split_name", "client_id", "serialized_example_proto"])
+EXAMPLES_INDEX_NAME = "idx_examples_client_id_split_name"
+
+# The maximum number of client ids bound in a single query, which keeps queries
+# under the default `SQLITE_MAX_VARIABLE_NUMBER` of older SQLite versions.
+_MAX_CLIENT_IDS_PER_QUERY = 900
 
 
 def _check_database_format(database_filepath: str):
@@ -84,6 +93,58 @@ def _fetch_client_ids(database_filepath: str,
   return map(lambda x: x[0], result)
 
 
+def _create_examples_index(database_filepath: str):
+  """Creates an index on the `(client_id, split_name)` columns of `examples`.
+
+  Args:
+    database_filepath: A string filepath to a SQLite database, which must be
+      writable if the index does not exist yet.
+  """
+  with contextlib.closing(sqlite3.connect(database_filepath)) as connection:
+    with connection:
+      connection.execute(
+          f"CREATE INDEX IF NOT EXISTS {EXAMPLES_INDEX_NAME} "
+          "ON examples (client_id, split_name);")
+
+
+class _ConnectionPool:
+  """A bounded pool of read-only connections to a SQLite database.
+
+  Connections are opened lazily, up to `max_size`, and are shared across
+  threads; a thread waits for a connection to be returned to the pool if all
+  `max_size` connections are in use.
+  """
+
+  def __init__(self, database_filepath: str, max_size: int):
+    self._uri = f"{pathlib.Path(database_filepath).resolve().as_uri()}?mode=ro"
+    self._max_size = max_size
+    self._size = 0
+    self._lock = threading.Lock()
+    self._connections = queue.LifoQueue()
+
+  def _open_connection(self) -> sqlite3.Connection:
+    return sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+
+  @contextlib.contextmanager
+  def connection(self) -> Iterator[sqlite3.Connection]:
+    """Yields a connection from the pool, returning it on exit."""
+    try:
+      connection = self._connections.get_nowait()
+    except queue.Empty:
+      with self._lock:
+        can_open = self._size < self._max_size
+        if can_open:
+          self._size += 1
+      if can_open:
+        connection = self._open_connection()
+      else:
+        connection = self._connections.get()
+    try:
+      yield connection
+    finally:
+      self._connections.put(connection)
+
+
 class SqlClientData(client_data.ClientData):
   """A `tff.simulation.datasets.ClientData` backed by an SQL file.
 
@@ -110,7 +171,11 @@ class SqlClientData(client_data.ClientData):
          held by this client.
   """
 
-  def __init__(self, database_filepath: str, split_name: Optional[str] = None):
+  def __init__(self,
+               database_filepath: str,
+               split_name: Optional[str] = None,
+               create_index: bool = False,
+               connection_pool_size: Optional[int] = None):
     """Constructs a `tff.simulation.datasets.SqlClientData` object.
 
     Args:
@@ -118,13 +183,39 @@ class SqlClientData(client_data.ClientData):
       split_name: An optional `str` identifier for the split of the database to
         use. This filters clients and examples based on the `split_name` column.
         A value of `None` means no filtering, selecting all examples.
+      create_index: Whether to create an index on the `(client_id, split_name)`
+        columns of the `examples` table, if it does not exist yet. This requires
+        the database to be writable, and speeds up looking up the examples of a
+        client in large databases.
+      connection_pool_size: An optional maximum number of read-only
+        connections to the database to keep open. If set, the datasets returned
+        by `create_tf_dataset_for_client` and `create_tf_datasets_for_clients`
+        are read eagerly through these connections, instead of opening a new
+        connection for every client dataset. `serializable_dataset_fn` is not
+        affected.
+
+    Raises:
+      ValueError: If `connection_pool_size` is not positive.
     """
     py_typecheck.check_type(database_filepath, str)
     _check_database_format(database_filepath)
+    if connection_pool_size is not None:
+      py_typecheck.check_type(connection_pool_size, int)
+      if connection_pool_size <= 0:
+        raise ValueError("Expected `connection_pool_size` to be positive, "
+                         f"found {connection_pool_size}.")
+    if create_index:
+      _create_examples_index(database_filepath)
     self._filepath = database_filepath
     self._split_name = split_name
+    if connection_pool_size is not None:
+      self._connection_pool = _ConnectionPool(database_filepath,
+                                              connection_pool_size)
+    else:
+      self._connection_pool = None
     self._client_ids = sorted(
         list(_fetch_client_ids(database_filepath, split_name)))
+    self._client_ids_set = frozenset(self._client_ids)
     logging.info("Loaded %d client ids from SQL database.",
                  len(self._client_ids))
     # SQLite returns a single column of bytes which are serialized protocol
@@ -145,6 +236,58 @@ class SqlClientData(client_data.ClientData):
         query=tf.strings.join(query_parts),
         output_types=(tf.string))
 
+  def _fetch_examples(self, connection: sqlite3.Connection,
+                      client_ids: Sequence[str]) -> dict[str, list[bytes]]:
+    """Fetches the examples of `client_ids` in as few queries as possible."""
+    examples = {client_id: [] for client_id in client_ids}
+    unique_client_ids = list(examples)
+    for start in range(0, len(unique_client_ids), _MAX_CLIENT_IDS_PER_QUERY):
+      batch_client_ids = unique_client_ids[start:start +
+                                           _MAX_CLIENT_IDS_PER_QUERY]
+      placeholders = ", ".join(["?"] * len(batch_client_ids))
+      query = ("SELECT client_id, serialized_example_proto FROM examples "
+               f"WHERE client_id IN ({placeholders})")
+      parameters = list(batch_client_ids)
+      if self._split_name is not None:
+        query += " AND split_name = ?"
+        parameters.append(self._split_name)
+      for client_id, serialized_example_proto in connection.execute(
+          query, parameters):
+        examples[client_id].append(serialized_example_proto)
+    return examples
+
+  def create_tf_datasets_for_clients(
+      self, client_ids: Sequence[str]) -> list[tf.data.Dataset]:
+    """Creates the datasets of several clients with a single bulk query.
+
+    This is faster than calling `create_tf_dataset_for_client` for each client
+    when selecting a cohort of clients, as the examples of all the clients are
+    read at once. The examples are held in memory by the returned datasets.
+
+    Args:
+      client_ids: A sequence of string identifiers of clients in `client_ids`.
+
+    Returns:
+      A list of `tf.data.Dataset` objects, one for each of `client_ids` in
+      order.
+
+    Raises:
+      ValueError: If any of `client_ids` is not a client in this `ClientData`.
+    """
+    for client_id in client_ids:
+      self._check_client_id(client_id)
+    if self._connection_pool is not None:
+      connection_context = self._connection_pool.connection()
+    else:
+      connection_context = contextlib.closing(sqlite3.connect(self._filepath))
+    with connection_context as connection:
+      examples = self._fetch_examples(connection, client_ids)
+    return [
+        tf.data.Dataset.from_tensor_slices(
+            tf.constant(examples[client_id], dtype=tf.string))
+        for client_id in client_ids
+    ]
+
   @property
   def serializable_dataset_fn(self):
     return self._create_dataset
@@ -166,12 +309,17 @@ class SqlClientData(client_data.ClientData):
     Returns:
       A `tf.data.Dataset` object.
     """
-    if client_id not in self.client_ids:
+    self._check_client_id(client_id)
+    if self._connection_pool is not None:
+      return self.create_tf_datasets_for_clients([client_id])[0]
+    return self._create_dataset(client_id)
+
+  def _check_client_id(self, client_id: str):
+    if client_id not in self._client_ids_set:
       raise ValueError(
           "ID [{i}] is not a client in this ClientData. See "
           "property `client_ids` for the list of valid ids.".format(
               i=client_id))
-    return self._create_dataset(client_id)
 
   @property
   def element_type_structure(self):
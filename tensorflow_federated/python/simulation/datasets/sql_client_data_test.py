@@ -147,6 +147,75 @@ class SqlClientDataTest(tf.test.TestCase):
       test_split('test', 1)
 
 
+  def test_create_dataset_for_client_with_connection_pool(self):
+
+    def test_split(split_name, example_counts):
+      client_data = sql_client_data.SqlClientData(
+          test_dataset_filepath(),
+          split_name=split_name,
+          connection_pool_size=2)
+      self.assertEqual(client_data.client_ids, list(example_counts.keys()))
+      for client_id, expected_examples in example_counts.items():
+        dataset = client_data.create_tf_dataset_for_client(client_id)
+        self.assertEqual(dataset.element_spec,
+                         tf.TensorSpec(shape=(), dtype=tf.string))
+        actual_examples = dataset.reduce(0, lambda s, x: s + 1)
+        self.assertEqual(actual_examples, expected_examples, msg=client_id)
+
+    with self.subTest('no_split'):
+      test_split(None, {'test_a': 1, 'test_b': 2, 'test_c': 3})
+    with self.subTest('train_split'):
+      test_split('train', {'test_a': 1, 'test_b': 1, 'test_c': 2})
+    with self.subTest('test_split'):
+      test_split('test', {'test_b': 1, 'test_c': 1})
+
+  def test_create_datasets_for_clients(self):
+
+    def test_split(split_name, connection_pool_size, example_counts):
+      client_data = sql_client_data.SqlClientData(
+          test_dataset_filepath(),
+          split_name=split_name,
+          connection_pool_size=connection_pool_size)
+      client_ids = ['test_c', 'test_a', 'test_c']
+      datasets = client_data.create_tf_datasets_for_clients(client_ids)
+      self.assertLen(datasets, len(client_ids))
+      for client_id, dataset in zip(client_ids, datasets):
+        actual_examples = [
+            tf.train.Example.FromString(x.numpy()) for x in dataset
+        ]
+        self.assertLen(actual_examples, example_counts[client_id])
+        for example in actual_examples:
+          self.assertEqual(
+              example.features.feature['client_id'].bytes_list.value,
+              [client_id.encode('utf-8')])
+
+    with self.subTest('no_split'):
+      test_split(None, None, {'test_a': 1, 'test_c': 3})
+    with self.subTest('no_split_with_connection_pool'):
+      test_split(None, 1, {'test_a': 1, 'test_c': 3})
+    with self.subTest('train_split'):
+      test_split('train', 1, {'test_a': 1, 'test_c': 2})
+
+  def test_create_datasets_for_clients_with_missing_client(self):
+    client_data = sql_client_data.SqlClientData(test_dataset_filepath())
+    with self.assertRaisesRegex(ValueError, 'not a client in this ClientData'):
+      client_data.create_tf_datasets_for_clients(['test_a', 'missing'])
+
+  def test_create_index(self):
+    sql_client_data.SqlClientData(test_dataset_filepath(), create_index=True)
+    with sqlite3.connect(test_dataset_filepath()) as connection:
+      index_names = [
+          r[0] for r in connection.execute(
+              "SELECT name FROM sqlite_master WHERE type = 'index';")
+      ]
+    self.assertIn(sql_client_data.EXAMPLES_INDEX_NAME, index_names)
+
+  def test_raises_with_non_positive_connection_pool_size(self):
+    with self.assertRaises(ValueError):
+      sql_client_data.SqlClientData(
+          test_dataset_filepath(), connection_pool_size=0)
+
+
 class PreprocessSqlClientDataTest(tf.test.TestCase):
 
   def test_preprocess_with_identity_gives_same_structure(self):
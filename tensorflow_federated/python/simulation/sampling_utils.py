@@ -15,7 +15,7 @@
 
 from collections.abc import Callable, Sequence
 import functools
-from typing import Optional, TypeVar
+from typing import Any, Optional, TypeVar
 
 import numpy as np
 
@@ -29,6 +29,75 @@ MLCG_MULTIPLIER = 16807
 T = TypeVar('T')
 
 
+def _get_pseudo_random_int(mlcg_start: int, round_num: int) -> int:
+  return pow(MLCG_MULTIPLIER, round_num,
+             MLCG_MODULUS) * mlcg_start % MLCG_MODULUS
+
+
+def _build_generator_fn(
+    random_seed: Optional[int]) -> Callable[[int], np.random.Generator]:
+  """Builds a function returning a `np.random.Generator` for a round number.
+
+  If `random_seed` is an integer, the generator of each round number is seeded
+  deterministically using the same multiplicative linear congruential generator
+  as `build_uniform_sampling_fn`. Otherwise, a nondeterministic seed is used.
+
+  Args:
+    random_seed: An optional integer random seed.
+  """
+  if isinstance(random_seed, int):
+    mlcg_start = np.random.RandomState(random_seed).randint(1, MLCG_MODULUS - 1)
+
+    def get_generator(round_num):
+      return np.random.default_rng(_get_pseudo_random_int(
+          mlcg_start, round_num))
+  else:
+
+    def get_generator(round_num):
+      del round_num  # Unused.
+      return np.random.default_rng()
+
+  return get_generator
+
+
+def _check_positive(value: int, name: str) -> None:
+  if value < 1:
+    raise ValueError(f'Expected `{name}` to be positive, found {value}.')
+
+
+def _build_block_sampling_fn(
+    sample_round_fn: Callable[[np.random.Generator, int], np.ndarray],
+    random_seed: Optional[int],
+    rounds_per_block: int) -> Callable[[int, int], np.ndarray]:
+  """Builds a sampling function which samples rounds in blocks.
+
+  The samples of `rounds_per_block` consecutive rounds are computed at once,
+  using a single generator seeded by the block number, and cached so that the
+  other rounds of the block are returned without sampling.
+
+  Args:
+    sample_round_fn: A callable accepting a `np.random.Generator` and an
+      integer `size`, and returning the samples of one round.
+    random_seed: An optional integer random seed, see `_build_generator_fn`.
+    rounds_per_block: The number of rounds to sample at once.
+  """
+  get_generator = _build_generator_fn(random_seed)
+
+  @functools.lru_cache(maxsize=2)
+  def sample_block(block_num, size):
+    generator = get_generator(block_num)
+    block = np.stack(
+        [sample_round_fn(generator, size) for _ in range(rounds_per_block)])
+    block.setflags(write=False)
+    return block
+
+  def sample(round_num, size):
+    block_num, index = divmod(round_num, rounds_per_block)
+    return sample_block(block_num, size)[index]
+
+  return sample
+
+
 def build_uniform_sampling_fn(
     sample_range: Sequence[T],
     replace: bool = False,
@@ -41,6 +110,10 @@ def build_uniform_sampling_fn(
   Knuth for reference). This does not affect model initialization, shuffling, or
   other such aspects of the federated training process.
 
+  Note: Sampling without replacement costs O(len(sample_range)) per round. For
+  large populations, prefer `build_uniform_index_sampling_fn`, whose cost per
+  round is proportional to the number of sampled clients.
+
   Args:
     sample_range: A 1-D array-like sequence, to be used as input to
       `np.random.choice`. Samples are generated randomly from the elements of
@@ -58,13 +131,10 @@ def build_uniform_sampling_fn(
   if isinstance(random_seed, int):
     mlcg_start = np.random.RandomState(random_seed).randint(1, MLCG_MODULUS - 1)
 
-    def get_pseudo_random_int(round_num):
-      return pow(MLCG_MULTIPLIER, round_num,
-                 MLCG_MODULUS) * mlcg_start % MLCG_MODULUS
-
   def sample(round_num, size, random_seed):
     if isinstance(random_seed, int):
-      random_state = np.random.RandomState(get_pseudo_random_int(round_num))
+      random_state = np.random.RandomState(
+          _get_pseudo_random_int(mlcg_start, round_num))
     else:
       random_state = np.random.RandomState()
     try:
@@ -75,3 +145,242 @@ def build_uniform_sampling_fn(
                        f'size {len(sample_range)}.') from e
 
   return functools.partial(sample, random_seed=random_seed)
+
+
+def build_uniform_index_sampling_fn(
+    population_size: int,
+    replace: bool = False,
+    random_seed: Optional[int] = None,
+    rounds_per_block: int = 1) -> Callable[[int, int], np.ndarray]:
+  """Builds a function sampling indices of a population uniformly at each round.
+
+  Unlike `build_uniform_sampling_fn`, the population is never materialized: the
+  returned function samples integer indices in `[0, population_size)`, which
+  can be used to index a sequence of client ids, and its cost per round is
+  proportional to the number of sampled indices rather than to the size of the
+  population.
+
+  If an integer `random_seed` is provided, the samples are deterministic and
+  seeded by the same multiplicative linear congruential generator as
+  `build_uniform_sampling_fn`, although the samples themselves differ.
+
+  Args:
+    population_size: The number of elements of the population.
+    replace: A boolean indicating whether the sampling is done with replacement
+      (True) or without replacement (False) within each round.
+    random_seed: If an integer, it is used as a random seed for the sampling
+      process. If None, a nondeterministic seed is used.
+    rounds_per_block: The number of consecutive rounds to sample at once. The
+      samples of a round depend on `rounds_per_block`.
+
+  Returns:
+    A function that takes as input an integer `round_num` and integer `size` and
+    returns a read-only `np.ndarray` of `size` sampled indices.
+
+  Raises:
+    ValueError: If `population_size` or `rounds_per_block` is not positive.
+  """
+  _check_positive(population_size, 'population_size')
+  _check_positive(rounds_per_block, 'rounds_per_block')
+
+  def sample_round(generator, size):
+    if replace:
+      return generator.integers(population_size, size=size)
+    if size > population_size:
+      raise ValueError(f'Failed to sample {size} clients from population of '
+                       f'size {population_size}.')
+    # Without a probability distribution, `np.random.Generator.choice` uses an
+    # algorithm whose cost is proportional to `size` for small samples.
+    return generator.choice(population_size, size=size, replace=False)
+
+  return _build_block_sampling_fn(sample_round, random_seed, rounds_per_block)
+
+
+def build_weighted_index_sampling_fn(
+    weights: Sequence[float],
+    replace: bool = True,
+    random_seed: Optional[int] = None,
+    rounds_per_block: int = 1) -> Callable[[int, int], np.ndarray]:
+  """Builds a function sampling indices in proportion to their weights.
+
+  Each index `i` is sampled with probability proportional to `weights[i]`, e.g.
+  the number of examples of the `i`-th client. The cumulative distribution of
+  the weights is computed once, and each sample costs O(log(len(weights))).
+
+  When sampling without replacement, indices are drawn with replacement and the
+  duplicates are discarded until `size` distinct indices are drawn (successive
+  sampling), which is efficient as long as no small set of indices holds most of
+  the weight.
+
+  Args:
+    weights: A 1-D sequence of non-negative weights, one for each element of the
+      population.
+    replace: A boolean indicating whether the sampling is done with replacement
+      (True) or without replacement (False) within each round.
+    random_seed: If an integer, it is used as a random seed for the sampling
+      process, see `build_uniform_index_sampling_fn`. If None, a
+      nondeterministic seed is used.
+    rounds_per_block: The number of consecutive rounds to sample at once.
+
+  Returns:
+    A function that takes as input an integer `round_num` and integer `size` and
+    returns a read-only `np.ndarray` of `size` sampled indices.
+
+  Raises:
+    ValueError: If `weights` is not a non-empty 1-D sequence of non-negative
+      finite weights with a positive sum, or `rounds_per_block` is not
+      positive.
+  """
+  weights = np.asarray(weights, dtype=np.float64)
+  if weights.ndim != 1 or weights.size == 0:
+    raise ValueError('Expected `weights` to be a non-empty 1-D sequence, found '
+                     f'shape {weights.shape}.')
+  if not np.all(np.isfinite(weights)) or np.any(weights < 0):
+    raise ValueError('Expected `weights` to be non-negative and finite.')
+  total_weight = np.sum(weights)
+  if total_weight <= 0:
+    raise ValueError('Expected `weights` to have a positive sum.')
+  _check_positive(rounds_per_block, 'rounds_per_block')
+  cumulative_weights = np.cumsum(weights) / total_weight
+  num_sampleable = np.count_nonzero(weights)
+
+  def draw(generator, size):
+    indices = np.searchsorted(
+        cumulative_weights, generator.random(size), side='right')
+    # Guard against rounding errors in the last cumulative weight.
+    return np.minimum(indices, len(cumulative_weights) - 1)
+
+  def sample_round(generator, size):
+    if replace:
+      return draw(generator, size)
+    if size > num_sampleable:
+      raise ValueError(f'Failed to sample {size} clients from population of '
+                       f'{num_sampleable} clients with a positive weight.')
+    # A `dict` is used as an insertion-ordered set.
+    sampled = {}
+    while len(sampled) < size:
+      for index in draw(generator, size - len(sampled)).tolist():
+        sampled[index] = None
+    return np.array(list(sampled), dtype=np.int64)
+
+  return _build_block_sampling_fn(sample_round, random_seed, rounds_per_block)
+
+
+def build_stratified_index_sampling_fn(
+    strata: Sequence[Any],
+    replace: bool = False,
+    random_seed: Optional[int] = None,
+    rounds_per_block: int = 1) -> Callable[[int, int], np.ndarray]:
+  """Builds a function sampling indices from each stratum of a population.
+
+  The population is partitioned into strata by the label `strata[i]` of each
+  index `i`. Each round, the `size` samples are allocated to the strata in
+  proportion to their sizes (using the largest remainder method), and sampled
+  uniformly within each stratum. The returned indices are grouped by stratum,
+  in the sorted order of the stratum labels.
+
+  Args:
+    strata: A 1-D sequence of stratum labels, one for each element of the
+      population.
+    replace: A boolean indicating whether the sampling is done with replacement
+      (True) or without replacement (False) within each round.
+    random_seed: If an integer, it is used as a random seed for the sampling
+      process, see `build_uniform_index_sampling_fn`. If None, a
+      nondeterministic seed is used.
+    rounds_per_block: The number of consecutive rounds to sample at once.
+
+  Returns:
+    A function that takes as input an integer `round_num` and integer `size` and
+    returns a read-only `np.ndarray` of `size` sampled indices.
+
+  Raises:
+    ValueError: If `strata` is empty or `rounds_per_block` is not positive.
+  """
+  labels = np.asarray(strata)
+  if labels.ndim != 1 or labels.size == 0:
+    raise ValueError('Expected `strata` to be a non-empty 1-D sequence, found '
+                     f'shape {labels.shape}.')
+  _check_positive(rounds_per_block, 'rounds_per_block')
+  _, stratum_ids = np.unique(labels, return_inverse=True)
+  stratum_sizes = np.bincount(stratum_ids)
+  members = np.split(
+      np.argsort(stratum_ids, kind='stable'),
+      np.cumsum(stratum_sizes)[:-1])
+  proportions = stratum_sizes / labels.size
+
+  def allocate(size):
+    quotas = size * proportions
+    allocation = np.floor(quotas).astype(np.int64)
+    remainder = size - np.sum(allocation)
+    if remainder > 0:
+      largest = np.argsort(allocation - quotas, kind='stable')[:remainder]
+      allocation[largest] += 1
+    return allocation
+
+  def sample_round(generator, size):
+    if not replace and size > labels.size:
+      raise ValueError(f'Failed to sample {size} clients from population of '
+                       f'size {labels.size}.')
+    samples = []
+    for stratum_members, stratum_size in zip(members, allocate(size)):
+      if stratum_size == 0:
+        continue
+      if replace:
+        positions = generator.integers(len(stratum_members), size=stratum_size)
+      else:
+        positions = generator.choice(
+            len(stratum_members), size=stratum_size, replace=False)
+      samples.append(stratum_members[positions])
+    return np.concatenate(samples)
+
+  return _build_block_sampling_fn(sample_round, random_seed, rounds_per_block)
+
+
+def build_epoch_index_sampling_fn(
+    population_size: int,
+    random_seed: Optional[int] = None) -> Callable[[int, int], np.ndarray]:
+  """Builds a function sampling indices without replacement across rounds.
+
+  The rounds are grouped into epochs over the population: each epoch is a random
+  permutation of the population, and consecutive rounds sample consecutive
+  slices of the permutation, so that no index is sampled twice in an epoch. An
+  epoch contains `population_size // size` rounds, and the remaining
+  `population_size % size` indices of the permutation are not sampled in that
+  epoch. The permutation of an epoch is computed once, so its cost is amortized
+  over the rounds of the epoch.
+
+  Note: The `size` of the sample must be the same for every round.
+
+  Args:
+    population_size: The number of elements of the population.
+    random_seed: If an integer, it is used as a random seed for the permutation
+      of each epoch, see `build_uniform_index_sampling_fn`. If None, a
+      nondeterministic seed is used.
+
+  Returns:
+    A function that takes as input an integer `round_num` and integer `size` and
+    returns a read-only `np.ndarray` of `size` sampled indices.
+
+  Raises:
+    ValueError: If `population_size` is not positive.
+  """
+  _check_positive(population_size, 'population_size')
+  get_generator = _build_generator_fn(random_seed)
+
+  @functools.lru_cache(maxsize=2)
+  def get_permutation(epoch_num):
+    permutation = get_generator(epoch_num).permutation(population_size)
+    permutation.setflags(write=False)
+    return permutation
+
+  def sample(round_num, size):
+    if size > population_size:
+      raise ValueError(f'Failed to sample {size} clients from population of '
+                       f'size {population_size}.')
+    if size == 0:
+      return np.zeros([0], dtype=np.int64)
+    rounds_per_epoch = population_size // size
+    epoch_num, index = divmod(round_num, rounds_per_epoch)
+    return get_permutation(epoch_num)[index * size:(index + 1) * size]
+
+  return sample
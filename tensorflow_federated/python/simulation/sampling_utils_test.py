@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from absl.testing import parameterized
+import numpy as np
 import tensorflow as tf
 
 from tensorflow_federated.python.simulation import sampling_utils
@@ -87,5 +88,104 @@ class SamplingTest(tf.test.TestCase, parameterized.TestCase):
     self.assertNotEqual(sample_1, sample_2)
 
 
+class IndexSamplingTest(tf.test.TestCase, parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('uniform_no_replace', lambda seed: sampling_utils.
+       build_uniform_index_sampling_fn(100, random_seed=seed)),
+      ('uniform_replace', lambda seed: sampling_utils.
+       build_uniform_index_sampling_fn(5, replace=True, random_seed=seed)),
+      ('uniform_blocks', lambda seed: sampling_utils.
+       build_uniform_index_sampling_fn(
+           100, random_seed=seed, rounds_per_block=4)),
+      ('weighted', lambda seed: sampling_utils.
+       build_weighted_index_sampling_fn(range(100), random_seed=seed)),
+      ('stratified', lambda seed: sampling_utils.
+       build_stratified_index_sampling_fn([0, 1] * 50, random_seed=seed)),
+      ('epoch', lambda seed: sampling_utils.build_epoch_index_sampling_fn(
+          100, random_seed=seed)),
+  )
+  def test_sampling_fn_is_deterministic_with_random_seed(self, build_fn):
+    sample_fn_1 = build_fn(1)
+    sample_fn_2 = build_fn(1)
+
+    for round_num in [7, 0, 5, 7]:
+      self.assertAllEqual(
+          sample_fn_1(round_num, 10), sample_fn_2(round_num, 10))
+    self.assertNotAllEqual(sample_fn_1(1, 10), sample_fn_1(2, 10))
+    self.assertNotAllEqual(sample_fn_1(1, 10), build_fn(2)(1, 10))
+
+  @parameterized.named_parameters(
+      ('1', 1),
+      ('3', 3),
+  )
+  def test_uniform_index_sampling_fn_samples_without_replacement(
+      self, rounds_per_block):
+    sample_fn = sampling_utils.build_uniform_index_sampling_fn(
+        1000000, random_seed=1, rounds_per_block=rounds_per_block)
+
+    for round_num in range(5):
+      sample = sample_fn(round_num, 100)
+
+      self.assertLen(sample, 100)
+      self.assertLen(set(sample.tolist()), 100)
+      self.assertTrue(np.all((sample >= 0) & (sample < 1000000)))
+
+  def test_uniform_index_sampling_fn_raises_value_error_with_size(self):
+    sample_fn = sampling_utils.build_uniform_index_sampling_fn(5)
+
+    with self.assertRaises(ValueError):
+      sample_fn(1, 10)
+
+  @parameterized.named_parameters(
+      ('replace', True),
+      ('no_replace', False),
+  )
+  def test_weighted_index_sampling_fn_samples_by_weight(self, replace):
+    weights = [0, 10, 0, 1, 5]
+    sample_fn = sampling_utils.build_weighted_index_sampling_fn(
+        weights, replace=replace, random_seed=1)
+
+    samples = np.concatenate([sample_fn(r, 3) for r in range(200)])
+
+    self.assertContainsSubset(set(samples.tolist()), {1, 3, 4})
+    counts = np.bincount(samples, minlength=len(weights))
+    self.assertGreater(counts[1], counts[4])
+    if not replace:
+      for round_num in range(10):
+        self.assertCountEqual(sample_fn(round_num, 3).tolist(), [1, 3, 4])
+
+  @parameterized.named_parameters(
+      ('empty', []),
+      ('negative', [1, -1]),
+      ('zero_sum', [0, 0]),
+  )
+  def test_weighted_index_sampling_fn_raises_value_error_with_weights(
+      self, weights):
+    with self.assertRaises(ValueError):
+      sampling_utils.build_weighted_index_sampling_fn(weights)
+
+  def test_stratified_index_sampling_fn_samples_in_proportion(self):
+    strata = ['a'] * 60 + ['b'] * 30 + ['c'] * 10
+    sample_fn = sampling_utils.build_stratified_index_sampling_fn(
+        strata, random_seed=1)
+
+    sample = sample_fn(1, 10)
+
+    sampled_strata = [strata[i] for i in sample.tolist()]
+    self.assertEqual(sampled_strata, ['a'] * 6 + ['b'] * 3 + ['c'])
+    self.assertLen(set(sample.tolist()), 10)
+
+  def test_epoch_index_sampling_fn_samples_each_index_once_per_epoch(self):
+    sample_fn = sampling_utils.build_epoch_index_sampling_fn(10, random_seed=1)
+
+    first_epoch = np.concatenate([sample_fn(r, 3) for r in range(3)])
+    second_epoch = np.concatenate([sample_fn(r, 3) for r in range(3, 6)])
+
+    self.assertLen(set(first_epoch.tolist()), 9)
+    self.assertLen(set(second_epoch.tolist()), 9)
+    self.assertNotAllEqual(first_epoch, second_epoch)
+
+
 if __name__ == '__main__':
   tf.test.main()
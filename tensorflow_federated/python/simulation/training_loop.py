@@ -15,11 +15,15 @@
 
 import asyncio
 import collections
-from collections.abc import Callable, Iterable, MutableMapping
+from collections.abc import Awaitable, Callable, Iterable, MutableMapping, Sequence
+import concurrent.futures
+import functools
+import threading
 import time
-from typing import Any, Optional
+from typing import Any, NamedTuple, Optional
 
 from absl import logging
+import tensorflow as tf
 
 from tensorflow_federated.python.common_libs import structure
 from tensorflow_federated.python.core.impl.computation import computation_base
@@ -27,6 +31,8 @@ from tensorflow_federated.python.core.impl.types import type_conversions
 from tensorflow_federated.python.core.templates import iterative_process
 from tensorflow_federated.python.program import program_state_manager as program_state_manager_lib
 from tensorflow_federated.python.program import release_manager as release_manager_lib
+from tensorflow_federated.python.simulation import sampling_utils
+from tensorflow_federated.python.simulation.datasets import client_data as client_data_lib
 
 MetricsType = MutableMapping[str, Any]
 
@@ -36,20 +42,145 @@ ROUND_NUMBER_KEY = 'round_number'
 TRAINING_TIME_KEY = 'training_time_in_seconds'
 EVALUATION_METRICS_PREFIX = 'evaluation/'
 EVALUATION_TIME_KEY = 'evaluation_time_in_seconds'
+SELECTION_TIME_KEY = 'selection_time_in_seconds'
+DATA_PREPARATION_TIME_KEY = 'data_preparation_time_in_seconds'
+RELEASE_TIME_KEY = 'release_time_in_seconds'
+SAVE_TIME_KEY = 'save_time_in_seconds'
+
+
+class CohortSelectionFn:
+  """Samples a cohort of clients and creates their datasets for each round.
+
+  A `CohortSelectionFn` can be used as the `training_selection_fn` of
+  `tff.simulation.run_training_process`. Calling it with a round number samples
+  `clients_per_round` client ids from `client_data` using
+  `tff.simulation.build_uniform_sampling_fn`, creates the dataset of each
+  sampled client, and applies `preprocess_fn` to each dataset. The training
+  loop reports the time spent sampling the clients and creating the datasets
+  separately.
+  """
+
+  def __init__(self,
+               client_data: client_data_lib.ClientData,
+               clients_per_round: int,
+               preprocess_fn: Optional[Callable[[tf.data.Dataset],
+                                                tf.data.Dataset]] = None,
+               replace: bool = False,
+               random_seed: Optional[int] = None):
+    """Returns an initialized `CohortSelectionFn`.
+
+    Args:
+      client_data: A `tff.simulation.datasets.ClientData` to sample clients
+        from.
+      clients_per_round: The number of clients to sample for each round.
+      preprocess_fn: An optional callable applied to the dataset of each
+        sampled client.
+      replace: Whether the clients are sampled with replacement.
+      random_seed: An optional random seed for the client sampling, see
+        `tff.simulation.build_uniform_sampling_fn`.
+
+    Raises:
+      ValueError: If `clients_per_round` is not positive.
+    """
+    if clients_per_round < 1:
+      raise ValueError('Expected `clients_per_round` to be positive, found '
+                       f'{clients_per_round}.')
+    self._client_data = client_data
+    self._clients_per_round = clients_per_round
+    self._preprocess_fn = preprocess_fn
+    self._sampling_fn = sampling_utils.build_uniform_sampling_fn(
+        client_data.client_ids, replace=replace, random_seed=random_seed)
+
+  def select_clients(self, round_num: int) -> list[str]:
+    """Returns the client ids sampled for `round_num`."""
+    return self._sampling_fn(round_num, self._clients_per_round)
+
+  def create_datasets(self,
+                      client_ids: Sequence[str]) -> list[tf.data.Dataset]:
+    """Returns the preprocessed datasets of `client_ids`."""
+    datasets = [
+        self._client_data.create_tf_dataset_for_client(x) for x in client_ids
+    ]
+    if self._preprocess_fn is not None:
+      datasets = [self._preprocess_fn(x) for x in datasets]
+    return datasets
+
+  def __call__(self, round_num: int) -> list[tf.data.Dataset]:
+    return self.create_datasets(self.select_clients(round_num))
+
+
+class _PreparedData(NamedTuple):
+  data: Any
+  selection_time: float
+  data_preparation_time: float
+
+
+def _prepare_data(client_selection_fn: Callable[[int], Any],
+                  round_num: int) -> _PreparedData:
+  """Selects the clients and creates the client data for one round."""
+  if isinstance(client_selection_fn, CohortSelectionFn):
+    selection_time_start = time.time()
+    client_ids = client_selection_fn.select_clients(round_num)
+    selection_time = time.time() - selection_time_start
+    data_preparation_time_start = time.time()
+    data = client_selection_fn.create_datasets(client_ids)
+    data_preparation_time = time.time() - data_preparation_time_start
+  else:
+    selection_time_start = time.time()
+    data = client_selection_fn(round_num)
+    selection_time = time.time() - selection_time_start
+    data_preparation_time = 0.0
+  return _PreparedData(data, selection_time, data_preparation_time)
+
+
+class _RoundPreparer:
+  """Prepares the client data of upcoming rounds on a pool of threads.
+
+  When the client data of a round is requested, the client data of the
+  following `num_rounds_to_prepare` rounds (up to `total_rounds`) starts being
+  prepared, so that it is ready by the time those rounds start.
+  """
+
+  def __init__(self, client_selection_fn: Callable[[int], Any],
+               num_rounds_to_prepare: int, total_rounds: int):
+    self._client_selection_fn = client_selection_fn
+    self._num_rounds_to_prepare = num_rounds_to_prepare
+    self._total_rounds = total_rounds
+    self._prepared_data = {}
+    self._executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=num_rounds_to_prepare,
+        thread_name_prefix='training_loop_round_preparer')
+
+  def get(self, round_num: int) -> _PreparedData:
+    """Returns the client data of `round_num`, waiting for it if necessary."""
+    last_round_num = min(round_num + self._num_rounds_to_prepare,
+                         self._total_rounds)
+    for prepared_round_num in range(round_num, last_round_num + 1):
+      if prepared_round_num not in self._prepared_data:
+        self._prepared_data[prepared_round_num] = self._executor.submit(
+            _prepare_data, self._client_selection_fn, prepared_round_num)
+    return self._prepared_data.pop(round_num).result()
+
+  def close(self) -> None:
+    """Cancels the preparation of the rounds which have not started."""
+    self._executor.shutdown(wait=False, cancel_futures=True)
+    self._prepared_data.clear()
 
 
 def _run_training(
-    training_fn: computation_base.Computation,
-    client_selection_fn: Callable[[int], Any], state: Any,
+    training_fn: computation_base.Computation, prepared_data: _PreparedData,
+    state: Any,
     round_num: int) -> tuple[Any, collections.OrderedDict[str, Any]]:
   """Runs one round of federated training."""
   logging.info('Running training at round %d', round_num)
   training_time_start = time.time()
-  training_data = client_selection_fn(round_num)
-  state, metrics = structure.from_container(training_fn(state, training_data))
+  state, metrics = structure.from_container(
+      training_fn(state, prepared_data.data))
   training_time = time.time() - training_time_start
   metrics[TRAINING_TIME_KEY] = training_time
   metrics[ROUND_NUMBER_KEY] = round_num
+  metrics[SELECTION_TIME_KEY] = prepared_data.selection_time
+  metrics[DATA_PREPARATION_TIME_KEY] = prepared_data.data_preparation_time
   return state, collections.OrderedDict(metrics)
 
 
@@ -67,6 +198,74 @@ def _run_evaluation(evaluation_fn: Callable[[Any, Any], MetricsType],
       {EVALUATION_METRICS_PREFIX + k: v for (k, v) in metrics.items()})
 
 
+async def _release_metrics(
+    metrics_managers: Iterable[release_manager_lib.ReleaseManager],
+    metrics: MetricsType, round_num: int) -> None:
+  """Releases `metrics` to all the `metrics_managers`."""
+  metrics_type = type_conversions.infer_type(metrics)
+  await asyncio.gather(
+      *[m.release(metrics, metrics_type, round_num) for m in metrics_managers])
+
+
+class _BackgroundWriter:
+  """Runs writes in order on an event loop in a background thread.
+
+  A write is a callable returning an awaitable, e.g. saving the program state or
+  releasing metrics. Writes run one at a time, in the order in which they were
+  submitted, so that the saved program state versions are always written in
+  increasing order. At most `max_pending_writes` writes are outstanding;
+  `submit` blocks until an earlier write completes when the limit is reached.
+
+  An error raised by a write is raised by the next call to `submit`,
+  `raise_if_failed` or `close`.
+  """
+
+  def __init__(self, max_pending_writes: int):
+    self._max_pending_writes = max_pending_writes
+    self._pending_writes = collections.deque()
+    self._loop = asyncio.new_event_loop()
+    self._lock = None
+    self._thread = threading.Thread(
+        target=self._loop.run_forever,
+        name='training_loop_background_writer',
+        daemon=True)
+    self._thread.start()
+
+  async def _write_in_order(self, write_fn: Callable[[], Awaitable[Any]]):
+    # The lock is created on the event loop of the background thread.
+    if self._lock is None:
+      self._lock = asyncio.Lock()
+    async with self._lock:
+      await write_fn()
+
+  def raise_if_failed(self) -> None:
+    """Raises the error of the first failed write which has completed."""
+    while self._pending_writes and self._pending_writes[0].done():
+      self._pending_writes.popleft().result()
+
+  def submit(self, write_fn: Callable[[], Awaitable[Any]]) -> None:
+    """Schedules `write_fn` to be run after the writes already submitted."""
+    self.raise_if_failed()
+    while len(self._pending_writes) >= self._max_pending_writes:
+      self._pending_writes.popleft().result()
+    self._pending_writes.append(
+        asyncio.run_coroutine_threadsafe(
+            self._write_in_order(write_fn), self._loop))
+
+  def close(self) -> None:
+    """Waits for the outstanding writes and stops the background thread."""
+    try:
+      while self._pending_writes:
+        self._pending_writes.popleft().result()
+    finally:
+      for write in self._pending_writes:
+        write.cancel()
+      self._pending_writes.clear()
+      self._loop.call_soon_threadsafe(self._loop.stop)
+      self._thread.join()
+      self._loop.close()
+
+
 def run_training_process(
     training_process: iterative_process.IterativeProcess,
     training_selection_fn: Callable[[int], Any],
@@ -78,7 +277,9 @@ def run_training_process(
         program_state_manager_lib.ProgramStateManager] = None,
     rounds_per_saving_program_state: int = 1,
     metrics_managers: Optional[Iterable[
-        release_manager_lib.ReleaseManager]] = None):
+        release_manager_lib.ReleaseManager]] = None,
+    max_pending_writes: Optional[int] = None,
+    num_rounds_to_prepare: int = 0):
   """Runs a federated `training_process`.
 
   The following `tff.Computation` types signaures are required:
@@ -103,10 +304,39 @@ def run_training_process(
 
   * tff.simulation.ROUND_NUMBER_KEY: The round number.
   * tff.simulation.TRAINING_TIME_KEY: The amount of time (in seconds) it takes
-    to run one round of training.
+    to run one round of training, excluding the selection of its client data.
+  * tff.simulation.SELECTION_TIME_KEY: The amount of time (in seconds) it takes
+    to select the clients of one round of training.
+  * tff.simulation.DATA_PREPARATION_TIME_KEY: The amount of time (in seconds)
+    it takes to create and preprocess the datasets of the selected clients. This
+    is only measured separately from the selection time if
+    `training_selection_fn` is a `tff.simulation.CohortSelectionFn`, and is
+    zero otherwise.
+  * tff.simulation.RELEASE_TIME_KEY: The amount of time (in seconds) training
+    was blocked releasing the metrics of the previous round.
+  * tff.simulation.SAVE_TIME_KEY: The amount of time (in seconds) training was
+    blocked saving the program state of the previous round.
   * tff.simulation.EVALUATION_TIME_KEY: The amount of time (in seconds) it takes
     to run one round of evaluation.
 
+  By default, the client data of each training round is selected right before
+  the round runs. If `num_rounds_to_prepare` is positive, the client data of
+  the next `num_rounds_to_prepare` rounds is instead selected and prepared on a
+  pool of threads while the current round runs, taking the selection and data
+  preparation off the critical path. In that case `training_selection_fn` must
+  be safe to call from multiple threads and is not guaranteed to be called in
+  round order.
+
+  By default, training blocks while the program state is saved and the metrics
+  are released. If `max_pending_writes` is specified, the saves and releases are
+  instead performed in order on a background thread while training continues,
+  with at most `max_pending_writes` of them outstanding. The state returned by
+  `training_process.next` is never modified by later rounds, so the state of a
+  round can be saved while the next rounds run. An error raised by a save or a
+  release is raised at the start of a later round, or before this function
+  returns; in both cases the outstanding writes are waited on first, so the
+  latest saved program state is always a complete round to resume from.
+
   Args:
     training_process: A `tff.templates.IterativeProcess` to run for training.
     training_selection_fn: A `Callable` accepting an integer round number, and
@@ -126,13 +356,84 @@ def run_training_process(
       between saving program state.
     metrics_managers: An optional list of `tff.program.ReleaseManagers`s to use
       to save metrics.
+    max_pending_writes: An optional maximum number of program state saves and
+      metrics releases to run in the background. If `None`, they are run
+      synchronously.
+    num_rounds_to_prepare: The number of upcoming rounds whose client data is
+      prepared in parallel with the current round. If zero, the client data of
+      each round is prepared synchronously.
 
   Returns:
     The `state` of the training process after training.
+
+  Raises:
+    ValueError: If `max_pending_writes` is not positive or
+      `num_rounds_to_prepare` is negative.
   """
+  if max_pending_writes is not None and max_pending_writes < 1:
+    raise ValueError('Expected `max_pending_writes` to be positive, found '
+                     f'{max_pending_writes}.')
+  if num_rounds_to_prepare < 0:
+    raise ValueError('Expected `num_rounds_to_prepare` to be non-negative, '
+                     f'found {num_rounds_to_prepare}.')
   loop = asyncio.get_event_loop()
+  if max_pending_writes is not None:
+    writer = _BackgroundWriter(max_pending_writes)
+  else:
+    writer = None
+
+  if num_rounds_to_prepare > 0:
+    preparer = _RoundPreparer(training_selection_fn, num_rounds_to_prepare,
+                              total_rounds)
+    prepare = preparer.get
+  else:
+    preparer = None
+    prepare = functools.partial(_prepare_data, training_selection_fn)
+
+  def _write(write_fn: Callable[[], Awaitable[Any]]) -> None:
+    if writer is not None:
+      writer.submit(write_fn)
+    else:
+      loop.run_until_complete(write_fn())
 
+  try:
+    state = _run_training_process(training_process, prepare, total_rounds,
+                                  evaluation_fn, evaluation_selection_fn,
+                                  rounds_per_evaluation, program_state_manager,
+                                  rounds_per_saving_program_state,
+                                  metrics_managers, loop, _write, writer)
+  except:
+    if writer is not None:
+      try:
+        writer.close()
+      except Exception:  # pylint: disable=broad-except
+        logging.exception('Failed to complete a background write.')
+    raise
+  finally:
+    if preparer is not None:
+      preparer.close()
+  if writer is not None:
+    writer.close()
+  return state
+
+
+def _run_training_process(
+    training_process: iterative_process.IterativeProcess,
+    prepare: Callable[[int], _PreparedData], total_rounds: int,
+    evaluation_fn: Optional[Callable[[Any, Any], MetricsType]],
+    evaluation_selection_fn: Optional[Callable[[int], Any]],
+    rounds_per_evaluation: int,
+    program_state_manager: Optional[
+        program_state_manager_lib.ProgramStateManager],
+    rounds_per_saving_program_state: int,
+    metrics_managers: Optional[Iterable[release_manager_lib.ReleaseManager]],
+    loop: asyncio.AbstractEventLoop, write: Callable[
+        [Callable[[], Awaitable[Any]]], None],
+    writer: Optional[_BackgroundWriter]) -> Any:
+  """Runs a federated `training_process`, see `run_training_process`."""
   logging.info('Running training process')
+  release_time = 0.0
+  save_time = 0.0
   if program_state_manager is not None:
     training_process_structure = training_process.initialize()
     program_state, previous_saved_version = loop.run_until_complete(
@@ -153,22 +454,29 @@ def run_training_process(
                                            evaluation_selection_fn, state, 0)
 
       if metrics_managers is not None:
-        metrics_type = type_conversions.infer_type(evaluation_metrics)
-        loop.run_until_complete(
-            asyncio.gather(*[
-                m.release(evaluation_metrics, metrics_type, 0)
-                for m in metrics_managers
-            ]))
+        release_time_start = time.time()
+        write(
+            functools.partial(_release_metrics, metrics_managers,
+                              evaluation_metrics, 0))
+        release_time = time.time() - release_time_start
 
     if program_state_manager is not None:
-      loop.run_until_complete(program_state_manager.save(state, 0))
+      save_time_start = time.time()
+      write(functools.partial(program_state_manager.save, state, 0))
+      save_time = time.time() - save_time_start
 
   for round_num in range(start_round, total_rounds + 1):
     logging.info('Starting round %d', round_num)
+    if writer is not None:
+      writer.raise_if_failed()
     metrics = collections.OrderedDict()
+    prepared_data = prepare(round_num)
     state, training_metrics = _run_training(training_process.next,
-                                            training_selection_fn, state,
-                                            round_num)
+                                            prepared_data, state, round_num)
+    training_metrics[RELEASE_TIME_KEY] = release_time
+    training_metrics[SAVE_TIME_KEY] = save_time
+    release_time = 0.0
+    save_time = 0.0
     if metrics_managers is not None:
       metrics.update(training_metrics)
 
@@ -181,15 +489,16 @@ def run_training_process(
           metrics.update(evaluation_metrics)
 
     if metrics_managers is not None:
-      metrics_type = type_conversions.infer_type(metrics)
-      loop.run_until_complete(
-          asyncio.gather(*[
-              m.release(metrics, metrics_type, round_num)
-              for m in metrics_managers
-          ]))
+      release_time_start = time.time()
+      write(
+          functools.partial(_release_metrics, metrics_managers, metrics,
+                            round_num))
+      release_time = time.time() - release_time_start
 
     if program_state_manager is not None:
       if round_num % rounds_per_saving_program_state == 0:
-        loop.run_until_complete(program_state_manager.save(state, round_num))
+        save_time_start = time.time()
+        write(functools.partial(program_state_manager.save, state, round_num))
+        save_time = time.time() - save_time_start
 
   return state
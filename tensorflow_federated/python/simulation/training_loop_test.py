@@ -26,6 +26,7 @@ from tensorflow_federated.python.core.impl.types import computation_types
 from tensorflow_federated.python.core.impl.types import placements
 from tensorflow_federated.python.core.templates import iterative_process
 from tensorflow_federated.python.simulation import training_loop
+from tensorflow_federated.python.simulation.datasets import from_tensor_slices_client_data
 
 
 @federated_computation.federated_computation
@@ -277,11 +278,19 @@ class RunTrainingProcessTest(parameterized.TestCase):
           ('metric', 1.0),
           ('training_time_in_seconds', mock.ANY),
           ('round_number', round_num),
+          ('selection_time_in_seconds', mock.ANY),
+          ('data_preparation_time_in_seconds', mock.ANY),
+          ('release_time_in_seconds', mock.ANY),
+          ('save_time_in_seconds', mock.ANY),
       ])
       metrics_type = computation_types.StructWithPythonType([
           ('metric', tf.float32),
           ('training_time_in_seconds', tf.float32),
           ('round_number', tf.int32),
+          ('selection_time_in_seconds', tf.float32),
+          ('data_preparation_time_in_seconds', tf.float32),
+          ('release_time_in_seconds', tf.float32),
+          ('save_time_in_seconds', tf.float32),
       ], collections.OrderedDict)
       call = mock.call(metrics, metrics_type, round_num)
       expected_calls.append(call)
@@ -337,6 +346,10 @@ class RunTrainingProcessTest(parameterized.TestCase):
             ('metric', 1.0),
             ('training_time_in_seconds', mock.ANY),
             ('round_number', round_num),
+            ('selection_time_in_seconds', mock.ANY),
+            ('data_preparation_time_in_seconds', mock.ANY),
+            ('release_time_in_seconds', mock.ANY),
+            ('save_time_in_seconds', mock.ANY),
             ('evaluation/metric', 1.0),
             ('evaluation/evaluation_time_in_seconds', mock.ANY),
         ])
@@ -344,6 +357,10 @@ class RunTrainingProcessTest(parameterized.TestCase):
             ('metric', tf.float32),
             ('training_time_in_seconds', tf.float32),
             ('round_number', tf.int32),
+            ('selection_time_in_seconds', tf.float32),
+            ('data_preparation_time_in_seconds', tf.float32),
+            ('release_time_in_seconds', tf.float32),
+            ('save_time_in_seconds', tf.float32),
             ('evaluation/metric', tf.float32),
             ('evaluation/evaluation_time_in_seconds', tf.float32),
         ], collections.OrderedDict)
@@ -352,11 +369,19 @@ class RunTrainingProcessTest(parameterized.TestCase):
             ('metric', 1.0),
             ('training_time_in_seconds', mock.ANY),
             ('round_number', round_num),
+            ('selection_time_in_seconds', mock.ANY),
+            ('data_preparation_time_in_seconds', mock.ANY),
+            ('release_time_in_seconds', mock.ANY),
+            ('save_time_in_seconds', mock.ANY),
         ])
         metrics_type = computation_types.StructWithPythonType([
             ('metric', tf.float32),
             ('training_time_in_seconds', tf.float32),
             ('round_number', tf.int32),
+            ('selection_time_in_seconds', tf.float32),
+            ('data_preparation_time_in_seconds', tf.float32),
+            ('release_time_in_seconds', tf.float32),
+            ('save_time_in_seconds', tf.float32),
         ], collections.OrderedDict)
       call = mock.call(metrics, metrics_type, round_num)
       expected_calls.append(call)
@@ -378,7 +403,7 @@ class RunTrainingProcessTest(parameterized.TestCase):
 
     with mock.patch('time.time') as mock_time:
       # Since absl.logging.info uses a call to time.time, we mock it out.
-      mock_time.side_effect = [0.0, 10.0] * 3
+      mock_time.side_effect = [0.0, 10.0] * 6
       with mock.patch('absl.logging.info'):
         training_loop.run_training_process(
             training_process=training_process,
@@ -403,6 +428,10 @@ class RunTrainingProcessTest(parameterized.TestCase):
         ('metric', 1.0),
         ('training_time_in_seconds', 10.0),
         ('round_number', 1),
+        ('selection_time_in_seconds', 10.0),
+        ('data_preparation_time_in_seconds', 0.0),
+        ('release_time_in_seconds', 10.0),
+        ('save_time_in_seconds', 0.0),
         ('evaluation/metric', 1.0),
         ('evaluation/evaluation_time_in_seconds', 10.0),
     ])
@@ -410,6 +439,10 @@ class RunTrainingProcessTest(parameterized.TestCase):
         ('metric', tf.float32),
         ('training_time_in_seconds', tf.float32),
         ('round_number', tf.int32),
+        ('selection_time_in_seconds', tf.float32),
+        ('data_preparation_time_in_seconds', tf.float32),
+        ('release_time_in_seconds', tf.float32),
+        ('save_time_in_seconds', tf.float32),
         ('evaluation/metric', tf.float32),
         ('evaluation/evaluation_time_in_seconds', tf.float32),
     ], collections.OrderedDict)
@@ -417,6 +450,162 @@ class RunTrainingProcessTest(parameterized.TestCase):
     expected_calls.append(call)
     self.assertEqual(metrics_manager.release.call_args_list, expected_calls)
 
+  @parameterized.named_parameters(
+      ('1', 1),
+      ('2', 2),
+      ('10', 10),
+  )
+  def test_training_fns_called_with_prepared_rounds(self,
+                                                    num_rounds_to_prepare):
+    training_process = mock.create_autospec(iterative_process.IterativeProcess)
+    training_process.initialize.return_value = 'initialize'
+    training_process.next.return_value = ('update', {'metric': 1.0})
+    training_selection_fn = mock.MagicMock()
+    training_selection_fn.side_effect = lambda round_num: [round_num]
+    total_rounds = 5
+
+    training_loop.run_training_process(
+        training_process=training_process,
+        training_selection_fn=training_selection_fn,
+        total_rounds=total_rounds,
+        num_rounds_to_prepare=num_rounds_to_prepare)
+
+    expected_calls = []
+    for round_num in range(1, total_rounds + 1):
+      call = mock.call(round_num)
+      expected_calls.append(call)
+    self.assertCountEqual(training_selection_fn.call_args_list, expected_calls)
+    expected_calls = []
+    for round_num in range(1, total_rounds + 1):
+      if round_num == 1:
+        state = 'initialize'
+      else:
+        state = 'update'
+      call = mock.call(state, [round_num])
+      expected_calls.append(call)
+    self.assertEqual(training_process.next.call_args_list, expected_calls)
+
+  @parameterized.named_parameters(
+      ('synchronous', 0),
+      ('prepared', 2),
+  )
+  def test_training_fns_called_with_cohort_selection_fn(
+      self, num_rounds_to_prepare):
+    training_process = mock.create_autospec(iterative_process.IterativeProcess)
+    training_process.initialize.return_value = 'initialize'
+    training_process.next.return_value = ('update', {'metric': 1.0})
+    client_data = from_tensor_slices_client_data.TestClientData({
+        'a': [1, 2],
+        'b': [3],
+        'c': [4, 5, 6],
+    })
+    training_selection_fn = training_loop.CohortSelectionFn(
+        client_data,
+        clients_per_round=2,
+        preprocess_fn=lambda x: x.batch(2),
+        random_seed=1)
+    metrics_manager = mock.AsyncMock()
+    total_rounds = 3
+
+    training_loop.run_training_process(
+        training_process=training_process,
+        training_selection_fn=training_selection_fn,
+        total_rounds=total_rounds,
+        metrics_managers=[metrics_manager],
+        num_rounds_to_prepare=num_rounds_to_prepare)
+
+    self.assertLen(training_process.next.call_args_list, total_rounds)
+    for round_num, call in enumerate(training_process.next.call_args_list, 1):
+      _, datasets = call.args
+      client_ids = training_selection_fn.select_clients(round_num)
+      self.assertLen(datasets, 2)
+      for dataset, client_id in zip(datasets, client_ids):
+        expected_dataset = client_data.create_tf_dataset_for_client(
+            client_id).batch(2)
+        self.assertEqual(
+            list(dataset.as_numpy_iterator())[0].tolist(),
+            list(expected_dataset.as_numpy_iterator())[0].tolist())
+    for call in metrics_manager.release.call_args_list:
+      metrics = call.args[0]
+      self.assertGreaterEqual(metrics['selection_time_in_seconds'], 0.0)
+      self.assertGreaterEqual(metrics['data_preparation_time_in_seconds'], 0.0)
+
+  @parameterized.named_parameters(
+      ('1', 1),
+      ('2', 2),
+      ('10', 10),
+  )
+  def test_program_state_manager_and_metrics_managers_called_in_background(
+      self, max_pending_writes):
+    training_process = mock.create_autospec(iterative_process.IterativeProcess)
+    training_process.initialize.return_value = 'initialize'
+    training_process.next.return_value = ('update', {'metric': 1.0})
+    training_selection_fn = mock.MagicMock()
+    program_state_manager = mock.AsyncMock()
+    program_state_manager.load_latest.return_value = (None, 0)
+    metrics_manager = mock.AsyncMock()
+    total_rounds = 5
+
+    training_loop.run_training_process(
+        training_process=training_process,
+        training_selection_fn=training_selection_fn,
+        total_rounds=total_rounds,
+        program_state_manager=program_state_manager,
+        metrics_managers=[metrics_manager],
+        max_pending_writes=max_pending_writes)
+
+    expected_calls = [mock.call('initialize', 0)]
+    for round_num in range(1, total_rounds + 1):
+      expected_calls.append(mock.call('update', round_num))
+    self.assertEqual(program_state_manager.save.call_args_list, expected_calls)
+    self.assertEqual(
+        [call.args[2] for call in metrics_manager.release.call_args_list],
+        list(range(1, total_rounds + 1)))
+
+  def test_raises_error_from_background_write(self):
+    training_process = mock.create_autospec(iterative_process.IterativeProcess)
+    training_process.initialize.return_value = 'initialize'
+    training_process.next.return_value = ('update', {'metric': 1.0})
+    training_selection_fn = mock.MagicMock()
+    program_state_manager = mock.AsyncMock()
+    program_state_manager.load_latest.return_value = (None, 0)
+    program_state_manager.save.side_effect = ValueError('save failed')
+
+    with self.assertRaisesRegex(ValueError, 'save failed'):
+      training_loop.run_training_process(
+          training_process=training_process,
+          training_selection_fn=training_selection_fn,
+          total_rounds=5,
+          program_state_manager=program_state_manager,
+          max_pending_writes=2)
+
+  @parameterized.named_parameters(
+      ('0', 0),
+      ('negative', -1),
+  )
+  def test_raises_value_error_with_max_pending_writes(self,
+                                                      max_pending_writes):
+    training_process = mock.create_autospec(iterative_process.IterativeProcess)
+    training_selection_fn = mock.MagicMock()
+
+    with self.assertRaises(ValueError):
+      training_loop.run_training_process(
+          training_process=training_process,
+          training_selection_fn=training_selection_fn,
+          total_rounds=5,
+          max_pending_writes=max_pending_writes)
+
+  def test_raises_value_error_with_num_rounds_to_prepare(self):
+    training_process = mock.create_autospec(iterative_process.IterativeProcess)
+    training_selection_fn = mock.MagicMock()
+
+    with self.assertRaises(ValueError):
+      training_loop.run_training_process(
+          training_process=training_process,
+          training_selection_fn=training_selection_fn,
+          total_rounds=5,
+          num_rounds_to_prepare=-1)
+
 
 if __name__ == '__main__':
   absltest.main()